@@ -17,7 +17,22 @@ uvloop.install()
 master = os.environ.get('HAIL_APISERVER_SPARK_MASTER')
 hl.init(master=master, min_block_size=0)
 
-app = web.Application()
+# responses smaller than this are not worth compressing
+COMPRESS_THRESHOLD = 1024
+
+
+@web.middleware
+async def compress_responses(request, handler):
+    # gzip-encoded request bodies are decompressed by aiohttp
+    response = await handler(request)
+    if isinstance(response, web.Response) and response.body is not None and \
+            len(response.body) >= COMPRESS_THRESHOLD:
+        # only if the client accepts a compressed response
+        response.enable_compression()
+    return response
+
+
+app = web.Application(middlewares=[compress_responses])
 routes = web.RouteTableDef()
 
 
@@ -64,6 +79,31 @@ async def execute(request, userdata):
         }, status=400)
 
 
+def blocking_execute_encoded(code):
+    jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, {})
+    typ = hl.dtype(jir.typ().toString())
+    result = Env.hc()._jhc.backend().executeEncode(jir, 'unblockedUncompressed')
+    return str(typ), bytes(result._1()), result._2()
+
+
+@routes.post('/execute/encoded')
+@authenticated_users_only
+async def execute_encoded(request, userdata):
+    code = await request.json()
+    info(f'execute encoded: {code}')
+    try:
+        typ, encoding, timings = await run(blocking_execute_encoded, code)
+        info(f'result: {len(encoding)} bytes of {typ}')
+        return web.Response(body=encoding,
+                            content_type='application/octet-stream',
+                            headers={'X-Hail-Type': typ,
+                                     'X-Hail-Timings': timings})
+    except FatalError as e:
+        return web.json_response({
+            'message': e.args[0]
+        }, status=400)
+
+
 def blocking_value_type(code):
     jir = Env.hail().expr.ir.IRParser.parse_value_ir(code, {}, {})
     return jir.typ().toString()
@@ -3,6 +3,8 @@ import sys
 if sys.version_info < (3, 6):
     raise EnvironmentError('Hail requires Python 3.6, found {}.{}'.format(
         sys.version_info.major, sys.version_info.minor))
+# module __getattr__ (PEP 562) is not supported before Python 3.7
+_eager_submodules = sys.version_info < (3, 7)
 del sys
 
 __doc__ = r"""
@@ -22,7 +24,7 @@ To report a bug, please open an issue: https://github.com/hail-is/hail/issues
 """
 
 from .context import init, stop, spark_context, default_reference, \
-    get_reference, set_global_seed, _set_flags, _get_flags, \
+    get_reference, set_global_seed, _set_flags, _get_flags, _set_result_cache, _set_auto_persist, \
     current_backend, debug_info, citation, cite_hail, cite_hail_bibtex
 from .table import Table, GroupedTable, asc, desc
 from .matrixtable import MatrixTable, GroupedMatrixTable
@@ -32,10 +34,6 @@ from .methods import *
 from . import genetics
 from . import methods
 from . import expr
-from . import stats
-from . import linalg
-from . import plot
-from . import experimental
 from . import ir
 from . import backend
 from hail.expr import aggregators as agg
@@ -52,6 +50,8 @@ __all__ = [
     'get_reference',
     'set_global_seed',
     '_set_flags',
+    '_set_result_cache',
+    '_set_auto_persist',
     '_get_flags',
     'Table',
     'GroupedTable',
@@ -94,6 +94,27 @@ import builtins
 __all__.extend([x for x in expr.__all__ if not hasattr(builtins, x)])
 del builtins
 
+# these submodules pull in scipy, bokeh and pandas, and are imported on first
+# access, e.g. `hl.linalg`
+_lazy_submodules = {'stats', 'linalg', 'plot', 'experimental'}
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        import importlib
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    # `set` and `sorted` are Hail's expression functions here
+    import builtins
+    return builtins.sorted(builtins.set(globals()) | _lazy_submodules)
+
+
+if _eager_submodules:
+    from . import stats, linalg, plot, experimental
+
 ir.register_functions()
 ir.register_aggregators()
 
@@ -1,8 +1,25 @@
+import sys
+
 from .backend import *
 
 __all__ = [
     'Backend',
     'LocalBackend',
     'SparkBackend',
-    'ServiceBackend'
+    'ServiceBackend',
+    'AsyncServiceBackend'
 ]
+
+
+def __getattr__(name):
+    # aiohttp is only imported for the asynchronous service backend
+    if name == 'AsyncServiceBackend':
+        from .aio_service_backend import AsyncServiceBackend
+        return AsyncServiceBackend
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# module __getattr__ (PEP 562) is not supported before Python 3.7
+if sys.version_info < (3, 7):
+    from .aio_service_backend import AsyncServiceBackend
+del sys
@@ -0,0 +1,112 @@
+import json
+
+import aiohttp
+
+from hail.expr.types import dtype
+from hail.ir.renderer import Renderer
+from hail.utils.java import FatalError
+from .backend import _service_request_body, _service_token, _service_execute_value, \
+    _service_table_type, _service_matrix_type, _service_blockmatrix_type
+
+
+class AsyncServiceBackend:
+    """Asynchronous client for the Hail apiserver.
+
+    Methods are coroutines, so type queries and executions can be issued
+    concurrently, for instance with :func:`asyncio.gather` or as futures
+    with :func:`asyncio.ensure_future`. Requests share a pool of keep-alive
+    connections, and bodies of at least `compress_threshold` bytes are
+    gzip-compressed.
+
+    Examples
+    --------
+    >>> backend = hl.current_backend().async_backend()  # doctest: +SKIP
+    >>> table_type, n = await asyncio.gather(backend.table_type(t._tir),
+    ...                                      backend.execute(ir.TableCount(t._tir)))  # doctest: +SKIP
+    """
+
+    def __init__(self, url, token=None, token_file=None, session=None, pool_size=10,
+                 compress_threshold=1024):
+        self.url = url
+        self.cookies = {'user': _service_token(token, token_file)}
+        self._compress_threshold = compress_threshold
+        self._session = session
+        self._pool_size = pool_size
+        # cleared if the server does not support binary-encoded results
+        self._encoded_results = True
+
+    def _get_session(self):
+        # created lazily, since the session is bound to the running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_size))
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _render(self, ir):
+        r = Renderer()
+        assert len(r.jirs) == 0
+        return r(ir)
+
+    async def _request(self, method, path, data, read):
+        body, headers = _service_request_body(data, self._compress_threshold)
+        async with self._get_session().request(method, f'{self.url}{path}', data=body,
+                                               headers=headers, cookies=self.cookies) as resp:
+            if resp.status == 400:
+                resp_json = await resp.json()
+                raise FatalError(resp_json['message'])
+            resp.raise_for_status()
+            return await read(resp)
+
+    async def _request_json(self, method, path, data):
+        return await self._request(method, path, data, lambda resp: resp.json())
+
+    async def execute_encoded(self, ir):
+        if not self._encoded_results:
+            return None
+
+        async def read(resp):
+            return await resp.read(), json.loads(resp.headers['X-Hail-Timings'])['timings']
+
+        try:
+            return await self._request('post', '/execute/encoded', self._render(ir), read)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                self._encoded_results = False
+                return None
+            raise
+
+    async def execute(self, ir, timed=False):
+        if ir.typ._can_convert_from_encoding():
+            result = await self.execute_encoded(ir)
+            if result is not None:
+                encoding, timings = result
+                value = ir.typ._from_encoding(encoding)
+                return (value, timings) if timed else value
+
+        resp_json = await self._request_json('post', '/execute', self._render(ir))
+        value, timings = _service_execute_value(resp_json)
+        return (value, timings) if timed else value
+
+    async def value_type(self, ir):
+        return dtype(await self._request_json('post', '/type/value', self._render(ir)))
+
+    async def table_type(self, tir):
+        return _service_table_type(await self._request_json('post', '/type/table', self._render(tir)))
+
+    async def matrix_type(self, mir):
+        return _service_matrix_type(await self._request_json('post', '/type/matrix', self._render(mir)))
+
+    async def blockmatrix_type(self, bmir):
+        return _service_blockmatrix_type(
+            await self._request_json('post', '/type/blockmatrix', self._render(bmir)))
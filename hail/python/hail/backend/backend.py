@@ -1,4 +1,5 @@
 import abc
+import gzip
 import os
 
 from hail.utils.java import *
@@ -6,20 +7,177 @@ from hail.expr.types import dtype
 from hail.expr.table_type import *
 from hail.expr.matrix_type import *
 from hail.expr.blockmatrix_type import *
+from hail.ir import BaseIR, ApplySeeded, TableWrite, MatrixWrite, MatrixMultiWrite, \
+    BlockMatrixWrite, BlockMatrixMultiWrite, NDArrayWrite, JavaIR, TableToValueApply, \
+    MatrixToValueApply, BlockMatrixToValueApply, TableRead, MatrixRead, BlockMatrixRead, \
+    JavaTable, JavaMatrix, JavaMatrixVectorRef, JavaBlockMatrix
+from hail.ir import reader_metadata
 from hail.ir.renderer import Renderer
+from hail.ir.table_reader import TableNativeReader, TableFromBlockMatrixNativeReader
+from hail.ir.matrix_reader import MatrixNativeReader
+from hail.ir.blockmatrix_reader import BlockMatrixNativeReader
+from hail.utils.lru_cache import LRUCache
+from hail.utils.misc import wrap_to_list
 from hail.table import Table
 from hail.matrixtable import MatrixTable
 
-import requests
 
-import pyspark
+def _execute_jir(backend, jbackend, ir, jir):
+    """Execute `jir` on a JVM backend, transporting the result in the binary
+    ``unblockedUncompressed`` encoding when Python can decode its type and
+    as JSON otherwise."""
+    if ir.typ._can_convert_from_encoding():
+        encoding, timings = backend._execute_encoded_cached(
+            ir, lambda: _execute_jir_encoded(jbackend, jir))
+        value = ir.typ._from_encoding(encoding)
+    else:
+        result = json.loads(jbackend.executeJSON(jir))
+        value = ir.typ._from_json(result['value'])
+        timings = result['timings']
+    return value, timings
+
+
+def _execute_jir_encoded(jbackend, jir):
+    result = jbackend.executeEncode(jir, 'unblockedUncompressed')
+    return result._1(), json.loads(result._2())['timings']
+
+
+# IRs whose values may change between executions, or that have side effects
+_uncacheable_irs = (ApplySeeded, TableWrite, MatrixWrite, MatrixMultiWrite,
+                    BlockMatrixWrite, BlockMatrixMultiWrite, NDArrayWrite,
+                    JavaIR, JavaTable, JavaMatrix, JavaMatrixVectorRef, JavaBlockMatrix)
+
+
+def _walk(ir):
+    visited = set()
+    stack = [ir]
+    while stack:
+        x = stack.pop()
+        if id(x) in visited:
+            continue
+        visited.add(id(x))
+        yield x
+        stack.extend(c for c in x.children if isinstance(c, BaseIR))
+
+
+def _stamped_paths(reader):
+    """Files whose modification times and sizes change when the data `reader`
+    reads is rewritten: the metadata file of native formats, which every
+    write replaces, and otherwise the files read. ``None`` if unknown."""
+    if isinstance(reader, (TableNativeReader, MatrixNativeReader)):
+        return [reader_metadata.native_metadata_path(reader.path)]
+    if isinstance(reader, (BlockMatrixNativeReader, TableFromBlockMatrixNativeReader)):
+        return [reader_metadata.blockmatrix_metadata_path(reader.path)]
+    paths = getattr(reader, 'path', None)
+    return None if paths is None else wrap_to_list(paths)
+
+
+def _reader_stamps(ir, fs):
+    """The paths, modification times and sizes of the files stamping the
+    data `ir` reads, or ``None`` if some of them are unknown."""
+    stamps = []
+    for x in _walk(ir):
+        if isinstance(x, (TableRead, MatrixRead, BlockMatrixRead)):
+            paths = _stamped_paths(x.reader)
+            if paths is None:
+                return None
+            for path in paths:
+                try:
+                    stat = fs.stat(path)
+                except Exception:
+                    return None
+                if stat.get('modification_time') is None:
+                    return None
+                stamps.append((path, stat['modification_time'], stat['size_bytes']))
+    return tuple(stamps)
+
+
+def _result_cache_key(ir, fs):
+    """Key under which the value of `ir` can be cached, or ``None`` if `ir` is
+    not deterministic.
+
+    `ir` is not deterministic if it draws random numbers, has side effects,
+    refers to objects in the JVM, or reads files whose modification times are
+    unknown. The key includes the modification times of the files `ir` reads,
+    so rewriting an input invalidates the cached values computed from it.
+    """
+    for x in _walk(ir):
+        if isinstance(x, _uncacheable_irs):
+            return None
+        if isinstance(x, (TableToValueApply, MatrixToValueApply, BlockMatrixToValueApply)):
+            name = x.config['name']
+            if 'Write' in name or 'Export' in name:
+                return None
+    stamps = _reader_stamps(ir, fs)
+    if stamps is None:
+        return None
+    return ir, stamps
 
 
 class Backend(abc.ABC):
+    # whether :meth:`.Table.to_pandas` converts through a Spark DataFrame
+    converts_through_spark = False
+
+    def __init__(self):
+        self._result_cache = None
+
     @abc.abstractmethod
     def execute(self, ir, timed=False):
         return
 
+    def execute_encoded(self, ir):
+        """Execute `ir` and return its value in the ``unblockedUncompressed``
+        binary encoding read by :meth:`.HailType._from_encoding`, together
+        with the timings, or ``None`` if the backend cannot encode results.
+        """
+        return None
+
+    def enable_result_cache(self, max_entries, max_bytes):
+        """Cache the encoded values of deterministic IRs, evicting the least
+        recently used values beyond `max_entries` values or `max_bytes`
+        bytes."""
+        self._result_cache = LRUCache(max_entries, max_bytes, size=len)
+
+    def disable_result_cache(self):
+        self._result_cache = None
+
+    def _execute_encoded_cached(self, ir, execute_encoded):
+        """Return the result of `execute_encoded`, an encoding and timings,
+        or the encoding cached for `ir`, with empty timings."""
+        if self._result_cache is None:
+            return execute_encoded()
+        key = _result_cache_key(ir, self.fs)
+        if key is None:
+            return execute_encoded()
+        encoding = self._result_cache.get(key)
+        if encoding is not None:
+            return encoding, {}
+        result = execute_encoded()
+        if result is not None:
+            self._result_cache.put(key, result[0])
+        return result
+
+    def enable_auto_persist(self, max_bytes):
+        """Persist the table and matrix table subtrees that recur across
+        queries, unpersisting the least recently used beyond `max_bytes`
+        bytes. Backends that cannot persist ignore this."""
+        pass
+
+    def disable_auto_persist(self):
+        pass
+
+    def stop(self):
+        """Release the resources of the backend when its context stops."""
+        pass
+
+    def cache_stats(self):
+        """Counters of the backend's caches, as a :obj:`dict` keyed by cache
+        name."""
+        stats = {}
+        if self._result_cache is not None:
+            stats['result_cache'] = self._result_cache.stats()
+        return stats
+
     @abc.abstractmethod
     def value_type(self, ir):
         return
@@ -87,8 +245,12 @@ class Backend(abc.ABC):
 
 
 class SparkBackend(Backend):
-    def __init__(self):
+    converts_through_spark = True
+
+    def __init__(self, jir_cache_size=256):
+        super().__init__()
         self._fs = None
+        self._jir_cache = LRUCache(jir_cache_size)
 
     @property
     def fs(self):
@@ -99,18 +261,42 @@ class SparkBackend(Backend):
 
     def _to_java_ir(self, ir):
         if not hasattr(ir, '_jir'):
-            r = Renderer(stop_at_jir=True)
-            # FIXME parse should be static
-            ir._jir = ir.parse(r(ir), ir_map=r.jirs)
+            # structurally equal IRs built separately share their parsed IR.
+            # Parsed reads hold the metadata of the files they read, so the
+            # key includes their modification times.
+            stamps = _reader_stamps(ir, self.fs)
+            jir = None if stamps is None else self._jir_cache.get((ir, stamps))
+            if jir is None:
+                r = Renderer(stop_at_jir=True)
+                # FIXME parse should be static
+                jir = ir.parse(r(ir), ir_map=r.jirs)
+                if stamps is not None:
+                    self._jir_cache.put((ir, stamps), jir)
+            ir._jir = jir
         return ir._jir
 
-    def execute(self, ir, timed=False):
-        result = json.loads(Env.hc()._jhc.backend().executeJSON(self._to_java_ir(ir)))
-        value = ir.typ._from_json(result['value'])
-        timings = result['timings']
+    def cache_stats(self):
+        stats = super().cache_stats()
+        stats['jir_cache'] = self._jir_cache.stats()
+        auto_persist = Env.hc()._jhc.pyAutoPersistStatsJSON()
+        if auto_persist is not None:
+            stats['auto_persist'] = json.loads(auto_persist)
+        return stats
+
+    def enable_auto_persist(self, max_bytes):
+        Env.hc()._jhc.enableAutoPersist(max_bytes)
 
+    def disable_auto_persist(self):
+        Env.hc()._jhc.disableAutoPersist()
+
+    def execute(self, ir, timed=False):
+        value, timings = _execute_jir(self, Env.hc()._jhc.backend(), ir, self._to_java_ir(ir))
         return (value, timings) if timed else value
 
+    def execute_encoded(self, ir):
+        jbackend = Env.hc()._jhc.backend()
+        return self._execute_encoded_cached(ir, lambda: _execute_jir_encoded(jbackend, self._to_java_ir(ir)))
+
     def value_type(self, ir):
         jir = self._to_java_ir(ir)
         return dtype(jir.typ().toString())
@@ -146,6 +332,7 @@ class SparkBackend(Backend):
         t = t.expand_types()
         if flatten:
             t = t.flatten()
+        import pyspark
         return pyspark.sql.DataFrame(self._to_java_ir(t._tir).pyToDF(), Env.spark_session()._wrapped)
 
     def to_pandas(self, t, flatten):
@@ -187,43 +374,115 @@ class SparkBackend(Backend):
         return json.loads(Env.hc()._jhc.pyParseVCFMetadataJSON(path))
 
 
-class LocalBackend(Backend):
-    def __init__(self):
-        pass
+class LocalBackend(SparkBackend):
+    """Backend running the partitions of queries on `cores` threads of the
+    driver's JVM instead of Spark executors, by default one per core.
 
-    def _to_java_ir(self, ir):
-        if not hasattr(ir, '_jir'):
-            r = Renderer(stop_at_jir=True)
-            # FIXME parse should be static
-            ir._jir = ir.parse(r(ir), ir_map=r.jirs)
-        return ir._jir
+    Queries whose tables and matrix tables cannot be lowered, like those with
+    shuffles, run on Spark as with :class:`.SparkBackend`, as do type
+    inference and reference genome operations. The times spent in each
+    partition are returned with the ``timings`` of :meth:`execute`.
+    """
+
+    # queries run in the driver's JVM, so conversions do not go through
+    # Spark either
+    converts_through_spark = False
+
+    def __init__(self, jir_cache_size=256, cores=None):
+        super().__init__(jir_cache_size)
+        self.cores = cores if cores is not None else os.cpu_count()
+        self._jbackend = None
+
+    def _jlocal_backend(self):
+        if self._jbackend is None:
+            self._jbackend = Env.hail().backend.local.LocalBackend.apply(self.cores)
+        return self._jbackend
 
     def execute(self, ir, timed=False):
-        result = json.loads(Env.hail().expr.ir.LocalBackend.executeJSON(self._to_java_ir(ir)))
-        value = ir.typ._from_json(result['value'])
-        timings = result['timings']
+        value, timings = _execute_jir(self, self._jlocal_backend(), ir, self._to_java_ir(ir))
         return (value, timings) if timed else value
 
+    def execute_encoded(self, ir):
+        jbackend = self._jlocal_backend()
+        return self._execute_encoded_cached(ir, lambda: _execute_jir_encoded(jbackend, self._to_java_ir(ir)))
+
+    def stop(self):
+        if self._jbackend is not None:
+            self._jbackend.close()
+            self._jbackend = None
+
+
+def _service_request_body(data, compress_threshold):
+    """Serialize `data` as the JSON body of a request to the apiserver,
+    gzip-compressed if it is at least `compress_threshold` bytes long."""
+    body = json.dumps(data).encode('utf-8')
+    headers = {'Content-Type': 'application/json'}
+    if len(body) >= compress_threshold:
+        body = gzip.compress(body)
+        headers['Content-Encoding'] = 'gzip'
+    return body, headers
+
+
+def _service_token(token, token_file):
+    if token_file is not None and token is not None:
+        raise ValueError('set only one of token_file and token')
+    if token is None:
+        token_file = (token_file or
+                      os.environ.get('HAIL_TOKEN_FILE') or
+                      os.path.expanduser('~/.hail/token'))
+        if not os.path.exists(token_file):
+            raise ValueError(
+                f'cannot create a client without a token. no file was '
+                f'found at {token_file}')
+        with open(token_file) as f:
+            token = f.read()
+    return token
+
+
+def _service_execute_value(resp_json):
+    typ = dtype(resp_json['type'])
+    result = json.loads(resp_json['result'])
+    return typ._from_json(result['value']), result['timings']
+
+
+def _service_table_type(resp_json):
+    return ttable._from_json(resp_json)
+
+
+def _service_matrix_type(resp_json):
+    return tmatrix._from_json(resp_json)
+
+
+def _service_blockmatrix_type(resp_json):
+    return tblockmatrix._from_json(resp_json)
+
 
 class ServiceBackend(Backend):
-    def __init__(self, url, token=None, token_file=None):
-        if token_file is not None and token is not None:
-            raise ValueError('set only one of token_file and token')
+    """Backend that executes pipelines on the Hail apiserver.
+
+    Requests share a pool of keep-alive connections. Request bodies of at
+    least `compress_threshold` bytes are gzip-compressed, and compressed
+    responses are accepted.
+
+    See :class:`.AsyncServiceBackend` to issue requests concurrently.
+    """
+
+    def __init__(self, url, token=None, token_file=None, pool_size=10, compress_threshold=1024):
+        super().__init__()
         self.url = url
+        self.cookies = {'user': _service_token(token, token_file)}
+        self._compress_threshold = compress_threshold
 
-        if token is None:
-            token_file = (token_file or
-                          os.environ.get('HAIL_TOKEN_FILE') or
-                          os.path.expanduser('~/.hail/token'))
-            if not os.path.exists(token_file):
-                raise ValueError(
-                    f'cannot create a client without a token. no file was '
-                    f'found at {token_file}')
-            with open(token_file) as f:
-                token = f.read()
-        self.cookies = {'user': token}
+        import requests.adapters
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.cookies.update(self.cookies)
 
         self._fs = None
+        # cleared if the server does not support binary-encoded results
+        self._encoded_results = True
 
     @property
     def fs(self):
@@ -232,62 +491,77 @@ class ServiceBackend(Backend):
             self._fs = GoogleCloudStorageFS()
         return self._fs
 
+    def close(self):
+        self._session.close()
+
+    def async_backend(self, session=None):
+        """An :class:`.AsyncServiceBackend` for the same apiserver and user."""
+        from .aio_service_backend import AsyncServiceBackend
+        return AsyncServiceBackend(self.url, token=self.cookies['user'], session=session,
+                                   compress_threshold=self._compress_threshold)
+
     def _render(self, ir):
         r = Renderer()
         assert len(r.jirs) == 0
         return r(ir)
 
-    def execute(self, ir, timed=False):
-        code = self._render(ir)
-        resp = requests.post(f'{self.url}/execute', json=code, cookies=self.cookies)
+    def _request(self, method, path, data):
+        body, headers = _service_request_body(data, self._compress_threshold)
+        resp = self._session.request(method, f'{self.url}{path}', data=body, headers=headers)
         if resp.status_code == 400:
             resp_json = resp.json()
             raise FatalError(resp_json['message'])
         resp.raise_for_status()
+        return resp
+
+    def execute_encoded(self, ir):
+        return self._execute_encoded_cached(ir, lambda: self._request_encoded(ir))
+
+    def _request_encoded(self, ir):
+        import requests
+        if not self._encoded_results:
+            return None
+        try:
+            resp = self._request('post', '/execute/encoded', self._render(ir))
+        except requests.HTTPError as e:
+            if e.response.status_code == 404:
+                self._encoded_results = False
+                return None
+            raise
+        return resp.content, json.loads(resp.headers['X-Hail-Timings'])['timings']
 
-        resp_json = resp.json()
-        typ = dtype(resp_json['type'])
-        result = json.loads(resp_json['result'])
-        value = typ._from_json(result['value'])
-        timings = result['timings']
-
+    def execute(self, ir, timed=False):
+        if ir.typ._can_convert_from_encoding():
+            result = self.execute_encoded(ir)
+            if result is not None:
+                encoding, timings = result
+                value = ir.typ._from_encoding(encoding)
+                return (value, timings) if timed else value
+
+        resp = self._request('post', '/execute', self._render(ir))
+        value, timings = _service_execute_value(resp.json())
         return (value, timings) if timed else value
 
     def _request_type(self, ir, kind):
-        code = self._render(ir)
-        resp = requests.post(f'{self.url}/type/{kind}', json=code, cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
-
-        return resp.json()
+        return self._request('post', f'/type/{kind}', self._render(ir)).json()
 
     def value_type(self, ir):
-        resp = self._request_type(ir, 'value')
-        return dtype(resp)
+        return dtype(self._request_type(ir, 'value'))
 
     def table_type(self, tir):
-        resp = self._request_type(tir, 'table')
-        return ttable._from_json(resp)
+        return _service_table_type(self._request_type(tir, 'table'))
 
     def matrix_type(self, mir):
-        resp = self._request_type(mir, 'matrix')
-        return tmatrix._from_json(resp)
+        return _service_matrix_type(self._request_type(mir, 'matrix'))
 
     def blockmatrix_type(self, bmir):
-        resp = self._request_type(bmir, 'blockmatrix')
-        return tblockmatrix._from_json(resp)
+        return _service_blockmatrix_type(self._request_type(bmir, 'blockmatrix'))
 
     def add_reference(self, config):
-        resp = requests.post(f'{self.url}/references/create', json=config, cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('post', '/references/create', config)
 
     def from_fasta_file(self, name, fasta_file, index_file, x_contigs, y_contigs, mt_contigs, par):
-        resp = requests.post(f'{self.url}/references/create/fasta', json={
+        self._request('post', '/references/create/fasta', {
             'name': name,
             'fasta_file': fasta_file,
             'index_file': index_file,
@@ -295,74 +569,29 @@ class ServiceBackend(Backend):
             'y_contigs': y_contigs,
             'mt_contigs': mt_contigs,
             'par': par
-        }, cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        })
 
     def remove_reference(self, name):
-        resp = requests.delete(f'{self.url}/references/delete',
-                               json={'name': name},
-                               cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('delete', '/references/delete', {'name': name})
 
     def get_reference(self, name):
-        resp = requests.get(f'{self.url}/references/get',
-                            json={'name': name},
-                            cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
-        return resp.json()
+        return self._request('get', '/references/get', {'name': name}).json()
 
     def add_sequence(self, name, fasta_file, index_file):
-        resp = requests.post(f'{self.url}/references/sequence/set',
-                             json={'name': name, 'fasta_file': fasta_file, 'index_file': index_file},
-                             cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('post', '/references/sequence/set',
+                      {'name': name, 'fasta_file': fasta_file, 'index_file': index_file})
 
     def remove_sequence(self, name):
-        resp = requests.delete(f'{self.url}/references/sequence/delete',
-                               json={'name': name},
-                               cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('delete', '/references/sequence/delete', {'name': name})
 
     def add_liftover(self, name, chain_file, dest_reference_genome):
-        resp = requests.post(f'{self.url}/references/liftover/add',
-                             json={'name': name, 'chain_file': chain_file,
-                                   'dest_reference_genome': dest_reference_genome},
-                             cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('post', '/references/liftover/add',
+                      {'name': name, 'chain_file': chain_file,
+                       'dest_reference_genome': dest_reference_genome})
 
     def remove_liftover(self, name, dest_reference_genome):
-        resp = requests.delete(f'{self.url}/references/liftover/remove',
-                               json={'name': name, 'dest_reference_genome': dest_reference_genome},
-                               cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
+        self._request('delete', '/references/liftover/remove',
+                      {'name': name, 'dest_reference_genome': dest_reference_genome})
 
     def parse_vcf_metadata(self, path):
-        resp = requests.post(f'{self.url}/parse-vcf-metadata',
-                             json={'path': path},
-                             cookies=self.cookies)
-        if resp.status_code == 400:
-            resp_json = resp.json()
-            raise FatalError(resp_json['message'])
-        resp.raise_for_status()
-        return resp.json()
+        return self._request('post', '/parse-vcf-metadata', {'path': path}).json()
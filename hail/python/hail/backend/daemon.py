@@ -0,0 +1,359 @@
+"""Daemon keeping a pool of JVMs in which Hail is initialized and warmed up,
+so that :func:`.init` connects to one of them instead of starting a JVM.
+
+Start it with::
+
+    python -m hail.backend.daemon --sessions 4 --idle-timeout 3600
+
+and initialize Hail with ``hl.init(daemon=True)``.
+
+The backend holds a single context per JVM, so each JVM runs one session at a
+time. A session lasts as long as the connection of its client to the daemon:
+when the client calls :func:`.stop` or exits, the daemon deletes the temporary
+directory of the session, restores the references, functions and flags of a
+new context, and returns the JVM to the pool. Clients talk to the daemon over
+a Unix socket readable only by the user who started it, with one JSON message
+per line.
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+log = logging.getLogger('hail.backend.daemon')
+
+
+def default_socket_path():
+    return os.environ.get('HAIL_DAEMON_SOCKET',
+                          os.path.join(tempfile.gettempdir(), f'hail-daemon-{os.getuid()}.sock'))
+
+
+def _send(f, message):
+    f.write(json.dumps(message).encode() + b'\n')
+    f.flush()
+
+
+def _receive(f):
+    line = f.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def _request(socket_path, message):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile('rwb') as f:
+            _send(f, message)
+            return _receive(f)
+
+
+class DaemonSession(object):
+    """Session in a JVM of the daemon listening on `socket_path`.
+
+    Raises :class:`OSError` if the daemon cannot be reached, and
+    :class:`.FatalError` if it has no JVM available within `timeout` seconds.
+    """
+
+    def __init__(self, socket_path, timeout=60):
+        from hail.utils.java import FatalError
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(socket_path)
+            self._file = self._sock.makefile('rwb')
+            _send(self._file, {'op': 'acquire', 'timeout': timeout})
+            reply = _receive(self._file)
+        except OSError:
+            self._sock.close()
+            raise
+        if reply is None or 'error' in reply:
+            self._sock.close()
+            raise FatalError(f'Hail daemon at {socket_path}: '
+                             f'{reply["error"] if reply else "connection closed"}')
+        self.port = reply['port']
+        self.secret = reply['secret']
+
+    def connect_spark(self):
+        """Connect pyspark to the JVM of this session."""
+        from pyspark import SparkContext
+
+        # pyspark connects to a running JVM instead of launching one if these
+        # are set, and keeps the gateway of a previous session otherwise
+        env = {'PYSPARK_GATEWAY_PORT': str(self.port),
+               'PYSPARK_GATEWAY_SECRET': self.secret}
+        saved = {k: os.environ.get(k) for k in env}
+        os.environ.update(env)
+        try:
+            SparkContext._gateway = None
+            SparkContext._jvm = None
+            SparkContext._ensure_initialized()
+        finally:
+            for k, v in saved.items():
+                if v is None:
+                    del os.environ[k]
+                else:
+                    os.environ[k] = v
+
+    def release(self):
+        """Hand the JVM back to the daemon."""
+        from pyspark import SparkContext
+
+        if SparkContext._gateway is not None:
+            SparkContext._gateway.close()
+            SparkContext._gateway = None
+            SparkContext._jvm = None
+        try:
+            _send(self._file, {'op': 'release'})
+        except OSError:
+            pass
+        self._file.close()
+        self._sock.close()
+
+
+# queries run in new JVMs to load and compile the code paths used by most
+# sessions
+def _warm_up_irs():
+    import hail as hl
+
+    t = hl.utils.range_table(100, 2)
+    t = t.annotate(x=hl.str(t.idx), y=hl.float64(t.idx) / 2)
+    return [str(ir) for ir in [
+        hl.ir.TableCount(t._tir),
+        t.aggregate(hl.struct(s=hl.agg.sum(t.idx), c=hl.agg.counter(t.idx % 3)), _localize=False)._ir,
+        t.collect(_localize=False)._ir,
+        hl.literal([1, 2, 3]).map(lambda x: hl.str(x * 2))._ir]]
+
+
+class _JVM(object):
+    """JVM of the pool, with Hail initialized."""
+
+    def __init__(self, config):
+        from pyspark.java_gateway import launch_gateway
+        from hail.context import _spark_conf
+
+        self.gateway = launch_gateway(_spark_conf())
+        self.port = self.gateway.gateway_parameters.port
+        self.secret = self.gateway.gateway_parameters.auth_token
+        jvm = self.gateway.jvm
+        self._hail = getattr(jvm, 'is').hail
+        try:
+            self._jhc = self._hail.HailContext.apply(
+                None, config.app_name, jvm.scala.Option.apply(config.master), config.local,
+                config.log, True, False, config.min_block_size, config.branching_factor,
+                config.tmp_dir, config.optimizer_iterations)
+            parse = self._hail.expr.ir.IRParser.parse_value_ir
+            for ir in _warm_up_irs():
+                self._jhc.backend().executeJSON(parse(ir))
+            # the session of the warm-up is not the one of the first client
+            self._hail.HailContext.endSession()
+        except Exception:
+            self.close()
+            raise
+
+    def reset(self):
+        self._hail.HailContext.endSession()
+
+    def close(self):
+        try:
+            self._hail.HailContext.get().sc().stop()
+        except Exception:
+            pass
+        self.gateway.close()
+        proc = getattr(self.gateway, 'proc', None)
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+
+
+class _Pool(object):
+    def __init__(self, n_sessions, config):
+        self._config = config
+        self._free = []
+        self._in_use = 0
+        self._starting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.last_used = time.time()
+        for _ in range(n_sessions):
+            self._spawn()
+
+    def _spawn(self):
+        with self._cond:
+            self._starting += 1
+        threading.Thread(target=self._start_jvm, daemon=True).start()
+
+    def _start_jvm(self):
+        try:
+            jvm = _JVM(self._config)
+            log.info(f'started JVM on port {jvm.port}')
+        except Exception:
+            log.exception('could not start JVM')
+            jvm = None
+        with self._cond:
+            self._starting -= 1
+            if jvm is not None:
+                if self._closed:
+                    jvm.close()
+                else:
+                    self._free.append(jvm)
+            self._cond.notify_all()
+
+    def acquire(self, timeout):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._free or self._closed, timeout) or self._closed:
+                return None
+            self._in_use += 1
+            self.last_used = time.time()
+            return self._free.pop()
+
+    def release(self, jvm):
+        try:
+            jvm.reset()
+        except Exception:
+            log.exception(f'could not reset JVM on port {jvm.port}, replacing it')
+            jvm.close()
+            jvm = None
+        with self._cond:
+            self._in_use -= 1
+            self.last_used = time.time()
+            if jvm is None:
+                self._spawn()
+            elif self._closed:
+                jvm.close()
+            else:
+                self._free.append(jvm)
+                self._cond.notify_all()
+
+    def idle_for(self):
+        with self._cond:
+            return 0 if self._in_use else time.time() - self.last_used
+
+    def status(self):
+        with self._cond:
+            return {'free': len(self._free), 'in_use': self._in_use, 'starting': self._starting}
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            free = self._free
+            self._free = []
+            self._cond.notify_all()
+        for jvm in free:
+            jvm.close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        pool = self.server.pool
+        message = _receive(self.rfile)
+        if message is None:
+            return
+        op = message.get('op')
+        if op == 'acquire':
+            jvm = pool.acquire(message.get('timeout'))
+            if jvm is None:
+                _send(self.wfile, {'error': 'no JVM available'})
+                return
+            try:
+                _send(self.wfile, {'port': jvm.port, 'secret': jvm.secret})
+                # the session ends when the client releases it or disconnects
+                while True:
+                    message = _receive(self.rfile)
+                    if message is None or message.get('op') == 'release':
+                        break
+            except (OSError, ValueError):
+                pass
+            finally:
+                pool.release(jvm)
+        elif op == 'status':
+            _send(self.wfile, pool.status())
+        elif op == 'shutdown':
+            _send(self.wfile, {})
+            threading.Thread(target=self.server.shutdown).start()
+        else:
+            _send(self.wfile, {'error': f'unknown operation {op!r}'})
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(socket_path, n_sessions, idle_timeout, config):
+    """Serve sessions in `n_sessions` JVMs on `socket_path` until shut down, or
+    until no session has been in use for `idle_timeout` seconds."""
+    if os.path.exists(socket_path):
+        try:
+            _request(socket_path, {'op': 'status'})
+            raise RuntimeError(f'a Hail daemon is already listening on {socket_path}')
+        except OSError:
+            os.unlink(socket_path)
+
+    old_umask = os.umask(0o177)
+    try:
+        server = _Server(socket_path, _Handler)
+    finally:
+        os.umask(old_umask)
+    server.pool = _Pool(n_sessions, config)
+
+    def exit_when_idle():
+        while True:
+            idle = server.pool.idle_for()
+            if idle >= idle_timeout:
+                log.info(f'idle for {idle:.0f}s, shutting down')
+                server.shutdown()
+                return
+            time.sleep(min(idle_timeout - idle, 60))
+
+    if idle_timeout:
+        threading.Thread(target=exit_when_idle, daemon=True).start()
+
+    log.info(f'listening on {socket_path}')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        server.pool.close()
+        os.unlink(socket_path)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m hail.backend.daemon',
+                                     description='Keep warm JVMs for Hail sessions.')
+    parser.add_argument('--socket', default=default_socket_path(),
+                        help='Path of the Unix socket to listen on.')
+    parser.add_argument('--sessions', type=int, default=1,
+                        help='Number of JVMs, each running one session at a time.')
+    parser.add_argument('--idle-timeout', type=float, default=3600,
+                        help='Exit after this many seconds without a session, 0 to never exit.')
+    parser.add_argument('--status', action='store_true',
+                        help='Print the status of the running daemon and exit.')
+    parser.add_argument('--shutdown', action='store_true',
+                        help='Shut down the running daemon and exit.')
+    parser.add_argument('--app-name', default='Hail')
+    parser.add_argument('--master')
+    parser.add_argument('--local', default='local[*]')
+    parser.add_argument('--log', default=os.path.join(os.getcwd(), 'hail-daemon.log'))
+    parser.add_argument('--min-block-size', type=int, default=0)
+    parser.add_argument('--branching-factor', type=int, default=50)
+    parser.add_argument('--tmp-dir', default='/tmp')
+    parser.add_argument('--optimizer-iterations', type=int, default=3)
+    args = parser.parse_args(args)
+
+    if args.status or args.shutdown:
+        print(json.dumps(_request(args.socket, {'op': 'status' if args.status else 'shutdown'})))
+        return
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s: %(message)s')
+    serve(args.socket, args.sessions, args.idle_timeout, args)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
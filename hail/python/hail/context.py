@@ -1,20 +1,39 @@
-import pkg_resources
-from pyspark import SparkContext, SparkConf
-from pyspark.sql import SparkSession
-
 import hail
 from hail.genetics.reference_genome import ReferenceGenome
-from hail.typecheck import nullable, typecheck, typecheck_method, enumeration
+from hail.typecheck import nullable, typecheck, typecheck_method, enumeration, clear_caches, lazy, oneof
 from hail.utils import get_env_or_default
 from hail.utils.java import Env, joption, FatalError, connect_logger, install_exception_handler, uninstall_exception_handler
-from hail.backend import Backend, ServiceBackend, SparkBackend
+from hail.backend import Backend, LocalBackend, ServiceBackend, SparkBackend
 
 import sys
 import os
 
 
+def _spark_context():
+    # pyspark is imported when Hail is initialized rather than with hail
+    from pyspark import SparkContext
+    return SparkContext
+
+
+def _spark_conf():
+    """Spark configuration adding the Hail JAR to the classpath when Hail is
+    pip installed, or ``None``."""
+    import pkg_resources
+    from pyspark import SparkConf
+
+    if pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
+        hail_jar_path = pkg_resources.resource_filename(__name__, "hail-all-spark.jar")
+        assert os.path.exists(hail_jar_path), f'{hail_jar_path} does not exist'
+        conf = SparkConf()
+        conf.set('spark.jars', hail_jar_path)
+        conf.set('spark.driver.extraClassPath', hail_jar_path)
+        conf.set('spark.executor.extraClassPath', './hail-all-spark.jar')
+        return conf
+    return None
+
+
 class HailContext(object):
-    @typecheck_method(sc=nullable(SparkContext),
+    @typecheck_method(sc=nullable(lazy(_spark_context)),
                       app_name=str,
                       master=nullable(str),
                       local=str,
@@ -28,12 +47,14 @@ class HailContext(object):
                       idempotent=bool,
                       global_seed=nullable(int),
                       optimizer_iterations=nullable(int),
-                      _backend=nullable(Backend))
+                      _backend=nullable(Backend),
+                      daemon=nullable(oneof(bool, str)))
     def __init__(self, sc=None, app_name="Hail", master=None, local='local[*]',
                  log=None, quiet=False, append=False,
                  min_block_size=1, branching_factor=50, tmp_dir=None,
                  default_reference="GRCh37", idempotent=False,
-                 global_seed=6348563392232659379, optimizer_iterations=None, _backend=None):
+                 global_seed=6348563392232659379, optimizer_iterations=None, _backend=None,
+                 daemon=None):
 
         if Env._hc:
             if idempotent:
@@ -42,16 +63,25 @@ class HailContext(object):
                 raise FatalError('Hail has already been initialized, restart session '
                                  'or stop Hail to change configuration.')
 
-        if pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
-            hail_jar_path = pkg_resources.resource_filename(__name__, "hail-all-spark.jar")
-            assert os.path.exists(hail_jar_path), f'{hail_jar_path} does not exist'
-            conf = SparkConf()
-            conf.set('spark.jars', hail_jar_path)
-            conf.set('spark.driver.extraClassPath', hail_jar_path)
-            conf.set('spark.executor.extraClassPath', './hail-all-spark.jar')
-            SparkContext._ensure_initialized(conf=conf)
+        from pyspark import SparkContext
+        from pyspark.sql import SparkSession
+
+        self._daemon_session = None
+        if daemon is None:
+            daemon = os.environ.get('HAIL_DAEMON_SOCKET')
+        if daemon and sc is None and (_backend is None or isinstance(_backend, SparkBackend)):
+            from hail.backend.daemon import DaemonSession, default_socket_path
+            socket_path = default_socket_path() if daemon is True else daemon
+            try:
+                self._daemon_session = DaemonSession(socket_path)
+            except OSError as e:
+                sys.stderr.write(f'Could not connect to the Hail daemon at {socket_path}, '
+                                 f'starting a new JVM: {e}\n')
+
+        if self._daemon_session is not None:
+            self._daemon_session.connect_spark()
         else:
-            SparkContext._ensure_initialized()
+            SparkContext._ensure_initialized(conf=_spark_conf())
 
         self._gateway = SparkContext._gateway
         self._jvm = SparkContext._jvm
@@ -84,12 +114,17 @@ class HailContext(object):
         if log is None:
             log = hail.utils.timestamp_path(os.path.join(os.getcwd(), 'hail'),
                                             suffix=f'-{version}.log')
-        self._log = log
 
         # we always pass 'quiet' to the JVM because stderr output needs
         # to be routed through Python separately.
         # if idempotent:
-        if idempotent:
+        if self._daemon_session is not None:
+            # the Spark configuration, log and tuning parameters are those
+            # the daemon started the JVM with
+            self._jhc = self._hail.HailContext.get()
+            self._hail.HailContext.startSession(tmp_dir)
+            log = self._jhc.logFile()
+        elif idempotent:
             self._jhc = self._hail.HailContext.getOrCreate(
                 jsc, app_name, joption(master), local, log, True, append,
                 min_block_size, branching_factor, tmp_dir, optimizer_iterations)
@@ -97,6 +132,7 @@ class HailContext(object):
             self._jhc = self._hail.HailContext.apply(
                 jsc, app_name, joption(master), local, log, True, append,
                 min_block_size, branching_factor, tmp_dir, optimizer_iterations)
+        self._log = log
 
         self._jsc = self._jhc.sc()
         self.sc = sc if sc else SparkContext(gateway=self._gateway, jsc=self._jvm.JavaSparkContext(self._jsc))
@@ -116,6 +152,8 @@ class HailContext(object):
             self._default_ref = ReferenceGenome._references[default_reference]
         else:
             self._default_ref = ReferenceGenome.read(default_reference)
+        # cached type strings may refer to the default reference of a previous context
+        clear_caches()
 
         jar_version = self._jhc.version()
 
@@ -131,7 +169,9 @@ class HailContext(object):
 
             connect_logger('localhost', 12888)
 
-            self._hail.HailContext.startProgressBar(self._jsc)
+            # the console output of a daemon JVM is not the one of this process
+            if self._daemon_session is None:
+                self._hail.HailContext.startProgressBar(self._jsc)
 
             sys.stderr.write(
                 'Welcome to\n'
@@ -155,11 +195,23 @@ class HailContext(object):
         return self._default_ref
 
     def stop(self):
-        Env.hail().HailContext.clear()
-        self.sc.stop()
+        self._backend.stop()
+        if self._daemon_session is not None:
+            # hand the JVM back to the daemon, which resets it for the next
+            # session; clearing the Java context first keeps pyspark from
+            # stopping it
+            self.sc._jsc = None
+            self.sc.stop()
+            self._daemon_session.release()
+            self._daemon_session = None
+        else:
+            Env.hail().HailContext.clear()
+            self.sc.stop()
         self.sc = None
         Env._jvm = None
         Env._gateway = None
+        Env._hail_package = None
+        Env._jutils = None
         Env._hc = None
         uninstall_exception_handler()
         Env._dummy_table = None
@@ -168,7 +220,7 @@ class HailContext(object):
         ReferenceGenome._references = {}
 
 
-@typecheck(sc=nullable(SparkContext),
+@typecheck(sc=nullable(lazy(_spark_context)),
            app_name=str,
            master=nullable(str),
            local=str,
@@ -182,14 +234,20 @@ class HailContext(object):
            idempotent=bool,
            global_seed=nullable(int),
            _optimizer_iterations=nullable(int),
-           _backend=nullable(Backend))
+           _backend=nullable(Backend),
+           daemon=nullable(oneof(bool, str)),
+           backend=enumeration('spark', 'local'),
+           cores=nullable(int))
 def init(sc=None, app_name='Hail', master=None, local='local[*]',
          log=None, quiet=False, append=False,
          min_block_size=0, branching_factor=50, tmp_dir='/tmp',
          default_reference='GRCh37', idempotent=False,
          global_seed=6348563392232659379,
          _optimizer_iterations=None,
-         _backend=None):
+         _backend=None,
+         daemon=None,
+         backend='spark',
+         cores=None):
     """Initialize Hail and Spark.
 
     Examples
@@ -221,6 +279,22 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
 
     >>> hl.init(sc=sc)  # doctest: +SKIP
 
+    Note
+    ----
+    Starting the JVM and compiling the first queries take several seconds. For
+    many short jobs, start a daemon keeping a pool of warm JVMs with
+
+    .. code-block:: text
+
+        python -m hail.backend.daemon --sessions 4 --idle-timeout 3600
+
+    and initialize Hail with ``daemon=True``, or set the ``HAIL_DAEMON_SOCKET``
+    environment variable to the socket of the daemon. Each session gets a JVM
+    of its own, with the references, functions, flags and temporary directory
+    of a new session; :func:`.stop` hands it back to the daemon. The Spark
+    configuration, `log`, `min_block_size` and `branching_factor` are those the
+    daemon was started with.
+
     See Also
     --------
     :func:`.stop`
@@ -257,16 +331,33 @@ def init(sc=None, app_name='Hail', master=None, local='local[*]',
         If ``True``, calling this function is a no-op if Hail has already been initialized.
     global_seed : :obj:`int`, optional
         Global random seed.
+    daemon : :obj:`bool` or :obj:`str`, optional
+        If ``True``, or the path of the socket of a daemon, run the session in
+        a warm JVM of the daemon. If the daemon cannot be reached, a new JVM
+        is started. Defaults to the ``HAIL_DAEMON_SOCKET`` environment
+        variable.
+    backend : :obj:`str`
+        Either ``'spark'``, to run queries as Spark jobs, or ``'local'``, to
+        run the partitions of queries on a pool of threads of the JVM of the
+        driver. Queries the local backend does not support run on Spark.
+    cores : :obj:`int`, optional
+        Number of threads of the local backend. Defaults to the number of
+        cores of the machine.
     """
+    if cores is not None and cores < 1:
+        raise ValueError(f'cores must be positive, found {cores}')
+    if _backend is None and backend == 'local':
+        _backend = LocalBackend(cores=cores)
     HailContext(sc, app_name, master, local, log, quiet, append,
                 min_block_size, branching_factor, tmp_dir,
                 default_reference, idempotent, global_seed,
-                _optimizer_iterations,_backend)
+                _optimizer_iterations,_backend, daemon)
 
 
 def _hail_cite_url():
     version = read_version_info()
     [tag, sha_prefix] = version.split("-")
+    import pkg_resources
     if pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
         # pip installed
         return f"https://github.com/hail-is/hail/releases/tag/{tag}"
@@ -377,6 +468,7 @@ def set_global_seed(seed):
 
 def read_version_info() -> str:
     # https://stackoverflow.com/questions/6028000/how-to-read-a-static-file-from-inside-a-python-package
+    import pkg_resources
     return pkg_resources.resource_string(__name__, 'hail_version').decode().strip()
 
 
@@ -397,12 +489,70 @@ def _get_flags(*flags):
     return {flag: Env.hc()._jhc.flags().get(flag) for flag in flags}
 
 
+@typecheck(enabled=bool, max_entries=int, max_bytes=int)
+def _set_result_cache(enabled=True, max_entries=1024, max_bytes=256 * 1024 * 1024):
+    """Enable or disable caching of the values of deterministic expressions.
+
+    Values are cached by the structure of their IR and the modification times
+    of the files it reads. IRs that generate random numbers, write files or
+    refer to objects in the JVM are never cached.
+
+    Parameters
+    ----------
+    enabled : :obj:`bool`
+        Whether to cache values.
+    max_entries : :obj:`int`
+        Maximum number of cached values.
+    max_bytes : :obj:`int`
+        Maximum total size of the cached values, in their binary encoding.
+    """
+    backend = Env.backend()
+    if enabled:
+        backend.enable_result_cache(max_entries, max_bytes)
+    else:
+        backend.disable_result_cache()
+
+
+@typecheck(enabled=bool, max_bytes=int)
+def _set_auto_persist(enabled=True, max_bytes=1024 * 1024 * 1024):
+    """Enable or disable persisting the tables and matrix tables that recur
+    across queries.
+
+    The second time a query contains a table or matrix table that an earlier
+    query in the session computed, it is persisted in memory and on disk, and
+    later queries containing it read the persisted rows. The least recently
+    used persisted tables are unpersisted once they hold more than
+    `max_bytes` bytes. The log reports hits and the bytes of persisted rows
+    they read, and :func:`.debug_info` the totals.
+
+    Tables are matched by the structure of their IR, so the files they read
+    must not change while enabled. Disabling unpersists every table persisted
+    this way.
+
+    Parameters
+    ----------
+    enabled : :obj:`bool`
+        Whether to persist recurring tables.
+    max_bytes : :obj:`int`
+        Maximum total size of the persisted tables, in memory and on disk.
+    """
+    if max_bytes <= 0:
+        raise ValueError(f'max_bytes must be positive, found {max_bytes}')
+    backend = Env.backend()
+    if enabled:
+        backend.enable_auto_persist(max_bytes)
+    else:
+        backend.disable_auto_persist()
+
+
 def debug_info():
+    import pkg_resources
     hail_jar_path = None
     if pkg_resources.resource_exists(__name__, "hail-all-spark.jar"):
         hail_jar_path = pkg_resources.resource_filename(__name__, "hail-all-spark.jar")
     return {
         'spark_conf': spark_context()._conf.getAll(),
         'hail_jar_path': hail_jar_path,
-        'version': hail.__version__
+        'version': hail.__version__,
+        'caches': Env.backend().cache_stats()
     }
@@ -17,6 +17,7 @@ from .full_outer_join_mt import full_outer_join_mt
 from .tidyr import gather, separate, spread
 from .codec import encode, decode
 from .db import DB
+from .table_lookup import TableLookup
 from .compile import compile_comparison_binary, compiled_compare
 
 __all__ = ['ld_score',
@@ -47,6 +48,7 @@ __all__ = ['ld_score',
            'spread',
            'encode',
            'DB',
+           'TableLookup',
            'decode',
            'compile_comparison_binary',
            'compiled_compare']
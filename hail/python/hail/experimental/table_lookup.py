@@ -0,0 +1,130 @@
+import hail as hl
+from hail.expr.types import tarray, tinterval, tstruct
+from hail.typecheck import typecheck_method, sequenceof, anytype
+from hail.utils import Interval, Struct
+from hail.utils.java import Env
+
+
+class TableLookup(object):
+    """Look up rows of a table written with :meth:`.Table.write` by key,
+    without running a distributed job.
+
+    Examples
+    --------
+
+    >>> lookup = hl.experimental.TableLookup('data/example.ht')  # doctest: +SKIP
+    >>> lookup.get([hl.Struct(locus=hl.Locus('1', 100), alleles=['A', 'T'])])  # doctest: +SKIP
+    >>> lookup.range(hl.Locus('1', 100), hl.Locus('1', 2000))  # doctest: +SKIP
+
+    Notes
+    -----
+    Lookups run in the driver. The partition bounds of the table select the
+    partitions that may contain matching rows, and the index of each of these
+    partitions gives the positions of the matching rows, so only those rows
+    are read and decoded. The index readers of the `max_open_partitions` most
+    recently used partitions are kept open, so repeated lookups into the same
+    partitions only read the rows.
+
+    Keys are structs with the first fields of the key of the table, in order,
+    or, to look up by the first key field only, values of its type. All keys
+    of a query must have the same number of fields.
+
+    The table must have been written by a version of Hail that writes
+    indices.
+
+    Parameters
+    ----------
+    path : :obj:`str`
+        Path of the table.
+    max_open_partitions : :obj:`int`
+        Number of partitions whose index readers are kept open.
+    """
+
+    @typecheck_method(path=str, max_open_partitions=int)
+    def __init__(self, path, max_open_partitions=32):
+        if max_open_partitions < 1:
+            raise ValueError(f'max_open_partitions must be positive, found {max_open_partitions}')
+        t = hl.read_table(path)
+        self.path = path
+        self.key_type = t.key.dtype
+        self.row_type = t.row.dtype
+        self._jlookup = Env.hail().io.index.TableLookup.apply(path, max_open_partitions)
+
+    def _key_prefix(self, key):
+        fields = list(self.key_type)
+        if isinstance(key, Struct):
+            names = list(key)
+            if names != fields[:len(names)]:
+                raise ValueError(f'key fields {names} are not a prefix of the key of the table {fields}')
+            n = len(names)
+        else:
+            key = Struct(**{fields[0]: key})
+            n = 1
+        prefix_type = tstruct(**{f: self.key_type[f] for f in fields[:n]})
+        prefix_type.typecheck(key)
+        return key, prefix_type
+
+    def _decode_rows(self, rows):
+        t = tarray(self.row_type)
+        if t._can_convert_from_encoding():
+            return t._from_encoding(rows)
+        return t._from_json(bytes(rows).decode('utf-8'))
+
+    def _codec(self):
+        return 'unblockedUncompressed' if tarray(self.row_type)._can_convert_from_encoding() else None
+
+    @typecheck_method(keys=sequenceof(anytype))
+    def get(self, keys):
+        """Rows whose keys start with one of `keys`.
+
+        Parameters
+        ----------
+        keys : :obj:`list`
+            Keys, or key prefixes, to look up.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Struct`
+            Matching rows, in the order of `keys`.
+        """
+        if not keys:
+            return []
+        prefixes = [self._key_prefix(k) for k in keys]
+        prefix_type = prefixes[0][1]
+        if any(t != prefix_type for _, t in prefixes):
+            raise ValueError('all keys must have the same fields')
+        keys_json = tarray(prefix_type)._to_json([k for k, _ in prefixes])
+        return self._decode_rows(self._jlookup.pyGet(keys_json, len(prefix_type), self._codec()))
+
+    @typecheck_method(start=anytype, end=anytype, includes_start=bool, includes_end=bool)
+    def range(self, start, end, includes_start=True, includes_end=False):
+        """Rows whose keys are between `start` and `end`.
+
+        Parameters
+        ----------
+        start
+            Key, or key prefix, of the start of the range.
+        end
+            Key, or key prefix, of the end of the range, with the same fields
+            as `start`.
+        includes_start : :obj:`bool`
+            Whether rows whose keys start with `start` are included.
+        includes_end : :obj:`bool`
+            Whether rows whose keys start with `end` are included.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Struct`
+            Matching rows, in key order.
+        """
+        start, start_type = self._key_prefix(start)
+        end, end_type = self._key_prefix(end)
+        if start_type != end_type:
+            raise ValueError('start and end must have the same fields')
+        interval = Interval(start, end, includes_start, includes_end, point_type=start_type)
+        interval_json = tinterval(start_type)._to_json(interval)
+        return self._decode_rows(self._jlookup.pyRange(interval_json, len(start_type), self._codec()))
+
+    def close(self):
+        """Close the files opened by lookups."""
+        self._jlookup.close()
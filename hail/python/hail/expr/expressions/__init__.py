@@ -46,6 +46,7 @@ __all__ = ['Indices',
            'eval',
            'eval_typed',
            'eval_timed',
+           'eval_many',
            'expr_any',
            'expr_int32',
            'expr_int64',
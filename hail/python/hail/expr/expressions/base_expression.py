@@ -1,11 +1,14 @@
 from typing import *
 
+import numpy as np
+
 from hail.expr import expressions
 from hail.expr.types import *
 from hail.ir import *
 from hail.typecheck import linked_list
 from hail.utils.java import *
 from hail.utils.linkedlist import LinkedList
+from hail.utils.misc import np_type_to_hl_type
 from .indices import *
 
 
@@ -22,7 +25,7 @@ class ExpressionWarning(Warning):
 
 
 def impute_type(x):
-    from hail.genetics import Locus, Call
+    from hail.genetics import Locus, Call, CallArray
     from hail.utils import Interval, Struct
     
     if isinstance(x, Expression):
@@ -46,6 +49,10 @@ def impute_type(x):
         return tinterval(x.point_type)
     elif isinstance(x, Call):
         return tcall
+    elif isinstance(x, CallArray):
+        return tarray(tcall)
+    elif isinstance(x, np.ndarray):
+        return tndarray(np_type_to_hl_type(x.dtype), x.ndim)
     elif isinstance(x, Struct):
         return tstruct(**{k: impute_type(x[k]) for k in x})
     elif isinstance(x, tuple):
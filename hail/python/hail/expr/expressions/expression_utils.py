@@ -222,6 +222,84 @@ def eval_typed(expression):
     return eval(expression), expression.dtype
 
 
+@typecheck(exprs=expr_any)
+def eval_many(*exprs):
+    """Evaluate several Hail expressions at once, returning their results.
+
+    Examples
+    --------
+
+    >>> hl.eval_many(1 + 2, hl.str(5), hl.array([1.5]))
+    (3, '5', [1.5])
+
+    Evaluate several aggregations over one table with a single pass:
+
+    >>> hl.eval_many(table1.aggregate(hl.agg.mean(table1.X), _localize=False),
+    ...              table1.aggregate(hl.agg.count(), _localize=False))
+    (6.5, 4)
+
+    Notes
+    -----
+    All expressions are combined into one tuple and compiled and executed by
+    the backend in a single round trip, which is much faster than calling
+    :func:`.eval` on each of them.
+
+    Expressions that refer to the globals of the same :class:`.Table` or
+    :class:`.MatrixTable` share one computation of those globals, and
+    aggregations over the same table or matrix table, as produced by
+    :meth:`.Table.aggregate` or :meth:`.MatrixTable.aggregate_entries` with
+    ``_localize=False``, are computed in one aggregation pass.
+
+    Each expression must have no indices, but can refer to the globals of a
+    :class:`.Table` or :class:`.MatrixTable`.
+
+    Parameters
+    ----------
+    exprs : varargs of :class:`.Expression`
+        Expressions, or Python values that can be implicitly interpreted as
+        expressions.
+
+    Returns
+    -------
+    :obj:`tuple`
+        Results of evaluating `exprs`, in order.
+    """
+    from hail.utils.java import Env
+    from hail.ir import Let, Ref, MakeTuple, GetTupleElement, TableAggregate, MatrixAggregate
+
+    sources = {}
+    for i, e in enumerate(exprs):
+        analyze('eval_many', e, Indices(e._indices.source))
+        if e._indices.source is not None:
+            sources.setdefault(id(e._indices.source), (e._indices.source, []))[1].append(i)
+
+    irs = [e._ir for e in exprs]
+    for source, idxs in sources.values():
+        uids = {i: Env.get_uid() for i in idxs}
+        source_globals = source.select_globals(**{uid: exprs[i] for i, uid in uids.items()}).index_globals()
+        for i, uid in uids.items():
+            irs[i] = source_globals[uid]._ir
+
+    # aggregations over the same child are combined into a single pass
+    aggregations = {}
+    for i, ir in enumerate(irs):
+        if isinstance(ir, (TableAggregate, MatrixAggregate)):
+            aggregations.setdefault((type(ir), ir.child), []).append(i)
+
+    bindings = []
+    for (agg_class, child), idxs in aggregations.items():
+        if len(idxs) > 1:
+            uid = Env.get_uid()
+            bindings.append((uid, agg_class(child, MakeTuple([irs[i].query for i in idxs]))))
+            for j, i in enumerate(idxs):
+                irs[i] = GetTupleElement(Ref(uid), j)
+
+    ir = MakeTuple(irs)
+    for uid, value in reversed(bindings):
+        ir = Let(uid, value, ir)
+    return Env.backend().execute(ir)
+
+
 def _get_refs(expr: Expression, builder: Dict[str, Indices]) -> None:
     from hail.ir import GetField, TopLevelReference
 
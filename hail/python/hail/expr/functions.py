@@ -193,6 +193,8 @@ def literal(x: Any, dtype: Optional[Union[HailType, str]] = None):
 
     if x is None:
         return hl.null(dtype)
+    elif isinstance(dtype, tndarray):
+        return _ndarray(x.astype(dtype._numpy_dtype, copy=False))
     elif is_primitive(dtype):
         if dtype == tint32:
             assert isinstance(x, builtins.int)
@@ -3754,25 +3756,25 @@ def _ndarray(collection, row_major=None):
     if isinstance(collection, np.ndarray):
         if row_major is None:
             row_major = not collection.flags.f_contiguous
-            flattened = collection.flatten('A')
-        else:
-            flattened = collection.flatten('C' if row_major else 'F')
+        flattened = collection.ravel('C' if row_major else 'F')
 
-        elem_type = np_type_to_hl_type(collection.dtype)
-        data = [to_expr(i.item(), elem_type) for i in flattened]
+        # the elements stay in the NumPy buffer, which the literal encodes as is
+        data_type = tarray(np_type_to_hl_type(collection.dtype))
+        data_expr = construct_expr(Literal(data_type, flattened), data_type)
         shape = collection.shape
-    elif isinstance(collection, list):
-        shape = list_shape(collection)
-        data = deep_flatten(collection)
     else:
-        shape = []
-        data = [collection]
+        if isinstance(collection, list):
+            shape = list_shape(collection)
+            data = deep_flatten(collection)
+        else:
+            shape = []
+            data = [collection]
+        data_expr = hl.array(data)
 
     if row_major is None:
         row_major = True
 
     shape_expr = to_expr(tuple([hl.int64(i) for i in shape]), ir.ttuple(*[tint64 for _ in shape]))
-    data_expr = hl.array(data)
     ndir = ir.MakeNDArray(data_expr._ir, shape_expr._ir, hl.bool(row_major)._ir)
 
     return construct_expr(ndir, tndarray(data_expr.dtype.element_type, builtins.len(shape)))
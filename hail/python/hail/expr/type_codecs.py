@@ -0,0 +1,551 @@
+"""Converters between Python values and the JSON and binary encodings of
+the backend, generated once per type.
+
+The ``_convert_*`` methods of :class:`.HailType` recurse through a method
+call, a missingness check and a dispatch on the type for every nested
+value. For a type, the functions here generate the source of a single
+function in which loops over nested collections are inlined and
+primitives are converted directly, and compile it. Types are converted
+by their own methods where no specialized code is generated, for
+instance for ndarrays.
+"""
+
+import struct
+
+import numpy as np
+
+from hail.utils.byte_reader import ByteReader
+from hail.utils.lru_cache import LRUCache
+
+_codecs = LRUCache(1024)
+
+# struct formats and NumPy dtypes of the fixed-width types, by parsable string
+_fixed_width = {'Int32': ('i', np.dtype('<i4')),
+                'Int64': ('q', np.dtype('<i8')),
+                'Float32': ('f', np.dtype('<f4')),
+                'Float64': ('d', np.dtype('<f8')),
+                'Boolean': ('?', np.dtype('?'))}
+
+# Python caps statically nested loops; deeper types are not compiled
+_max_depth = 15
+
+
+def _popcount(b):
+    return bin(int.from_bytes(b, 'little')).count('1')
+
+
+def _missing_bytes(values):
+    missing = bytearray((len(values) + 7) >> 3)
+    for i, v in enumerate(values):
+        if v is None:
+            missing[i >> 3] |= 1 << (i & 7)
+    return missing
+
+
+class _Source(object):
+    """Lines of a generated function and the constants it refers to."""
+
+    def __init__(self):
+        self.lines = []
+        self.env = {'ByteReader': ByteReader, 'np': np, 'popcount': _popcount, 'missing_bytes': _missing_bytes}
+        self._n = 0
+
+    def fresh(self, prefix):
+        self._n += 1
+        return f'{prefix}{self._n}'
+
+    def const(self, value, prefix='c'):
+        name = self.fresh(prefix)
+        self.env[name] = value
+        return name
+
+    def emit(self, indent, line):
+        self.lines.append('    ' * indent + line)
+
+    def compile(self, name):
+        code = '\n'.join(self.lines)
+        exec(compile(code, f'<{name}>', 'exec'), self.env)
+        return self.env[name]
+
+
+def _depth(t):
+    from hail.expr import types
+    if isinstance(t, (types.tarray, types.tset)):
+        return 1 + _depth(t.element_type)
+    if isinstance(t, types.tdict):
+        return 1 + max(_depth(t.key_type), _depth(t.value_type))
+    if isinstance(t, types.tstruct):
+        return 1 + max([_depth(ft) for ft in t.values()], default=0)
+    if isinstance(t, types.ttuple):
+        return 1 + max([_depth(ft) for ft in t.types], default=0)
+    if isinstance(t, types.tinterval):
+        return 1 + _depth(t.point_type)
+    return 0
+
+
+def _record_constructor(src, t, values):
+    record = src.const(t._record_class(), 'record')
+    if len(values) > 250:
+        return f'{record}(*({", ".join(values)},))'
+    return f'{record}({", ".join(values)})'
+
+
+def _tuple_display(values):
+    return f'({", ".join(values)},)' if values else '()'
+
+
+# decoding from the binary encoding: statements reading the value at `off`
+# in `buf` into a variable
+
+def _emit_decode(src, t, target, indent):
+    from hail.expr import types
+    from hail import genetics
+    emit = src.emit
+    parsable = t._parsable_string() if not isinstance(t, (types.tstruct, types.ttuple, types.tarray, types.tset,
+                                                          types.tdict, types.tinterval, types.tndarray)) else None
+
+    if parsable in _fixed_width:
+        fmt, dtype = _fixed_width[parsable]
+        if fmt == '?':
+            emit(indent, f'{target} = buf[off] != 0')
+        else:
+            unpack = src.const(struct.Struct('<' + fmt).unpack_from, 'unpack')
+            emit(indent, f'{target}, = {unpack}(buf, off)')
+        emit(indent, f'off += {dtype.itemsize}')
+    elif parsable == 'String':
+        unpack = src.const(struct.Struct('<i').unpack_from, 'unpack')
+        n = src.fresh('n')
+        emit(indent, f'{n}, = {unpack}(buf, off)')
+        emit(indent, f'{target} = str(buf[off + 4:off + 4 + {n}], "utf-8")')
+        emit(indent, f'off += 4 + {n}')
+    elif parsable == 'Call':
+        unpack = src.const(struct.Struct('<i').unpack_from, 'unpack')
+        from_java = src.const(genetics.Call._from_java, 'call')
+        emit(indent, f'{target} = {from_java}({unpack}(buf, off)[0])')
+        emit(indent, 'off += 4')
+    elif isinstance(t, types.tlocus):
+        unpack = src.const(struct.Struct('<i').unpack_from, 'unpack')
+        rg = src.const(t.reference_genome, 'rg')
+        locus = src.const(genetics.Locus._from_fields, 'locus')
+        n = src.fresh('n')
+        emit(indent, f'{n}, = {unpack}(buf, off)')
+        emit(indent, f'off += 4 + {n}')
+        emit(indent, f'{target} = {locus}(str(buf[off - {n}:off], "utf-8"), {unpack}(buf, off)[0], {rg})')
+        emit(indent, 'off += 4')
+    elif isinstance(t, types.tarray) and t.element_type == types.tcall:
+        _emit_fallback_decode(src, types._decode_calls, target, indent)
+    elif isinstance(t, (types.tarray, types.tset)):
+        _emit_decode_elements(src, t.element_type, target, indent)
+        if isinstance(t, types.tset):
+            emit(indent, f'{target} = set({target})')
+    elif isinstance(t, types.tdict):
+        unpack = src.const(struct.Struct('<i').unpack_from, 'unpack')
+        n, m, k, v = src.fresh('n'), src.fresh('m'), src.fresh('k'), src.fresh('v')
+        emit(indent, f'{n}, = {unpack}(buf, off)')
+        emit(indent, 'off += 4')
+        emit(indent, f'{target} = {{}}')
+        emit(indent, f'for _ in range({n}):')
+        emit(indent + 1, f'{m} = buf[off]')
+        emit(indent + 1, 'off += 1')
+        _emit_decode_field(src, t.key_type, k, f'{m} & 1', indent + 1)
+        _emit_decode_field(src, t.value_type, v, f'{m} & 2', indent + 1)
+        emit(indent + 1, f'{target}[{k}] = {v}')
+    elif isinstance(t, (types.tstruct, types.ttuple)):
+        field_types = list(t.values()) if isinstance(t, types.tstruct) else t.types
+        values = _emit_decode_fields(src, field_types, indent)
+        if isinstance(t, types.tstruct):
+            emit(indent, f'{target} = {_record_constructor(src, t, values)}')
+        else:
+            emit(indent, f'{target} = {_tuple_display(values)}')
+    elif isinstance(t, types.tinterval):
+        from hail.utils import Interval
+        start, end = _emit_decode_fields(src, [t.point_type, t.point_type], indent)
+        interval = src.const(Interval, 'Interval')
+        point_type = src.const(t.point_type, 'point_type')
+        emit(indent, f'{target} = {interval}({start}, {end}, buf[off] != 0, buf[off + 1] != 0, '
+                     f'point_type={point_type})')
+        emit(indent, 'off += 2')
+    else:
+        _emit_fallback_decode(src, t._convert_from_encoding, target, indent)
+
+
+def _emit_fallback_decode(src, f, target, indent):
+    reader = src.fresh('reader')
+    f = src.const(f, 'decode')
+    src.emit(indent, f'{reader} = ByteReader(buf, off)')
+    src.emit(indent, f'{target} = {f}({reader})')
+    src.emit(indent, f'off = {reader}._offset')
+
+
+def _emit_decode_field(src, t, target, is_missing, indent):
+    src.emit(indent, f'if {is_missing}:')
+    src.emit(indent + 1, f'{target} = None')
+    src.emit(indent, 'else:')
+    _emit_decode(src, t, target, indent + 1)
+
+
+def _emit_decode_fields(src, field_types, indent):
+    """Decode the fields of a struct, preceded by their missing bits, into
+    fresh variables and return their names."""
+    n_bytes = (len(field_types) + 7) >> 3
+    missing = [src.fresh('m') for _ in range(n_bytes)]
+    for i, m in enumerate(missing):
+        src.emit(indent, f'{m} = buf[off + {i}]')
+    if n_bytes:
+        src.emit(indent, f'off += {n_bytes}')
+    values = []
+    for i, ft in enumerate(field_types):
+        v = src.fresh('f')
+        _emit_decode_field(src, ft, v, f'{missing[i >> 3]} & {1 << (i & 7)}', indent)
+        values.append(v)
+    return values
+
+
+def _emit_decode_elements(src, element_type, target, indent):
+    from hail.expr import types
+    emit = src.emit
+    unpack = src.const(struct.Struct('<i').unpack_from, 'unpack')
+    n, m, i = src.fresh('n'), src.fresh('m'), src.fresh('i')
+    emit(indent, f'{n}, = {unpack}(buf, off)')
+    emit(indent, f'{m} = buf[off + 4:off + 4 + (({n} + 7) >> 3)]')
+    emit(indent, f'off += 4 + (({n} + 7) >> 3)')
+    parsable = element_type._parsable_string() if isinstance(element_type, (types._tint32, types._tint64,
+                                                                              types._tfloat32, types._tfloat64,
+                                                                              types._tbool)) else None
+    if parsable in _fixed_width:
+        # present values of fixed-width types are stored contiguously
+        _, dtype = _fixed_width[parsable]
+        dtype = src.const(dtype, 'dtype')
+        present = src.fresh('present')
+        emit(indent, f'if not any({m}):')
+        emit(indent + 1, f'{target} = np.frombuffer(buf, {dtype}, {n}, off).tolist()')
+        emit(indent + 1, f'off += {n} * {dtype}.itemsize')
+        emit(indent, 'else:')
+        emit(indent + 1, f'{present} = {n} - popcount({m})')
+        emit(indent + 1, f'{present}, off = iter(np.frombuffer(buf, {dtype}, {present}, off).tolist()), '
+                         f'off + {present} * {dtype}.itemsize')
+        emit(indent + 1, f'{target} = [None if {m}[{i} >> 3] & (1 << ({i} & 7)) else next({present}) '
+                         f'for {i} in range({n})]')
+    else:
+        e = src.fresh('e')
+        emit(indent, f'{target} = [None] * {n}')
+        emit(indent, f'for {i} in range({n}):')
+        emit(indent + 1, f'if not {m}[{i} >> 3] & (1 << ({i} & 7)):')
+        _emit_decode(src, element_type, e, indent + 2)
+        emit(indent + 2, f'{target}[{i}] = {e}')
+
+
+def _compile_decoder(t):
+    src = _Source()
+    src.emit(0, 'def decode(buf):')
+    # the value is encoded as a tuple with a single nullable field
+    src.emit(1, 'if buf[0] & 1:')
+    src.emit(2, 'return None')
+    src.emit(1, 'off = 1')
+    _emit_decode(src, t, 'value', 1)
+    src.emit(1, 'return value')
+    return src.compile('decode')
+
+
+# encoding to the binary encoding: statements appending a present value to
+# the bytearray `out`
+
+def _emit_encode(src, t, value, indent):
+    from hail.expr import types
+    emit = src.emit
+    parsable = t._parsable_string() if isinstance(t, (types._tint32, types._tint64, types._tfloat32,
+                                                      types._tfloat64, types._tbool, types._tstr,
+                                                      types._tcall)) else None
+
+    if parsable in _fixed_width:
+        fmt, _ = _fixed_width[parsable]
+        if fmt == '?':
+            emit(indent, f'out.append(1 if {value} else 0)')
+        else:
+            pack = src.const(struct.Struct('<' + fmt).pack, 'pack')
+            emit(indent, f'out += {pack}({value})')
+    elif parsable == 'String':
+        _emit_encode_str(src, value, indent)
+    elif parsable == 'Call':
+        pack = src.const(struct.Struct('<i').pack, 'pack')
+        emit(indent, f'out += {pack}({value}._call)')
+    elif isinstance(t, types.tlocus):
+        pack = src.const(struct.Struct('<i').pack, 'pack')
+        _emit_encode_str(src, f'{value}.contig', indent)
+        emit(indent, f'out += {pack}({value}.position)')
+    elif isinstance(t, (types.tarray, types.tset)):
+        _emit_encode_elements(src, t, value, indent)
+    elif isinstance(t, types.tdict):
+        pack = src.const(struct.Struct('<i').pack, 'pack')
+        k, v = src.fresh('k'), src.fresh('v')
+        emit(indent, f'out += {pack}(len({value}))')
+        emit(indent, f'for {k}, {v} in {value}.items():')
+        emit(indent + 1, f'out.append(({k} is None) | (({v} is None) << 1))')
+        _emit_encode_present(src, t.key_type, k, indent + 1)
+        _emit_encode_present(src, t.value_type, v, indent + 1)
+    elif isinstance(t, (types.tstruct, types.ttuple)):
+        if isinstance(t, types.tstruct):
+            fields = [(repr(f), ft) for f, ft in t.items()]
+        else:
+            fields = [(str(i), ft) for i, ft in enumerate(t.types)]
+        values = [src.fresh('f') for _ in fields]
+        fields_of = _emit_struct_fields(src, t, value, indent)
+        for v, (f, _) in zip(values, fields):
+            emit(indent, f'{v} = {fields_of}[{f}]')
+        _emit_encode_fields(src, [ft for _, ft in fields], values, indent)
+    elif isinstance(t, types.tinterval):
+        start, end = src.fresh('start'), src.fresh('end')
+        emit(indent, f'{start}, {end} = {value}.start, {value}.end')
+        _emit_encode_fields(src, [t.point_type, t.point_type], [start, end], indent)
+        emit(indent, f'out.append(1 if {value}.includes_start else 0)')
+        emit(indent, f'out.append(1 if {value}.includes_end else 0)')
+    else:
+        f = src.const(t._convert_to_encoding, 'encode')
+        emit(indent, f'{f}(writer, {value})')
+
+
+def _emit_struct_fields(src, t, value, indent):
+    """Name of a mapping of the fields of the struct or tuple `value`,
+    bypassing the argument checks of :meth:`.Struct.__getitem__`."""
+    from hail.expr import types
+    from hail.utils import Struct
+    if not isinstance(t, types.tstruct):
+        return value
+    fields_of = src.fresh('fields')
+    struct_class = src.const(Struct, 'Struct')
+    src.emit(indent, f'{fields_of} = {value}._fields if isinstance({value}, {struct_class}) else {value}')
+    return fields_of
+
+
+def _emit_encode_str(src, value, indent):
+    pack = src.const(struct.Struct('<i').pack, 'pack')
+    b = src.fresh('b')
+    src.emit(indent, f'{b} = {value}.encode("utf-8")')
+    src.emit(indent, f'out += {pack}(len({b}))')
+    src.emit(indent, f'out += {b}')
+
+
+def _emit_encode_present(src, t, value, indent):
+    src.emit(indent, f'if {value} is not None:')
+    n_lines = len(src.lines)
+    _emit_encode(src, t, value, indent + 1)
+    if len(src.lines) == n_lines:
+        # empty structs and tuples are encoded as nothing
+        src.emit(indent + 1, 'pass')
+
+
+def _emit_encode_fields(src, field_types, values, indent):
+    for i in range(0, len(values), 8):
+        bits = ' | '.join(f'(({v} is None) << {j})' for j, v in enumerate(values[i:i + 8]))
+        src.emit(indent, f'out.append({bits})')
+    for t, v in zip(field_types, values):
+        _emit_encode_present(src, t, v, indent)
+
+
+def _emit_encode_elements(src, t, value, indent):
+    from hail.expr import types
+    from hail import genetics
+    emit = src.emit
+    element_type = t.element_type
+    if isinstance(t, types.tarray) and element_type == types.tcall:
+        call_array = src.const(genetics.CallArray, 'CallArray')
+        encode_calls = src.const(types._encode_calls, 'encode_calls')
+        emit(indent, f'if isinstance({value}, {call_array}):')
+        emit(indent + 1, f'{encode_calls}(writer, {value})')
+        emit(indent, 'else:')
+        indent += 1
+    elif isinstance(t, types.tset):
+        emit(indent, f'{value} = list({value})')
+    parsable = element_type._parsable_string() if isinstance(element_type, (types._tint32, types._tint64,
+                                                                              types._tfloat32, types._tfloat64,
+                                                                              types._tbool)) else None
+    if parsable in _fixed_width and isinstance(t, types.tarray):
+        _, dtype = _fixed_width[parsable]
+        ndarray = src.const(np.ndarray, 'ndarray')
+        encode_array = src.const(types._encode_array, 'encode_array')
+        emit(indent, f'if isinstance({value}, {ndarray}):')
+        emit(indent + 1, f'{encode_array}(writer, {src.const(dtype, "dtype")}, {value})')
+        emit(indent, 'else:')
+        indent += 1
+    pack = src.const(struct.Struct('<i').pack, 'pack')
+    emit(indent, f'out += {pack}(len({value}))')
+    emit(indent, f'out += missing_bytes({value})')
+    if parsable in _fixed_width:
+        fmt, _ = _fixed_width[parsable]
+        present = src.fresh('present')
+        emit(indent, f'{present} = [v for v in {value} if v is not None]')
+        emit(indent, f'out += struct.pack(f"<{{len({present})}}{fmt}", *{present})')
+        src.env['struct'] = struct
+    else:
+        e = src.fresh('e')
+        emit(indent, f'for {e} in {value}:')
+        _emit_encode_present(src, element_type, e, indent + 1)
+
+
+def _compile_encoder(t):
+    src = _Source()
+    src.emit(0, 'def encode(writer, value):')
+    src.emit(1, 'out = writer._buf')
+    _emit_encode(src, t, 'value', 1)
+    src.emit(1, 'return')
+    return src.compile('encode')
+
+
+# JSON: expressions converting a present value held in a variable
+
+def _json_decode_expr(src, t, value):
+    from hail.expr import types
+    from hail import genetics
+    if isinstance(t, (types._tint32, types._tint64, types._tbool, types._tstr)):
+        return value
+    if isinstance(t, (types._tfloat32, types._tfloat64)):
+        return f'float({value})'
+    if isinstance(t, types.tlocus):
+        rg = src.const(t.reference_genome, 'rg')
+        locus = src.const(genetics.Locus._from_fields, 'locus')
+        return f'{locus}({value}["contig"], {value}["position"], {rg})'
+    if isinstance(t, (types.tarray, types.tset)) and not t.element_type == types.tcall:
+        e = src.fresh('e')
+        element = _json_decode_na_expr(src, t.element_type, e)
+        if isinstance(t, types.tset):
+            return f'{{{element} for {e} in {value}}}'
+        return f'[{element} for {e} in {value}]'
+    if isinstance(t, types.tdict):
+        e, k, v = src.fresh('e'), src.fresh('k'), src.fresh('v')
+        return (f'{{{_json_decode_na_expr(src, t.key_type, k)}: {_json_decode_na_expr(src, t.value_type, v)} '
+                f'for {k}, {v} in (({e}["key"], {e}["value"]) for {e} in {value})}}')
+    if isinstance(t, (types.tstruct, types.ttuple, types.tinterval)):
+        return f'{src.const(_compile_json_decoder_body(t), "decode")}({value})'
+    return f'{src.const(t._convert_from_json, "decode")}({value})'
+
+
+def _json_decode_na_expr(src, t, value):
+    expr = _json_decode_expr(src, t, value)
+    if expr == value:
+        return value
+    return f'None if {value} is None else {expr}'
+
+
+def _compile_json_decoder_body(t):
+    """Function converting a present struct, tuple or interval."""
+    from hail.expr import types
+    src = _Source()
+    src.emit(0, 'def decode(x):')
+    if isinstance(t, types.tinterval):
+        from hail.utils import Interval
+        start, end = src.fresh('start'), src.fresh('end')
+        src.emit(1, f'{start} = x["start"]')
+        src.emit(1, f'{end} = x["end"]')
+        interval = src.const(Interval, 'Interval')
+        point_type = src.const(t.point_type, 'point_type')
+        src.emit(1, f'return {interval}({_json_decode_na_expr(src, t.point_type, start)}, '
+                    f'{_json_decode_na_expr(src, t.point_type, end)}, '
+                    f'x["includeStart"], x["includeEnd"], point_type={point_type})')
+        return src.compile('decode')
+
+    if isinstance(t, types.tstruct):
+        fields = [(f'x.get({f!r})', ft) for f, ft in t.items()]
+    else:
+        fields = [(f'x[{i}]', ft) for i, ft in enumerate(t.types)]
+    values = []
+    for get, ft in fields:
+        v = src.fresh('f')
+        src.emit(1, f'{v} = {get}')
+        expr = _json_decode_na_expr(src, ft, v)
+        if expr != v:
+            src.emit(1, f'{v} = {expr}')
+        values.append(v)
+    if isinstance(t, types.tstruct):
+        src.emit(1, f'return {_record_constructor(src, t, values)}')
+    else:
+        src.emit(1, f'return {_tuple_display(values)}')
+    return src.compile('decode')
+
+
+def _compile_json_decoder(t):
+    src = _Source()
+    src.emit(0, 'def decode(x):')
+    src.emit(1, f'return {_json_decode_na_expr(src, t, "x")}')
+    return src.compile('decode')
+
+
+def _json_encode_expr(src, t, value):
+    from hail.expr import types
+    if isinstance(t, (types._tint32, types._tint64, types._tbool, types._tstr)):
+        return value
+    if isinstance(t, (types.tarray, types.tset)):
+        e = src.fresh('e')
+        if isinstance(t, types.tarray) and t.element_type._encoding_format is not None:
+            ndarray = src.const(np.ndarray, 'ndarray')
+            value = f'({value}.tolist() if isinstance({value}, {ndarray}) else {value})'
+        return f'[{_json_encode_na_expr(src, t.element_type, e)} for {e} in {value}]'
+    if isinstance(t, types.tdict):
+        k, v = src.fresh('k'), src.fresh('v')
+        return (f'[{{"key": {_json_encode_na_expr(src, t.key_type, k)}, '
+                f'"value": {_json_encode_na_expr(src, t.value_type, v)}}} for {k}, {v} in {value}.items()]')
+    if isinstance(t, (types.tstruct, types.ttuple)):
+        return f'{src.const(_compile_json_encoder_body(t), "encode")}({value})'
+    return f'{src.const(t._convert_to_json, "encode")}({value})'
+
+
+def _json_encode_na_expr(src, t, value):
+    expr = _json_encode_expr(src, t, value)
+    if expr == value:
+        return value
+    return f'None if {value} is None else {expr}'
+
+
+def _compile_json_encoder_body(t):
+    """Function converting a present struct or tuple."""
+    from hail.expr import types
+    src = _Source()
+    src.emit(0, 'def encode(x):')
+    if isinstance(t, types.tstruct):
+        fields = [(repr(f), ft) for f, ft in t.items()]
+    else:
+        fields = [(str(i), ft) for i, ft in enumerate(t.types)]
+    values = []
+    fields_of = _emit_struct_fields(src, t, 'x', 1)
+    for f, ft in fields:
+        v = src.fresh('f')
+        src.emit(1, f'{v} = {fields_of}[{f}]')
+        values.append(_json_encode_na_expr(src, ft, v))
+    if isinstance(t, types.tstruct):
+        src.emit(1, 'return {' + ', '.join(f'{f}: {v}' for (f, _), v in zip(fields, values)) + '}')
+    else:
+        src.emit(1, 'return [' + ', '.join(values) + ']')
+    return src.compile('encode')
+
+
+def _compile_json_encoder(t):
+    src = _Source()
+    src.emit(0, 'def encode(x):')
+    src.emit(1, f'return {_json_encode_na_expr(src, t, "x")}')
+    return src.compile('encode')
+
+
+_compilers = {'from_encoding': _compile_decoder,
+              'to_encoding': _compile_encoder,
+              'from_json': _compile_json_decoder,
+              'to_json': _compile_json_encoder}
+
+
+def codec(t, kind):
+    """Generated converter of `kind` for values of type `t`, or ``None`` if
+    the type is too deeply nested to be compiled.
+
+    ``from_encoding`` decodes the buffer read by :meth:`.HailType._from_encoding`.
+    ``to_encoding`` appends a present value to a :class:`.ByteWriter`.
+    ``from_json`` and ``to_json`` convert nullable values like
+    :meth:`.HailType._convert_from_json_na` and
+    :meth:`.HailType._convert_to_json_na`.
+    """
+    key = (kind, t)
+    f = _codecs.get(key)
+    if f is None:
+        if _depth(t) > _max_depth:
+            f = False
+        else:
+            f = _compilers[kind](t)
+        _codecs.put(key, f)
+    return f or None
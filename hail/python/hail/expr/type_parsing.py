@@ -153,3 +153,129 @@ class TypeConstructor(NodeVisitor):
 
 
 type_node_visitor = TypeConstructor()
+
+
+# Types as serialized by the backend in the metadata of native files, e.g.
+# "Table{global:Struct{},key:[idx],row:Struct{idx:+Int32}}". Requiredness is
+# dropped.
+relational_type_grammar = Grammar(
+    r"""
+    relational_type = _ (table / matrix) _
+    table = "Table" _ "{" components "}"
+    matrix = "Matrix" _ "{" components "}"
+    components = component ("," component)*
+    component = identifier ":" _ (nested_keys / keys / type) _
+    nested_keys = "[" _ keys trailing_keys "]"
+    keys = "[" ((identifier ("," identifier)*) / _) "]"
+    trailing_keys = ("," identifier)*
+    type = _ "+"? _ (array / ndarray / set / dict / struct / union / tuple / interval / int64 / int32 / float32 / float64 / bool / str / call / locus) _
+    int64 = "Int64"
+    int32 = "Int32" / "Int"
+    float32 = "Float32"
+    float64 = "Float64"
+    bool = "Boolean"
+    call = "Call"
+    str = "String"
+    locus = "Locus" _ "(" identifier ")"
+    array = "Array" _ "[" type "]"
+    ndarray = "NDArray" _ "[" type "," _ nat_literal _ "]"
+    set = "Set" _ "[" type "]"
+    dict = "Dict" _ "[" type "," type "]"
+    struct = "Struct" _ "{" (fields / _) "}"
+    union = "Union" _ "{" (fields / _) "}"
+    tuple = "Tuple" _ "[" ((type ("," type)*) / _) "]"
+    fields = field ("," field)*
+    field = identifier ":" type
+    interval = "Interval" _ "[" type "]"
+    identifier = _ (simple_identifier / escaped_identifier) _
+    simple_identifier = ~"\w+"
+    escaped_identifier = ~"`([^`\\\\]|\\\\.)*`"
+    nat_literal = ~"[0-9]+"
+    _ = ~"\s*"
+    """)
+
+
+class RelationalTypeConstructor(TypeConstructor):
+    # raised by visit_locus for reference genomes unknown to Python
+    unwrapped_exceptions = (KeyError,)
+
+    def visit_relational_type(self, node, visited_children):
+        _, [t], _ = visited_children
+        return t
+
+    def visit_table(self, node, visited_children):
+        ttable, _, brace, components, brace = visited_children
+        return hl.ttable(components['global'], components['row'], components['key'])
+
+    def visit_matrix(self, node, visited_children):
+        tmatrix, _, brace, components, brace = visited_children
+        return hl.tmatrix(components['global'],
+                          components['col'], components['col_key'],
+                          components['row'], components['row_key'],
+                          components['entry'])
+
+    def visit_components(self, node, visited_children):
+        first, rest = visited_children
+        return dict([first] + [component for comma, component in rest])
+
+    def visit_component(self, node, visited_children):
+        name, colon, _, [value], _ = visited_children
+        return (name, value)
+
+    def visit_nested_keys(self, node, visited_children):
+        # partition key followed by the rest of the key
+        bracket, _, keys, trailing_keys, bracket = visited_children
+        return keys + trailing_keys
+
+    def visit_keys(self, node, visited_children):
+        bracket, [maybe_keys], bracket = visited_children
+        if not maybe_keys:
+            return []
+        first, rest = maybe_keys
+        return [first] + [k for comma, k in rest]
+
+    def visit_trailing_keys(self, node, visited_children):
+        return [k for comma, k in visited_children]
+
+    def visit_type(self, node, visited_children):
+        _, required, _, [t], _ = visited_children
+        return t
+
+    def visit_locus(self, node, visited_children):
+        tlocus, _, paren, rg, paren = visited_children
+        if rg not in hl.ReferenceGenome._references:
+            raise KeyError(rg)
+        return hl.tlocus(rg)
+
+    def visit_array(self, node, visited_children):
+        tarray, _, bracket, t, bracket = visited_children
+        return hl.tarray(t)
+
+    def visit_ndarray(self, node, visited_children):
+        tndarray, _, bracket, elem_t, comma, _, ndim, _, bracket = visited_children
+        return hl.tndarray(elem_t, ndim)
+
+    def visit_dict(self, node, visited_children):
+        tdict, _, bracket, kt, comma, vt, bracket = visited_children
+        return hl.tdict(kt, vt)
+
+    def visit_tuple(self, node, visited_children):
+        ttuple, _, bracket, [maybe_types], bracket = visited_children
+        if not maybe_types:
+            return hl.ttuple()
+        else:
+            [first, rest] = maybe_types
+            return hl.ttuple(first, *(t for comma, t in rest))
+
+
+relational_type_node_visitor = RelationalTypeConstructor()
+
+
+def parse_relational_type(type_str):
+    """Parse a :class:`.ttable` or :class:`.tmatrix` serialized by the backend.
+
+    Raises :class:`KeyError` if the type refers to a reference genome that
+    has not been loaded.
+    """
+    tree = relational_type_grammar.parse(type_str)
+    return relational_type_node_visitor.visit(tree)
@@ -1,8 +1,12 @@
 import abc
+import ast
 import json
 import math
+import struct
 from collections import Mapping, Sequence
 
+import numpy as np
+
 import hail as hl
 from hail import genetics
 from hail.expr.nat import NatBase, NatLiteral
@@ -10,6 +14,8 @@ from hail.expr.type_parsing import type_grammar, type_node_visitor
 from hail.genetics.reference_genome import reference_genome_type
 from hail.typecheck import *
 from hail.utils.java import scala_object, jset, Env, escape_parsable
+from hail.utils.byte_reader import ByteReader, is_missing
+from hail.utils.byte_writer import ByteWriter
 
 __all__ = [
     'dtype',
@@ -187,6 +193,9 @@ class HailType(object):
         return json.dumps(converted)
 
     def _convert_to_json_na(self, x):
+        encode = self._codec('to_json')
+        if encode is not None:
+            return encode(x)
         if x is None:
             return x
         else:
@@ -200,6 +209,9 @@ class HailType(object):
         return self._convert_from_json_na(x)
 
     def _convert_from_json_na(self, x):
+        decode = self._codec('from_json')
+        if decode is not None:
+            return decode(x)
         if x is None:
             return x
         else:
@@ -208,6 +220,65 @@ class HailType(object):
     def _convert_from_json(self, x):
         return x
 
+    def _from_encoding(self, encoding):
+        """Decode a value encoded by the backend with the
+        ``unblockedUncompressed`` codec as a tuple with a single, nullable
+        field of this type. All nested values are encoded as nullable.
+        """
+        decode = self._codec('from_encoding')
+        if decode is not None:
+            return decode(memoryview(encoding))
+        byte_reader = ByteReader(memoryview(encoding))
+        if is_missing(byte_reader.read_missing_bytes(1), 0):
+            return None
+        return self._convert_from_encoding(byte_reader)
+
+    def _can_convert_from_encoding(self):
+        """Whether values of this type can be decoded with
+        :meth:`._from_encoding` and encoded with :meth:`._to_encoding`."""
+        return False
+
+    def _convert_from_encoding(self, byte_reader):
+        raise NotImplementedError(f"cannot decode values of type '{self}'")
+
+    def _to_encoding(self, x):
+        """Encode `x` in the layout read by :meth:`._from_encoding`."""
+        byte_writer = ByteWriter()
+        byte_writer.write_missing_bytes([x])
+        if x is not None:
+            encode = self._codec('to_encoding')
+            if encode is not None:
+                encode(byte_writer, x)
+            else:
+                self._convert_to_encoding(byte_writer, x)
+        return byte_writer.getvalue()
+
+    # struct format character of fixed-width types, for which an array of
+    # present values is encoded contiguously
+    _encoding_format = None
+
+    def _convert_to_encoding(self, byte_writer, x):
+        raise NotImplementedError(f"cannot encode values of type '{self}'")
+
+    def _codec(self, kind):
+        """Converter of `kind` generated for this type by
+        :func:`hail.expr.type_codecs.codec`, or ``None`` to convert with the
+        ``_convert_*`` methods."""
+        codecs = self.__dict__.get('_codecs')
+        if codecs is None:
+            codecs = self.__dict__['_codecs'] = {}
+        if kind not in codecs:
+            from hail.expr.type_codecs import codec
+            codecs[kind] = codec(self, kind)
+        return codecs[kind]
+
+    def __getstate__(self):
+        # generated converters and classes are not pickled
+        state = self.__dict__.copy()
+        state.pop('_codecs', None)
+        if '_record' in state:
+            state['_record'] = None
+        return state
 
     def _traverse(self, obj, f):
         """Traverse a nested type and object.
@@ -234,7 +305,7 @@ class HailType(object):
         raise NotImplementedError
 
 
-hail_type = oneof(HailType, transformed((str, dtype)))
+hail_type = oneof(HailType, transformed((str, dtype), cache=True))
 
 
 class _tvoid(HailType):
@@ -288,6 +359,17 @@ class _tint32(HailType):
     def _parsable_string(self):
         return "Int32"
 
+    _encoding_format = 'i'
+
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_int32()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int32(x)
+
     @property
     def min_value(self):
         return -(1 << 31)
@@ -334,6 +416,17 @@ class _tint64(HailType):
     def _parsable_string(self):
         return "Int64"
 
+    _encoding_format = 'q'
+
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_int64()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int64(x)
+
     @property
     def min_value(self):
         return -(1 << 63)
@@ -374,6 +467,17 @@ class _tfloat32(HailType):
     def _parsable_string(self):
         return "Float32"
 
+    _encoding_format = 'f'
+
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_float32()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_float32(x)
+
     def _convert_from_json(self, x):
         return float(x)
 
@@ -414,6 +518,17 @@ class _tfloat64(HailType):
     def _parsable_string(self):
         return "Float64"
 
+    _encoding_format = 'd'
+
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_float64()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_float64(x)
+
     def _convert_from_json(self, x):
         return float(x)
 
@@ -455,6 +570,17 @@ class _tstr(HailType):
     def _parsable_string(self):
         return "String"
 
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_bytes(byte_reader.read_int32()).decode('utf-8')
+
+    def _convert_to_encoding(self, byte_writer, x):
+        b = x.encode('utf-8')
+        byte_writer.write_int32(len(b))
+        byte_writer.write_bytes(b)
+
     def unify(self, t):
         return t == tstr
 
@@ -487,6 +613,17 @@ class _tbool(HailType):
     def _parsable_string(self):
         return "Boolean"
 
+    _encoding_format = '?'
+
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        return byte_reader.read_bool()
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_bool(x)
+
     def unify(self, t):
         return t == tbool
 
@@ -510,6 +647,10 @@ class tndarray(HailType):
     NDArrays contain elements of only one type, which is parameterized by
     `element_type`.
 
+    NDArrays of numeric or boolean elements are transferred from the backend
+    in the NumPy ``.npy`` layout and returned as read-only views of the
+    received buffer; use :meth:`numpy.ndarray.copy` to modify them.
+
     Parameters
     ----------
     element_type : :class:`.HailType`
@@ -552,12 +693,16 @@ class tndarray(HailType):
         return self._ndim.n
 
     def _traverse(self, obj, f):
-        if f(self, obj):
-            for elt in obj:
-                self.element_type._traverse(elt, f)
+        # elements are stored in a NumPy buffer, not as Python values
+        f(self, obj)
 
     def _typecheck_one_level(self, annotation):
-        raise NotImplementedError
+        if annotation is not None:
+            if not isinstance(annotation, np.ndarray):
+                raise TypeError("type 'ndarray' expected NumPy 'ndarray', but found type '%s'" % type(annotation))
+            if annotation.ndim != self.ndim:
+                raise TypeError(f"type '{self}' expected an ndarray with {self.ndim} dimensions, "
+                                f"but found {annotation.ndim}")
 
     def __str__(self):
         return "ndarray<{}, {}>".format(self.element_type, self.ndim)
@@ -575,11 +720,27 @@ class tndarray(HailType):
     def _parsable_string(self):
         return f'NDArray[{self._element_type._parsable_string()},{self.ndim}]'
 
+    @property
+    def _numpy_dtype(self):
+        if self.element_type._encoding_format is None:
+            raise TypeError(f"ndarrays of type '{self.element_type}' have no NumPy representation")
+        return np.dtype('<' + self.element_type._encoding_format)
+
     def _convert_from_json(self, x):
-        raise NotImplementedError
+        return np.array(x['data'], dtype=self._numpy_dtype).reshape(x['shape'])
 
     def _convert_to_json(self, x):
-        raise NotImplementedError
+        return {'shape': list(x.shape),
+                'data': [self.element_type._convert_to_json(v) for v in x.ravel().tolist()]}
+
+    def _can_convert_from_encoding(self):
+        return self.element_type._encoding_format is not None
+
+    def _convert_from_encoding(self, byte_reader):
+        return _decode_npy(byte_reader)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        _encode_npy(byte_writer, np.asarray(x, dtype=self._numpy_dtype))
 
     def clear(self):
         self._element_type.clear()
@@ -594,6 +755,101 @@ class tndarray(HailType):
         return tndarray(self._element_type.subst(), self._ndim.subst())
 
 
+_npy_magic = b'\x93NUMPY'
+
+
+def _decode_npy(byte_reader):
+    """Decode an ndarray in the NumPy ``.npy`` format written by the native
+    encoder. The array is a read-only view of the encoded bytes."""
+    if byte_reader.read_bytes_view(len(_npy_magic)) != _npy_magic:
+        raise ValueError('ndarray encoding does not start with the .npy magic string')
+    major = byte_reader.read_byte()
+    byte_reader.read_byte()
+    if major == 1:
+        header_len, = struct.unpack('<H', byte_reader.read_bytes_view(2))
+    else:
+        header_len, = struct.unpack('<I', byte_reader.read_bytes_view(4))
+    header = ast.literal_eval(str(byte_reader.read_bytes_view(header_len), 'latin1'))
+    shape = header['shape']
+    data = byte_reader.read_array(np.dtype(header['descr']), int(np.prod(shape)))
+    return data.reshape(shape, order='F' if header['fortran_order'] else 'C')
+
+
+def _encode_npy(byte_writer, x):
+    """Encode `x` in the layout read by :func:`._decode_npy`, copying its
+    buffer once. Fortran-ordered arrays keep their order."""
+    fortran_order = x.ndim > 1 and x.flags.f_contiguous and not x.flags.c_contiguous
+    shape = ''.join(f'{n}, ' for n in x.shape)
+    header = f"{{'descr': '{x.dtype.str}', 'fortran_order': {fortran_order}, 'shape': ({shape})}}"
+    # the data starts at a multiple of 64 bytes, as in the native encoder
+    padding = 64 - (len(_npy_magic) + 4 + len(header)) % 64
+    byte_writer.write_bytes(_npy_magic)
+    byte_writer.write_bytes(b'\x01\x00')
+    byte_writer.write_bytes(struct.pack('<H', len(header) + padding))
+    byte_writer.write_bytes((header + ' ' * (padding - 1) + '\n').encode('latin1'))
+    data = x.T if fortran_order else np.ascontiguousarray(x)
+    byte_writer.write_bytes(memoryview(data.reshape(-1).view(np.uint8)))
+
+
+def _decode_elements(element_type, byte_reader):
+    length = byte_reader.read_int32()
+    missing = byte_reader.read_missing_bytes(length)
+    fmt = element_type._encoding_format
+    if fmt is not None and not any(missing):
+        return list(byte_reader.read_values(fmt, length))
+    return [None if is_missing(missing, i) else element_type._convert_from_encoding(byte_reader)
+            for i in range(length)]
+
+
+def _encode_elements(element_type, byte_writer, x):
+    fmt = element_type._encoding_format
+    if fmt is not None and isinstance(x, np.ndarray):
+        _encode_array(byte_writer, np.dtype('<' + fmt), x)
+        return
+    byte_writer.write_int32(len(x))
+    byte_writer.write_missing_bytes(x)
+    if fmt is not None:
+        present = [v for v in x if v is not None]
+        byte_writer.write_bytes(struct.pack(f'<{len(present)}{fmt}', *present))
+    else:
+        for v in x:
+            if v is not None:
+                element_type._convert_to_encoding(byte_writer, v)
+
+
+def _encode_array(byte_writer, dtype, x):
+    """Encode the one-dimensional NumPy array `x` as an array with no
+    missing elements, copying its buffer once."""
+    x = np.ascontiguousarray(x, dtype=dtype)
+    byte_writer.write_int32(len(x))
+    byte_writer.write_bytes(bytes((len(x) + 7) >> 3))
+    byte_writer.write_bytes(memoryview(x.view(np.uint8)))
+
+
+def _decode_calls(byte_reader):
+    # calls are packed int32s, decoded at once into a CallArray
+    length = byte_reader.read_int32()
+    missing_bytes = np.frombuffer(byte_reader.read_missing_bytes(length), dtype=np.uint8)
+    missing = np.unpackbits(missing_bytes.reshape(-1, 1), axis=1)[:, ::-1].ravel()[:length].astype(bool)
+    n_present = length - int(missing.sum())
+    present = np.frombuffer(byte_reader.read_bytes_view(4 * n_present), dtype='<i4')
+    if n_present == length:
+        packed = present.astype(np.int32)
+    else:
+        packed = np.zeros(length, dtype=np.int32)
+        packed[~missing] = present
+    return genetics.CallArray._from_packed(packed, missing)
+
+
+def _encode_calls(byte_writer, calls):
+    missing = calls.missing
+    byte_writer.write_int32(len(missing))
+    padded = np.zeros((len(missing) + 7) >> 3 << 3, dtype=bool)
+    padded[:len(missing)] = missing
+    byte_writer.write_bytes(np.packbits(padded.reshape(-1, 8)[:, ::-1], axis=1).tobytes())
+    byte_writer.write_bytes(calls.packed[~missing].astype('<i4').tobytes())
+
+
 class tarray(HailType):
     """Hail type for variable-length arrays of elements.
 
@@ -656,9 +912,29 @@ class tarray(HailType):
         return "Array[" + self.element_type._parsable_string() + "]"
 
     def _convert_from_json(self, x):
+        if self.element_type == tcall:
+            return genetics.CallArray._from_packed(
+                np.array([0 if c is None else genetics.call._parse(c) for c in x], dtype=np.int32),
+                np.array([c is None for c in x], dtype=bool))
         return [self.element_type._convert_from_json_na(elt) for elt in x]
 
+    def _can_convert_from_encoding(self):
+        return self.element_type._can_convert_from_encoding()
+
+    def _convert_from_encoding(self, byte_reader):
+        if self.element_type == tcall:
+            return _decode_calls(byte_reader)
+        return _decode_elements(self.element_type, byte_reader)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        if isinstance(x, genetics.CallArray):
+            _encode_calls(byte_writer, x)
+        else:
+            _encode_elements(self.element_type, byte_writer, x)
+
     def _convert_to_json(self, x):
+        if isinstance(x, np.ndarray):
+            x = x.tolist()
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
     def _propagate_jtypes(self, jtype):
@@ -738,6 +1014,15 @@ class tset(HailType):
     def _convert_from_json(self, x):
         return {self.element_type._convert_from_json_na(elt) for elt in x}
 
+    def _can_convert_from_encoding(self):
+        return self.element_type._can_convert_from_encoding()
+
+    def _convert_from_encoding(self, byte_reader):
+        return set(_decode_elements(self.element_type, byte_reader))
+
+    def _convert_to_encoding(self, byte_writer, x):
+        _encode_elements(self.element_type, byte_writer, list(x))
+
     def _convert_to_json(self, x):
         return [self.element_type._convert_to_json_na(elt) for elt in x]
 
@@ -839,9 +1124,32 @@ class tdict(HailType):
         return {self.key_type._convert_from_json_na(elt['key']): self.value_type._convert_from_json_na(elt['value']) for
                 elt in x}
 
+    def _can_convert_from_encoding(self):
+        return self.key_type._can_convert_from_encoding() and self.value_type._can_convert_from_encoding()
+
+    def _convert_from_encoding(self, byte_reader):
+        # encoded as an array of required struct{key, value}
+        length = byte_reader.read_int32()
+        d = {}
+        for _ in range(length):
+            missing = byte_reader.read_missing_bytes(2)
+            k = None if is_missing(missing, 0) else self.key_type._convert_from_encoding(byte_reader)
+            v = None if is_missing(missing, 1) else self.value_type._convert_from_encoding(byte_reader)
+            d[k] = v
+        return d
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int32(len(x))
+        for k, v in x.items():
+            byte_writer.write_missing_bytes([k, v])
+            if k is not None:
+                self.key_type._convert_to_encoding(byte_writer, k)
+            if v is not None:
+                self.value_type._convert_to_encoding(byte_writer, v)
+
     def _convert_to_json(self, x):
-        return [{'key': self.key_type._convert_to_json(k),
-                 'value':self.value_type._convert_to_json(v)} for k, v in x.items()]
+        return [{'key': self.key_type._convert_to_json_na(k),
+                 'value': self.value_type._convert_to_json_na(v)} for k, v in x.items()]
 
     def _propagate_jtypes(self, jtype):
         self._key_type._add_jtype(jtype.keyType())
@@ -879,6 +1187,7 @@ class tstruct(HailType, Mapping):
     def __init__(self, **field_types):
         self._field_types = field_types
         self._fields = tuple(field_types)
+        self._record = None
         super(tstruct, self).__init__()
 
     @property
@@ -954,9 +1263,30 @@ class tstruct(HailType, Mapping):
         return "Struct{{{}}}".format(
             ','.join('{}:{}'.format(escape_parsable(f), t._parsable_string()) for f, t in self.items()))
 
+    def _record_class(self):
+        """Class of the structs of this type decoded from the backend."""
+        if self._record is None:
+            from hail.utils.struct import _record_class
+            self._record = _record_class(self._fields)
+        return self._record
+
     def _convert_from_json(self, x):
-        from hail.utils import Struct
-        return Struct(**{f: t._convert_from_json_na(x.get(f)) for f, t in self.items()})
+        return self._record_class()(*[t._convert_from_json_na(x.get(f)) for f, t in self.items()])
+
+    def _can_convert_from_encoding(self):
+        return all(t._can_convert_from_encoding() for t in self.values())
+
+    def _convert_from_encoding(self, byte_reader):
+        missing = byte_reader.read_missing_bytes(len(self))
+        return self._record_class()(*[None if is_missing(missing, i) else t._convert_from_encoding(byte_reader)
+                                      for i, t in enumerate(self.values())])
+
+    def _convert_to_encoding(self, byte_writer, x):
+        values = [x[f] for f in self]
+        byte_writer.write_missing_bytes(values)
+        for t, v in zip(self.values(), values):
+            if v is not None:
+                t._convert_to_encoding(byte_writer, v)
 
     def _convert_to_json(self, x):
         return {f: t._convert_to_json_na(x[f]) for f, t in self.items()}
@@ -1197,6 +1527,20 @@ class ttuple(HailType):
     def _convert_from_json(self, x):
         return tuple(self.types[i]._convert_from_json_na(x[i]) for i in range(len(self.types)))
 
+    def _can_convert_from_encoding(self):
+        return all(t._can_convert_from_encoding() for t in self.types)
+
+    def _convert_from_encoding(self, byte_reader):
+        missing = byte_reader.read_missing_bytes(len(self.types))
+        return tuple(None if is_missing(missing, i) else t._convert_from_encoding(byte_reader)
+                     for i, t in enumerate(self.types))
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_missing_bytes(x)
+        for t, v in zip(self.types, x):
+            if v is not None:
+                t._convert_to_encoding(byte_writer, v)
+
     def _convert_to_json(self, x):
         return [self.types[i]._convert_to_json_na(x[i]) for i in range(len(self.types))]
 
@@ -1240,7 +1584,17 @@ class _tcall(HailType):
         return "Call"
 
     def _convert_from_json(self, x):
-        return hl.Call._from_java(hl.Call._call_jobject().parse(x))
+        return hl.Call._parse(x)
+
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        # the JVM representation of a call is its packed int32
+        return hl.Call._from_java(byte_reader.read_int32())
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_int32(x._call)
 
     def _convert_to_json(self, x):
         return str(x)
@@ -1313,6 +1667,19 @@ class tlocus(HailType):
     def _convert_from_json(self, x):
         return genetics.Locus(x['contig'], x['position'], reference_genome=self.reference_genome)
 
+    def _can_convert_from_encoding(self):
+        return True
+
+    def _convert_from_encoding(self, byte_reader):
+        # encoded as struct{contig: +str, position: +int32}
+        contig = byte_reader.read_bytes(byte_reader.read_int32()).decode('utf-8')
+        position = byte_reader.read_int32()
+        return genetics.Locus(contig, position, reference_genome=self.reference_genome)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        tstr._convert_to_encoding(byte_writer, x.contig)
+        byte_writer.write_int32(x.position)
+
     def _convert_to_json(self, x):
         return {'contig': x.contig, 'position': x.position}
 
@@ -1394,6 +1761,28 @@ class tinterval(HailType):
                         x['includeStart'],
                         x['includeEnd'])
 
+    def _can_convert_from_encoding(self):
+        return self.point_type._can_convert_from_encoding()
+
+    def _convert_from_encoding(self, byte_reader):
+        # encoded as struct{start, end, includesStart: +bool, includesEnd: +bool}
+        from hail.utils import Interval
+        missing = byte_reader.read_missing_bytes(2)
+        start = None if is_missing(missing, 0) else self.point_type._convert_from_encoding(byte_reader)
+        end = None if is_missing(missing, 1) else self.point_type._convert_from_encoding(byte_reader)
+        includes_start = byte_reader.read_bool()
+        includes_end = byte_reader.read_bool()
+        return Interval(start, end, includes_start, includes_end, point_type=self.point_type)
+
+    def _convert_to_encoding(self, byte_writer, x):
+        byte_writer.write_missing_bytes([x.start, x.end])
+        if x.start is not None:
+            self.point_type._convert_to_encoding(byte_writer, x.start)
+        if x.end is not None:
+            self.point_type._convert_to_encoding(byte_writer, x.end)
+        byte_writer.write_bool(x.includes_start)
+        byte_writer.write_bool(x.includes_end)
+
     def _convert_to_json(self, x):
         return {'start': self.point_type._convert_to_json_na(x.start),
                 'end': self.point_type._convert_to_json_na(x.end),
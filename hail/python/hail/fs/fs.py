@@ -36,6 +36,10 @@ class FS(abc.ABC):
     def ls(self, path: str) -> List[Dict]:
         pass
 
+    @abc.abstractmethod
+    def rmtree(self, path: str):
+        pass
+
     def copy_log(self, path: str) -> None:
         log = Env.hc()._log
         try:
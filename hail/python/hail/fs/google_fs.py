@@ -57,3 +57,6 @@ class GoogleCloudStorageFS(FS):
         files = self.client.ls(path, detail=True)
 
         return [self._process_obj(file) for file in files]
+
+    def rmtree(self, path: str):
+        self.client.rm(path, recursive=True)
@@ -39,6 +39,9 @@ class HadoopFS(FS):
         r = Env.jutils().ls(path, Env.hc()._jhc)
         return json.loads(r)
 
+    def rmtree(self, path: str):
+        Env.jutils().rmtree(path, Env.hc()._jhc)
+
 
 class HadoopReader(io.RawIOBase):
     def __init__(self, path, buffer_size):
@@ -1,10 +1,11 @@
-from .call import Call
+from .call import Call, CallArray
 from .reference_genome import ReferenceGenome
 from .pedigree import Pedigree, Trio
 from .locus import Locus
 
 __all__ = ['Locus',
            'Call',
+           'CallArray',
            'Pedigree',
            'Trio',
            'ReferenceGenome']
@@ -1,5 +1,81 @@
+import re
+from collections.abc import Sequence
+
+import numpy as np
+
 from hail.typecheck import *
-from hail.utils.java import *
+from hail.utils.java import FatalError
+
+
+def _pack(allele_repr, phased, ploidy):
+    if (allele_repr >> 29) != 0:
+        raise FatalError(f"invalid allele representation: {allele_repr}. Max value is 2^29 - 1")
+    return (allele_repr << 3) | (ploidy << 1) | int(phased)
+
+
+def _diploid_gt_index(j, k):
+    return k * (k + 1) // 2 + j
+
+
+def _allele_pair(allele_repr):
+    # inverse of _diploid_gt_index
+    k = int(((8 * allele_repr + 1) ** 0.5 - 1) / 2)
+    while k * (k + 1) // 2 > allele_repr:
+        k -= 1
+    while (k + 1) * (k + 2) // 2 <= allele_repr:
+        k += 1
+    return allele_repr - k * (k + 1) // 2, k
+
+
+def _alleles(c):
+    """Alleles of the packed call `c`, as a tuple."""
+    ploidy = (c >> 1) & 0x3
+    allele_repr = c >> 3
+    if ploidy == 0:
+        return ()
+    if ploidy == 1:
+        return allele_repr,
+    j, k = _allele_pair(allele_repr)
+    if c & 0x1:
+        return j, k - j
+    return j, k
+
+
+_call_regex = re.compile(r'(-?\d+)(?:([/|])(-?\d+))?|\|(-?\d+)|(\|?)-')
+
+
+def _parse(s):
+    """Packed representation of the call string `s`, as written by
+    :meth:`Call.__str__`."""
+    m = _call_regex.fullmatch(s)
+    if m is None:
+        raise FatalError(f"invalid call expression: '{s}'")
+    a0, sep, a1, haploid_phased, zeroploid_phased = m.groups()
+    if a0 is not None:
+        if a1 is None:
+            return _pack_alleles([int(a0)], False)
+        return _pack_alleles([int(a0), int(a1)], sep == '|')
+    if haploid_phased is not None:
+        return _pack_alleles([int(haploid_phased)], True)
+    return _pack_alleles([], zeroploid_phased == '|')
+
+
+def _pack_alleles(alleles, phased):
+    ploidy = len(alleles)
+    if ploidy > 2:
+        raise NotImplementedError("Calls with greater than 2 alleles are not supported.")
+    if any(a < 0 for a in alleles):
+        raise FatalError(f"allele indices must be >= 0. Found {list(alleles)}.")
+    if ploidy == 0:
+        return _pack(0, phased, 0)
+    if ploidy == 1:
+        return _pack(alleles[0], phased, 1)
+    j, k = alleles
+    if phased:
+        return _pack(_diploid_gt_index(j, j + k), True, 2)
+    if k < j:
+        j, k = k, j
+    return _pack(_diploid_gt_index(j, k), False, 2)
 
 
 class Call(object):
@@ -15,36 +91,36 @@ class Call(object):
         `alleles`.
     """
 
-    _cached_jobject = None
-
-    @staticmethod
-    def _call_jobject():
-        if not Call._cached_jobject:
-            Call._cached_jobject = scala_object(Env.hail().variant, 'Call')
-        return Call._cached_jobject
+    # the packed int32 representation used by the backend: the allele
+    # representation in the upper 29 bits, then 2 bits of ploidy and 1 bit
+    # for whether the call is phased
+    __slots__ = ['_call']
 
     @typecheck_method(alleles=sequenceof(int),
                       phased=bool)
     def __init__(self, alleles, phased=False):
-        if len(alleles) > 2:
-            raise NotImplementedError("Calls with greater than 2 alleles are not supported.")
-        self._phased = phased
-        self._alleles = alleles
-        self._ploidy = len(alleles)
-        self._call = scala_object(Env.hail().variant, 'CallN').apply(alleles, phased)
+        self._call = _pack_alleles(alleles, phased)
 
     @classmethod
     def _from_java(cls, jc):
         c = Call.__new__(cls)
         c._call = jc
-        c._alleles = None
-        c._phased = None
-        c._ploidy = None
-        super(Call, c).__init__()
         return c
 
+    @classmethod
+    def _parse(cls, s):
+        return cls._from_java(_parse(s))
+
     def __str__(self):
-        return Call._call_jobject().toString(self._call)
+        phased = self.phased
+        ploidy = self.ploidy
+        if ploidy == 0:
+            return '|-' if phased else '-'
+        if ploidy == 1:
+            a = self._call >> 3
+            return f'|{a}' if phased else str(a)
+        j, k = _alleles(self._call)
+        return f'{j}|{k}' if phased else f'{j}/{k}'
 
     def __repr__(self):
         return 'Call(alleles=%s, phased=%s)' % (self.alleles, self.phased)
@@ -56,6 +132,9 @@ class Call(object):
         # hash('Call') = 0x16f6c8bfbd18ab94
         return hash(self._call) ^ 0x16f6c8bfbd18ab94
 
+    def __reduce__(self):
+        return Call._from_java, (self._call,)
+
     def __getitem__(self, item):
         """Get the i*th* allele.
 
@@ -74,9 +153,7 @@ class Call(object):
         :obj:`list` of :obj:`int`
         """
 
-        if self._alleles is None:
-            self._alleles = jarray_to_list(Call._call_jobject().alleles(self._call))
-        return self._alleles
+        return list(_alleles(self._call))
 
     @property
     def ploidy(self):
@@ -87,9 +164,7 @@ class Call(object):
         :obj:`int`
         """
 
-        if not self._ploidy:
-            self._ploidy = Call._call_jobject().ploidy(self._call)
-        return self._ploidy
+        return (self._call >> 1) & 0x3
 
     @property
     def phased(self):
@@ -100,9 +175,7 @@ class Call(object):
         :obj:`bool`
         """
 
-        if not self._phased:
-            self._phased = Call._call_jobject().isPhased(self._call)
-        return self._phased
+        return (self._call & 0x1) == 1
 
     def is_haploid(self):
         """True if the ploidy == 1.
@@ -110,7 +183,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHaploid(self._call)
+        return self.ploidy == 1
 
     def is_diploid(self):
         """True if the ploidy == 2.
@@ -118,7 +191,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isDiploid(self._call)
+        return self.ploidy == 2
 
     def is_hom_ref(self):
         """True if the call has no alternate alleles.
@@ -126,7 +199,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHomRef(self._call)
+        return self.ploidy > 0 and (self._call >> 3) == 0
 
     def is_het(self):
         """True if the call contains two different alleles.
@@ -134,7 +207,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHet(self._call)
+        if self.ploidy != 2:
+            return False
+        j, k = _alleles(self._call)
+        return j != k
 
     def is_hom_var(self):
         """True if the call contains two identical alternate alleles.
@@ -142,7 +218,13 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHomVar(self._call)
+        ploidy = self.ploidy
+        if ploidy == 1:
+            return (self._call >> 3) > 0
+        if ploidy == 2:
+            j, k = _alleles(self._call)
+            return j == k and j > 0
+        return False
 
     def is_non_ref(self):
         """True if the call contains any non-reference alleles.
@@ -150,7 +232,7 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isNonRef(self._call)
+        return self.ploidy > 0 and (self._call >> 3) > 0
 
     def is_het_non_ref(self):
         """True if the call contains two different alternate alleles.
@@ -158,7 +240,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHetNonRef(self._call)
+        if self.ploidy != 2:
+            return False
+        j, k = _alleles(self._call)
+        return j > 0 and k > 0 and j != k
 
     def is_het_ref(self):
         """True if the call contains one reference and one alternate allele.
@@ -166,7 +251,10 @@ class Call(object):
         :rtype: bool
         """
 
-        return Call._call_jobject().isHetRef(self._call)
+        if self.ploidy != 2:
+            return False
+        j, k = _alleles(self._call)
+        return (j == 0) != (k == 0)
 
     def n_alt_alleles(self):
         """Returns the count of non-reference alleles.
@@ -174,7 +262,7 @@ class Call(object):
         :rtype: int
         """
 
-        return Call._call_jobject().nNonRefAlleles(self._call)
+        return sum(a != 0 for a in _alleles(self._call))
 
     @typecheck_method(n_alleles=int)
     def one_hot_alleles(self, n_alleles):
@@ -211,7 +299,11 @@ class Call(object):
         -------
         :obj:`list` of :obj:`int`
         """
-        return jiterable_to_list(Call._call_jobject().oneHotAlleles(self._call, n_alleles))
+        result = [0] * n_alleles
+        for a in _alleles(self._call):
+            if a < n_alleles:
+                result[a] += 1
+        return result
 
     def unphased_diploid_gt_index(self):
         """Return the genotype index for unphased, diploid calls.
@@ -224,4 +316,225 @@ class Call(object):
         if self.ploidy != 2 or self.phased:
             raise FatalError(
                 "'unphased_diploid_gt_index' is only valid for unphased, diploid calls. Found {}.".format(repr(self)))
-        return Call._call_jobject().unphasedDiploidGtIndex(self._call)
+        return self._call >> 3
+
+
+class CallArray(Sequence):
+    """An array of calls, stored as a NumPy array of their packed
+    representation.
+
+    Collecting an expression of type ``array<call>`` returns a
+    :class:`.CallArray`. It behaves like a :obj:`list` of :class:`.Call`, with
+    ``None`` for missing calls, and also provides the predicates of
+    :class:`.Call` computed for all calls at once.
+
+    Examples
+    --------
+
+    >>> calls = hl.CallArray([hl.Call([0, 0]), hl.Call([0, 1]), None, hl.Call([1, 1])])
+    >>> calls[1]
+    Call(alleles=[0, 1], phased=False)
+
+    >>> calls.n_alt_alleles().tolist()
+    [0, 1, None, 2]
+
+    Notes
+    -----
+    Vectorized methods return a :class:`numpy.ma.MaskedArray` in which missing
+    calls are masked.
+
+    Parameters
+    ----------
+    calls : :obj:`list` of :class:`.Call`
+        Calls, with ``None`` for missing calls.
+    """
+
+    __slots__ = ['_packed', '_missing']
+
+    @typecheck_method(calls=sequenceof(nullable(Call)))
+    def __init__(self, calls):
+        self._missing = np.array([c is None for c in calls], dtype=bool)
+        self._packed = np.array([0 if c is None else c._call for c in calls], dtype=np.int32)
+
+    @classmethod
+    def _from_packed(cls, packed, missing):
+        a = CallArray.__new__(cls)
+        a._packed = packed
+        a._missing = missing
+        return a
+
+    @property
+    def packed(self):
+        """The packed representation of the calls, as used by the backend.
+        Elements for missing calls are zero.
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of int32
+        """
+        return self._packed
+
+    @property
+    def missing(self):
+        """Whether each call is missing.
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of bool
+        """
+        return self._missing
+
+    def __len__(self):
+        return len(self._packed)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return CallArray._from_packed(self._packed[item], self._missing[item])
+        if self._missing[item]:
+            return None
+        return Call._from_java(int(self._packed[item]))
+
+    def __iter__(self):
+        for c, missing in zip(self._packed.tolist(), self._missing.tolist()):
+            yield None if missing else Call._from_java(c)
+
+    def __eq__(self, other):
+        if isinstance(other, CallArray):
+            return np.array_equal(self._missing, other._missing) and \
+                np.array_equal(self._packed[~self._missing], other._packed[~other._missing])
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'CallArray(%s)' % list(self)
+
+    def __str__(self):
+        return '[%s]' % ', '.join('NA' if c is None else str(c) for c in self)
+
+    def _masked(self, values):
+        return np.ma.MaskedArray(values, mask=self._missing.copy())
+
+    def _alleles(self):
+        """The first and second allele of each call, or -1 if the call has
+        fewer alleles."""
+        c = self._packed
+        ploidy = (c >> 1) & 0x3
+        allele_repr = c >> 3
+        # inverse of the diploid genotype index, exact for representations
+        # below 2^29
+        k = np.floor((np.sqrt(8 * allele_repr.astype(np.float64) + 1) - 1) / 2).astype(np.int32)
+        j = allele_repr - k * (k + 1) // 2
+        phased = (c & 0x1) == 1
+        first = np.where(ploidy == 0, -1, np.where(ploidy == 1, allele_repr, j))
+        second = np.where(ploidy == 2, np.where(phased, k - j, k), -1)
+        return first, second
+
+    @property
+    def ploidy(self):
+        """The number of alleles of each call.
+
+        Returns
+        -------
+        :class:`numpy.ma.MaskedArray` of int32
+        """
+        return self._masked((self._packed >> 1) & 0x3)
+
+    @property
+    def phased(self):
+        """Whether each call is phased.
+
+        Returns
+        -------
+        :class:`numpy.ma.MaskedArray` of bool
+        """
+        return self._masked((self._packed & 0x1) == 1)
+
+    def is_hom_ref(self):
+        """Whether each call has no alternate alleles.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of bool
+        """
+        return self._masked((((self._packed >> 1) & 0x3) > 0) & ((self._packed >> 3) == 0))
+
+    def is_het(self):
+        """Whether each call contains two different alleles.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of bool
+        """
+        first, second = self._alleles()
+        return self._masked((second >= 0) & (first != second))
+
+    def is_hom_var(self):
+        """Whether each call contains only identical alternate alleles.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of bool
+        """
+        first, second = self._alleles()
+        ploidy = (self._packed >> 1) & 0x3
+        return self._masked(((ploidy == 1) & (first > 0)) | ((ploidy == 2) & (first == second) & (first > 0)))
+
+    def is_non_ref(self):
+        """Whether each call contains any non-reference alleles.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of bool
+        """
+        return self._masked((((self._packed >> 1) & 0x3) > 0) & ((self._packed >> 3) > 0))
+
+    def is_het_non_ref(self):
+        """Whether each call contains two different alternate alleles.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of bool
+        """
+        first, second = self._alleles()
+        return self._masked((first > 0) & (second > 0) & (first != second))
+
+    def is_het_ref(self):
+        """Whether each call contains one reference and one alternate allele.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of bool
+        """
+        first, second = self._alleles()
+        return self._masked((second >= 0) & ((first == 0) != (second == 0)))
+
+    def n_alt_alleles(self):
+        """The count of non-reference alleles of each call.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of int32
+        """
+        first, second = self._alleles()
+        return self._masked((first > 0).astype(np.int32) + (second > 0).astype(np.int32))
+
+    @typecheck_method(n_alleles=int)
+    def one_hot_alleles(self, n_alleles):
+        """The one-hot encoded representation of the called alleles of each
+        call, as in :meth:`.Call.one_hot_alleles`, with one row per call.
+
+        Parameters
+        ----------
+        n_alleles : :obj:`int`
+            Number of total alleles, including the reference.
+
+        Returns
+        -------
+        :class:`numpy.ma.MaskedArray` of int32
+        """
+        result = np.zeros((len(self), n_alleles), dtype=np.int32)
+        rows = np.arange(len(self))
+        for alleles in self._alleles():
+            called = (alleles >= 0) & (alleles < n_alleles) & ~self._missing
+            np.add.at(result, (rows[called], alleles[called]), 1)
+        return np.ma.MaskedArray(result, mask=np.repeat(self._missing[:, np.newaxis], n_alleles, axis=1))
+
+    def unphased_diploid_gt_index(self):
+        """The genotype index of each call, which must be unphased and
+        diploid.
+
+        :rtype: :class:`numpy.ma.MaskedArray` of int32
+        """
+        present = self._packed[~self._missing]
+        if np.any((present & 0x7) != 4):
+            raise FatalError("'unphased_diploid_gt_index' is only valid for unphased, diploid calls.")
+        return self._masked(self._packed >> 3)
@@ -40,6 +40,16 @@ class Locus(object):
     def __hash__(self):
         return hash(self._contig) ^ hash(self._position) ^ hash(self._rg)
 
+    @classmethod
+    def _from_fields(cls, contig, position, reference_genome):
+        """Locus from a contig and position known to be valid, without
+        checking the arguments."""
+        locus = cls.__new__(cls)
+        locus._contig = contig
+        locus._position = position
+        locus._rg = reference_genome
+        return locus
+
     @classmethod
     @typecheck_method(string=str,
                       reference_genome=reference_genome_type)
@@ -87,3 +97,77 @@ class Locus(object):
         :return: :class:`.ReferenceGenome`
         """
         return self._rg
+
+    def global_position(self):
+        """Returns a zero-indexed absolute position along the reference genome.
+
+        The global position is computed as :py:attr:`~position` - 1 plus the sum
+        of the lengths of all the contigs that precede this locus's :py:attr:`~contig`
+        in the reference genome's ordering of contigs.
+
+        **Examples**
+
+        >>> hl.Locus('1', 10000).global_position()
+        9999
+
+        :rtype: int
+        """
+        return self._rg._contig_global_position(self._contig) + self._position - 1
+
+    def _in_par(self, contigs):
+        return self._contig in contigs and any(par.contains(self) for par in self._rg.par)
+
+    def in_x_nonpar(self):
+        """Returns ``True`` if the locus is in a non-pseudoautosomal
+        region of chromosome X.
+
+        :rtype: bool
+        """
+        return self._contig in self._rg.x_contigs and not self._in_par(self._rg.x_contigs)
+
+    def in_x_par(self):
+        """Returns ``True`` if the locus is in a pseudoautosomal region
+        of chromosome X.
+
+        :rtype: bool
+        """
+        return self._in_par(self._rg.x_contigs)
+
+    def in_y_nonpar(self):
+        """Returns ``True`` if the locus is in a non-pseudoautosomal
+        region of chromosome Y.
+
+        :rtype: bool
+        """
+        return self._contig in self._rg.y_contigs and not self._in_par(self._rg.y_contigs)
+
+    def in_y_par(self):
+        """Returns ``True`` if the locus is in a pseudoautosomal region
+        of chromosome Y.
+
+        :rtype: bool
+        """
+        return self._in_par(self._rg.y_contigs)
+
+    def in_autosome(self):
+        """Returns ``True`` if the locus is on an autosome.
+
+        :rtype: bool
+        """
+        rg = self._rg
+        return not (self._contig in rg.x_contigs or self._contig in rg.y_contigs or self._contig in rg.mt_contigs)
+
+    def in_autosome_or_par(self):
+        """Returns ``True`` if the locus is on an autosome or
+        a pseudoautosomal region of chromosome X or Y.
+
+        :rtype: bool
+        """
+        return self.in_autosome() or self.in_x_par() or self.in_y_par()
+
+    def in_mito(self):
+        """Returns ``True`` if the locus is on mitochondrial DNA.
+
+        :rtype: bool
+        """
+        return self._contig in self._rg.mt_contigs
@@ -1,9 +1,11 @@
+import bisect
+import itertools
 import json
 import re
 from hail.typecheck import *
 from hail.utils import wrap_to_list
 from hail.utils.java import jiterable_to_list, Env, joption
-from hail.typecheck import oneof, transformed
+from hail.typecheck import oneof, transformed, clear_caches
 import hail as hl
 
 rg_type = lazy()
@@ -110,8 +112,12 @@ class ReferenceGenome(object):
         self._par_tuple = par
         self._par = [hl.Interval(hl.Locus(c, s, self), hl.Locus(c, e, self)) for (c, s, e) in par]
         self._global_positions = None
+        self._contig_indices = None
+        self._contig_ends = None
 
         ReferenceGenome._references[name] = self
+        # parsed types may refer to a reference genome replaced by this one
+        clear_caches()
 
         if not _builtin:
             Env.backend().add_reference(self._config)
@@ -225,8 +231,7 @@ class ReferenceGenome(object):
         else:
             raise KeyError("Contig `{}' is not in reference genome.".format(contig))
 
-    @typecheck_method(contig=str)
-    def _contig_global_position(self, contig):
+    def _compute_global_positions(self):
         if self._global_positions is None:
             gp = {}
             lengths = self._lengths
@@ -235,8 +240,47 @@ class ReferenceGenome(object):
                 gp[c] = x
                 x += lengths[c]
             self._global_positions = gp
+            self._contig_indices = {c: i for i, c in enumerate(self.contigs)}
+            self._contig_ends = list(itertools.accumulate(lengths[c] for c in self.contigs))
+
+    @typecheck_method(contig=str)
+    def _contig_global_position(self, contig):
+        self._compute_global_positions()
         return self._global_positions[contig]
 
+    def _contig_index(self, contig):
+        """Index of `contig` in :meth:`contigs`, or ``None`` if it is not a
+        contig of the reference genome."""
+        self._compute_global_positions()
+        return self._contig_indices.get(contig)
+
+    @typecheck_method(global_pos=int)
+    def locus_from_global_position(self, global_pos):
+        """Locus at a global position, as computed by :meth:`.Locus.global_position`.
+
+        Examples
+        --------
+
+        >>> rg = hl.get_reference('GRCh37')
+        >>> rg.locus_from_global_position(249250621)
+        Locus(contig=2, position=1, reference_genome=GRCh37)
+
+        Parameters
+        ----------
+        global_pos : :obj:`int`
+            Zero-based position in the concatenation of the contigs.
+
+        Returns
+        -------
+        :class:`.Locus`
+        """
+        self._compute_global_positions()
+        i = bisect.bisect_right(self._contig_ends, global_pos)
+        if global_pos < 0 or i == len(self._contigs):
+            raise ValueError(f"global position {global_pos} is out of range for reference genome '{self.name}'")
+        contig = self._contigs[i]
+        return hl.Locus(contig, global_pos - self._global_positions[contig] + 1, self)
+
     @classmethod
     @typecheck_method(path=str)
     def read(cls, path):
@@ -10,6 +10,7 @@ class BaseIR(Renderable):
     def __init__(self, *children):
         super().__init__()
         self._type = None
+        self._hash = None
         self.children = children
 
     def __str__(self):
@@ -49,7 +50,30 @@ class BaseIR(Renderable):
         return
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.children == other.children and self._eq(other)
+        # compare pairs of nodes from an explicit stack, so that deep IRs do
+        # not exceed the recursion limit; differing hashes end the comparison
+        # early. Each pair is compared once, so that subtrees shared within
+        # a DAG are not walked once per path to them.
+        stack = [(self, other)]
+        visited = set()
+        while stack:
+            l, r = stack.pop()
+            if l is r:
+                continue
+            if not isinstance(l, BaseIR):
+                if l != r:
+                    return False
+                continue
+            if (id(l), id(r)) in visited:
+                continue
+            visited.add((id(l), id(r)))
+            if not (isinstance(r, l.__class__)
+                    and hash(l) == hash(r)
+                    and l._eq(r)
+                    and len(l.children) == len(r.children)):
+                return False
+            stack.extend(zip(l.children, r.children))
+        return True
 
     def __ne__(self, other):
         return not self == other
@@ -68,8 +92,35 @@ class BaseIR(Renderable):
         """
         return True
 
+    def _hash_key(self):
+        """Non-child-BaseIR attributes of the BaseIR that are combined with
+        the hashes of its children to form its structural hash.
+
+        Must agree with :meth:`_eq`: BaseIRs that compare equal must have
+        equal keys.
+
+        Returns
+        -------
+        hashable
+        """
+        return self.head_str()
+
     def __hash__(self):
-        return 31 + hash(str(self))
+        if self._hash is None:
+            # compute bottom-up without recursion; each node is hashed once
+            stack = [(self, False)]
+            while stack:
+                x, children_done = stack.pop()
+                if x._hash is not None:
+                    continue
+                if children_done:
+                    x._hash = hash((type(x), x._hash_key(), tuple(hash(c) for c in x.children)))
+                else:
+                    stack.append((x, True))
+                    for c in x.children:
+                        if isinstance(c, BaseIR) and c._hash is None:
+                            stack.append((c, False))
+        return self._hash
 
 
 class IR(BaseIR):
@@ -3,6 +3,7 @@ from hail.ir import hl
 from hail.expr.types import tarray
 from hail.ir import BlockMatrixIR, IR
 from hail.ir.blockmatrix_reader import BlockMatrixReader
+from hail.ir.reader_metadata import local_type
 from hail.ir import BlockMatrixIR, IR, tarray, Renderer
 from hail.typecheck import typecheck_method, sequenceof, sized_tupleof, oneof
 
@@ -24,7 +25,9 @@ class BlockMatrixRead(BlockMatrixIR):
         return self.reader == other.reader
 
     def _compute_type(self):
-        self._type = Env.backend().blockmatrix_type(self)
+        self._type = local_type(self.reader)
+        if self._type is None:
+            self._type = Env.backend().blockmatrix_type(self)
 
 
 class BlockMatrixMap(BlockMatrixIR):
@@ -242,6 +245,9 @@ class JavaBlockMatrix(BlockMatrixIR):
     def render_head(self, r):
         return f'(JavaBlockMatrix {r.add_jir(self.jir)}'
 
+    def _eq(self, other):
+        return self.jir == other.jir
+
     def _compute_type(self):
         self._type = tblockmatrix._from_java(self.jir.typ())
 
@@ -1,15 +1,29 @@
 import abc
 import json
 
+from . import reader_metadata
+from ..expr.blockmatrix_type import tblockmatrix
+from ..expr.types import tfloat64
 from ..typecheck import *
 from ..utils.misc import escape_str
 
 
+def _block_matrix_type(n_rows, n_cols, block_size):
+    from .blockmatrix_ir import _matrix_shape_to_tensor_shape
+    tensor_shape, is_row_vector = _matrix_shape_to_tensor_shape(n_rows, n_cols)
+    return tblockmatrix(tfloat64, tensor_shape, is_row_vector, block_size)
+
+
 class BlockMatrixReader(object):
     @abc.abstractmethod
     def render(self):
         pass
 
+    def _local_type(self):
+        """Type of the block matrix read, computed without the backend, or
+        ``None`` if only the backend can compute it."""
+        return None
+
     @abc.abstractmethod
     def __eq__(self, other):
         pass
@@ -25,6 +39,10 @@ class BlockMatrixNativeReader(BlockMatrixReader):
                   'path': self.path}
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        metadata = reader_metadata.blockmatrix_metadata(self.path)
+        return _block_matrix_type(metadata['nRows'], metadata['nCols'], metadata['blockSize'])
+
     def __eq__(self, other):
         return isinstance(other, BlockMatrixNativeReader) and \
                self.path == other.path
@@ -44,6 +62,13 @@ class BlockMatrixBinaryReader(BlockMatrixReader):
                   'blockSize': self.block_size}
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        n_rows, n_cols = self.shape
+        if n_rows * n_cols > 2 ** 31 - 1:
+            # let the backend report the error
+            return None
+        return _block_matrix_type(n_rows, n_cols, self.block_size)
+
     def __eq__(self, other):
         return isinstance(other, BlockMatrixBinaryReader) and \
                self.path == other.path and \
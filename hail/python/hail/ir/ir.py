@@ -1,7 +1,9 @@
+import base64
 import copy
 from collections import defaultdict
 
 import decorator
+import numpy as np
 
 import hail
 from hail.expr.types import *
@@ -10,6 +12,7 @@ from hail.typecheck import *
 from hail.utils.misc import escape_str, dump_json, parsable_strings, escape_id
 from .base_ir import *
 from .matrix_writer import MatrixWriter, MatrixNativeMultiWriter
+from .reader_metadata import invalidate_metadata
 from .renderer import Renderer, Renderable, RenderableStr, ParensRenderer
 from .table_writer import TableWriter
 
@@ -415,6 +418,10 @@ class MakeArray(IR):
     def _eq(self, other):
         return other._type == self._type
 
+    def _hash_key(self):
+        # the element type may be inferred after the node is hashed
+        return len(self.args)
+
     def _compute_type(self, env, agg_env):
         for a in self.args:
             a._compute_type(env, agg_env)
@@ -689,7 +696,7 @@ class ArraySort(IR):
     def bound_variables(self):
         return {self.l_name, self.r_name} | super().bound_variables
 
-    def __eq__(self, other):
+    def _eq(self, other):
         return other.l_name == self.l_name and other.r_name == self.r_name
 
     def _compute_type(self, env, agg_env):
@@ -1168,18 +1175,16 @@ class BaseApplyAggOp(IR):
         assert all(map(lambda c: len(c.aggregations) == 0, self.children))
         return [self]
 
-    def __eq__(self, other):
-        return isinstance(other, self.__class__) and \
-               other.agg_op == self.agg_op and \
-               other.constructor_args == self.constructor_args and \
-               other.init_op_args == self.init_op_args and \
-               other.seq_op_args == self.seq_op_args
+    def _eq(self, other):
+        return other.agg_op == self.agg_op and \
+               len(other.constructor_args) == len(self.constructor_args) and \
+               (other.init_op_args is None) == (self.init_op_args is None) and \
+               len(other.seq_op_args) == len(self.seq_op_args)
 
-    def __hash__(self):
-        return hash(tuple([self.agg_op,
-                           tuple(self.constructor_args),
-                           tuple(self.init_op_args) if self.init_op_args is not None else hash(None),
-                           tuple(self.seq_op_args)]))
+    def _hash_key(self):
+        return (self.agg_op,
+                len(self.constructor_args),
+                None if self.init_op_args is None else len(self.init_op_args))
 
     def _compute_type(self, env, agg_env):
         for a in self.constructor_args:
@@ -1243,12 +1248,11 @@ class MakeStruct(IR):
     def render_children(self, r):
         return [InsertFields.IFRenderField(escape_id(f), x) for f, x in self.fields]
 
-    def __eq__(self, other):
-        return isinstance(other, MakeStruct) \
-               and other.fields == self.fields
+    def _eq(self, other):
+        return [f for f, _ in other.fields] == [f for f, _ in self.fields]
 
-    def __hash__(self):
-        return hash(tuple(self.fields))
+    def _hash_key(self):
+        return tuple(f for f, _ in self.fields)
 
     def _compute_type(self, env, agg_env):
         for f, x in self.fields:
@@ -1339,12 +1343,14 @@ class InsertFields(IR):
             *(InsertFields.IFRenderField(escape_id(f), x) for f, x in self.fields)
         ]
 
-    def __eq__(self, other):
-        return isinstance(other, InsertFields) and \
-               other.old == self.old and \
-               other.fields == self.fields and \
+    def _eq(self, other):
+        return [f for f, _ in other.fields] == [f for f, _ in self.fields] and \
                other.field_order == self.field_order
 
+    def _hash_key(self):
+        return (tuple(f for f, _ in self.fields),
+                None if self.field_order is None else tuple(self.field_order))
+
     def _compute_type(self, env, agg_env):
         self.old._compute_type(env, agg_env)
         for f, x in self.fields:
@@ -1692,11 +1698,6 @@ class MatrixAggregate(IR):
     def copy(self, child, query):
         return MatrixAggregate(child, query)
 
-    def __eq__(self, other):
-        return isinstance(other, MatrixAggregate) and \
-               other.child == self.child and \
-               other.query == self.query
-
     def _compute_type(self, env, agg_env):
         self.query._compute_type(self.child.typ.global_env(), self.child.typ.entry_env())
         self._type = self.query.typ
@@ -1708,6 +1709,7 @@ class TableWrite(IR):
         super().__init__(child)
         self.child = child
         self.writer = writer
+        invalidate_metadata(writer.path)
 
     @typecheck_method(child=TableIR)
     def copy(self, child):
@@ -1729,6 +1731,7 @@ class MatrixWrite(IR):
         super().__init__(child)
         self.child = child
         self.matrix_writer = matrix_writer
+        invalidate_metadata(matrix_writer.path)
 
     @typecheck_method(child=MatrixIR)
     def copy(self, child):
@@ -1750,6 +1753,7 @@ class MatrixMultiWrite(IR):
     def __init__(self, children, writer):
         super().__init__(*children)
         self.writer = writer
+        invalidate_metadata(writer.prefix)
 
     def copy(self, *children):
         return MatrixMultiWrite(children, self.writer)
@@ -1772,6 +1776,7 @@ class BlockMatrixWrite(IR):
         super().__init__(child)
         self.child = child
         self.writer = writer
+        invalidate_metadata(writer.path)
 
     def copy(self, child):
         return BlockMatrixWrite(child, self.writer)
@@ -1793,6 +1798,7 @@ class BlockMatrixMultiWrite(IR):
         super().__init__(*block_matrices)
         self.block_matrices = block_matrices
         self.writer = writer
+        invalidate_metadata(writer.prefix)
 
     def copy(self, *block_matrices):
         return BlockMatrixWrite(block_matrices, self.writer)
@@ -1888,22 +1894,46 @@ class BlockMatrixToValueApply(IR):
 
 
 class Literal(IR):
+    # literals whose binary encoding is at least this many bytes are rendered
+    # as EncodedLiteral, which the JVM decodes without going through JSON
+    encoded_threshold = 1 << 16
+
     @typecheck_method(typ=hail_type,
                       value=anytype)
     def __init__(self, typ, value):
         super(Literal, self).__init__()
         self._typ: 'hail.HailType' = typ
         self.value = value
+        self._rendered_head = None
 
     def copy(self):
         return Literal(self._typ, self.value)
 
+    def render_head(self, r):
+        if self._rendered_head is None:
+            self._rendered_head = self._render_head()
+        return self._rendered_head
+
+    def _render_head(self):
+        if self._typ._can_convert_from_encoding():
+            encoding = self._typ._to_encoding(self.value)
+            if len(encoding) >= Literal.encoded_threshold:
+                return (f'(EncodedLiteral {self._typ._parsable_string()} unblockedUncompressed '
+                        f'"{base64.b64encode(encoding).decode("ascii")}"')
+        return f'(Literal {self.head_str()}'
+
     def head_str(self):
         return f'{self._typ._parsable_string()} {dump_json(self._typ._convert_to_json_na(self.value))}'
 
+    def _hash_key(self):
+        return self.render_head(None)
+
     def _eq(self, other):
-        return other._typ == self._typ and \
-               other.value == self.value
+        if other._typ != self._typ:
+            return False
+        if isinstance(self.value, np.ndarray) or isinstance(other.value, np.ndarray):
+            return np.array_equal(self.value, other.value)
+        return other.value == self.value
 
     def _compute_type(self, env, agg_env):
         self._type = self._typ
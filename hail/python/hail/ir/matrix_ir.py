@@ -1,5 +1,6 @@
 import hail as hl
 from hail.ir.base_ir import *
+from hail.ir.reader_metadata import local_type
 from hail.utils.misc import escape_str, parsable_strings, dump_json, escape_id
 
 
@@ -36,8 +37,13 @@ class MatrixRead(MatrixIR):
     def _eq(self, other):
         return self.reader == other.reader and self.drop_cols == other.drop_cols and self.drop_rows == other.drop_rows
 
+    def _hash_key(self):
+        return (self.drop_cols, self.drop_rows, self.reader.render(None))
+
     def _compute_type(self):
-        self._type = Env.backend().matrix_type(self)
+        self._type = local_type(self.reader)
+        if self._type is None:
+            self._type = Env.backend().matrix_type(self)
 
 
 class MatrixFilterRows(MatrixIR):
@@ -527,6 +533,9 @@ class JavaMatrix(MatrixIR):
     def render_head(self, r):
         return f'(JavaMatrix {r.add_jir(self._jir)}'
 
+    def _eq(self, other):
+        return self._jir == other._jir
+
     def _compute_type(self):
         self._type = hl.tmatrix._from_java(self._jir.typ())
 
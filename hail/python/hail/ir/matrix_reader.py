@@ -3,6 +3,7 @@ import json
 
 import hail as hl
 
+from . import reader_metadata
 from .utils import make_filter_and_replace
 from ..expr.types import tfloat32, tfloat64
 from ..genetics.reference_genome import reference_genome_type
@@ -16,6 +17,11 @@ class MatrixReader(object):
     def render(self, r):
         pass
 
+    def _local_type(self):
+        """Type of the matrix table read, computed without the backend, or
+        ``None`` if only the backend can compute it."""
+        return None
+
     @abc.abstractmethod
     def __eq__(self, other):
         pass
@@ -59,6 +65,9 @@ class MatrixNativeReader(MatrixReader):
             }
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        return reader_metadata.native_type(self.path)
+
     def __eq__(self, other):
         return isinstance(other, MatrixNativeReader) and \
                other.path == self.path and \
@@ -82,6 +91,12 @@ class MatrixRangeReader(MatrixReader):
                   'nPartitions': self.n_partitions}
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        return hl.tmatrix(hl.tstruct(),
+                          hl.tstruct(col_idx=hl.tint32), ['col_idx'],
+                          hl.tstruct(row_idx=hl.tint32), ['row_idx'],
+                          hl.tstruct())
+
     def __eq__(self, other):
         return isinstance(other, MatrixRangeReader) and \
                other.n_rows == self.n_rows and \
@@ -151,6 +166,17 @@ class MatrixVCFReader(MatrixReader):
                   'partitionsJSON': self._partitions_json}
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        if self.filter is not None or self.find_replace is not None \
+                or any(reader_metadata.is_glob(p) for p in self.path) \
+                or any(p.endswith('.gz') for p in self.path) and not (self.force_gz or self.force_bgz):
+            return None
+        header_file = self.header_file if self.header_file is not None else self.path[0]
+        return reader_metadata.vcf_type(header_file,
+                                        self.call_fields,
+                                        tfloat32 if self.entry_float_type == tfloat32._parsable_string() else tfloat64,
+                                        self.reference_genome)
+
     def __eq__(self, other):
         return isinstance(other, MatrixVCFReader) and \
                other.path == self.path and \
@@ -21,14 +21,19 @@ class MatrixNativeWriter(MatrixWriter):
                       stage_locally=bool,
                       codec_spec=nullable(str),
                       partitions=nullable(str),
-                      partitions_type=nullable(hail_type))
-    def __init__(self, path, overwrite, stage_locally, codec_spec, partitions, partitions_type):
+                      partitions_type=nullable(hail_type),
+                      field_groups=nullable(sequenceof(sequenceof(str))),
+                      partition_stats=nullable(sequenceof(sequenceof(str))))
+    def __init__(self, path, overwrite, stage_locally, codec_spec, partitions, partitions_type, field_groups=None,
+                 partition_stats=None):
         self.path = path
         self.overwrite = overwrite
         self.stage_locally = stage_locally
         self.codec_spec = codec_spec
         self.partitions = partitions
         self.partitions_type = partitions_type
+        self.field_groups = [list(g) for g in field_groups] if field_groups is not None else None
+        self.partition_stats = [list(f) for f in partition_stats] if partition_stats is not None else None
 
     def render(self):
         writer = {'name': 'MatrixNativeWriter',
@@ -38,6 +43,10 @@ class MatrixNativeWriter(MatrixWriter):
                   'codecSpecJSONStr': self.codec_spec,
                   'partitions': self.partitions,
                   'partitionsTypeStr': self.partitions_type._parsable_string() if self.partitions_type is not None else None}
+        if self.field_groups is not None:
+            writer['fieldGroups'] = self.field_groups
+        if self.partition_stats is not None:
+            writer['partitionStats'] = self.partition_stats
         return escape_str(json.dumps(writer))
 
     def __eq__(self, other):
@@ -47,7 +56,9 @@ class MatrixNativeWriter(MatrixWriter):
                other.stage_locally == self.stage_locally and \
                other.codec_spec == self.codec_spec and \
                other.partitions == self.partitions and \
-               other.partitions_type == self.partitions_type
+               other.partitions_type == self.partitions_type and \
+               other.field_groups == self.field_groups and \
+               other.partition_stats == self.partition_stats
                
 
 
@@ -0,0 +1,263 @@
+"""Metadata of the files read by relational IRs, used to compute the types of
+readers in Python without asking the backend.
+
+Metadata is cached along with the size and modification time of the file
+it is read from, so files rewritten outside of this session are read again.
+Writing to a path through Hail also invalidates the metadata cached for it.
+"""
+
+import gzip
+import io
+import json
+import re
+
+from hail.expr.matrix_type import tmatrix
+from hail.expr.types import tarray, tbool, tcall, tfloat64, tint32, tlocus, tset, tstr, tstruct
+from hail.expr.type_parsing import parse_relational_type
+from hail.utils.java import Env
+from hail.utils.lru_cache import LRUCache
+
+_metadata_cache = LRUCache(256)
+
+_glob_chars = re.compile(r'[*?\[\]{}]')
+
+
+def _cached(kind, path, fetch, stamp=None):
+    key = (kind, path, stamp)
+    value = _metadata_cache.get(key)
+    if value is None:
+        value = fetch()
+        _metadata_cache.put(key, value)
+    return value
+
+
+def _cached_by_stamp(kind, path, fetch, stamped_path):
+    """The value of `fetch`, cached along with the size and modification time
+    of `stamped_path`, or fetched every time if those are unknown."""
+    stat = Env.fs().stat(stamped_path)
+    if stat.get('modification_time') is None:
+        return fetch()
+    return _cached(kind, path, fetch, (stat['modification_time'], stat['size_bytes']))
+
+
+def invalidate_metadata(path):
+    """Drop the metadata cached for the paths that start with `path`.
+
+    Writers call this with their output path, or with their prefix when they
+    write several outputs.
+    """
+    for key in _metadata_cache:
+        _, p, _ = key
+        if p.startswith(path):
+            _metadata_cache.pop(key)
+
+
+def local_type(reader):
+    """Type computed by `reader` without the backend, or ``None`` if it
+    cannot be, for instance because the files are missing or malformed.
+    The backend then computes the type or reports the error."""
+    try:
+        return reader._local_type()
+    except Exception:
+        return None
+
+
+def is_glob(path):
+    return _glob_chars.search(path) is not None
+
+
+def _open_text(path):
+    """Open `path` as text, decompressing gzip and block gzip files if the
+    file system does not."""
+    f = Env.fs().open(path, 'rb')
+    if not isinstance(f, io.BufferedReader):
+        f = io.BufferedReader(f)
+    if f.peek(2)[:2] == b'\x1f\x8b':
+        f = gzip.GzipFile(fileobj=f)
+    return io.TextIOWrapper(f, encoding='utf-8')
+
+
+def native_metadata_path(path):
+    return path + '/metadata.json.gz'
+
+
+def native_type(path):
+    """Type of the native table or matrix table at `path`, or ``None`` if it
+    refers to a reference genome that has not been loaded."""
+    metadata_path = native_metadata_path(path)
+
+    def fetch():
+        with _open_text(metadata_path) as f:
+            spec = json.load(f)
+        type_str = spec['table_type'] if 'table_type' in spec else spec['matrix_type']
+        try:
+            return parse_relational_type(type_str)
+        except KeyError:
+            # the backend loads the references stored with the file
+            return False
+    return _cached_by_stamp('native', path, fetch, metadata_path) or None
+
+
+def blockmatrix_metadata_path(path):
+    return path + '/metadata.json'
+
+
+def blockmatrix_metadata(path):
+    metadata_path = blockmatrix_metadata_path(path)
+
+    def fetch():
+        with _open_text(metadata_path) as f:
+            return json.load(f)
+    return _cached_by_stamp('blockmatrix', path, fetch, metadata_path)
+
+
+def header_lines(path):
+    """The leading lines of `path` that start with ``#``."""
+    def fetch():
+        lines = []
+        with _open_text(path) as f:
+            for line in f:
+                if not line.startswith('#'):
+                    break
+                lines.append(line.rstrip('\r\n'))
+        return lines
+
+    return _cached_by_stamp('header', path, fetch, path)
+
+
+def first_line(path, is_skipped):
+    """The first line of `path` for which `is_skipped` is false."""
+    with _open_text(path) as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not is_skipped(line):
+                return line
+    return None
+
+
+_vcf_compound_header_line = re.compile(r'##(INFO|FORMAT)=<(.*)>')
+_vcf_header_attribute = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|[^,]*),?')
+
+_vcf_base_types = {'Integer': tint32, 'String': tstr, 'Character': tstr, 'Flag': tbool}
+
+
+def _vcf_signature(lines, call_fields, float_type):
+    """Struct of the INFO or FORMAT fields in `lines`, or ``None`` if a field
+    is one the backend rejects or types differently."""
+    fields = {}
+    for attrs in lines:
+        id = attrs['ID']
+        typ = attrs['Type']
+        number = attrs['Number']
+        if id in fields or (typ == 'Flag' and number != '0'):
+            return None
+        if id in call_fields:
+            if typ != 'String' or number != '1':
+                return None
+            t = tcall
+        elif typ == 'Float':
+            t = float_type
+        elif typ in _vcf_base_types:
+            t = _vcf_base_types[typ]
+        else:
+            return None
+        if not (number == '1' or typ == 'Flag'):
+            if number not in ('A', 'R', 'G', '.') and not number.isdigit():
+                return None
+            t = tarray(t)
+        fields[id] = t
+    return tstruct(**fields)
+
+
+def vcf_type(path, call_fields, entry_float_type, reference_genome):
+    """Type of a VCF with the header lines of `path`, or ``None`` if the
+    header cannot be parsed here."""
+    compound = {'INFO': [], 'FORMAT': []}
+    for line in header_lines(path):
+        m = _vcf_compound_header_line.fullmatch(line)
+        if m is None:
+            continue
+        attrs = {k: v for k, v in _vcf_header_attribute.findall(m.group(2))}
+        if not {'ID', 'Number', 'Type'}.issubset(attrs):
+            return None
+        compound[m.group(1)].append(attrs)
+
+    call_fields = {'GT', *call_fields}
+    info_type = _vcf_signature(compound['INFO'], call_fields, tfloat64)
+    entry_type = _vcf_signature(compound['FORMAT'], call_fields, entry_float_type)
+    if info_type is None or entry_type is None:
+        return None
+
+    if reference_genome is None:
+        locus_type = tstruct(contig=tstr, position=tint32)
+    else:
+        locus_type = tlocus(reference_genome)
+    row_type = tstruct(locus=locus_type,
+                       alleles=tarray(tstr),
+                       rsid=tstr,
+                       qual=tfloat64,
+                       filters=tset(tstr),
+                       info=info_type)
+    return tmatrix(tstruct(),
+                   tstruct(s=tstr), ['s'],
+                   row_type, ['locus', 'alleles'],
+                   entry_type)
+
+
+def split_line(s, separator, quote):
+    """Split a line of a text table as the backend does, or return ``None``
+    for malformed quoting."""
+    if len(separator) == 1:
+        def match_separator(i):
+            return 1 if s[i] == separator else -1
+    else:
+        pattern = re.compile(separator)
+
+        def match_separator(i):
+            m = pattern.match(s, i)
+            return m.end() - i if m else -1
+
+    fields = []
+    field = []
+    i = 0
+    while i < len(s):
+        c = s[i]
+        n = match_separator(i)
+        if n != -1:
+            i += n
+            fields.append(''.join(field))
+            field = []
+        elif quote is not None and c == quote:
+            if field:
+                return None
+            end = s.find(quote, i + 1)
+            if end == -1:
+                return None
+            field.append(s[i + 1:end])
+            i = end + 1
+            if i < len(s):
+                n = match_separator(i)
+                if n == -1:
+                    return None
+                i += n
+                fields.append(''.join(field))
+                field = []
+        else:
+            field.append(c)
+            i += 1
+    fields.append(''.join(field))
+    return fields
+
+
+def mangle(names):
+    result = []
+    seen = set()
+    for name in names:
+        mangled = name
+        i = 0
+        while mangled in seen:
+            i += 1
+            mangled = f'{name}_{i}'
+        seen.add(mangled)
+        result.append(mangled)
+    return result
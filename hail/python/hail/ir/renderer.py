@@ -1,4 +1,5 @@
 from hail import ir
+from hail.utils.java import Env
 import abc
 from typing import Sequence, List
 
@@ -88,11 +89,203 @@ class RQStack(object):
         return self._idx < 0
 
 
+class CSEBinding(Renderable):
+    def __init__(self, kind: str, name: str, value: 'Renderable', body: 'Renderable'):
+        self.kind = kind
+        self.name = name
+        self.value = value
+        self.body = body
+
+    def render_head(self, r: 'Renderer') -> str:
+        return f'({self.kind} {self.name}'
+
+    def render_tail(self, r: 'Renderer') -> str:
+        return ')'
+
+    def render_children(self, r: 'Renderer') -> Sequence['Renderable']:
+        return [self.value, self.body]
+
+
+class CSEDefinition(Renderable):
+    """Marks the single place a bound subexpression is rendered in full.
+
+    If `wrap` is true, the lets bound at the root of the subexpression's region
+    are rendered around it.
+    """
+
+    def __init__(self, x: 'Renderable', wrap: bool = True):
+        self.x = x
+        self.wrap = wrap
+
+
+class CSEAnalysis(object):
+    """Finds value IR subtrees reachable along more than one path and decides
+    where each can be bound so that it is rendered exactly once.
+
+    A shared subtree is bound with a ``Let`` at the root of the value IR region
+    (the maximal value IR tree below a relational node) that contains all of
+    its occurrences, provided none of its free references is rebound between
+    the region root and an occurrence, it does not occur in an aggregation
+    context, and hoisting it cannot cause a conditionally evaluated expression
+    to be evaluated unconditionally. Closed subtrees that do not satisfy these
+    conditions are instead bound with a relational let at the top of the IR.
+    """
+
+    def __init__(self, root: 'Renderable', stop_at_jir: bool):
+        self.root = root
+        self.stop_at_jir = stop_at_jir
+        self.nodes = {}
+        self.parents = {}
+        self.children = {}
+        self.post_order = []
+        self.refs = {}
+        self.open = {}
+        self.total = {}
+        self.new_region = set()
+
+        self.bindings = {}
+        self.region_lets = {}
+        self.relational_lets = []
+
+    def _is_leaf(self, x):
+        return self.stop_at_jir and hasattr(x, '_jir')
+
+    def _trivial(self, x):
+        # fields of references are as cheap to render and evaluate as the references
+        while isinstance(x, ir.GetField):
+            x = x.o
+        return self._is_leaf(x) or (len(x.children) == 0 and not isinstance(x, ir.Literal))
+
+    def _traverse(self):
+        stack = [(False, self.root, None)]
+        while stack:
+            exiting, x, parent = stack.pop()
+            if exiting:
+                self._exit(x)
+                continue
+            if isinstance(x, ir.BaseIR):
+                key = id(x)
+                parents = self.parents.setdefault(key, [])
+                if parent is not None:
+                    parents.append(parent)
+                    self.children[parent].append(key)
+                if key in self.nodes:
+                    continue
+                self.nodes[key] = x
+                self.children[key] = []
+                if self._is_leaf(x):
+                    self._exit(key)
+                    continue
+                stack.append((True, key, None))
+                parent = key
+            for child in reversed(x.render_children(self)):
+                stack.append((False, child, parent))
+
+    def _exit(self, key):
+        self.post_order.append(key)
+        x = self.nodes[key]
+        if not isinstance(x, ir.IR):
+            return
+        children = self.children[key]
+        refs = {x.name} if isinstance(x, ir.Ref) else set()
+        is_open = isinstance(x, (_classes('opaque'), _classes('aggregating')))
+        total = isinstance(x, _classes('total'))
+        if any(not isinstance(self.nodes[c], ir.IR) for c in children):
+            # value children of a node with relational children are evaluated in a fresh environment
+            self.new_region.add(key)
+            total = False
+        else:
+            for c in children:
+                refs |= self.refs[c]
+                is_open = is_open or self.open[c]
+                total = total and self.total[c]
+        self.refs[key] = frozenset(refs)
+        self.open[key] = is_open
+        self.total[key] = total
+
+    def _child_context(self, ctx, parent_key, child_key):
+        p = self.nodes[parent_key]
+        if not isinstance(p, ir.IR) or parent_key in self.new_region:
+            return (child_key, False, frozenset(), False)
+        region, in_agg, bound, guarded = ctx
+        own = _own_bindings(p)
+        return (region,
+                in_agg or isinstance(p, _classes('aggregating')),
+                bound | own if own else bound,
+                guarded or _is_guard(p))
+
+    def _definition_contexts(self, key):
+        kind, _, region = self.bindings[key]
+        if kind == 'Let':
+            return {(region, False, frozenset(), False)}
+        return {(key, False, frozenset(), False)}
+
+    def _decide(self, key, contexts):
+        # hoisting must not evaluate an expression that could fail where it was not evaluated before
+        if self.open[key] or not (self.total[key] or all(not guarded for _, _, _, guarded in contexts)):
+            return None
+        refs = self.refs[key]
+        regions = {ctx[0] for ctx in contexts}
+        if len(regions) == 1:
+            region = next(iter(regions))
+            if region != key and all(not in_agg and not (bound & refs) for _, in_agg, bound, _ in contexts):
+                return 'Let', region
+        if not refs:
+            return 'RelationalLet', None
+        return None
+
+    def __call__(self):
+        self._traverse()
+
+        root_key = id(self.root)
+        contexts = {}
+        mult = {}
+        for key in reversed(self.post_order):
+            if key == root_key:
+                contexts[key] = {(key, False, frozenset(), False)}
+                mult[key] = 1
+                continue
+            ctxs = set()
+            m = 0
+            for p in self.parents[key]:
+                if p in self.bindings:
+                    m += 1
+                    parent_contexts = self._definition_contexts(p)
+                else:
+                    m += mult[p]
+                    parent_contexts = contexts[p]
+                for ctx in parent_contexts:
+                    ctxs.add(self._child_context(ctx, p, key))
+            contexts[key] = ctxs
+            mult[key] = m
+
+            x = self.nodes[key]
+            if m > 1 and isinstance(x, ir.IR) and not self._trivial(x):
+                decision = self._decide(key, ctxs)
+                if decision is not None:
+                    kind, region = decision
+                    # unique across renders, since relational lets are
+                    # resolved by name across the IRs of a session
+                    self.bindings[key] = (kind, Env.get_uid(), region)
+
+        # a subtree must be bound outside of every subtree that contains it
+        for key in self.post_order:
+            if key in self.bindings:
+                kind, _, region = self.bindings[key]
+                if kind == 'Let':
+                    self.region_lets.setdefault(region, []).append(key)
+                else:
+                    self.relational_lets.append(key)
+        return self
+
+
 class Renderer(object):
-    def __init__(self, stop_at_jir=False):
+    def __init__(self, stop_at_jir=False, cse=True):
         self.stop_at_jir = stop_at_jir
+        self.cse = cse
         self.count = 0
         self.jirs = {}
+        self._cse = None
 
     def add_jir(self, jir):
         jir_id = f'm{self.count}'
@@ -100,12 +293,57 @@ class Renderer(object):
         self.jirs[jir_id] = jir
         return jir_id
 
+    def _wrap_region(self, x):
+        lets = self._cse.region_lets.get(id(x))
+        if not lets:
+            return x
+        body = CSEDefinition(x, wrap=False)
+        for key in reversed(lets):
+            _, name, _ = self._cse.bindings[key]
+            body = CSEBinding('Let', name, CSEDefinition(self._cse.nodes[key]), body)
+        return body
+
+    def _expand(self, x):
+        if isinstance(x, CSEDefinition):
+            return self._wrap_region(x.x) if x.wrap else x.x
+        binding = self._cse.bindings.get(id(x))
+        if binding is None:
+            return self._wrap_region(x)
+        kind, name, _ = binding
+        if kind == 'Let':
+            return RenderableStr(f'(Ref {name})')
+        return RenderableStr(f'(RelationalRef {name} {x.typ._parsable_string()})')
+
+    def _bind_relational_lets(self, x):
+        if isinstance(x, ir.MatrixIR):
+            kind = 'RelationalLetMatrixTable'
+        elif isinstance(x, ir.TableIR):
+            kind = 'RelationalLetTable'
+        elif isinstance(x, ir.BlockMatrixIR):
+            kind = 'RelationalLetBlockMatrix'
+        else:
+            kind = 'RelationalLet'
+        body = x
+        for key in reversed(self._cse.relational_lets):
+            _, name, _ = self._cse.bindings[key]
+            body = CSEBinding(kind, name, CSEDefinition(self._cse.nodes[key]), body)
+        return body
+
     def __call__(self, x: 'Renderable'):
         stack = RQStack()
         builder = []
 
+        if self.cse:
+            self._cse = CSEAnalysis(x, self.stop_at_jir)()
+            if self._cse.bindings:
+                x = self._bind_relational_lets(x)
+            else:
+                self._cse = None
+
         while x is not None or stack.non_empty():
             if x is not None:
+                if self._cse is not None and not isinstance(x, CSEBinding):
+                    x = self._expand(x)
                 # TODO: it would be nice to put the JavaIR logic in BaseIR somewhere but this isn't trivial
                 if self.stop_at_jir and hasattr(x, '_jir'):
                     jir_id = self.add_jir(x._jir)
@@ -134,3 +372,47 @@ class Renderer(object):
                     x = top.pop()
 
         return ''.join(builder)
+
+
+def _own_bindings(x):
+    if isinstance(x, (ir.Let, ir.ArrayMap, ir.ArrayFilter, ir.ArrayFlatMap, ir.AggExplode, ir.NDArrayMap)):
+        return frozenset([x.name])
+    if isinstance(x, (ir.ArraySort, ir.ArrayLeftJoinDistinct)):
+        return frozenset([x.l_name, x.r_name])
+    if isinstance(x, (ir.ArrayFold, ir.ArrayScan)):
+        return frozenset([x.accum_name, x.value_name])
+    if isinstance(x, ir.ArrayFor):
+        return frozenset([x.value_name])
+    if isinstance(x, ir.AggArrayPerElement):
+        return frozenset([x.element_name, x.index_name])
+    if isinstance(x, ir.Uniroot):
+        return frozenset([x.argname])
+    return None
+
+
+def _is_guard(x):
+    # children of these nodes are not necessarily evaluated, or are evaluated once per element
+    return (isinstance(x, (ir.If, ir.Coalesce, ir.ArrayMap, ir.ArrayFilter, ir.ArrayFlatMap, ir.ArrayFold,
+                           ir.ArrayScan, ir.ArrayFor, ir.ArrayLeftJoinDistinct, ir.ArraySort, ir.NDArrayMap,
+                           ir.Uniroot))
+            or (isinstance(x, ir.Apply) and x.function in ('||', '&&')))
+
+
+_node_classes = None
+
+
+def _classes(kind):
+    # resolved lazily: hail.ir is only partially initialized when this module is imported
+    global _node_classes
+    if _node_classes is None:
+        def lookup(*names):
+            return tuple(getattr(ir, name) for name in names)
+
+        _node_classes = {
+            'aggregating': lookup('BaseApplyAggOp', 'AggFilter', 'AggExplode', 'AggGroupBy', 'AggArrayPerElement'),
+            'opaque': lookup('ApplySeeded', 'In'),
+            'total': lookup('Ref', 'I32', 'I64', 'F32', 'F64', 'Str', 'TrueIR', 'FalseIR', 'NA', 'Literal', 'IsNA',
+                            'GetField', 'SelectFields', 'InsertFields', 'MakeStruct', 'MakeTuple',
+                            'GetTupleElement', 'MakeArray', 'ArrayLen', 'ApplyComparisonOp')
+        }
+    return _node_classes[kind]
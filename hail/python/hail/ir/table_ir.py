@@ -3,6 +3,7 @@ import json
 import hail as hl
 from hail.expr.types import dtype
 from hail.ir.base_ir import *
+from hail.ir.reader_metadata import local_type
 from hail.utils.java import Env
 from hail.utils.misc import escape_str, parsable_strings, dump_json, escape_id
 
@@ -198,7 +199,9 @@ class TableRead(TableIR):
         return self.reader == other.reader and self.drop_rows == other.drop_rows
 
     def _compute_type(self):
-        self._type = Env.backend().table_type(self)
+        self._type = local_type(self.reader)
+        if self._type is None:
+            self._type = Env.backend().table_type(self)
 
 
 class TableImport(TableIR):
@@ -600,5 +603,8 @@ class JavaTable(TableIR):
     def render_head(self, r):
         return f'(JavaTable {r.add_jir(self._jir)}'
 
+    def _eq(self, other):
+        return self._jir == other._jir
+
     def _compute_type(self):
         self._type = hl.ttable._from_java(self._jir.typ())
@@ -1,8 +1,10 @@
 import abc
 import json
+import re
 
 import hail as hl
 
+from hail.ir import reader_metadata
 from hail.ir.utils import make_filter_and_replace
 from hail.typecheck import *
 from hail.utils.misc import escape_str
@@ -13,6 +15,11 @@ class TableReader(object):
     def render(self):
         pass
 
+    def _local_type(self):
+        """Type of the table read, computed without the backend, or ``None``
+        if only the backend can compute it."""
+        return None
+
     @abc.abstractmethod
     def __eq__(self, other):
         pass
@@ -56,6 +63,9 @@ class TableNativeReader(TableReader):
             }
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        return reader_metadata.native_type(self.path)
+
     def __eq__(self, other):
         return isinstance(other, TableNativeReader) and \
                other.path == self.path and \
@@ -66,7 +76,8 @@ class TextTableReader(TableReader):
     def __init__(self, paths, min_partitions, types, comment,
                  delimiter, missing, no_header, impute, quote,
                  skip_blank_lines, force_bgz, filter, find_replace,
-                 force_gz):
+                 force_gz, impute_sample=None, impute_fallback='error', impute_cache=False):
+        self._types = types
         self.config = {
             'files': paths,
             'typeMapStr': {f: t._parsable_string() for f, t in types.items()},
@@ -80,7 +91,10 @@ class TextTableReader(TableReader):
             'skipBlankLines': skip_blank_lines,
             'forceBGZ': force_bgz,
             'filterAndReplace': make_filter_and_replace(filter, find_replace),
-            'forceGZ': force_gz
+            'forceGZ': force_gz,
+            'imputeSample': impute_sample,
+            'imputeFallback': impute_fallback,
+            'imputeCache': impute_cache
         }
 
     def render(self):
@@ -88,6 +102,42 @@ class TextTableReader(TableReader):
                   'options': self.config}
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        config = self.config
+        path = config['files'][0]
+        if config['impute'] \
+                or any(config['filterAndReplace'].values()) \
+                or any(reader_metadata.is_glob(p) for p in config['files']) \
+                or (path.endswith('.gz') and not (config['forceBGZ'] or config['forceGZ'])):
+            return None
+
+        separator = config['separator']
+        quote = config['quoteStr']
+        comment_starts = [c for c in config['comment'] if len(c) == 1]
+        try:
+            comment_regexes = [re.compile(c) for c in config['comment'] if len(c) > 1]
+            if len(separator) > 1:
+                re.compile(separator)
+        except re.error:
+            return None
+
+        def is_skipped(line):
+            return any(line.startswith(c) for c in comment_starts) \
+                or any(r.fullmatch(line) for r in comment_regexes) \
+                or (config['skipBlankLines'] and not line)
+
+        header = reader_metadata.first_line(path, is_skipped)
+        if header is None or '\\' in header:
+            return None
+        columns = reader_metadata.split_line(header, separator, quote)
+        if columns is None:
+            return None
+        if config['noHeader']:
+            columns = [f'f{i}' for i in range(len(columns))]
+        columns = reader_metadata.mangle(columns)
+        row_type = hl.tstruct(**{c: self._types.get(c, hl.tstr) for c in columns})
+        return hl.ttable(hl.tstruct(), row_type, [])
+
     def __eq__(self, other):
         return isinstance(other, TextTableReader) and \
                other.config == self.config
@@ -105,6 +155,11 @@ class TableFromBlockMatrixNativeReader(TableReader):
                   'nPartitions': self.n_partitions}
         return escape_str(json.dumps(reader))
 
+    def _local_type(self):
+        return hl.ttable(hl.tstruct(),
+                         hl.tstruct(row_idx=hl.tint64, entries=hl.tarray(hl.tfloat64)),
+                         ['row_idx'])
+
     def __eq__(self, other):
         return isinstance(other, TableFromBlockMatrixNativeReader) and \
                other.path == self.path and \
@@ -18,13 +18,17 @@ class TableNativeWriter(TableWriter):
     @typecheck_method(path=str,
                       overwrite=bool,
                       stage_locally=bool,
-                      codec_spec=nullable(str))
-    def __init__(self, path, overwrite, stage_locally, codec_spec):
+                      codec_spec=nullable(str),
+                      field_groups=nullable(sequenceof(sequenceof(str))),
+                      partition_stats=nullable(sequenceof(sequenceof(str))))
+    def __init__(self, path, overwrite, stage_locally, codec_spec, field_groups=None, partition_stats=None):
         super(TableNativeWriter, self).__init__()
         self.path = path
         self.overwrite = overwrite
         self.stage_locally = stage_locally
         self.codec_spec = codec_spec
+        self.field_groups = [list(g) for g in field_groups] if field_groups is not None else None
+        self.partition_stats = [list(f) for f in partition_stats] if partition_stats is not None else None
 
     def render(self):
         writer = {'name': 'TableNativeWriter',
@@ -32,6 +36,10 @@ class TableNativeWriter(TableWriter):
                   'overwrite': self.overwrite,
                   'stageLocally': self.stage_locally,
                   'codecSpecJSONStr': self.codec_spec}
+        if self.field_groups is not None:
+            writer['fieldGroups'] = self.field_groups
+        if self.partition_stats is not None:
+            writer['partitionStats'] = self.partition_stats
         return escape_str(json.dumps(writer))
 
     def __eq__(self, other):
@@ -39,7 +47,9 @@ class TableNativeWriter(TableWriter):
                other.path == self.path and \
                other.overwrite == self.overwrite and \
                other.stage_locally == self.stage_locally and \
-               other.codec_spec == self.codec_spec
+               other.codec_spec == self.codec_spec and \
+               other.field_groups == self.field_groups and \
+               other.partition_stats == self.partition_stats
 
 
 class TableTextWriter(TableWriter):
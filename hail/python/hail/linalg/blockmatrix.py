@@ -1,4 +1,7 @@
+import mmap
 import os
+import shutil
+import tempfile
 
 import itertools
 import numpy as np
@@ -325,6 +328,14 @@ class BlockMatrix(object):
 
         The number of entries must be less than :math:`2^{31}`.
 
+        The entries are read by the JVM from a local file, in shared memory
+        if there is room, written a chunk of rows at a time so that they are
+        converted to float64 without copying the whole ndarray in memory. A
+        :class:`numpy.memmap` of float64 values in row-major order that covers
+        a whole file, such as the result of :meth:`to_numpy`, is read from its
+        own file. The JVM reads the entries before returning, so later
+        changes to `ndarray` do not change the block matrix.
+
         Parameters
         ----------
         ndarray: :class:`numpy.ndarray`
@@ -343,13 +354,13 @@ class BlockMatrix(object):
             raise ValueError(f'from_numpy: ndarray dimensions must be non-zero, found shape {ndarray.shape}')
 
         nd = _ndarray_as_2d(ndarray)
-        nd = _ndarray_as_float64(nd)
         n_rows, n_cols = nd.shape
+        _check_entries_size(n_rows, n_cols)
 
-        path = new_local_temp_file()
-        uri = local_path_uri(path)
-        nd.tofile(path)
-        return cls.fromfile(uri, n_rows, n_cols, block_size)
+        with _TransferDir(8 * nd.size) as d:
+            path = _transfer_file(ndarray, d, nd)
+            return cls._from_java(Env.hail().linalg.BlockMatrix.readDoubles(
+                Env.hc()._jhc, local_path_uri(path), n_rows, n_cols, block_size))
 
     @classmethod
     @typecheck_method(entry_expr=expr_float64,
@@ -1127,6 +1138,10 @@ class BlockMatrix(object):
         -----
         The resulting ndarray will have the same shape as the block matrix.
 
+        The entries are received from the JVM in a local file, in shared
+        memory if there is room, which is mapped rather than read: the result
+        is a :class:`numpy.memmap` whose storage is freed with it.
+
         Returns
         -------
         :class:`numpy.ndarray`
@@ -1137,10 +1152,10 @@ class BlockMatrix(object):
             self.export_blocks(path, binary=True)
             return BlockMatrix.rectangles_to_numpy(path, binary=True)
 
-        path = new_local_temp_file()
-        uri = local_path_uri(path)
-        self.tofile(uri)
-        return np.fromfile(path).reshape((self.n_rows, self.n_cols))
+        with _TransferDir(8 * self.n_rows * self.n_cols) as d:
+            path = os.path.join(d, 'entries')
+            self.tofile(local_path_uri(path))
+            return _open_transfer_file(path, (self.n_rows, self.n_cols))
 
     @property
     def is_sparse(self):
@@ -2374,22 +2389,96 @@ def _ndarray_as_float64(nd):
     return nd
 
 
+# rows are converted to float64 this many bytes at a time when written for
+# the JVM
+_transfer_chunk_bytes = 64 << 20
+
+
+class _TransferDir(object):
+    """Local directory for a file of `n_bytes` exchanged with the JVM, removed
+    on exit. It is in shared memory if there is room, so that the file is
+    never written to disk."""
+
+    def __init__(self, n_bytes):
+        self.parent = _transfer_parent_dir(n_bytes)
+
+    def __enter__(self):
+        self.path = tempfile.mkdtemp(dir=self.parent)
+        return self.path
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def _transfer_parent_dir(n_bytes):
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK | os.X_OK):
+        stat = os.statvfs(shm)
+        # leave room for other users of shared memory
+        if stat.f_bavail * stat.f_frsize >= 2 * n_bytes:
+            return shm
+    return None
+
+
+def _is_whole_file_memmap(nd):
+    return (isinstance(nd, np.memmap)
+            and isinstance(nd.base, mmap.mmap)
+            and nd.offset == 0
+            and nd.dtype == np.dtype('<f8')
+            and nd.flags.c_contiguous
+            and os.path.isfile(nd.filename)
+            and os.path.getsize(nd.filename) == nd.nbytes)
+
+
+def _transfer_file(nd, d, nd_2d=None):
+    """Path of a file holding the entries of `nd` as float64 in row-major
+    order, for the JVM to read before the transfer directory `d` is removed:
+    the file of `nd` itself if it is a memmap covering one, and otherwise a
+    file written in `d`.
+
+    `nd_2d` is `nd` reshaped to two dimensions, if it is already."""
+    if _is_whole_file_memmap(nd):
+        nd.flush()
+        return nd.filename
+
+    path = os.path.join(d, 'entries')
+    nd = _ndarray_as_2d(nd) if nd_2d is None else nd_2d
+    if nd.dtype == np.float64 and nd.flags.c_contiguous:
+        nd.tofile(path)
+        return path
+
+    out = np.memmap(path, dtype=np.float64, mode='w+', shape=nd.shape)
+    chunk_rows = max(1, _transfer_chunk_bytes // (8 * nd.shape[1]))
+    try:
+        for i in range(0, nd.shape[0], chunk_rows):
+            out[i:i + chunk_rows] = nd[i:i + chunk_rows].astype(np.float64)
+    except (TypeError, ValueError) as e:
+        raise TypeError(f"ndarray elements of dtype {nd.dtype} cannot be converted to type 'float64'") from e
+    out.flush()
+    del out
+    return path
+
+
+def _open_transfer_file(path, shape):
+    """Map the float64 entries the JVM wrote to `path`. The mapping outlives
+    the file, whose storage is freed with the returned array."""
+    return np.memmap(path, dtype=np.float64, mode='r+', shape=shape)
+
+
 def _jarray_from_ndarray(nd):
     if nd.size >= (1 << 31):
         raise ValueError(f'size of ndarray must be less than 2^31, found {nd.size}')
 
-    nd = _ndarray_as_float64(nd)
-    path = new_local_temp_file()
-    uri = local_path_uri(path)
-    nd.tofile(path)
-    return Env.hail().utils.richUtils.RichArray.importFromDoubles(Env.hc()._jhc, uri, nd.size)
+    with _TransferDir(8 * nd.size) as d:
+        path = _transfer_file(nd, d, nd.reshape(1, -1))
+        return Env.hail().utils.richUtils.RichArray.importFromDoubles(Env.hc()._jhc, local_path_uri(path), nd.size)
 
 
 def _ndarray_from_jarray(ja):
-    path = new_local_temp_file()
-    uri = local_path_uri(path)
-    Env.hail().utils.richUtils.RichArray.exportToDoubles(Env.hc()._jhc, uri, ja)
-    return np.fromfile(path)
+    with _TransferDir(8 * len(ja)) as d:
+        path = os.path.join(d, 'entries')
+        Env.hail().utils.richUtils.RichArray.exportToDoubles(Env.hc()._jhc, local_path_uri(path), ja)
+        return _open_transfer_file(path, (len(ja),))
 
 
 def _breeze_fromfile(uri, n_rows, n_cols):
@@ -2408,14 +2497,12 @@ def _breeze_from_ndarray(nd):
     if any(i == 0 for i in nd.shape):
         raise ValueError(f'from_numpy: ndarray dimensions must be non-zero, found shape {nd.shape}')
 
-    nd = _ndarray_as_2d(nd)
-    nd = _ndarray_as_float64(nd)
-    n_rows, n_cols = nd.shape
+    nd_2d = _ndarray_as_2d(nd)
+    n_rows, n_cols = nd_2d.shape
 
-    path = new_local_temp_file()
-    uri = local_path_uri(path)
-    nd.tofile(path)
-    return _breeze_fromfile(uri, n_rows, n_cols)
+    with _TransferDir(8 * nd.size) as d:
+        path = _transfer_file(nd, d, nd_2d)
+        return _breeze_fromfile(local_path_uri(path), n_rows, n_cols)
 
 
 def _svd(a, full_matrices=True, compute_uv=True, overwrite_a=False, check_finite=True):
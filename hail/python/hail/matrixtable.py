@@ -9,7 +9,7 @@ from hail.expr.types import *
 from hail.expr.table_type import *
 from hail.expr.matrix_type import *
 from hail.ir import *
-from hail.table import Table, ExprContainer, TableIndexKeyError
+from hail.table import Table, ExprContainer, TableIndexKeyError, _partition_stats_paths, _read_partition_stats
 from hail.typecheck import *
 from hail.utils import storage_level, LinkedList
 from hail.utils.java import warn, jiterable_to_list, Env, scala_object, joption, jnone
@@ -2465,9 +2465,13 @@ class MatrixTable(ExprContainer):
                       overwrite=bool,
                       stage_locally=bool,
                       _codec_spec=nullable(str),
-                      _partitions=nullable(expr_any))
+                      _partitions=nullable(expr_any),
+                      _field_groups=nullable(sequenceof(sequenceof(str))),
+                      _partition_stats=nullable(sequenceof(expr_any)))
     def write(self, output: str, overwrite: bool = False, stage_locally: bool = False,
-              _codec_spec: Optional[str] = None, _partitions = None):
+              _codec_spec: Optional[str] = None, _partitions = None,
+              _field_groups: Optional[Sequence[Sequence[str]]] = None,
+              _partition_stats: Optional[Sequence[Expression]] = None):
         """Write to disk.
 
         Examples
@@ -2488,6 +2492,16 @@ class MatrixTable(ExprContainer):
             before being copied to ``output``
         overwrite : bool
             If ``True``, overwrite an existing file at the destination.
+        _field_groups : :obj:`list` of :obj:`list` of :obj:`str`, optional
+            Groups of non-key row fields, each written to its own files next
+            to the files of the other row fields, as the entries are. Reads of
+            the matrix table only read the groups with fields in use.
+        _partition_stats : :obj:`list` of :class:`.Expression`, optional
+            Numeric or string row fields, possibly nested in structs, whose
+            minimum, maximum and number of missing values are recorded for each
+            partition. Reads of the matrix table skip the partitions for which
+            a row filter on these fields is false for every row. See
+            :meth:`._partition_stats`.
         """
 
         if _partitions is not None:
@@ -2495,7 +2509,11 @@ class MatrixTable(ExprContainer):
         else:
             _partitions_type = None
 
-        writer = MatrixNativeWriter(output, overwrite, stage_locally, _codec_spec, _partitions, _partitions_type)
+        if _partition_stats is not None:
+            _partition_stats = _partition_stats_paths('MatrixTable.write', _partition_stats, self._row_indices, 'va')
+
+        writer = MatrixNativeWriter(output, overwrite, stage_locally, _codec_spec, _partitions, _partitions_type,
+                                    _field_groups, _partition_stats)
         Env.backend().execute(MatrixWrite(self._mir, writer))
 
     class _Show:
@@ -3671,6 +3689,22 @@ class MatrixTable(ExprContainer):
     def _filter_partitions(self, parts, keep=True) -> 'MatrixTable':
         return MatrixTable(MatrixToMatrixApply(self._mir, {'name': 'MatrixFilterPartitions', 'parts': parts, 'keep': keep}))
 
+    def _partition_stats(self):
+        """The row field statistics recorded for each partition by ``write``
+        with ``_partition_stats``, for a matrix table read by
+        :func:`.read_matrix_table`.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Struct` or :obj:`None`
+            One struct per partition, with a field ``min``, ``max`` and
+            ``n_missing`` for each recorded row field, or ``None`` if no
+            statistics were recorded.
+        """
+        if not (isinstance(self._mir, MatrixRead) and isinstance(self._mir.reader, MatrixNativeReader)):
+            raise ValueError("'MatrixTable._partition_stats': matrix table must be read with 'read_matrix_table'")
+        return _read_partition_stats(self._mir.reader.path)
+
     @classmethod
     @typecheck_method(table=Table)
     def from_rows_table(cls, table: Table) -> 'MatrixTable':
@@ -1063,8 +1063,7 @@ def import_bgen(path,
     row_set = set(_row_fields)
 
     if variants is not None:
-        mt_type = Env.backend().matrix_type(
-            MatrixRead(MatrixBGENReader(path, sample_file, index_file_map, n_partitions, block_size, None)))
+        mt_type = MatrixRead(MatrixBGENReader(path, sample_file, index_file_map, n_partitions, block_size, None)).typ
         lt = mt_type.row_type['locus']
 
         expected_vtype = tstruct(locus=lt, alleles=tarray(tstr))
@@ -1245,7 +1244,10 @@ def import_gen(path,
            force_bgz=bool,
            filter=nullable(str),
            find_replace=nullable(sized_tupleof(str, str)),
-           force=bool)
+           force=bool,
+           impute_sample=nullable(int),
+           impute_fallback=enumeration('error', 'missing'),
+           impute_cache=bool)
 def import_table(paths,
                  key=None,
                  min_partitions=None,
@@ -1260,7 +1262,10 @@ def import_table(paths,
                  force_bgz=False,
                  filter=None,
                  find_replace=None,
-                 force=False) -> Table:
+                 force=False,
+                 impute_sample=None,
+                 impute_fallback='error',
+                 impute_cache=False) -> Table:
     """Import delimited text file (text table) as :class:`.Table`.
 
     The resulting :class:`.Table` will have no key fields. Use
@@ -1348,6 +1353,16 @@ def import_table(paths,
     files because the file is parsed twice, the convenience is often worth this
     cost.
 
+    For very large inputs, `impute_sample` limits imputation to a sample of
+    that many lines, read from several places in each uncompressed file and from
+    the start of each compressed file. A value later in the file may then not
+    parse as the imputed type of its field. By default, this is an error; with
+    ``impute_fallback='missing'``, such values are imported as missing instead.
+    With ``impute_cache=True``, the imputed types are saved to a file next to
+    the first input file, named after it with the suffix ``.hail_types.json``.
+    Later imports of the same files, with the same sizes and modification times
+    and the same options, use the saved types and skip imputation.
+
     The `delimiter` parameter is either a delimiter character (if a single
     character) or a field separator regex (2 or more characters). This regex
     follows the `Java regex standard
@@ -1432,11 +1447,23 @@ def import_table(paths,
         If ``True``, load gzipped files serially on one core. This should
         be used only when absolutely necessary, as processing time will be
         increased due to lack of parallelism.
+    impute_sample : :obj:`int`, optional
+        If set with `impute`, impute field types from at most this many lines
+        spread across the files, rather than from every line.
+    impute_fallback : :obj:`str`
+        What to do with a value that does not parse as the type imputed from a
+        sample of lines: ``'error'`` or ``'missing'``.
+    impute_cache : :obj:`bool`
+        If ``True`` with `impute`, save imputed types next to the input, and
+        reuse types saved for the same input and options.
 
     Returns
     -------
     :class:`.Table`
     """
+    if impute_sample is not None and impute_sample <= 0:
+        raise ValueError(f"'import_table': 'impute_sample' must be positive, found {impute_sample}")
+
     paths = wrap_to_list(paths)
     comment = wrap_to_list(comment)
     missing = wrap_to_list(missing)
@@ -1444,7 +1471,7 @@ def import_table(paths,
     tr = TextTableReader(paths, min_partitions, types, comment,
                          delimiter, missing, no_header, impute, quote,
                          skip_blank_lines, force_bgz, filter, find_replace,
-                         force)
+                         force, impute_sample, impute_fallback, impute_cache)
     t = Table(TableRead(tr))
     if key:
         key = wrap_to_list(key)
@@ -9,10 +9,8 @@ from hail.expr.expressions import *
 from hail.expr.types import *
 from hail.ir import *
 from hail.genetics.reference_genome import reference_genome_type
-from hail.linalg import BlockMatrix
 from hail.matrixtable import MatrixTable
 from hail.methods.misc import require_biallelic, require_row_key_variant, require_col_key_str
-from hail.stats import LinearMixedModel
 from hail.table import Table
 from hail.typecheck import *
 from hail.utils import wrap_to_list, new_temp_file
@@ -947,28 +945,28 @@ def linear_mixed_model(y,
         raise ValueError("linear_mixed_model: 'x' has missing, nan, or infinite values")
 
     if z_t is None:
-        model, p = LinearMixedModel.from_kinship(y_nd, x_nd, k, p_path, overwrite)
+        model, p = hl.stats.LinearMixedModel.from_kinship(y_nd, x_nd, k, p_path, overwrite)
     else:
         check_entry_indexed('from_matrix_table: z_t', z_t)
         if matrix_table_source('linear_mixed_model/z_t', z_t) != source:
             raise ValueError("linear_mixed_model: 'y' and 'z_t' must "
                              "have the same source")
-        z_bm = BlockMatrix.from_entry_expr(z_t,
-                                           mean_impute=mean_impute,
-                                           center=standardize,
-                                           normalize=standardize).T  # variance is 1 / n
+        z_bm = hl.linalg.BlockMatrix.from_entry_expr(z_t,
+                                                     mean_impute=mean_impute,
+                                                     center=standardize,
+                                                     normalize=standardize).T  # variance is 1 / n
         m = z_bm.shape[1]
-        model, p = LinearMixedModel.from_random_effects(y_nd, x_nd, z_bm, p_path, overwrite)
+        model, p = hl.stats.LinearMixedModel.from_random_effects(y_nd, x_nd, z_bm, p_path, overwrite)
         if standardize:
             model.s = model.s * (n / m)  # now variance is 1 / m
         if model.low_rank and isinstance(p, np.ndarray):
             assert n > m
-            p = BlockMatrix.read(p_path)
+            p = hl.linalg.BlockMatrix.read(p_path)
     return model, p
 
 
 @typecheck(entry_expr=expr_float64,
-           model=LinearMixedModel,
+           model=lazy(lambda: hl.stats.LinearMixedModel),
            pa_t_path=nullable(str),
            a_t_path=nullable(str),
            mean_impute=bool,
@@ -1112,13 +1110,13 @@ def linear_mixed_regression_rows(entry_expr,
 
     pa_t_path = new_temp_file() if pa_t_path is None else pa_t_path
     a_t_path = new_temp_file() if a_t_path is None else a_t_path
-    p = BlockMatrix.read(model.p_path)
+    p = hl.linalg.BlockMatrix.read(model.p_path)
 
-    BlockMatrix.write_from_entry_expr(entry_expr,
-                                      a_t_path,
-                                      mean_impute=mean_impute,
-                                      block_size=p.block_size)
-    a_t = BlockMatrix.read(a_t_path)
+    hl.linalg.BlockMatrix.write_from_entry_expr(entry_expr,
+                                                a_t_path,
+                                                mean_impute=mean_impute,
+                                                block_size=p.block_size)
+    a_t = hl.linalg.BlockMatrix.read(a_t_path)
     (a_t @ p.T).write(pa_t_path, force_row_major=True)
 
     ht = model.fit_alternatives(pa_t_path,
@@ -1850,10 +1848,10 @@ def pc_relate(call_expr, min_individual_maf, *, k=None, scores_expr=None,
     mean_imputed_gt = hl.or_else(hl.float64(mt.__gt), mt.__mean_gt)
 
     if not block_size:
-        block_size = BlockMatrix.default_block_size()
+        block_size = hl.linalg.BlockMatrix.default_block_size()
 
-    g = BlockMatrix.from_entry_expr(mean_imputed_gt,
-                                    block_size=block_size)
+    g = hl.linalg.BlockMatrix.from_entry_expr(mean_imputed_gt,
+                                              block_size=block_size)
 
     int_statistics = {'kin': 0, 'kin2': 1, 'kin20': 2, 'all': 3}[statistics]
 
@@ -2252,7 +2250,7 @@ def split_multi_hts(ds, keep_star=False, left_aligned=False, vep_root='vep'):
 
 
 @typecheck(call_expr=expr_call)
-def genetic_relatedness_matrix(call_expr) -> BlockMatrix:
+def genetic_relatedness_matrix(call_expr) -> 'BlockMatrix':
     r"""Compute the genetic relatedness matrix (GRM).
 
     Examples
@@ -2321,13 +2319,13 @@ def genetic_relatedness_matrix(call_expr) -> BlockMatrix:
     mt = mt.annotate_rows(__hwe_scaled_std_dev=hl.sqrt(mt.__mean_gt * (2 - mt.__mean_gt)))
 
     normalized_gt = hl.or_else((mt.__gt - mt.__mean_gt) / mt.__hwe_scaled_std_dev, 0.0)
-    bm = BlockMatrix.from_entry_expr(normalized_gt)
+    bm = hl.linalg.BlockMatrix.from_entry_expr(normalized_gt)
 
     return (bm.T @ bm) / (bm.n_rows / 2.0)
 
 
 @typecheck(call_expr=expr_call)
-def realized_relationship_matrix(call_expr) -> BlockMatrix:
+def realized_relationship_matrix(call_expr) -> 'BlockMatrix':
     r"""Computes the realized relationship matrix (RRM).
 
     Examples
@@ -2394,13 +2392,13 @@ def realized_relationship_matrix(call_expr) -> BlockMatrix:
     mt = mt.filter_rows(mt.__centered_length > 0.1)  # truly non-zero values are at least sqrt(0.5)
 
     normalized_gt = hl.or_else((mt.__gt - mt.__mean_gt) / mt.__centered_length, 0.0)
-    bm = BlockMatrix.from_entry_expr(normalized_gt)
+    bm = hl.linalg.BlockMatrix.from_entry_expr(normalized_gt)
 
     return (bm.T @ bm) / (bm.n_rows / bm.n_cols)
 
 
 @typecheck(entry_expr=expr_float64, block_size=nullable(int))
-def row_correlation(entry_expr, block_size=None) -> BlockMatrix:
+def row_correlation(entry_expr, block_size=None) -> 'BlockMatrix':
     """Computes the correlation matrix between row vectors.
 
     Examples
@@ -2495,7 +2493,7 @@ def row_correlation(entry_expr, block_size=None) -> BlockMatrix:
         Correlation matrix between row vectors. Row and column indices
         correspond to matrix table row index.
     """
-    bm = BlockMatrix.from_entry_expr(entry_expr, mean_impute=True, center=True, normalize=True, block_size=block_size)
+    bm = hl.linalg.BlockMatrix.from_entry_expr(entry_expr, mean_impute=True, center=True, normalize=True, block_size=block_size)
     return bm @ bm.T
 
 
@@ -2504,7 +2502,7 @@ def row_correlation(entry_expr, block_size=None) -> BlockMatrix:
            radius=oneof(int, float),
            coord_expr=nullable(expr_float64),
            block_size=nullable(int))
-def ld_matrix(entry_expr, locus_expr, radius, coord_expr=None, block_size=None) -> BlockMatrix:
+def ld_matrix(entry_expr, locus_expr, radius, coord_expr=None, block_size=None) -> 'BlockMatrix':
     """Computes the windowed correlation (linkage disequilibrium) matrix between
     variants.
 
@@ -2633,7 +2631,7 @@ def ld_matrix(entry_expr, locus_expr, radius, coord_expr=None, block_size=None)
     """
     starts_and_stops = hl.linalg.utils.locus_windows(locus_expr, radius, coord_expr, _localize=False)
     ld = hl.row_correlation(entry_expr, block_size)
-    return BlockMatrix._from_java(ld._jbm.filterRowIntervalsIR(
+    return hl.linalg.BlockMatrix._from_java(ld._jbm.filterRowIntervalsIR(
         Env.backend()._to_java_ir(starts_and_stops._ir),
         False))
 
@@ -3345,7 +3343,7 @@ def ld_prune(call_expr, r2=0.2, bp_window_size=1000000, memory_per_core=256, kee
         Table of a maximal independent set of variants.
     """
     if block_size is None:
-        block_size = BlockMatrix.default_block_size()
+        block_size = hl.linalg.BlockMatrix.default_block_size()
 
     if not 0.0 <= r2 <= 1:
       raise ValueError(f'r2 must be in the range [0.0, 1.0], found {r2}')
@@ -3374,7 +3372,7 @@ def ld_prune(call_expr, r2=0.2, bp_window_size=1000000, memory_per_core=256, kee
     mt = mt.annotate_rows(info=locally_pruned_table[mt.row_key])
     mt = mt.filter_rows(hl.is_defined(mt.info))
 
-    std_gt_bm = BlockMatrix.from_entry_expr(
+    std_gt_bm = hl.linalg.BlockMatrix.from_entry_expr(
         hl.or_else(
             (mt[field].n_alt_alleles() - mt.info.mean) * mt.info.centered_length_rec,
             0.0),
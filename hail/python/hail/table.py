@@ -1,8 +1,7 @@
 from collections import Counter
 
 import itertools
-import pandas
-import pyspark
+import json
 from typing import *
 
 from hail.expr.expressions import *
@@ -15,6 +14,40 @@ from hail.utils.misc import *
 table_type = lazy()
 
 
+# pandas and pyspark are slow to import, and only needed by the conversions
+def _pandas_dataframe():
+    import pandas
+    return pandas.DataFrame
+
+
+def _pyspark_dataframe():
+    import pyspark.sql
+    return pyspark.sql.DataFrame
+
+
+def _partition_stats_paths(caller, fields, indices, row):
+    paths = []
+    for field in fields:
+        analyze(caller, field, indices)
+        path = []
+        x = field._ir
+        while isinstance(x, GetField):
+            path.append(x.name)
+            x = x.o
+        if not (isinstance(x, TopLevelReference) and x.name == row and path):
+            raise ValueError(f"'{caller}': '_partition_stats' expects row fields, found {field}")
+        paths.append(path[::-1])
+    return paths
+
+
+def _read_partition_stats(path):
+    s = Env.hail().expr.ir.PartitionStats.pyPartitionStatsJSON(path)
+    if s is None:
+        return None
+    stats = json.loads(s)
+    return hl.dtype(stats['type'])._convert_from_json_na(stats['value'])
+
+
 class TableIndexKeyError(Exception):
     def __init__(self, key_type, index_expressions):
         self.key_type = key_type
@@ -1148,6 +1181,33 @@ class Table(ExprContainer):
         else:
             return construct_expr(agg_ir, expr.dtype)
 
+    @typecheck_method(exprs=expr_any)
+    def aggregate_many(self, *exprs):
+        """Aggregate over rows into several local values in one pass.
+
+        Examples
+        --------
+
+        >>> table1.aggregate_many(hl.agg.mean(table1.X), hl.agg.count(), hl.agg.max(table1.Z))
+        (6.5, 4, 4)
+
+        Notes
+        -----
+        This is equivalent to calling :meth:`.Table.aggregate` on each of
+        `exprs`, but the table is aggregated over only once.
+
+        Parameters
+        ----------
+        exprs : varargs of :class:`.Expression`
+            Aggregation expressions.
+
+        Returns
+        -------
+        :obj:`tuple`
+            Aggregated values, in order.
+        """
+        return self.aggregate(hl.tuple(exprs))
+
     @typecheck_method(output=str,
                       overwrite=bool,
                       stage_locally=bool,
@@ -1192,9 +1252,12 @@ class Table(ExprContainer):
     @typecheck_method(output=str,
                       overwrite=bool,
                       stage_locally=bool,
-                      _codec_spec=nullable(str))
+                      _codec_spec=nullable(str),
+                      _field_groups=nullable(sequenceof(sequenceof(str))),
+                      _partition_stats=nullable(sequenceof(expr_any)))
     def write(self, output: str, overwrite = False, stage_locally: bool = False,
-              _codec_spec: Optional[str] = None):
+              _codec_spec: Optional[str] = None, _field_groups: Optional[Sequence[Sequence[str]]] = None,
+              _partition_stats: Optional[Sequence[Expression]] = None):
         """Write to disk.
 
         Examples
@@ -1202,6 +1265,16 @@ class Table(ExprContainer):
 
         >>> table1.write('output/table1.ht')
 
+        Store the fields `C1` and `C2` apart from the other fields, so that
+        queries using neither of them do not read their data:
+
+        >>> table1.write('output/table1_groups.ht', overwrite=True, _field_groups=[['C1', 'C2']])  # doctest: +SKIP
+
+        Record the range of `X` and `Z` in each partition, so that filters on
+        them skip the partitions they rule out:
+
+        >>> table1.write('output/table1_stats.ht', overwrite=True, _partition_stats=[table1.X, table1.Z])  # doctest: +SKIP
+
         Warning
         -------
         Do not write to a path that is being read from in the same computation.
@@ -1215,9 +1288,23 @@ class Table(ExprContainer):
             before being copied to ``output``.
         overwrite : bool
             If ``True``, overwrite an existing file at the destination.
+        _field_groups : :obj:`list` of :obj:`list` of :obj:`str`, optional
+            Groups of non-key row fields, each written to its own files next
+            to the files of the other fields. Reads of the table only read the
+            groups with fields in use.
+        _partition_stats : :obj:`list` of :class:`.Expression`, optional
+            Numeric or string row fields, possibly nested in structs, whose
+            minimum, maximum and number of missing values are recorded for each
+            partition. Reads of the table skip the partitions for which a
+            filter on these fields is false for every row. See
+            :meth:`._partition_stats`.
         """
 
-        Env.backend().execute(TableWrite(self._tir, TableNativeWriter(output, overwrite, stage_locally, _codec_spec)))
+        if _partition_stats is not None:
+            _partition_stats = _partition_stats_paths('Table.write', _partition_stats, self._row_indices, 'row')
+
+        writer = TableNativeWriter(output, overwrite, stage_locally, _codec_spec, _field_groups, _partition_stats)
+        Env.backend().execute(TableWrite(self._tir, writer))
 
     def _show(self, n, width, truncate, types):
         return Table._Show(self, n, width, truncate, types)
@@ -1796,8 +1883,8 @@ class Table(ExprContainer):
         """
         return Env.backend().unpersist_table(self)
 
-    @typecheck_method(_localize=bool)
-    def collect(self, _localize=True):
+    @typecheck_method(_localize=bool, stream=bool)
+    def collect(self, _localize=True, stream=False):
         """Collect the rows of the table into a local list.
 
         Examples
@@ -1812,15 +1899,30 @@ class Table(ExprContainer):
         of these structs can be accessed similarly to fields on a table, using dot
         methods (``struct.foo``) or string indexing (``struct['foo']``).
 
+        If `stream` is ``True``, an iterator over the rows is returned instead of a
+        list. See :meth:`.Table.iter_rows`.
+
         Warning
         -------
-        Using this method can cause out of memory errors. Only collect small tables.
+        Using this method without `stream` can cause out of memory errors. Only
+        collect small tables.
+
+        Parameters
+        ----------
+        stream : :obj:`bool`
+            If ``True``, fetch the rows one partition at a time and return an
+            iterator.
 
         Returns
         -------
         :obj:`list` of :class:`.Struct`
             List of rows.
         """
+        if stream:
+            if not _localize:
+                raise ValueError("'collect': cannot stream an unlocalized collect")
+            return self.iter_rows()
+
         ir = GetField(TableCollect(self._tir), 'rows')
         e = construct_expr(ir, hl.tarray(self.row.dtype))
         if _localize:
@@ -1828,6 +1930,79 @@ class Table(ExprContainer):
         else:
             return e
 
+    @typecheck_method(batch_size=nullable(int))
+    def iter_rows(self, batch_size=None):
+        """Iterate over the rows of the table, fetching them through the
+        backend one partition at a time.
+
+        Examples
+        --------
+
+        >>> for row in table1.iter_rows():
+        ...     pass
+
+        Fetch at most two rows at a time:
+
+        >>> for row in table1.iter_rows(batch_size=2):
+        ...     pass
+
+        Notes
+        -----
+        Unlike :meth:`.Table.collect`, the rows of the table are never all held
+        in memory at once: at most one partition, or at most `batch_size` rows
+        if `batch_size` is given, is localized at a time. Rows are produced in
+        table order.
+
+        Each partition is computed separately. When `batch_size` is given, each
+        partition is computed once and written to a temporary file indexed by
+        row position, and each batch reads only its own rows from that file.
+        If the table is the result of an expensive pipeline with a shuffle
+        (such as :meth:`.Table.key_by` with a new key),
+        :meth:`.Table.persist` or :meth:`.Table.checkpoint` it first, since
+        every partition depends on the whole shuffle.
+
+        Parameters
+        ----------
+        batch_size : :obj:`int`, optional
+            Maximum number of rows to fetch in one request to the backend.
+
+        Returns
+        -------
+        iterator of :class:`.Struct`
+        """
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError(f"'iter_rows': 'batch_size' must be positive, found {batch_size}")
+        return self._iter_rows(batch_size)
+
+    def _iter_rows(self, batch_size):
+        for i in range(self.n_partitions()):
+            part = self._filter_partitions([i])
+            if batch_size is None:
+                yield from part.collect()
+                continue
+
+            # computed once and written keyed by position, so that each batch
+            # reads only its own rows through the index
+            idx = Env.get_uid()
+            part = part.add_index(idx)
+            part = part.annotate(**{idx: hl.int32(part[idx])}).key_by(idx)
+            path = new_temp_file(suffix='ht')
+            part.write(path)
+            try:
+                start = 0
+                while True:
+                    batch = hl.read_table(path,
+                                          _intervals=[hl.Interval(start, start + batch_size)],
+                                          _filter_intervals=True)
+                    batch = batch.key_by().drop(idx).collect()
+                    yield from batch
+                    if len(batch) < batch_size:
+                        break
+                    start += batch_size
+            finally:
+                # also when the iterator is closed early
+                Env.fs().rmtree(path)
+
     def describe(self, handler=print):
         """Print information about the fields in the table."""
 
@@ -2939,7 +3114,7 @@ class Table(ExprContainer):
         return self._row.drop(*self.key.keys())
 
     @staticmethod
-    @typecheck(df=pyspark.sql.DataFrame,
+    @typecheck(df=lazy(_pyspark_dataframe),
                key=table_key_type)
     def from_spark(df, key=[]) -> 'Table':
         """Convert PySpark SQL DataFrame to a table.
@@ -3002,28 +3177,102 @@ class Table(ExprContainer):
         """
         return Env.spark_backend('to_spark').to_spark(self, flatten)
 
-    @typecheck_method(flatten=bool)
-    def to_pandas(self, flatten=True):
+    @typecheck_method(flatten=bool, columnar=bool)
+    def to_pandas(self, flatten=True, columnar=False):
         """Converts this table to a Pandas DataFrame.
 
         Because conversion to Pandas is done through Spark, and Spark
         cannot represent complex types, types are expanded before
         flattening or conversion.
 
+        Notes
+        -----
+        If `columnar` is ``True``, or if the current backend does not convert
+        through Spark, the table is not converted to a Spark DataFrame.
+        Instead, as with :meth:`.Table.to_numpy`, the backend collects the rows
+        into one array and, in the same query, maps it to one array per field.
+        The result is transferred in a binary encoding from which the numeric
+        columns are rebuilt without per-value conversion. Types are expanded in
+        the same way, so both modes produce the same columns. Missing values
+        are ``NaN`` in numeric columns and ``None`` in all others.
+
         Parameters
         ----------
         flatten : :obj:`bool`
             If ``True``, :meth:`flatten` before converting to Pandas DataFrame.
+        columnar : :obj:`bool`
+            If ``True``, convert without going through Spark.
 
         Returns
         -------
         :class:`.pandas.DataFrame`
 
         """
-        return Env.spark_backend('to_pandas').to_pandas(self, flatten)
+        if not columnar and Env.backend().converts_through_spark:
+            return Env.backend().to_pandas(self, flatten)
+
+        from hail.utils.columnar import to_pandas_column
+        t = self.expand_types()
+        if flatten:
+            t = t.flatten()
+        columns = t._to_columns()
+        import pandas
+        return pandas.DataFrame({f: to_pandas_column(c) for f, c in columns.items()},
+                                columns=list(columns))
+
+    @typecheck_method(flatten=bool)
+    def to_numpy(self, flatten=True):
+        """Converts the fields of this table to NumPy masked arrays.
+
+        Examples
+        --------
+
+        >>> columns = table1.to_numpy()
+        >>> columns['HT'].mean() # doctest: +SKIP
+        67.5
+
+        Notes
+        -----
+        The backend collects the rows of the table into one array and, in the
+        same query, maps it to one array per field, which is transferred in a
+        binary encoding. Boolean, integer and floating-point fields are rebuilt
+        as NumPy arrays of the corresponding type without per-value
+        conversion. Values of all other types are converted to Python values
+        in arrays of dtype ``object``.
+
+        Each array is a :class:`numpy.ma.MaskedArray` whose mask is set where
+        the field is missing.
+
+        Warning
+        -------
+        Every row of the table is held in memory. Only convert small tables.
+
+        Parameters
+        ----------
+        flatten : :obj:`bool`
+            If ``True``, :meth:`flatten` before converting.
+
+        Returns
+        -------
+        :obj:`dict` of :obj:`str` to :class:`numpy.ma.MaskedArray`
+            One array per field, in field order.
+        """
+        t = self.flatten() if flatten else self
+        return t._to_columns()
+
+    def _to_columns(self):
+        from hail.utils.columnar import columns_expr, decode_columns, columns_from_values
+        row_type = self.row.dtype
+        columns = columns_expr(self.collect(_localize=False))
+        if columns.dtype._can_convert_from_encoding():
+            result = Env.backend().execute_encoded(columns._ir)
+            if result is not None:
+                encoding, _ = result
+                return decode_columns(row_type, encoding)
+        return columns_from_values(row_type, Env.backend().execute(columns._ir))
 
     @staticmethod
-    @typecheck(df=pandas.DataFrame,
+    @typecheck(df=lazy(_pandas_dataframe),
                key=oneof(str, sequenceof(str)))
     def from_pandas(df, key=[]) -> 'Table':
         """Create table from Pandas DataFrame
@@ -3212,6 +3461,21 @@ class Table(ExprContainer):
     def _filter_partitions(self, parts, keep=True) -> 'Table':
         return Table(TableToTableApply(self._tir, {'name': 'TableFilterPartitions', 'parts': parts, 'keep': keep}))
 
+    def _partition_stats(self):
+        """The field statistics recorded for each partition by ``write`` with
+        ``_partition_stats``, for a table read by :func:`.read_table`.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Struct` or :obj:`None`
+            One struct per partition, with a field ``min``, ``max`` and
+            ``n_missing`` for each recorded row field, or ``None`` if no
+            statistics were recorded.
+        """
+        if not (isinstance(self._tir, TableRead) and isinstance(self._tir.reader, TableNativeReader)):
+            raise ValueError("'Table._partition_stats': table must be read with 'read_table'")
+        return _read_partition_stats(self._tir.reader.path)
+
     @typecheck_method(entries_field_name=str,
                       cols_field_name=str,
                       col_key=sequenceof(str))
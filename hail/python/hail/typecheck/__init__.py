@@ -23,4 +23,7 @@ __all__ = ['TypeChecker',
            'func_spec',
            'table_key_type',
            'TypecheckFailure',
+           'set_checks_enabled',
+           'checks_enabled',
+           'clear_caches',
            ]
@@ -2,7 +2,7 @@ import re
 import inspect
 import abc
 import collections
-from decorator import decorator
+import functools
 
 
 class TypecheckFailure(Exception):
@@ -37,6 +37,16 @@ class TypeChecker(object):
     def format(self, arg):
         return f"{extract(type(arg))}: {arg}"
 
+    def validates_only(self):
+        """Whether :meth:`check` returns its argument unchanged. These checks
+        are skipped when checks are disabled with :func:`set_checks_enabled`."""
+        return False
+
+    def cacheable(self):
+        """Whether the results of :meth:`check` on immutable arguments are
+        cached. Results must depend only on the argument and be shareable."""
+        return False
+
 
 class MultipleTypeChecker(TypeChecker):
     def __init__(self, checkers):
@@ -61,6 +71,12 @@ class MultipleTypeChecker(TypeChecker):
     def expects(self):
         return '(' + ' or '.join([c.expects() for c in self.checkers]) + ')'
 
+    def validates_only(self):
+        return all(c.validates_only() for c in self.checkers)
+
+    def cacheable(self):
+        return all(c.validates_only() or c.cacheable() for c in self.checkers)
+
 
 class SequenceChecker(TypeChecker):
     def __init__(self, element_checker):
@@ -202,6 +218,9 @@ class LinkedListChecker(TypeChecker):
     def expects(self):
         return 'linkedlist[%s]' % self.type
 
+    def validates_only(self):
+        return True
+
 
 class AnyChecker(TypeChecker):
     def __init__(self):
@@ -213,6 +232,9 @@ class AnyChecker(TypeChecker):
     def expects(self):
         return 'any'
 
+    def validates_only(self):
+        return True
+
 
 class CharChecker(TypeChecker):
     def __init__(self):
@@ -227,6 +249,9 @@ class CharChecker(TypeChecker):
     def expects(self):
         return 'char'
 
+    def validates_only(self):
+        return True
+
 
 class LiteralChecker(TypeChecker):
     def __init__(self, t):
@@ -242,27 +267,37 @@ class LiteralChecker(TypeChecker):
     def expects(self):
         return extract(self.t)
 
+    def validates_only(self):
+        return True
+
 
 class LazyChecker(TypeChecker):
-    def __init__(self):
+    def __init__(self, load=None):
         self.t = None
+        self.load = load
         super(LazyChecker, self).__init__()
 
     def set(self, t):
         self.t = t
 
-    def check(self, x, caller, param):
+    def _type(self):
+        if not self.t and self.load is not None:
+            self.t = self.load()
         if not self.t:
             raise RuntimeError("LazyChecker not initialized. Use 'set' to provide the expected type")
-        if isinstance(x, self.t):
+        return self.t
+
+    def check(self, x, caller, param):
+        if isinstance(x, self._type()):
             return x
         else:
             raise TypecheckFailure
 
     def expects(self):
-        if not self.t:
-            raise RuntimeError("LazyChecker not initialized. Use 'set' to provide the expected type")
-        return extract(self.t)
+        return extract(self._type())
+
+    def validates_only(self):
+        return True
 
 
 class ExactlyTypeChecker(TypeChecker):
@@ -282,6 +317,9 @@ class ExactlyTypeChecker(TypeChecker):
     def expects(self):
         return repr(self.v)
 
+    def validates_only(self):
+        return True
+
 
 class CoercionChecker(TypeChecker):
     """Type checker that performs argument transformations.
@@ -293,8 +331,9 @@ class CoercionChecker(TypeChecker):
      sequenceof(int), lambda x: x[0]))
     """
 
-    def __init__(self, *fs):
+    def __init__(self, *fs, cache=False):
         self.fs = fs
+        self.cache = cache
         super(CoercionChecker, self).__init__()
 
     def check(self, x, caller, param):
@@ -308,6 +347,9 @@ class CoercionChecker(TypeChecker):
     def expects(self):
         return '(' + ' or '.join([c.expects() for c, _ in self.fs]) + ')'
 
+    def cacheable(self):
+        return self.cache and all(c.validates_only() for c, _ in self.fs)
+
 
 class AnyFuncChecker(TypeChecker):
     def __init__(self):
@@ -321,6 +363,9 @@ class AnyFuncChecker(TypeChecker):
     def expects(self):
         return 'function'
 
+    def validates_only(self):
+        return True
+
 
 class FunctionChecker(TypeChecker):
     def __init__(self, nargs, ret_checker):
@@ -417,16 +462,23 @@ def func_spec(n, tc):
 
 anyfunc = AnyFuncChecker()
 
-def transformed(*tcs):
+def transformed(*tcs, cache=False):
+    """Checker applying the function paired with the first checker that
+    accepts the argument. With `cache`, results for immutable arguments are
+    cached, so the functions must be deterministic and their results safe to
+    share between calls."""
     fs = []
     for tc, f in tcs:
         tc = only(tc)
         fs.append((tc, f))
-    return CoercionChecker(*fs)
+    return CoercionChecker(*fs, cache=cache)
 
 
-def lazy():
-    return LazyChecker()
+def lazy(load=None):
+    """Checker for instances of a type that is set later, with
+    :meth:`.LazyChecker.set`, or returned by `load` on first use, for
+    instance to avoid importing a module until it is needed."""
+    return LazyChecker(load)
 
 
 anytype = AnyChecker()
@@ -441,131 +493,207 @@ table_key_type = nullable(
         sequenceof(str)))
 
 
-def get_signature(f) -> inspect.Signature:
-    if hasattr(f, '__memo'):
-        return f.__memo
-    else:
-        signature = inspect.signature(f)
-        f.__memo = signature
-        return signature
+class _Settings(object):
+    enabled = True
 
 
-def check_meta(f, checks, is_method):
-    if hasattr(f, '__checked'):
-        return
-    else:
-        spec = get_signature(f)
-        params = list(spec.parameters)
-        if is_method:
-            params = params[1:]
-        signature_namespace = set(params)
-        tc_namespace = set(checks.keys())
-
-        # ensure that the typecheck signature is appropriate and matches the function signature
-        if signature_namespace != tc_namespace:
-            unmatched_tc = list(tc_namespace - signature_namespace)
-            unmatched_sig = list(signature_namespace - tc_namespace)
-            if unmatched_sig or unmatched_tc:
-                msg = ''
-                if unmatched_tc:
-                    msg += 'unmatched typecheck arguments: %s' % unmatched_tc
-                if unmatched_sig:
-                    if msg:
-                        msg += ', and '
-                    msg += 'function parameters with no defined type: %s' % unmatched_sig
-                raise RuntimeError('%s: invalid typecheck signature: %s' % (f.__name__, msg))
-        f.__checked = True
-
-
-def check_all(f, args, kwargs, checks, is_method):
-    spec = get_signature(f)
-    check_meta(f, checks, is_method)
-    name = f.__name__
-    arg_list = list(args)
-
-    args_ = []
-    kwargs_ = {}
-
-    has_varargs = any(param.kind == param.VAR_POSITIONAL for param in spec.parameters.values())
-    n_pos_args = len(
-        list(filter(
-            lambda p: p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD),
-            spec.parameters.values())))
-    if not has_varargs and len(args) > n_pos_args:
-        raise TypeError(f"'{name}' takes {n_pos_args} positional arguments, found {len(args)}")
-
-    for i, (arg_name, param) in enumerate(spec.parameters.items()):
-        if i == 0 and is_method:
-            if not isinstance(arg_list[0], object):
-                raise RuntimeError("no class found as first argument. Did you mean to use 'typecheck' "
-                                   "instead of 'typecheck_method'?")
-            args_.append(args[i])
-            continue
-        checker = checks[arg_name]
-        assert isinstance(param, inspect.Parameter)
-        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+_settings = _Settings()
+
+
+def set_checks_enabled(enabled):
+    """Enable or disable the checks that only validate arguments.
+
+    Checks that convert their arguments, for instance strings to types or
+    Python values to expressions, always run. With checks disabled, invalid
+    arguments produce errors later, or no errors at all.
+
+    Parameters
+    ----------
+    enabled : :obj:`bool`
+    """
+    _settings.enabled = enabled
+
+
+def checks_enabled():
+    return _settings.enabled
+
+
+# arguments whose checker results may be cached
+_immutable_types = frozenset([bool, int, float, str, type(None)])
+
+# results of cacheable checkers, one cache per checked parameter
+_result_caches = []
+_max_cached_results = 1024
+
+
+def clear_caches():
+    """Clear the cached checker results, for instance when the objects that
+    type strings refer to change."""
+    for cache in _result_caches:
+        cache.clear()
+
+
+def _failure(fname, pname, checker, arg):
+    return TypeError(f"{fname}: parameter '{pname}': "
+                     f"expected {checker.expects()}, found {checker.format(arg)}")
+
+
+def _argument_check(checker, fname, pname):
+    """Function checking the value of parameter `pname`."""
+    check = checker.check
+
+    def check_arg(x):
+        try:
+            return check(x, fname, pname)
+        except TypecheckFailure as e:
+            raise _failure(fname, pname, checker, x) from e
+
+    if not checker.cacheable():
+        return check_arg
+
+    cache = {}
+    _result_caches.append(cache)
+    validates_only = checker.validates_only()
+    immutable_types = _immutable_types
+
+    def check_cached(x):
+        t = type(x)
+        if t not in immutable_types:
+            return check_arg(x)
+        key = (t, x)
+        try:
+            result = cache[key]
+        except KeyError:
+            result = check_arg(x)
+            if len(cache) >= _max_cached_results:
+                cache.clear()
+            cache[key] = True if validates_only else result
+            return result
+        return x if validates_only else result
+
+    return check_cached
+
+
+def _varargs_check(checker, fname, pname):
+    check = checker.check
+
+    def check_varargs(args):
+        args_ = []
+        for j, arg in enumerate(args):
+            try:
+                args_.append(check(arg, fname, pname))
+            except TypecheckFailure as e:
+                raise TypeError(f"{fname}: parameter '*{pname}' (arg {j} of {len(args)}): "
+                                f"expected {checker.expects()}, found {checker.format(arg)}") from e
+        return args_
+
+    return check_varargs
+
+
+def _varkw_check(checker, fname):
+    check = checker.check
+
+    def check_varkw(kwargs):
+        kwargs_ = {}
+        for name, arg in kwargs.items():
             try:
-                if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
-                    # must be positional
-                    if i < len(args):
-                        arg = args[i]
-                        args_.append(checker.check(arg, name, arg_name))
-                    # passed as keyword
-                    else:
-                        if arg_name in kwargs:
-                            arg = kwargs.pop(arg_name)
-                        else:
-                            if param.default is inspect._empty:
-                                raise TypeError(f'Expected {n_pos_args} positional arguments, '
-                                                f'found {len(args)}')
-                            arg = param.default
-                        args_.append(checker.check(arg, name, arg_name))
-                else:
-                    if arg_name in kwargs:
-                        arg = kwargs.pop(arg_name)
-                    else:
-                        if param.default is inspect._empty:
-                            raise TypeError(f"{name}() missing required keyword-only argument '{arg_name}'")
-                        arg = param.default
-                    kwargs_[arg_name] = checker.check(arg, name, arg_name)
+                kwargs_[name] = check(arg, fname, name)
             except TypecheckFailure as e:
-                raise TypeError("{fname}: parameter '{argname}': "
-                                "expected {expected}, found {found}".format(
-                    fname=name,
-                    argname=arg_name,
-                    expected=checker.expects(),
-                    found=checker.format(arg)
-                )) from e
-        elif param.kind == param.VAR_POSITIONAL:
-            # consume the rest of the positional arguments
-            varargs = args[i:]
-            for j, arg in enumerate(varargs):
-                try:
-                    args_.append(checker.check(arg, name, arg_name))
-                except TypecheckFailure as e:
-                    raise TypeError("{fname}: parameter '*{argname}' (arg {idx} of {tot}): "
-                                    "expected {expected}, found {found}".format(
-                        fname=name,
-                        argname=arg_name,
-                        idx=j,
-                        tot=len(varargs),
-                        expected=checker.expects(),
-                        found=checker.format(arg)
-                    )) from e
+                raise TypeError(f"{fname}: keyword argument '{name}': "
+                                f"expected {checker.expects()}, found {checker.format(arg)}") from e
+        return kwargs_
+
+    return check_varkw
+
+
+def _signature_mismatch(f, params, checks):
+    signature_namespace = set(p.name for p in params)
+    tc_namespace = set(checks.keys())
+    if signature_namespace == tc_namespace:
+        return None
+    unmatched_tc = list(tc_namespace - signature_namespace)
+    unmatched_sig = list(signature_namespace - tc_namespace)
+    msg = ''
+    if unmatched_tc:
+        msg += 'unmatched typecheck arguments: %s' % unmatched_tc
+    if unmatched_sig:
+        if msg:
+            msg += ', and '
+        msg += 'function parameters with no defined type: %s' % unmatched_sig
+    return '%s: invalid typecheck signature: %s' % (f.__name__, msg)
+
+
+def _checked(f, checks, is_method):
+    """Wrap `f` in a function with the same signature that checks its
+    arguments.
+
+    The wrapper is generated when `f` is decorated, with one statement per
+    parameter, so a call binds its arguments natively and runs each checker
+    directly."""
+    params = list(inspect.signature(f).parameters.values())
+    checked_params = params[1:] if is_method else params
+
+    mismatch = _signature_mismatch(f, checked_params, checks)
+    if mismatch is not None:
+        # reported when called, so that importing the module succeeds
+        def wrapper(*args, **kwargs):
+            raise RuntimeError(mismatch)
+        return functools.update_wrapper(wrapper, f)
+
+    fname = f.__name__
+    env = {'__f': f, '__settings': _settings}
+    signature = []
+    call = []
+    body = []
+    seen_star = False
+    for i, param in enumerate(params):
+        name = param.name
+        if param.kind == param.VAR_POSITIONAL:
+            seen_star = True
+            signature.append(f'*{name}')
+            call.append(f'*{name}')
+        elif param.kind == param.VAR_KEYWORD:
+            signature.append(f'**{name}')
+            call.append(f'**{name}')
         else:
-            assert param.kind == param.VAR_KEYWORD
-            # kwargs now holds all variable kwargs
-            for kwarg_name, arg in kwargs.items():
-                try:
-                    kwargs_[kwarg_name] = checker.check(arg, name, arg_name)
-                except TypecheckFailure as e:
-                    raise TypeError("{fname}: keyword argument '{argname}': "
-                                    "expected {expected}, found {found}".format(
-                        fname=name,
-                        argname=kwarg_name,
-                        expected=checker.expects(),
-                        found=checker.format(arg))) from e
-    return args_, kwargs_
+            if param.kind == param.KEYWORD_ONLY:
+                if not seen_star:
+                    seen_star = True
+                    signature.append('*')
+                call.append(f'{name}={name}')
+            else:
+                call.append(name)
+            if param.default is inspect.Parameter.empty:
+                signature.append(name)
+            else:
+                env[f'__default_{i}'] = param.default
+                signature.append(f'{name}=__default_{i}')
+            if param.kind == param.POSITIONAL_ONLY and \
+                    (i + 1 == len(params) or params[i + 1].kind != param.POSITIONAL_ONLY):
+                signature.append('/')
+
+        if is_method and i == 0:
+            continue
+        checker = checks[name]
+        check = f'__check_{i}'
+        if param.kind == param.VAR_POSITIONAL:
+            env[check] = _varargs_check(checker, fname, name)
+            body.append(f'{name} = {check}({name})')
+        elif param.kind == param.VAR_KEYWORD:
+            env[check] = _varkw_check(checker, fname)
+            body.append(f'{name} = {check}({name})')
+        else:
+            env[check] = _argument_check(checker, fname, name)
+            if checker.validates_only():
+                body.append(f'if __settings.enabled: {check}({name})')
+            else:
+                body.append(f'{name} = {check}({name})')
+
+    lines = [f'def wrapper({", ".join(signature)}):']
+    lines.extend('    ' + line for line in body)
+    lines.append(f'    return __f({", ".join(call)})')
+    exec(compile('\n'.join(lines), f'<typecheck {fname}>', 'exec'), env)
+    return functools.update_wrapper(env['wrapper'], f)
 
 
 def typecheck_method(**checkers):
@@ -579,9 +707,7 @@ def typecheck(**checkers):
 def _make_dec(checkers, is_method):
     checkers = {k: only(v) for k, v in checkers.items()}
 
-    @decorator
-    def wrapper(__original_func, *args, **kwargs):
-        args_, kwargs_ = check_all(__original_func, args, kwargs, checkers, is_method=is_method)
-        return __original_func(*args_, **kwargs_)
+    def wrapper(f):
+        return _checked(f, checkers, is_method)
 
     return wrapper
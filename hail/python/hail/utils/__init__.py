@@ -3,6 +3,7 @@ from .hadoop_utils import hadoop_copy, hadoop_open, hadoop_exists, hadoop_is_dir
 from .struct import Struct
 from .linkedlist import LinkedList
 from .interval import Interval
+from .interval_index import IntervalIndex
 from .java import error, warn, info, FatalError
 from .tutorial import get_1kg, get_movie_lens
 
@@ -25,6 +26,7 @@ __all__ = ['hadoop_open',
            'run_command',
            'Struct',
            'Interval',
+           'IntervalIndex',
            'error',
            'warn',
            'info',
@@ -0,0 +1,75 @@
+import struct
+
+import numpy as np
+
+
+class ByteReader(object):
+    """Sequential reader over a buffer in the uncompressed, unblocked pack
+    codec used by the backend to transport values (``unblockedUncompressed``).
+
+    Fixed-width values are little-endian. Variable-length values (strings and
+    arrays) are prefixed by their length as a 32-bit integer.
+    """
+
+    def __init__(self, byte_memview, offset=0):
+        self._memview = byte_memview
+        self._offset = offset
+
+    def read_byte(self):
+        b = self._memview[self._offset]
+        self._offset += 1
+        return b
+
+    def read_bool(self):
+        return self.read_byte() != 0
+
+    def read_int32(self):
+        i = struct.unpack_from('<i', self._memview, self._offset)[0]
+        self._offset += 4
+        return i
+
+    def read_int64(self):
+        i = struct.unpack_from('<q', self._memview, self._offset)[0]
+        self._offset += 8
+        return i
+
+    def read_float32(self):
+        f = struct.unpack_from('<f', self._memview, self._offset)[0]
+        self._offset += 4
+        return f
+
+    def read_float64(self):
+        f = struct.unpack_from('<d', self._memview, self._offset)[0]
+        self._offset += 8
+        return f
+
+    def read_bytes_view(self, num_bytes):
+        b = self._memview[self._offset:self._offset + num_bytes]
+        self._offset += num_bytes
+        return b
+
+    def read_bytes(self, num_bytes):
+        return self.read_bytes_view(num_bytes).tobytes()
+
+    def read_values(self, fmt, n):
+        """Read `n` contiguous fixed-width values with struct format
+        character `fmt`."""
+        values = struct.unpack_from(f'<{n}{fmt}', self._memview, self._offset)
+        self._offset += struct.calcsize(f'<{n}{fmt}')
+        return values
+
+    def read_array(self, dtype, n):
+        """Read `n` contiguous values of NumPy `dtype` as a read-only array
+        sharing the underlying buffer."""
+        a = np.frombuffer(self._memview, dtype=dtype, count=n, offset=self._offset)
+        self._offset += n * dtype.itemsize
+        return a
+
+    def read_missing_bytes(self, n):
+        """Read the missing bits of `n` nullable values; bit ``i`` is set if
+        value ``i`` is missing."""
+        return self.read_bytes_view((n + 7) >> 3)
+
+
+def is_missing(missing_bytes, i):
+    return missing_bytes[i >> 3] & (1 << (i & 7)) != 0
@@ -0,0 +1,47 @@
+import struct
+
+_int32 = struct.Struct('<i')
+_int64 = struct.Struct('<q')
+_float32 = struct.Struct('<f')
+_float64 = struct.Struct('<d')
+
+
+class ByteWriter(object):
+    """Sequential writer producing the encoding read by
+    :class:`.ByteReader`."""
+
+    def __init__(self):
+        self._buf = bytearray()
+
+    def write_byte(self, b):
+        self._buf.append(b)
+
+    def write_bool(self, b):
+        self._buf.append(1 if b else 0)
+
+    def write_int32(self, i):
+        self._buf += _int32.pack(i)
+
+    def write_int64(self, i):
+        self._buf += _int64.pack(i)
+
+    def write_float32(self, f):
+        self._buf += _float32.pack(f)
+
+    def write_float64(self, f):
+        self._buf += _float64.pack(f)
+
+    def write_bytes(self, b):
+        self._buf += b
+
+    def write_missing_bytes(self, values):
+        """Write the missing bits of `values`; bit ``i`` is set if value ``i``
+        is ``None``."""
+        missing = bytearray((len(values) + 7) >> 3)
+        for i, v in enumerate(values):
+            if v is None:
+                missing[i >> 3] |= 1 << (i & 7)
+        self._buf += missing
+
+    def getvalue(self):
+        return bytes(self._buf)
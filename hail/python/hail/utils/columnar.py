@@ -0,0 +1,83 @@
+import numpy as np
+
+import hail as hl
+from hail.utils.byte_reader import ByteReader
+
+_numpy_dtypes = {
+    hl.tbool: np.dtype('?'),
+    hl.tint32: np.dtype('<i4'),
+    hl.tint64: np.dtype('<i8'),
+    hl.tfloat32: np.dtype('<f4'),
+    hl.tfloat64: np.dtype('<f8'),
+}
+
+
+def columns_expr(rows):
+    """Map an array of structs to a struct with one array per field.
+
+    `rows` is computed once and bound, so each field is projected from the
+    same array of rows."""
+    row_type = rows.dtype.element_type
+    return hl.rbind(rows, lambda rs: hl.struct(**{f: rs.map(lambda r: r[f]) for f in row_type}))
+
+
+def _unpack_mask(missing_bytes, n):
+    bits = np.unpackbits(np.frombuffer(missing_bytes, dtype=np.uint8).reshape(-1, 1), axis=1)
+    # missing bits are little-endian within each byte
+    return bits[:, ::-1].ravel()[:n].astype(bool)
+
+
+def _decode_column(element_type, byte_reader):
+    n = byte_reader.read_int32()
+    mask = _unpack_mask(byte_reader.read_missing_bytes(n), n)
+    dtype = _numpy_dtypes.get(element_type)
+    if dtype is not None:
+        # present values of fixed-width types are stored contiguously
+        n_present = n - int(mask.sum())
+        present = np.frombuffer(byte_reader.read_bytes_view(n_present * dtype.itemsize), dtype=dtype)
+        data = np.zeros(n, dtype=dtype)
+        data[~mask] = present
+    else:
+        data = np.empty(n, dtype=object)
+        for i in np.flatnonzero(~mask):
+            data[i] = element_type._convert_from_encoding(byte_reader)
+    return np.ma.MaskedArray(data, mask=mask)
+
+
+def decode_columns(row_type, encoding):
+    """Decode the binary encoding of :func:`columns_expr` into a dict of
+    masked arrays, one per field of `row_type`."""
+    byte_reader = ByteReader(memoryview(encoding))
+    # neither the result nor the struct of columns is missing
+    byte_reader.read_missing_bytes(1)
+    byte_reader.read_missing_bytes(len(row_type))
+    return {f: _decode_column(t, byte_reader) for f, t in row_type.items()}
+
+
+def columns_from_values(row_type, columns):
+    """Convert a :class:`.Struct` of lists, as computed by
+    :func:`columns_expr`, into a dict of masked arrays."""
+    result = {}
+    for f, t in row_type.items():
+        values = columns[f]
+        mask = np.array([v is None for v in values], dtype=bool)
+        dtype = _numpy_dtypes.get(t)
+        if dtype is not None:
+            data = np.array([0 if v is None else v for v in values], dtype=dtype)
+        else:
+            data = np.empty(len(values), dtype=object)
+            data[:] = values
+        result[f] = np.ma.MaskedArray(data, mask=mask)
+    return result
+
+
+def to_pandas_column(column):
+    """Convert a masked array to a column with missing values represented as
+    pandas does: ``NaN`` for numeric columns and ``None`` otherwise."""
+    if not column.mask.any():
+        return column.data
+    if column.dtype.kind in 'iuf':
+        return column.astype(np.float64).filled(np.nan)
+    data = column.data.astype(object)
+    data[column.mask] = None
+    return data
@@ -1,11 +1,87 @@
 from hail.typecheck import *
 from hail.utils.java import *
-from hail.expr.types import hail_type
+from hail.expr.types import hail_type, _tfloat32, _tfloat64, tlocus, tstruct, ttuple, tarray, tset, tdict, \
+    tinterval
 import hail as hl
+import math
 
 interval_type = lazy()
 
 
+def _ordering_key(t):
+    """Function from values of type `t` to Python values that compare as
+    the backend orders them: missing values last and NaN above all other
+    floating-point numbers."""
+    if isinstance(t, (_tfloat32, _tfloat64)):
+        def key(x):
+            if math.isnan(x):
+                return (1,)
+            return (0, x, math.copysign(1.0, x))
+    elif isinstance(t, tlocus):
+        rg = t.reference_genome
+
+        def key(x):
+            # contigs missing from the reference are ordered after the others, by name
+            i = rg._contig_index(x.contig)
+            contig = (0, i) if i is not None else (1, x.contig)
+            return (0, contig, x.position)
+    elif isinstance(t, (tstruct, ttuple)):
+        fields = list(t.items()) if isinstance(t, tstruct) else list(enumerate(t.types))
+        field_keys = [(f, _ordering_key(ft)) for f, ft in fields]
+
+        def key(x):
+            return (0, tuple(k(x[f]) for f, k in field_keys))
+    elif isinstance(t, tarray):
+        element_key = _ordering_key(t.element_type)
+
+        def key(x):
+            return (0, tuple(element_key(e) for e in x))
+    elif isinstance(t, tset):
+        element_key = _ordering_key(t.element_type)
+
+        def key(x):
+            return (0, tuple(sorted(element_key(e) for e in x)))
+    elif isinstance(t, tdict):
+        key_key = _ordering_key(t.key_type)
+        value_key = _ordering_key(t.value_type)
+
+        def key(x):
+            return (0, tuple(sorted((key_key(k), value_key(v)) for k, v in x.items())))
+    elif isinstance(t, tinterval):
+        point_key = _ordering_key(t.point_type)
+
+        def key(x):
+            return (0,
+                    point_key(x.start), -1 if x.includes_start else 1,
+                    point_key(x.end), 1 if x.includes_end else -1)
+    else:
+        def key(x):
+            return (0, x)
+
+    def missing_last(x):
+        return (2,) if x is None else key(x)
+    return missing_last
+
+
+_ordering_keys = {}
+
+
+def _point_ordering_key(t):
+    key = _ordering_keys.get(t)
+    if key is None:
+        key = _ordering_key(t)
+        _ordering_keys[t] = key
+    return key
+
+
+def _compare_endpoints(k1, sign1, k2, sign2):
+    """Compares interval endpoints given as the ordering key of a point and a
+    sign: -1 just below the point, 0 at the point, 1 just above it."""
+    if k1 != k2:
+        return -1 if k1 < k2 else 1
+    return (sign1 > sign2) - (sign1 < sign2)
+
+
 class Interval(object):
     """
     An object representing a range of values between `start` and `end`.
@@ -174,7 +250,11 @@ class Interval(object):
         :obj:`bool`
         """
 
-        return hl.eval(hl.literal(self, hl.tinterval(self._point_type)).contains(value))
+        self._point_type.typecheck(value)
+        k = _point_ordering_key(self._point_type)(value)
+        start, start_sign, end, end_sign = self._endpoints()
+        return (_compare_endpoints(start, start_sign, k, 0) < 0
+                and _compare_endpoints(end, end_sign, k, 0) > 0)
 
     @typecheck_method(interval=interval_type)
     def overlaps(self, interval):
@@ -190,6 +270,18 @@ class Interval(object):
         :obj:`bool`
         """
 
-        return hl.eval(hl.literal(self, hl.tinterval(self._point_type)).overlaps(interval))
+        if interval.point_type != self._point_type:
+            raise TypeError("'overlaps': expected an interval with point type '{}', found '{}'"
+                            .format(self._point_type, interval.point_type))
+        start, start_sign, end, end_sign = self._endpoints()
+        other_start, other_start_sign, other_end, other_end_sign = interval._endpoints()
+        return (_compare_endpoints(start, start_sign, other_end, other_end_sign) < 0
+                and _compare_endpoints(end, end_sign, other_start, other_start_sign) > 0)
+
+    def _endpoints(self):
+        """Ordering keys and signs of the start and end of the interval."""
+        key = _point_ordering_key(self._point_type)
+        return (key(self._start), -1 if self._includes_start else 1,
+                key(self._end), 1 if self._includes_end else -1)
 
 interval_type.set(Interval)
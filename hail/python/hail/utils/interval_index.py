@@ -0,0 +1,400 @@
+import bisect
+
+import numpy as np
+
+from hail.expr.types import hail_type, _tint32, _tint64, _tfloat32, _tfloat64, tlocus, tstruct
+from hail.typecheck import typecheck_method, sequenceof, nullable
+from hail.utils.interval import Interval, _point_ordering_key
+
+
+def _float_coordinates(x):
+    """Maps floats to int64s in the order of the backend: -0.0 below 0.0
+    and NaN above infinity."""
+    x = np.asarray(x, dtype=np.float64)
+    x = np.where(np.isnan(x), np.nan, x)
+    bits = x.view(np.int64)
+    return bits ^ ((bits >> 63) & np.int64(0x7fffffffffffffff))
+
+
+def _numeric_coordinates(t):
+    """Function from a sequence of points of type `t` to int64 coordinates
+    in the same order, and from an array of already computed coordinates:
+    numbers for numeric types and global positions for loci. ``None`` if
+    points of type `t` do not map to integers."""
+    if isinstance(t, tstruct) and len(t) == 1:
+        field = list(t)[0]
+        field_coordinates = _numeric_coordinates(t[field])
+        if field_coordinates is None:
+            return None
+
+        def coordinates(points):
+            if isinstance(points, np.ndarray):
+                return field_coordinates(points)
+            return field_coordinates([p[field] for p in points])
+        return coordinates
+    if isinstance(t, (_tint32, _tint64)):
+        return lambda points: np.asarray(points, dtype=np.int64)
+    if isinstance(t, (_tfloat32, _tfloat64)):
+        return _float_coordinates
+    if isinstance(t, tlocus):
+        rg = t.reference_genome
+
+        def coordinates(points):
+            if isinstance(points, np.ndarray):
+                return points.astype(np.int64, copy=False)
+            return np.fromiter((rg._contig_global_position(p.contig) + p.position - 1 for p in points),
+                               dtype=np.int64, count=len(points))
+        return coordinates
+    return None
+
+
+def _nesting_parents(lo, hi):
+    """Position of an interval containing each interval, or -1, for intervals
+    sorted by start and then by decreasing end. Equal intervals share a
+    parent, so that the intervals under each parent are sorted by end as well
+    as start."""
+    parents = np.full(len(lo), -1, dtype=np.int64)
+    lo, hi = lo.tolist(), hi.tolist()
+    stack = []
+    for i in range(len(lo)):
+        while stack and (hi[stack[-1]] < hi[i] or (hi[stack[-1]] == hi[i] and lo[stack[-1]] == lo[i])):
+            stack.pop()
+        if stack:
+            parents[i] = stack[-1]
+        stack.append(i)
+    return parents
+
+
+def _ranges(first, last):
+    """Positions from `first` to `last` for each range, and the range of
+    each."""
+    counts = np.maximum(last - first, 0)
+    ranges = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(first, counts) + offsets, ranges
+
+
+class IntervalIndex(object):
+    """Sorted index of intervals answering point and overlap queries in
+    Python, without the backend.
+
+    Examples
+    --------
+
+    >>> index = hl.utils.IntervalIndex([hl.Interval(1, 5), hl.Interval(3, 8, includes_end=True)])
+    >>> index.query(4)
+    [Interval(start=1, end=5, includes_start=True, includes_end=False), Interval(start=3, end=8, includes_start=True, includes_end=True)]
+    >>> index.contains_many([0, 5, 8, 9])
+    array([False,  True,  True, False])
+
+    Notes
+    -----
+    Queries follow the ordering of the backend, so they agree with
+    :meth:`.IntervalExpression.contains` and
+    :meth:`.IntervalExpression.overlaps`. The `_many` methods answer a batch
+    of queries at once with NumPy. For numeric point types, and for loci
+    and structs with a single numeric or locus field, points can also be
+    passed as a NumPy array of numbers or of global positions (see
+    :meth:`.Locus.global_position`), which avoids creating a Python object
+    per point.
+
+    Missing points are not contained in any interval, and intervals that
+    contain no points, such as ``hl.Interval(5, 5)``, are ignored.
+
+    Parameters
+    ----------
+    intervals : :obj:`list` of :class:`.Interval`
+        Intervals with the same point type.
+    point_type : :class:`.HailType`, optional
+        Point type of the intervals. Required if `intervals` is empty.
+    """
+
+    @typecheck_method(intervals=sequenceof(Interval), point_type=nullable(hail_type))
+    def __init__(self, intervals, point_type=None):
+        intervals = list(intervals)
+        if point_type is None:
+            if not intervals:
+                raise ValueError("'IntervalIndex': 'point_type' is required for an empty list of intervals")
+            point_type = intervals[0].point_type
+        for i in intervals:
+            if i.point_type != point_type:
+                raise TypeError("'IntervalIndex': expected intervals with point type '{}', found '{}'"
+                                .format(point_type, i.point_type))
+
+        self._point_type = point_type
+        self._intervals = intervals
+        self._numeric = _numeric_coordinates(point_type)
+        if self._numeric is None:
+            key = _point_ordering_key(point_type)
+            self._keys = sorted({key(p) for i in intervals for p in (i.start, i.end)})
+            self._key_ranks = {k: r for r, k in enumerate(self._keys)}
+
+        starts, start_signs, ends, end_signs = self._endpoints(intervals)
+        # endpoints are ranked among the distinct endpoints of the intervals,
+        # so that they compare as integers
+        xs = np.concatenate([starts, ends])
+        signs = np.concatenate([start_signs, end_signs])
+        order = np.lexsort((signs, xs))
+        xs, signs = xs[order], signs[order]
+        distinct = np.ones(len(xs), dtype=bool)
+        distinct[1:] = (xs[1:] != xs[:-1]) | (signs[1:] != signs[:-1])
+        self._endpoint_xs = xs[distinct]
+        self._endpoint_signs = signs[distinct]
+        lo = self._endpoint_coordinates(starts, start_signs)
+        hi = self._endpoint_coordinates(ends, end_signs)
+
+        # intervals that contain no points are never returned
+        nonempty = np.flatnonzero(lo < hi)
+        order = nonempty[np.lexsort((-hi[nonempty], lo[nonempty]))]
+        self._lo = lo[order]
+        self._sorted_hi = np.sort(hi[nonempty])
+
+        # nested containment list: each interval is listed under an interval
+        # containing it, and the intervals of a list are sorted by both start
+        # and end, so those a query overlaps are contiguous. Lists are laid
+        # out one after another, searched through keys offset by list.
+        parents = _nesting_parents(self._lo, hi[order])
+        layout = np.argsort(parents, kind='stable')
+        lists = parents[layout] + 1
+        self._list_width = 2 * len(self._endpoint_xs) + 2
+        self._nested_index = order[layout]
+        self._nested_lo = self._lo[layout]
+        self._nested_lo_keys = lists * self._list_width + self._nested_lo
+        self._nested_hi_keys = lists * self._list_width + hi[order][layout]
+        self._nested_list = layout + 1
+        self._nested_has_list = np.bincount(parents + 1, minlength=len(order) + 1)[1:][layout] > 0
+
+    def __len__(self):
+        return len(self._intervals)
+
+    @property
+    def intervals(self):
+        """Indexed intervals, in the order given.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Interval`
+        """
+        return self._intervals
+
+    @property
+    def point_type(self):
+        """Point type of the indexed intervals.
+
+        Returns
+        -------
+        :class:`.HailType`
+        """
+        return self._point_type
+
+    def _endpoints(self, intervals):
+        """Coordinates of the start and end points of `intervals` and their
+        signs: -1 for an endpoint just below its point and 1 just above."""
+        starts, _ = self._point_coordinates([i.start for i in intervals])
+        ends, _ = self._point_coordinates([i.end for i in intervals])
+        includes_start = np.fromiter((i.includes_start for i in intervals), dtype=bool, count=len(intervals))
+        includes_end = np.fromiter((i.includes_end for i in intervals), dtype=bool, count=len(intervals))
+        return (starts, np.where(includes_start, -1, 1).astype(np.int8),
+                ends, np.where(includes_end, 1, -1).astype(np.int8))
+
+    def _endpoint_coordinates(self, xs, signs):
+        """Coordinates of endpoints, or points with sign 0, in the ranking of
+        the distinct endpoints of the indexed intervals: ``2r + 1`` for the
+        endpoint of rank ``r`` and ``2r`` between those of ranks ``r - 1``
+        and ``r``."""
+        if len(self._endpoint_xs) == 0:
+            return np.zeros(len(xs), dtype=np.int64)
+        lower = np.searchsorted(self._endpoint_xs, xs, side='left')
+        upper = np.searchsorted(self._endpoint_xs, xs, side='right')
+        # at most two distinct endpoints, with signs -1 and 1, share a point
+        last = len(self._endpoint_xs) - 1
+        first_sign = np.where(upper > lower, self._endpoint_signs[np.minimum(lower, last)], 2)
+        second_sign = np.where(upper > lower + 1, self._endpoint_signs[np.minimum(lower + 1, last)], 2)
+        rank = lower + (first_sign < signs) + (second_sign < signs)
+        exact = (first_sign == signs) | (second_sign == signs)
+        return 2 * rank + exact
+
+    def _point_coordinates(self, points):
+        """Coordinates of `points` and a mask of the missing ones. For point
+        types that do not map to integers, coordinates are ranks among the
+        endpoints of the indexed intervals: ``2r + 1`` for the point of rank
+        ``r`` and ``2r`` between those of ranks ``r - 1`` and ``r``."""
+        if isinstance(points, np.ndarray):
+            if self._numeric is None:
+                raise TypeError("'IntervalIndex': points of type '{}' must be passed as a list"
+                                .format(self._point_type))
+            return self._numeric(points), np.zeros(len(points), dtype=bool)
+
+        points = list(points)
+        missing = np.fromiter((p is None for p in points), dtype=bool, count=len(points))
+        present = [p for p in points if p is not None]
+        if self._numeric is not None:
+            present_coordinates = self._numeric(present) if present else np.zeros(0, dtype=np.int64)
+        else:
+            key = _point_ordering_key(self._point_type)
+            present_coordinates = np.zeros(len(present), dtype=np.int64)
+            for j, p in enumerate(present):
+                k = key(p)
+                r = self._key_ranks.get(k)
+                present_coordinates[j] = 2 * r + 1 if r is not None else 2 * bisect.bisect_left(self._keys, k)
+        coordinates = np.zeros(len(points), dtype=np.int64)
+        coordinates[~missing] = present_coordinates
+        return coordinates, missing
+
+    def _query_coordinates(self, points):
+        xs, missing = self._point_coordinates(points)
+        return self._endpoint_coordinates(xs, np.zeros(len(xs), dtype=np.int8)), missing
+
+    def _overlapping(self, lo, hi, missing):
+        """Pairs of queries from `lo` to `hi`, in endpoint coordinates, and
+        the indexed intervals containing a point strictly between the two,
+        ordered by query and then by interval start. Each list searched is
+        under an interval found, so the work is bounded by the number of
+        pairs."""
+        queries = np.flatnonzero(~missing)
+        lists = np.zeros(len(queries), dtype=np.int64)
+        found_queries = [queries[:0]]
+        found = [queries[:0]]
+        while len(queries):
+            offsets = lists * self._list_width
+            first = np.searchsorted(self._nested_hi_keys, offsets + lo[queries], side='right')
+            last = np.searchsorted(self._nested_lo_keys, offsets + hi[queries])
+            positions, which = _ranges(first, last)
+            queries = queries[which]
+            found_queries.append(queries)
+            found.append(positions)
+            nested = self._nested_has_list[positions]
+            queries = queries[nested]
+            lists = self._nested_list[positions[nested]]
+        queries = np.concatenate(found_queries)
+        indices = self._nested_index[np.concatenate(found)]
+        order = np.lexsort((indices, self._nested_lo[np.concatenate(found)], queries))
+        return queries[order], indices[order]
+
+    def count_many(self, points):
+        """Number of intervals containing each point.
+
+        Parameters
+        ----------
+        points : :obj:`list` or :class:`numpy.ndarray`
+            Points of type :meth:`.point_type`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of :obj:`int`
+        """
+        p, missing = self._query_coordinates(points)
+        # every interval ending before a point also starts before it
+        counts = np.searchsorted(self._lo, p) - np.searchsorted(self._sorted_hi, p)
+        counts[missing] = 0
+        return counts
+
+    def contains_many(self, points):
+        """Whether any interval contains each point.
+
+        Parameters
+        ----------
+        points : :obj:`list` or :class:`numpy.ndarray`
+            Points of type :meth:`.point_type`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray` of :obj:`bool`
+        """
+        return self.count_many(points) > 0
+
+    def query_many(self, points):
+        """Pairs of points and the intervals containing them.
+
+        Examples
+        --------
+
+        >>> index = hl.utils.IntervalIndex([hl.Interval(1, 5), hl.Interval(3, 8, includes_end=True)])
+        >>> point_indices, interval_indices = index.query_many([0, 4, 8])
+        >>> point_indices, interval_indices
+        (array([1, 1, 2]), array([0, 1, 1]))
+
+        Parameters
+        ----------
+        points : :obj:`list` or :class:`numpy.ndarray`
+            Points of type :meth:`.point_type`.
+
+        Returns
+        -------
+        (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            Indices of the points and, for each, the index in
+            :meth:`.intervals` of an interval containing the point, ordered
+            by point and then by interval start.
+        """
+        p, missing = self._query_coordinates(points)
+        return self._overlapping(p, p, missing)
+
+    def overlaps_many(self, intervals):
+        """Pairs of query intervals and the indexed intervals they overlap.
+
+        Parameters
+        ----------
+        intervals : :obj:`list` of :class:`.Interval`
+            Intervals with point type :meth:`.point_type`.
+
+        Returns
+        -------
+        (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+            Indices of the query intervals and, for each, the index in
+            :meth:`.intervals` of an overlapping interval, ordered by query
+            and then by interval start.
+        """
+        intervals = list(intervals)
+        for i in intervals:
+            if i.point_type != self._point_type:
+                raise TypeError("'overlaps_many': expected intervals with point type '{}', found '{}'"
+                                .format(self._point_type, i.point_type))
+        starts, start_signs, ends, end_signs = self._endpoints(intervals)
+        lo = self._endpoint_coordinates(starts, start_signs)
+        hi = self._endpoint_coordinates(ends, end_signs)
+        return self._overlapping(lo, hi, np.zeros(len(intervals), dtype=bool))
+
+    def contains(self, point):
+        """True if any interval contains `point`.
+
+        Parameters
+        ----------
+        point :
+            Object with type :meth:`.point_type`.
+
+        Returns
+        -------
+        :obj:`bool`
+        """
+        return bool(self.count_many([point])[0])
+
+    def query(self, point):
+        """Intervals containing `point`, ordered by start.
+
+        Parameters
+        ----------
+        point :
+            Object with type :meth:`.point_type`.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Interval`
+        """
+        _, indices = self.query_many([point])
+        return [self._intervals[i] for i in indices]
+
+    @typecheck_method(interval=Interval)
+    def overlaps(self, interval):
+        """Intervals overlapping `interval`, ordered by start.
+
+        Parameters
+        ----------
+        interval : :class:`.Interval`
+            Interval with point type :meth:`.point_type`.
+
+        Returns
+        -------
+        :obj:`list` of :class:`.Interval`
+        """
+        _, indices = self.overlaps_many([interval])
+        return [self._intervals[i] for i in indices]
@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Least-recently-used cache bounded by a number of entries and,
+    optionally, by the total size of its values.
+
+    Parameters
+    ----------
+    max_entries : :obj:`int`
+        Maximum number of entries.
+    max_size : :obj:`int`, optional
+        Maximum total size of the values, as measured by `size`.
+    size : callable, optional
+        Size of a value. Required if `max_size` is set.
+    """
+
+    def __init__(self, max_entries, max_size=None, size=None):
+        if max_size is not None and size is None:
+            raise ValueError("'size' is required when 'max_size' is set")
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._size = size
+        self._entries = OrderedDict()
+        self.total_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def get(self, key, default=None):
+        try:
+            value, _ = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        size = self._size(value) if self._size is not None else 0
+        if self.max_size is not None and size > self.max_size:
+            # would evict everything else and still not fit
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_size -= old[1]
+        self._entries[key] = (value, size)
+        self.total_size += size
+        while len(self._entries) > self.max_entries or \
+                (self.max_size is not None and self.total_size > self.max_size):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_size -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.total_size -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
+        self.total_size = 0
+
+    def stats(self):
+        """Counters and current occupancy of the cache, as a :obj:`dict`."""
+        return {'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'size': self.total_size,
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions}
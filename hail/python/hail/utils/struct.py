@@ -1,5 +1,6 @@
 from hail.typecheck import *
 from collections import Mapping, OrderedDict
+from hail.utils.lru_cache import LRUCache
 from hail.utils.misc import get_nice_attr_error, get_nice_field_error
 
 
@@ -33,6 +34,8 @@ class Struct(Mapping):
         Field names and values.
     """
 
+    __slots__ = ['_fields', '__dict__']
+
     def __init__(self, **kwargs):
         self._fields = kwargs
         for k, v in kwargs.items():
@@ -76,6 +79,9 @@ class Struct(Mapping):
     def __iter__(self):
         return iter(self._fields)
 
+    def __reduce__(self):
+        return _struct_from_items, (list(self._fields.items()),)
+
     def annotate(self, **kwargs):
         """Add new fields or recompute existing fields.
 
@@ -151,6 +157,97 @@ class Struct(Mapping):
         return Struct(**d)
 
 
+def _struct_from_items(items):
+    return Struct(**dict(items))
+
+
+class _Record(Struct):
+    """Struct with a fixed list of fields, stored in a tuple.
+
+    Structs decoded from the backend are records, whose classes are
+    generated once per list of field names by :func:`_record_class`. A
+    record keeps no dictionary, so collecting many rows costs little more
+    than the tuples of their values. Fields are read through properties of
+    the class; operations that change the fields return a :class:`.Struct`.
+    """
+
+    __slots__ = ['_values']
+    _field_names = ()
+    _field_index = {}
+
+    def __init__(self, *values):
+        self._values = values
+
+    @property
+    def _fields(self):
+        return dict(zip(self._field_names, self._values))
+
+    def __contains__(self, item):
+        return item in self._field_index
+
+    def _get_field(self, item):
+        i = self._field_index.get(item)
+        if i is None:
+            raise KeyError(get_nice_field_error(self, item))
+        return self._values[i]
+
+    def __getitem__(self, item):
+        return self._get_field(item)
+
+    def __getattr__(self, item):
+        i = self._field_index.get(item)
+        if i is None:
+            raise AttributeError(get_nice_attr_error(self, item))
+        return self._values[i]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __str__(self):
+        return 'Struct({})'.format(', '.join('{}={}'.format(k, repr(v))
+                                             for k, v in zip(self._field_names, self._values)))
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self._values == other._values
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return 37 + hash(tuple(sorted(zip(self._field_names, self._values))))
+
+    def __iter__(self):
+        return iter(self._field_names)
+
+    def __reduce__(self):
+        return _record_from_values, (self._field_names, self._values)
+
+
+_record_classes = LRUCache(1024)
+
+
+def _record_class(field_names):
+    """Record class with fields `field_names`, shared by all the structs with
+    these fields."""
+    field_names = tuple(field_names)
+    cls = _record_classes.get(field_names)
+    if cls is None:
+        attributes = {'__slots__': (),
+                      '_field_names': field_names,
+                      '_field_index': {f: i for i, f in enumerate(field_names)}}
+        for i, f in enumerate(field_names):
+            # fields shadow methods, as they do on a Struct, but not the
+            # attributes records are made of
+            if f.isidentifier() and not (f.startswith('_') and hasattr(_Record, f)):
+                attributes[f] = property(lambda self, i=i: self._values[i])
+        cls = type('Struct', (_Record,), attributes)
+        _record_classes.put(field_names, cls)
+    return cls
+
+
+def _record_from_values(field_names, values):
+    return _record_class(field_names)(*values)
+
+
 @typecheck(struct=Struct)
 def to_dict(struct):
     return dict(struct.items())
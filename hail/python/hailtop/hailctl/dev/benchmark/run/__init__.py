@@ -1,6 +1,12 @@
 from .matrix_table_benchmarks import *
 from hailtop.hailctl.dev.benchmark.run.methods_benchmarks import *
 from .table_benchmarks import *
+from .ir_benchmarks import *
+from .value_benchmarks import *
+from .typecheck_benchmarks import *
+from .import_benchmarks import *
+from .local_backend_benchmarks import *
+from .field_group_benchmarks import *
 from .utils import run_all, run_pattern, run_list, initialize
 
 __all__ = [
@@ -15,6 +15,11 @@ def main(args_):
                         type=int,
                         default=1,
                         help='Number of cores to use.')
+    parser.add_argument('--backend', '-b',
+                        type=str,
+                        default='spark',
+                        choices=['spark', 'local'],
+                        help='Backend running the benchmarks.')
     parser.add_argument('--pattern', '-k', type=str, required=False,
                         help='Run all tests that substring match the pattern')
     parser.add_argument("--n-iter", "-n",
@@ -48,7 +53,7 @@ def main(args_):
         out_file = None
     writer = lambda s: print(s, end='', file=out_file)
 
-    run_data = {'cores': args.cores}
+    run_data = {'cores': args.cores, 'backend': args.backend}
     if args.format == 'table':
         writer(f'#{json.dumps(run_data, separators=(",", ":"))}\n')
         writer('Name\tMean\tMedian\tStDev\n')
@@ -77,6 +82,8 @@ def main(args_):
             for t in stats["times"]:
                 writer(f'    {t:.2f}s\n')
             writer(f'    Mean {stats["mean"]:.2f}, Median {stats["median"]:.2f}\n')
+            for k, v in stats.get('metrics', {}).items():
+                writer(f'    {k}: {v}\n')
 
     config = RunConfig(args.n_iter, handler, args.verbose)
     if args.tests:
@@ -0,0 +1,56 @@
+import os
+
+import hail as hl
+from hail.utils.java import Env
+
+from .utils import benchmark, resource
+
+# gnomad_dp_simulation.mt with wide per-row statistics, written with all row
+# fields in the rows, and with the wide fields in field groups of their own
+_layouts = {'default': None,
+            'field_groups': [['count_array'], ['stats']]}
+
+
+def _layout_path(layout):
+    path = resource(f'gnomad_dp_simulation_row_stats_{layout}.mt')
+    if not os.path.exists(os.path.join(path, '_SUCCESS')):
+        mt = hl.read_matrix_table(resource('gnomad_dp_simulation.mt'))
+        mt = mt.annotate_rows(mean=hl.agg.mean(mt.x),
+                              stats=hl.agg.stats(mt.x),
+                              count_array=hl.rbind(hl.agg.counter(hl.min(100, mt.x)),
+                                                   lambda c: hl.range(0, 100).map(lambda i: c.get(i, 0))))
+        mt.write(path, overwrite=True, _field_groups=_layouts[layout])
+    return path
+
+
+def _hadoop_bytes_read():
+    # the benchmarks run Spark in local mode, so the tasks read through the
+    # file systems of the driver's JVM
+    return sum(s.getBytesRead() for s in Env.jvm().org.apache.hadoop.fs.FileSystem.getAllStatistics())
+
+
+def _bytes_read(f):
+    before = _hadoop_bytes_read()
+    f()
+    return {'bytes_read': _hadoop_bytes_read() - before}
+
+
+def _narrow_select(layout):
+    mt = hl.read_matrix_table(_layout_path(layout))
+    return _bytes_read(lambda: mt.rows().aggregate(hl.agg.mean(mt.mean)))
+
+
+@benchmark
+def narrow_select_rows_default_layout():
+    return _narrow_select('default')
+
+
+@benchmark
+def narrow_select_rows_field_groups():
+    return _narrow_select('field_groups')
+
+
+@benchmark
+def wide_select_rows_field_groups():
+    mt = hl.read_matrix_table(_layout_path('field_groups'))
+    return _bytes_read(lambda: mt.rows().aggregate(hl.agg.sum(mt.mean + mt.stats.mean + hl.sum(mt.count_array))))
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+from .utils import benchmark
+
+# cumulative import time budgets in microseconds, as reported by
+# `python -X importtime`
+import_time_budgets = {
+    'hail': 600_000,
+    'hail.context': 400_000,
+    'hail.expr': 250_000,
+    'hail.table': 100_000,
+    'hail.matrixtable': 100_000,
+    'hail.methods': 100_000,
+    'hail.backend': 60_000,
+}
+
+# loaded on first use of the modules that need them, e.g. `hl.plot`
+deferred_modules = ['pandas', 'scipy', 'bokeh', 'pyspark', 'aiohttp', 'requests',
+                    'pkg_resources', 'hail.linalg', 'hail.stats', 'hail.plot', 'hail.experimental']
+
+
+def import_times(module):
+    """Cumulative import time of each module imported by `module`, in
+    microseconds."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@benchmark
+def import_hail():
+    times = import_times('hail')
+    over = {name: (times[name], budget) for name, budget in import_time_budgets.items()
+            if times.get(name, 0) > budget}
+    if over:
+        raise AssertionError('import time over budget: ' + ', '.join(
+            f'{name} {t / 1e3:.0f}ms > {budget / 1e3:.0f}ms' for name, (t, budget) in over.items()))
+    eager = [name for name in deferred_modules if name in times]
+    if eager:
+        raise AssertionError(f'imported by `import hail`: {", ".join(eager)}')
+    return {'import_hail_ms': round(times['hail'] / 1e3)}
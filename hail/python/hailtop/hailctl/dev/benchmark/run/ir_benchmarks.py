@@ -0,0 +1,63 @@
+import hail as hl
+import hail.ir as ir
+from hail.utils.java import Env
+
+from .utils import benchmark
+
+
+def deep_expression(depth):
+    x = ir.Ref('x')
+    for i in range(depth):
+        x = ir.ApplyBinaryPrimOp('+', x, ir.I32(i))
+    return x
+
+
+@benchmark
+def ir_hash_lookup_deep_expression():
+    irs = [deep_expression(10_000) for _ in range(10)]
+    d = {x: i for i, x in enumerate(irs)}
+    for _ in range(100_000):
+        for x in irs:
+            d[x]
+
+
+@benchmark
+def ir_hash_lookup_equal_deep_expression():
+    # structurally equal but distinct, so each lookup compares every node
+    irs = [deep_expression(10_000) for _ in range(10)]
+    d = {x: i for i, x in enumerate(irs)}
+    keys = [deep_expression(10_000) for _ in range(10)]
+    for _ in range(100):
+        for x in keys:
+            d[x]
+
+
+@benchmark
+def ir_eq_deep_expressions_differing_at_root():
+    x = deep_expression(10_000)
+    y = ir.ApplyBinaryPrimOp('-', x.children[0], x.children[1])
+    hash(x), hash(y)
+    for _ in range(100_000):
+        assert x != y
+
+
+def render_and_parse_literals(encoded_threshold):
+    threshold = ir.Literal.encoded_threshold
+    ir.Literal.encoded_threshold = encoded_threshold
+    try:
+        for v in [list(range(1_000_000)),
+                  [str(i) for i in range(1_000_000)],
+                  {str(i): float(i) for i in range(1_000_000)}]:
+            Env.backend()._to_java_ir(hl.literal(v)._ir)
+    finally:
+        ir.Literal.encoded_threshold = threshold
+
+
+@benchmark
+def ir_render_and_parse_large_literals_json():
+    render_and_parse_literals(float('inf'))
+
+
+@benchmark
+def ir_render_and_parse_large_literals_encoded():
+    render_and_parse_literals(0)
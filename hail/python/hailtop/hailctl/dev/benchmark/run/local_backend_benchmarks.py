@@ -0,0 +1,24 @@
+import hail as hl
+
+from .utils import benchmark, resource
+
+# queries the local backend runs without Spark, one partition per thread; run
+# with `--backend local --cores N` to compare with the Spark backend
+
+
+@benchmark
+def lowered_range_filter_count():
+    ht = hl.utils.range_table(100_000_000, 64)
+    ht.filter(ht.idx % 7 == 0).count()
+
+
+@benchmark
+def lowered_range_map_collect():
+    ht = hl.utils.range_table(1_000_000, 64)
+    ht.annotate(x=hl.str(ht.idx), y=hl.float64(ht.idx) / 3).collect()
+
+
+@benchmark
+def lowered_read_filter_count():
+    ht = hl.read_table(resource('table_10M_par_100.ht'))
+    ht.filter(ht.f_0 < 0.5).count()
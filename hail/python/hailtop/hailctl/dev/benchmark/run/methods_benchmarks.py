@@ -1,3 +1,5 @@
+import os
+
 from .utils import benchmark, resource, get_mt
 
 import hail as hl
@@ -10,6 +12,23 @@ def import_vcf_write():
     mt.write(out)
 
 
+def _import_table_impute(**kwargs):
+    tsv = resource('profile_rows.tsv')
+    if not os.path.exists(tsv):
+        hl.read_matrix_table(resource('profile.mt')).rows().flatten().export(tsv)
+    hl.import_table(tsv, impute=True, **kwargs)._force_count()
+
+
+@benchmark
+def import_table_impute():
+    _import_table_impute()
+
+
+@benchmark
+def import_table_impute_sample():
+    _import_table_impute(impute_sample=10_000, impute_fallback='missing')
+
+
 @benchmark
 def import_vcf_count_rows():
     mt = hl.import_vcf(resource('profile.vcf.bgz'))
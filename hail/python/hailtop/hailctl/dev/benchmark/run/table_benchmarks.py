@@ -213,3 +213,40 @@ def join_p100_p10():
     ht1 = hl.read_table(resource('table_10M_par_100.ht'))
     ht2 = hl.read_table(resource('table_10M_par_10.ht'))
     ht1.join(ht2)._force_count()
+
+def _filter_non_key_field(partition_stats):
+    with TemporaryDirectory() as tmpdir:
+        ht = hl.utils.range_table(10_000_000, 1000)
+        ht = ht.annotate(x=ht.idx * 2)
+        ht.write(path.join(tmpdir, 'tmp.ht'), _partition_stats=[ht.x] if partition_stats else None)
+        ht = hl.read_table(path.join(tmpdir, 'tmp.ht'))
+        ht.filter((ht.x > 1_000_000) & (ht.x < 1_200_000))._force_count()
+
+@benchmark
+def table_filter_non_key_field():
+    _filter_non_key_field(False)
+
+@benchmark
+def table_filter_non_key_field_partition_stats():
+    _filter_non_key_field(True)
+
+def _reused_subplan(auto_persist):
+    ht = hl.read_table(resource('table_10M_par_100.ht'))
+    ht = ht.annotate(s=hl.delimit(hl.array([hl.str(ht[f'f_{i}']) for i in range(5)])))
+    ht = ht.filter(hl.len(ht.s) % 7 != 0)
+    if auto_persist:
+        hl._set_auto_persist(max_bytes=1 << 32)
+    try:
+        for _ in range(4):
+            ht.aggregate(hl.agg.count_where(ht.s.contains('9')))
+    finally:
+        if auto_persist:
+            hl._set_auto_persist(False)
+
+@benchmark
+def table_reused_subplan():
+    _reused_subplan(False)
+
+@benchmark
+def table_reused_subplan_auto_persist():
+    _reused_subplan(True)
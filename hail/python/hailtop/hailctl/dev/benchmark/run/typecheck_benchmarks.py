@@ -0,0 +1,41 @@
+import timeit
+
+import hail as hl
+from hail.typecheck import typecheck, nullable, oneof, sequenceof, set_checks_enabled
+
+from .utils import benchmark
+
+
+@typecheck(a=int, b=nullable(str), c=oneof(str, sequenceof(str)), d=hl.expr.types.hail_type)
+def checked(a, b=None, c='x', d='int32'):
+    pass
+
+
+def unchecked(a, b=None, c='x', d='int32'):
+    pass
+
+
+def per_call_overhead(n=200_000):
+    def call(f):
+        return timeit.timeit(lambda: f(1, 'b', c=['x', 'y'], d='array<int32>'), number=n) / n
+    return {'overhead_us_per_call': round((call(checked) - call(unchecked)) * 1e6, 2)}
+
+
+@benchmark
+def typecheck_call_overhead():
+    return per_call_overhead()
+
+
+@benchmark
+def typecheck_call_overhead_disabled():
+    set_checks_enabled(False)
+    try:
+        return per_call_overhead()
+    finally:
+        set_checks_enabled(True)
+
+
+@benchmark
+def typecheck_expression_construction():
+    for i in range(20_000):
+        hl.cond(hl.struct(a=i, b=hl.str(i)).a > 5, 'x', hl.null(hl.tstr))
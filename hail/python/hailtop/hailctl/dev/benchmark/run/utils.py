@@ -28,7 +28,7 @@ class Benchmark(object):
         self.f = f
 
     def run(self):
-        self.f()
+        return self.f()
 
 
 class RunConfig(object):
@@ -90,7 +90,8 @@ def _ensure_initialized():
 
 def initialize(args):
     assert not _initialized
-    hl.init(master=f'local[{args.cores}]', quiet=True, log=args.log)
+    hl.init(master=f'local[{args.cores}]', quiet=True, log=args.log,
+            backend=args.backend, cores=args.cores)
 
     download_data()
 
@@ -102,9 +103,15 @@ def _run(benchmark: Benchmark, config: RunConfig, context):
     if config.verbose:
         print(f'{context}Running {benchmark.name}...', file=sys.stderr)
     times = []
+    # benchmarks may return a dict of measurements other than time, such as
+    # bytes read, which are reported from the last run
+    metrics = None
     for i in range(config.n_iter):
         try:
-            time = timeit.Timer(lambda: benchmark.run()).timeit(1)
+            def run():
+                nonlocal metrics
+                metrics = benchmark.run()
+            time = timeit.Timer(run).timeit(1)
             times.append(time)
             if config.verbose:
                 print(f'    run {i + 1}: {time:.2f}', file=sys.stderr)
@@ -114,12 +121,15 @@ def _run(benchmark: Benchmark, config: RunConfig, context):
             config.handler({'name': benchmark.name,
                             'failed': True})
             return
-    config.handler({'name': benchmark.name,
-                    'failed': False,
-                    'mean': np.mean(times),
-                    'median': np.median(times),
-                    'stdev': np.std(times),
-                    'times': times})
+    stats = {'name': benchmark.name,
+             'failed': False,
+             'mean': np.mean(times),
+             'median': np.median(times),
+             'stdev': np.std(times),
+             'times': times}
+    if isinstance(metrics, dict):
+        stats['metrics'] = metrics
+    config.handler(stats)
 
 
 def run_all(config: RunConfig):
@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+
+import hail as hl
+from hail.utils.byte_reader import ByteReader
+from hail.utils.java import Env
+
+from .utils import benchmark
+
+
+def wide_rows():
+    ht = hl.utils.range_table(20_000)
+    ht = ht.annotate(**{f'f{i}': hl.str(ht.idx + i) if i % 2 else ht.idx * i for i in range(100)})
+    return ht.collect(_localize=False)
+
+
+def deep_value():
+    x = hl.range(0, 100_000).map(lambda i: hl.struct(i=i, s=hl.str(i)))
+    for _ in range(3):
+        x = hl.array([x, x])
+    return x
+
+
+def execute_json(expr):
+    ir = expr._ir
+    jir = Env.backend()._to_java_ir(ir)
+    ir.typ._from_json(json.loads(Env.hc()._jhc.backend().executeJSON(jir))['value'])
+
+
+def execute_encoded(expr):
+    ir = expr._ir
+    jir = Env.backend()._to_java_ir(ir)
+    ir.typ._from_encoding(Env.hc()._jhc.backend().executeEncode(jir, 'unblockedUncompressed')._1())
+
+
+_wide_rows_encoding = None
+
+
+def wide_rows_encoding():
+    # fetched once, so that the benchmarks below time decoding alone
+    global _wide_rows_encoding
+    if _wide_rows_encoding is None:
+        ir = wide_rows()._ir
+        jir = Env.backend()._to_java_ir(ir)
+        _wide_rows_encoding = (ir.typ,
+                               Env.hc()._jhc.backend().executeEncode(jir, 'unblockedUncompressed')._1())
+    return _wide_rows_encoding
+
+
+@benchmark
+def value_decode_wide_rows():
+    typ, encoding = wide_rows_encoding()
+    typ._from_encoding(encoding)
+
+
+@benchmark
+def value_collect_wide_schema_json():
+    execute_json(wide_rows())
+
+
+@benchmark
+def value_collect_wide_schema_encoded():
+    execute_encoded(wide_rows())
+
+
+@benchmark
+def value_deep_schema_json():
+    execute_json(deep_value())
+
+
+@benchmark
+def value_deep_schema_encoded():
+    execute_encoded(deep_value())
+
+
+def nested_rows():
+    typ = hl.tarray(hl.tstruct(idx=hl.tint32,
+                               s=hl.tstr,
+                               xs=hl.tarray(hl.tfloat64),
+                               inner=hl.tstruct(x=hl.tint64, ys=hl.tarray(hl.tint32))))
+    rows = [hl.Struct(idx=i, s=str(i), xs=[float(j) for j in range(20)],
+                      inner=hl.Struct(x=i, ys=list(range(5))))
+            for i in range(50_000)]
+    return typ, rows
+
+
+def decode_interpreted(typ, encoding):
+    # the recursion through the _convert_from_encoding methods of each type
+    byte_reader = ByteReader(memoryview(encoding))
+    byte_reader.read_missing_bytes(1)
+    return typ._convert_from_encoding(byte_reader)
+
+
+@benchmark
+def value_decode_nested_generated():
+    typ, rows = nested_rows()
+    typ._from_encoding(typ._to_encoding(rows))
+
+
+@benchmark
+def value_decode_nested_interpreted():
+    typ, rows = nested_rows()
+    decode_interpreted(typ, typ._to_encoding(rows))
+
+
+@benchmark
+def value_json_nested_generated():
+    typ, rows = nested_rows()
+    typ._from_json(typ._to_json(rows))
+
+
+
+@benchmark
+def value_ndarray_round_trip():
+    a = np.random.rand(4_000, 1_000)
+    typ = hl.tndarray(hl.tfloat64, 2)
+    typ._from_encoding(typ._to_encoding(a))
+
+
+@benchmark
+def value_ndarray_literal():
+    Env.backend()._to_java_ir(hl.literal(np.random.rand(1_000, 1_000))._ir)
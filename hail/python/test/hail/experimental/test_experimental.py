@@ -332,3 +332,26 @@ class Tests(unittest.TestCase):
             a = arrs[i]
             a2 = np.loadtxt(f'{prefix}/files/{i}.tsv')
             self.assertTrue(np.array_equal(a, a2))
+
+    def test_table_lookup(self):
+        path = new_temp_file(suffix='ht')
+        t = hl.utils.range_table(1000, 10)
+        t = t.key_by(k1=t.idx // 10, k2=hl.str(t.idx % 10)).annotate(x=t.idx * 2, y=hl.null(hl.tfloat64))
+        t.write(path)
+        lookup = hl.experimental.TableLookup(path, max_open_partitions=2)
+        try:
+            row = lambda i: hl.Struct(idx=i, k1=i // 10, k2=str(i % 10), x=2 * i, y=None)
+            self.assertEqual(lookup.get([hl.Struct(k1=55, k2='3'), hl.Struct(k1=2, k2='7')]), [row(553), row(27)])
+            # keys past the open partitions, missing keys, and prefixes
+            self.assertEqual(lookup.get([hl.Struct(k1=1000, k2='0')]), [])
+            self.assertEqual(lookup.get([99, 0]), [row(i) for i in [*range(990, 1000), *range(10)]])
+            self.assertEqual(lookup.range(98, 100), [row(i) for i in range(980, 1000)])
+            self.assertEqual(lookup.range(hl.Struct(k1=9, k2='8'), hl.Struct(k1=10, k2='1'), includes_end=True),
+                             [row(i) for i in [98, 99, 100, 101]])
+            self.assertEqual(lookup.range(5, 2), [])
+            with self.assertRaises(ValueError):
+                lookup.get([hl.Struct(k2='1')])
+            with self.assertRaises(ValueError):
+                lookup.get([1, hl.Struct(k1=1, k2='1')])
+        finally:
+            lookup.close()
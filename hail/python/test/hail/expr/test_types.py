@@ -1,9 +1,11 @@
+import json
 import unittest
 
 from hail.expr import coercer_from_dtype
 from hail.expr.types import *
 from ..helpers import *
 from hail.utils.java import Env
+from hail.utils.misc import np_type_to_hl_type
 
 setUpModule = startTestHailContext
 tearDownModule = stopTestHailContext
@@ -96,3 +98,108 @@ class Tests(unittest.TestCase):
             hl.tstruct(a=hl.tbool, b=hl.tint32, c=hl.tint32)._rename({'b': 'x', 'c': 'x'})
         with self.assertRaisesRegex(ValueError, "attempted to rename 'a' and 'b' both to 'a'"):
             hl.tstruct(a=hl.tbool, b=hl.tint32)._rename({'b': 'a'})
+
+    def test_from_encoding_matches_json(self):
+        values = [
+            hl.literal(None, tint32),
+            hl.literal(-5),
+            hl.int64(1 << 40),
+            hl.float32(0.5),
+            hl.float64(-1.25),
+            hl.literal('fooé'),
+            hl.literal(True),
+            hl.call(0, 1, phased=True),
+            hl.locus('1', 100),
+            hl.interval(hl.locus('1', 100), hl.locus('1', 200), includes_end=True),
+            hl.literal(hl.utils.Interval(None, 5, point_type=tint32)),
+            hl.literal([1, None, 3] * 5),
+            hl.literal({'a', 'b', None}),
+            hl.literal({'a': 1, 'b': None}),
+            hl.struct(a=hl.null(tint32), b=hl.literal([[1.5], None]), c=hl.tuple([hl.null(tstr), 'x'])),
+            hl.struct(**{f'f{i}': i for i in range(20)}),
+            hl.tuple([])]
+        backend = Env.backend()
+        jbackend = Env.hc()._jhc.backend()
+        for v in values:
+            t = v.dtype
+            self.assertTrue(t._can_convert_from_encoding())
+            jir = backend._to_java_ir(v._ir)
+            json_value = t._from_json(json.loads(jbackend.executeJSON(jir))['value'])
+            encoded = jbackend.executeEncode(jir, 'unblockedUncompressed')._1()
+            self.assertEqual(t._from_encoding(encoded), json_value)
+
+    def test_generated_codecs_match_methods(self):
+        from hail.utils.byte_reader import ByteReader
+        from hail.utils.byte_writer import ByteWriter
+
+        t = tstruct(a=tint32, b=tarray(tfloat64), c=tset(tstr), d=tdict(tstr, tint64),
+                    e=ttuple(tbool, tfloat32), f=tinterval(tlocus('GRCh37')), g=tarray(tcall))
+        values = [
+            None,
+            hl.Struct(a=None, b=None, c=None, d=None, e=None, f=None, g=None),
+            hl.Struct(a=5, b=[1.5, None, -2.0], c={'x', None}, d={'k': 1 << 40, 'l': None},
+                      e=(True, None),
+                      f=hl.Interval(hl.Locus('1', 100), hl.Locus('1', 200), includes_end=True),
+                      g=[hl.Call([0, 1], phased=True), None, hl.Call([])])]
+        for v in values:
+            self.assertEqual(t._convert_from_json_na(t._convert_to_json_na(v)), v)
+            if v is None:
+                continue
+            self.assertIsNotNone(t._codec('to_encoding'))
+            writer = ByteWriter()
+            t._convert_to_encoding(writer, v)
+            self.assertEqual(t._to_encoding(v)[1:], writer.getvalue())
+            encoding = t._to_encoding(v)
+            self.assertEqual(t._from_encoding(encoding),
+                             t._convert_from_encoding(ByteReader(memoryview(encoding), 1)))
+
+        deep = tint32
+        for _ in range(20):
+            deep = tarray(deep)
+        self.assertIsNone(deep._codec('from_encoding'))
+        v = 1
+        for _ in range(20):
+            v = [v, None]
+        self.assertEqual(deep._from_encoding(deep._to_encoding(v)), v)
+
+    def test_cannot_convert_from_encoding(self):
+        self.assertFalse(tndarray(tstr, 2)._can_convert_from_encoding())
+        self.assertFalse(tarray(tunion(a=tint32))._can_convert_from_encoding())
+        self.assertFalse(tstruct(x=tndarray(tstr, 1))._can_convert_from_encoding())
+
+    def test_ndarray_encoding(self):
+        import io
+        import numpy as np
+
+        values = [np.arange(12.).reshape(3, 4),
+                  np.asfortranarray(np.arange(12.).reshape(3, 4)),
+                  np.arange(12, dtype=np.int32).reshape(3, 4)[:, ::2],
+                  np.array(7, dtype=np.int64),
+                  np.ones((2, 0, 3), dtype=bool)]
+        for v in values:
+            t = hl.tndarray(np_type_to_hl_type(v.dtype), v.ndim)
+            self.assertTrue(t._can_convert_from_encoding())
+            encoding = t._to_encoding(v)
+            # the layout is the .npy format
+            self.assertTrue(np.array_equal(np.load(io.BytesIO(encoding[1:])), v))
+            decoded = t._from_encoding(encoding)
+            self.assertEqual(decoded.dtype, v.dtype)
+            self.assertTrue(np.array_equal(decoded, v))
+            self.assertFalse(decoded.flags.writeable)
+            self.assertTrue(np.array_equal(t._convert_from_json_na(t._convert_to_json_na(v)), v))
+
+        t = tstruct(x=tndarray(tfloat64, 2), y=tarray(tfloat64))
+        v = hl.Struct(x=np.eye(3), y=np.arange(3.))
+        decoded = t._from_encoding(t._to_encoding(v))
+        self.assertTrue(np.array_equal(decoded.x, v.x))
+        self.assertEqual(decoded.y, [0., 1., 2.])
+
+    def test_ndarray_literal(self):
+        import numpy as np
+
+        a = np.asfortranarray(np.arange(6.).reshape(2, 3))
+        e = hl.literal(a)
+        self.assertEqual(e.dtype, tndarray(tfloat64, 2))
+        self.assertEqual(hl.literal(a, 'ndarray<float32, 2>').dtype, tndarray(tfloat32, 2))
+        with self.assertRaises(TypeError):
+            hl.literal(a, 'ndarray<float64, 1>')
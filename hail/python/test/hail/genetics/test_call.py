@@ -94,3 +94,49 @@ class Tests(unittest.TestCase):
                                "Calls with greater than 2 alleles are not supported.",
                                Call,
                                [1, 1, 1, 1])
+
+    def test_parse_and_str(self):
+        for s, c in [('0/1', Call([0, 1])),
+                     ('1|0', Call([1, 0], phased=True)),
+                     ('2', Call([2])),
+                     ('|2', Call([2], phased=True)),
+                     ('-', Call([])),
+                     ('|-', Call([], phased=True))]:
+            self.assertEqual(Call._parse(s), c)
+            self.assertEqual(str(c), s)
+        self.assertEqual(Call([1, 0]), Call([0, 1]))
+        self.assertNotEqual(Call([1, 0], phased=True), Call([0, 1], phased=True))
+
+    def test_eval_same_as_local(self):
+        calls = [Call([]), Call([1]), Call([0, 0]), Call([2, 1]), Call([1, 2], phased=True), Call([3, 3])]
+        for c in calls:
+            ce = hl.literal(c)
+            expected = hl.eval(hl.struct(alleles=ce.alleles(),
+                                         is_het=ce.is_het(),
+                                         is_hom_var=ce.is_hom_var(),
+                                         is_het_ref=ce.is_het_ref(),
+                                         n_alt_alleles=ce.n_alt_alleles(),
+                                         one_hot_alleles=ce.one_hot_alleles(['A', 'C', 'G', 'T'])))
+            self.assertEqual(c.alleles, expected.alleles)
+            self.assertEqual(c.is_het(), expected.is_het)
+            self.assertEqual(c.is_hom_var(), expected.is_hom_var)
+            self.assertEqual(c.is_het_ref(), expected.is_het_ref)
+            self.assertEqual(c.n_alt_alleles(), expected.n_alt_alleles)
+            self.assertEqual(c.one_hot_alleles(4), expected.one_hot_alleles)
+            self.assertEqual(hl.eval(hl.parse_call(str(c))), c)
+
+    def test_call_array(self):
+        calls = [Call([0, 0]), Call([0, 1]), None, Call([1, 2], phased=True), Call([1])]
+        collected = hl.eval(hl.literal(calls, hl.tarray(hl.tcall)))
+        self.assertIsInstance(collected, CallArray)
+        self.assertEqual(collected, calls)
+        self.assertEqual(list(collected), calls)
+        self.assertEqual(collected[1:3], calls[1:3])
+        self.assertEqual(collected.missing.tolist(), [False, False, True, False, False])
+        self.assertEqual(collected.is_het().tolist(), [False, True, None, True, False])
+        self.assertEqual(collected.is_hom_var().tolist(), [False, False, None, False, True])
+        self.assertEqual(collected.n_alt_alleles().tolist(), [0, 1, None, 2, 1])
+        self.assertEqual(collected.ploidy.tolist(), [2, 2, None, 2, 1])
+        self.assertEqual(collected.one_hot_alleles(3).tolist(),
+                         [[2, 0, 0], [1, 1, 0], [None, None, None], [0, 1, 1], [0, 1, 0]])
+        self.assertEqual(hl.eval(hl.literal(collected)), collected)
@@ -15,3 +15,32 @@ class Tests(unittest.TestCase):
         self.assertEqual(l, Locus('1', 100))
         self.assertEqual(l, Locus(1, 100))
         self.assertEqual(l.reference_genome, hl.default_reference())
+
+    def test_predicates_same_as_eval(self):
+        rg = hl.get_reference('GRCh37')
+        loci = [Locus('1', 100), Locus('X', 60000), Locus('X', 60001), Locus('X', 2699521),
+                Locus('Y', 10001), Locus('Y', 59363567), Locus('MT', 5), Locus('GL000192.1', 5)]
+        expected = hl.eval(hl.array([hl.struct(global_position=l.global_position(),
+                                               in_x_nonpar=l.in_x_nonpar(),
+                                               in_x_par=l.in_x_par(),
+                                               in_y_nonpar=l.in_y_nonpar(),
+                                               in_y_par=l.in_y_par(),
+                                               in_autosome=l.in_autosome(),
+                                               in_autosome_or_par=l.in_autosome_or_par(),
+                                               in_mito=l.in_mito())
+                                     for l in [hl.literal(l) for l in loci]]))
+        actual = [hl.Struct(global_position=l.global_position(),
+                            in_x_nonpar=l.in_x_nonpar(),
+                            in_x_par=l.in_x_par(),
+                            in_y_nonpar=l.in_y_nonpar(),
+                            in_y_par=l.in_y_par(),
+                            in_autosome=l.in_autosome(),
+                            in_autosome_or_par=l.in_autosome_or_par(),
+                            in_mito=l.in_mito())
+                  for l in loci]
+        self.assertEqual(actual, expected)
+
+        for l in loci:
+            self.assertEqual(rg.locus_from_global_position(l.global_position()), l)
+        with self.assertRaises(ValueError):
+            rg.locus_from_global_position(-1)
@@ -162,6 +162,34 @@ class Tests(unittest.TestCase):
 
         self._assert_eq(bm.to_numpy(_force_blocking=True), a)
 
+    def test_to_from_numpy_transfer_files(self):
+        from unittest import mock
+        import hail.linalg.blockmatrix as blockmatrix
+
+        a = np.asfortranarray(np.arange(70, dtype=np.int32).reshape((7, 10)))
+        # converted to float64 one row at a time, in a file removed once read
+        transfer_dir = new_local_temp_dir()
+        with mock.patch.object(blockmatrix, '_transfer_chunk_bytes', 80), \
+                mock.patch.object(blockmatrix, '_transfer_parent_dir', lambda n_bytes: transfer_dir):
+            bm = BlockMatrix.from_numpy(a, block_size=3)
+            self.assertEqual(os.listdir(transfer_dir), [])
+            a1 = bm.to_numpy()
+        self.assertIsInstance(a1, np.memmap)
+        self._assert_eq(a1, a)
+
+        with self.assertRaises(TypeError):
+            BlockMatrix.from_numpy(np.array([['a', 'b']]))
+
+        # a memmap of a whole file is read from its file before from_numpy
+        # returns, so later writes to it do not change the block matrix
+        path = os.path.join(new_local_temp_dir(), 'a')
+        m = np.memmap(path, dtype=np.float64, mode='w+', shape=a.shape)
+        m[:] = a
+        bm = BlockMatrix.from_numpy(m)
+        m[:] = 0
+        self._assert_eq(bm.to_numpy(), a)
+        self._assert_eq(BlockMatrix.from_numpy(m[1:]).to_numpy(), np.zeros((6, 10)))
+
     def test_to_table(self):
         schema = hl.tstruct(row_idx=hl.tint64, entries=hl.tarray(hl.tfloat64))
         rows = [{'row_idx': 0, 'entries': [0.0, 1.0]},
@@ -1040,6 +1040,33 @@ class Tests(unittest.TestCase):
         mt2 = hl.read_matrix_table(f)
         self.assertTrue(mt._same(mt2))
 
+    def test_write_field_groups(self):
+        mt = hl.utils.range_matrix_table(300, 20, 6)
+        mt = mt.annotate_rows(a=hl.str(mt.row_idx), b=hl.range(0, mt.row_idx % 4), c=hl.float64(mt.row_idx))
+        mt = mt.annotate_entries(x=mt.row_idx * mt.col_idx)
+        f = new_temp_file(suffix='mt')
+        mt.write(f, _field_groups=[['b'], ['c']])
+        mt2 = hl.read_matrix_table(f)
+        self.assertTrue(mt._same(mt2))
+        self.assertTrue(mt.rows().select('b')._same(mt2.rows().select('b')))
+        self.assertTrue(mt.select_rows('c')._same(mt2.select_rows('c')))
+        self.assertTrue(mt.rows()._same(hl.read_table(f + '/rows')))
+
+    def test_write_partition_stats(self):
+        mt = hl.utils.range_matrix_table(100, 10, 4)
+        mt = mt.annotate_rows(x=hl.int64(mt.row_idx) * 3)
+        mt = mt.annotate_entries(e=mt.row_idx * mt.col_idx)
+        f = new_temp_file(suffix='mt')
+        mt.write(f, _partition_stats=[mt.x])
+        mt2 = hl.read_matrix_table(f)
+        self.assertEqual([s.x.max for s in mt2._partition_stats()], [72, 147, 222, 297])
+        self.assertTrue(mt.filter_rows(mt.x > 250)._same(mt2.filter_rows(mt2.x > 250)))
+        self.assertEqual(mt2.filter_rows(mt2.x <= 3).count_rows(), 2)
+        # partitions the stats rule out are not read
+        self.assertEqual(mt2.filter_rows(mt2.x > 250).n_partitions(), 1)
+        self.assertEqual(mt2.filter_rows(mt2.x <= 3).n_partitions(), 1)
+        self.assertEqual(mt2.filter_rows(mt2.x > 1000).n_partitions(), 0)
+
     def test_nulls_in_distinct_joins(self):
 
         # MatrixAnnotateRowsTable uses left distinct join
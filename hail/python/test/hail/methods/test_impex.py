@@ -1346,3 +1346,23 @@ class ImportTableTests(unittest.TestCase):
     def test_glob(self):
         tables = hl.import_table(resource('variantAnnotations.split.*.tsv'))
         assert tables.count() == 346
+
+    def test_import_table_impute_sample(self):
+        t = hl.utils.range_table(1000, 4)
+        t = t.annotate(x=hl.cond(t.idx == 999, '1.5', hl.str(t.idx)))
+        # compressed files are sampled from the start
+        f = new_temp_file(suffix='.bgz')
+        t.export(f)
+
+        t2 = hl.import_table(f, impute=True, impute_sample=100, impute_fallback='missing')
+        self.assertEqual(t2.x.dtype, hl.tint32)
+        self.assertEqual(t2.aggregate(hl.agg.count_where(hl.is_missing(t2.x))), 1)
+        with self.assertRaises(hl.utils.FatalError):
+            hl.import_table(f, impute=True, impute_sample=100)._force_count()
+        self.assertEqual(hl.import_table(f, impute=True).x.dtype, hl.tfloat64)
+
+        t3 = hl.import_table(f, impute=True, impute_sample=100, impute_fallback='missing', impute_cache=True)
+        self.assertTrue(hl.hadoop_exists(f + '.hail_types.json'))
+        t4 = hl.import_table(f, impute=True, impute_sample=100, impute_fallback='missing', impute_cache=True)
+        self.assertEqual(t4.row.dtype, t3.row.dtype)
+        self.assertTrue(t2._same(t4))
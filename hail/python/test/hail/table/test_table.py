@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 import pyspark.sql
 import pytest
@@ -589,6 +590,46 @@ class Tests(unittest.TestCase):
 
         self.assertTrue(t._same(t2))
 
+    def test_to_numpy(self):
+        ht = hl.utils.range_table(10, n_partitions=3)
+        ht = ht.annotate(x=hl.or_missing(ht.idx % 3 != 0, ht.idx / 2),
+                         y=hl.or_missing(ht.idx % 2 == 0, hl.str(ht.idx)),
+                         s=hl.struct(b=ht.idx < 5, l=hl.int64(ht.idx) << 40))
+        columns = ht.to_numpy()
+        assert list(columns) == ['idx', 'x', 'y', 's.b', 's.l']
+        assert columns['idx'].dtype == np.int32
+        assert columns['x'].dtype == np.float64
+        assert columns['s.l'].dtype == np.int64
+        rows = ht.flatten().collect()
+        for f, column in columns.items():
+            assert [None if m else v for v, m in zip(column.data.tolist(), np.ma.getmaskarray(column))] == \
+                [r[f] for r in rows]
+
+    def test_to_pandas_columnar(self):
+        ht = hl.utils.range_table(10, n_partitions=3)
+        ht = ht.annotate(x=hl.or_missing(ht.idx % 3 != 0, ht.idx),
+                         y=hl.or_missing(ht.idx % 2 == 0, hl.str(ht.idx)),
+                         l=hl.locus('1', ht.idx + 1))
+        df = ht.to_pandas(columnar=True)
+        assert list(df.columns) == ['idx', 'x', 'y', 'l.contig', 'l.position']
+        assert df['x'].isna().tolist() == [i % 3 == 0 for i in range(10)]
+        assert df['y'].tolist() == [str(i) if i % 2 == 0 else None for i in range(10)]
+        assert df['l.position'].tolist() == list(range(1, 11))
+
+    def test_to_pandas_columnar_collects_once(self):
+        from hail.ir.renderer import Renderer
+        from hail.utils.columnar import columns_expr
+        ht = hl.utils.range_table(10)
+        ht = ht.annotate(x=ht.idx * 2, y=hl.str(ht.idx), z=ht.idx / 3)
+        rendered = Renderer()(columns_expr(ht.collect(_localize=False))._ir)
+        assert rendered.count('(TableCollect') == 1
+
+    @skip_unless_spark_backend()
+    def test_to_pandas_columnar_matches_spark(self):
+        ht = hl.utils.range_table(10, n_partitions=3)
+        ht = ht.annotate(x=ht.idx / 3, y=hl.str(ht.idx), s=hl.struct(a=ht.idx, b=hl.set([ht.idx])))
+        pd.testing.assert_frame_equal(ht.to_pandas(columnar=True), ht.to_pandas())
+
     def test_rename(self):
         kt = hl.utils.range_table(10)
         kt = kt.annotate_globals(foo=5, fi=3)
@@ -729,6 +770,60 @@ class Tests(unittest.TestCase):
         t2 = hl.read_table(f)
         self.assertTrue(t._same(t2))
 
+    def test_write_field_groups(self):
+        t = hl.utils.range_table(500, 7)
+        t = t.annotate(a=hl.str(t.idx), b=hl.float64(t.idx) / 2, c=hl.range(0, t.idx % 5), d=hl.null(hl.tint32))
+        f = new_temp_file(suffix='ht')
+        t.write(f, _field_groups=[['c'], ['b', 'd']])
+        t2 = hl.read_table(f)
+        self.assertTrue(t._same(t2))
+        self.assertEqual(t2.row.dtype, t.row.dtype)
+        self.assertTrue(t.select('c', 'a')._same(t2.select('c', 'a')))
+        self.assertTrue(t.select('d')._same(t2.select('d')))
+        self.assertEqual(t2.aggregate(hl.agg.sum(t2.b)), t.aggregate(hl.agg.sum(t.b)))
+
+        t3 = hl.read_table(f, _intervals=[hl.Interval(start=150, end=250)])
+        self.assertTrue(t.filter((t.idx >= 150) & (t.idx < 250))._same(t3))
+
+        with self.assertRaises(hl.utils.FatalError):
+            t.write(new_temp_file(suffix='ht'), _field_groups=[['idx']])
+        with self.assertRaises(hl.utils.FatalError):
+            t.write(new_temp_file(suffix='ht'), _field_groups=[['a'], ['a', 'b']])
+
+    def test_write_partition_stats(self):
+        t = hl.utils.range_table(100, 4)
+        t = t.annotate(x=hl.float64(t.idx) / 2,
+                       s=hl.format('%03d', t.idx),
+                       info=hl.struct(y=hl.or_missing(t.idx % 2 == 0, t.idx)))
+        f = new_temp_file(suffix='ht')
+        t.write(f, _partition_stats=[t.x, t.s, t.info.y])
+        t2 = hl.read_table(f)
+        stats = t2._partition_stats()
+        self.assertEqual(len(stats), 4)
+        self.assertEqual(stats[0],
+                         hl.Struct(**{'x': hl.Struct(min=0.0, max=12.0, n_missing=0),
+                                      's': hl.Struct(min='000', max='024', n_missing=0),
+                                      'info.y': hl.Struct(min=0, max=24, n_missing=12)}))
+
+        for pred in [lambda t: t.x > 40,
+                     lambda t: (t.x < 5) | (t.s == '060'),
+                     lambda t: ~(t.s >= '050'),
+                     lambda t: hl.is_missing(t.info.y) & (t.idx < 30),
+                     lambda t: t.info.y == 99]:
+            self.assertTrue(t.filter(pred(t))._same(t2.filter(pred(t2))))
+        # partitions the stats rule out are not read
+        self.assertEqual(t2.filter(t2.x > 40).n_partitions(), 1)
+        self.assertEqual(t2.filter((t2.x < 5) | (t2.s == '060')).n_partitions(), 2)
+        self.assertEqual(t2.filter(t2.info.y == 99).n_partitions(), 0)
+
+        f2 = new_temp_file(suffix='ht')
+        t.write(f2)
+        self.assertIsNone(hl.read_table(f2)._partition_stats())
+        with self.assertRaises(ValueError):
+            t._partition_stats()
+        with self.assertRaises(hl.utils.FatalError):
+            t.write(new_temp_file(suffix='ht'), _partition_stats=[t.info])
+
     def test_min_partitions(self):
         assert hl.import_table(resource('variantAnnotations.tsv'), min_partitions=50).n_partitions() == 50
 
@@ -1012,6 +1107,64 @@ class Tests(unittest.TestCase):
         ht = hl.utils.range_table(10)
         assert hl.eval(ht.collect(_localize=False)) == ht.collect()
 
+    def test_aggregate_many(self):
+        ht = hl.utils.range_table(10)
+        assert ht.aggregate_many(hl.agg.max(ht.idx), hl.agg.count(), hl.agg.collect(hl.str(ht.idx))) == \
+            (9, 10, [str(i) for i in range(10)])
+
+    def test_eval_many(self):
+        ht = hl.utils.range_table(10).annotate_globals(g=5)
+        ht2 = hl.utils.range_table(3).annotate_globals(h='x')
+        mt = hl.utils.range_matrix_table(3, 4)
+        assert hl.eval_many(
+            1,
+            ht.g + 1,
+            ht.aggregate(hl.agg.sum(ht.idx), _localize=False),
+            ht2.h,
+            ht.aggregate(hl.agg.count(), _localize=False),
+            ht2.aggregate(hl.agg.count(), _localize=False),
+            ht.g * 2,
+            mt.aggregate_entries(hl.agg.count(), _localize=False),
+            mt.aggregate_entries(hl.agg.sum(mt.row_idx), _localize=False)) == \
+            (1, 6, 45, 'x', 10, 3, 10, 12, 12)
+        assert hl.eval_many() == ()
+
+    def test_iter_rows(self):
+        ht = hl.utils.range_table(23, n_partitions=8)
+        ht = ht.annotate(x=hl.str(ht.idx))
+        rows = ht.collect()
+        assert list(ht.iter_rows()) == rows
+        assert list(ht.collect(stream=True)) == rows
+        for batch_size in [1, 2, 3, 100]:
+            assert list(ht.iter_rows(batch_size=batch_size)) == rows
+        assert list(ht.filter(False).iter_rows()) == []
+        with self.assertRaises(ValueError):
+            ht.iter_rows(batch_size=0)
+
+    def test_iter_rows_removes_partition_files(self):
+        from unittest import mock
+        import hail.table
+        paths = []
+
+        def new_temp_file(**kwargs):
+            paths.append(hl.utils.new_temp_file(**kwargs))
+            return paths[-1]
+
+        ht = hl.utils.range_table(10, n_partitions=2)
+        with mock.patch.object(hail.table, 'new_temp_file', new_temp_file):
+            assert len(list(ht.iter_rows(batch_size=3))) == 10
+            rows = ht.iter_rows(batch_size=3)
+            next(rows)
+            rows.close()
+        assert len(paths) == 3
+        assert not any(hl.hadoop_exists(path) for path in paths)
+
+    def test_iter_rows_matrix_table(self):
+        mt = hl.utils.range_matrix_table(7, 3, n_partitions=3)
+        mt = mt.annotate_entries(x=mt.row_idx * mt.col_idx)
+        for t in [mt.rows(), mt.cols(), mt.entries()]:
+            assert list(t.iter_rows(batch_size=2)) == t.collect()
+
     def test_take_localize_false(self):
         ht = hl.utils.range_table(10)
         assert hl.eval(ht.take(3, _localize=False)) == ht.take(3)
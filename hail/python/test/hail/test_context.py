@@ -1,6 +1,10 @@
 import unittest
 
 import hail as hl
+from hail.backend.backend import _reader_stamps
+from hail.backend.daemon import _request
+from hail.utils import new_temp_file
+from hail.utils.java import Env
 from .helpers import startTestHailContext, stopTestHailContext
 
 setUpModule = startTestHailContext
@@ -17,3 +21,131 @@ class Tests(unittest.TestCase):
     def test_top_level_functions_are_do_not_error(self):
         hl.current_backend()
         hl.debug_info()
+
+    def test_jir_cache(self):
+        backend = hl.current_backend()
+        if not hasattr(backend, '_jir_cache'):
+            return
+        hl.utils.range_table(10).count()
+        hits = backend._jir_cache.hits
+        # rebuilt from scratch, so structurally equal but not identical
+        hl.utils.range_table(10).count()
+        self.assertGreater(backend._jir_cache.hits, hits)
+        self.assertIn('jir_cache', hl.debug_info()['caches'])
+
+        # reads of rewritten files are parsed again
+        path = new_temp_file(extension='ht')
+        hl.utils.range_table(10).write(path)
+        self.assertEqual(hl.read_table(path).count(), 10)
+        # stamped by the metadata every write replaces, not the directory
+        self.assertEqual([stamp[0] for stamp in _reader_stamps(hl.read_table(path)._tir, Env.fs())],
+                         [path + '/metadata.json.gz'])
+        hl.utils.range_table(5).write(path, overwrite=True)
+        self.assertEqual(hl.read_table(path).count(), 5)
+
+    def test_result_cache(self):
+        hl._set_result_cache(max_entries=10, max_bytes=1 << 20)
+        try:
+            stats = lambda: hl.debug_info()['caches']['result_cache']
+            t = hl.utils.range_table(10)
+            x = hl.literal([1, 2, 3]).map(lambda x: x * 2)
+            self.assertEqual(hl.eval(x), [2, 4, 6])
+            self.assertEqual(hl.eval(x), [2, 4, 6])
+            self.assertEqual(stats()['hits'], 1)
+
+            # random values are not cached
+            y = hl.rand_unif(0, 1)
+            hl.eval(y)
+            hl.eval(y)
+            self.assertEqual(stats()['hits'], 1)
+
+            path = new_temp_file(extension='ht')
+            t.write(path)
+            self.assertEqual(hl.read_table(path).count(), 10)
+            self.assertEqual(hl.read_table(path).count(), 10)
+            self.assertEqual(stats()['hits'], 2)
+            # rewriting the table invalidates values read from it
+            t.filter(t.idx < 5).write(path, overwrite=True)
+            self.assertEqual(hl.read_table(path).count(), 5)
+        finally:
+            hl._set_result_cache(False)
+
+    def test_auto_persist(self):
+        backend = hl.current_backend()
+        if not isinstance(backend, hl.backend.SparkBackend):
+            self.skipTest('auto persist needs a Spark backend')
+        hl._set_auto_persist(max_bytes=1 << 30)
+        try:
+            stats = lambda: hl.debug_info()['caches']['auto_persist']
+            t = hl.utils.range_table(100, n_partitions=4)
+            t = t.annotate(x=t.idx * 2)
+            t = t.filter(t.x % 3 == 0)
+            self.assertEqual(t.count(), 34)
+            self.assertEqual(stats()['persisted'], 0)
+            # computed by an earlier query, so persisted
+            self.assertEqual(t.count(), 34)
+            self.assertEqual(stats()['persisted'], 1)
+            self.assertEqual(stats()['hits'], 0)
+            self.assertEqual(t.aggregate(hl.agg.sum(t.x)), sum(x for x in range(0, 200, 2) if x % 3 == 0))
+            self.assertEqual(t.annotate(y=t.x + 1).y.collect()[:3], [1, 7, 13])
+            self.assertEqual(stats()['hits'], 2)
+            self.assertGreater(stats()['bytes_saved'], 0)
+
+            # persisted tables beyond the budget are unpersisted
+            hl._set_auto_persist(max_bytes=1)
+            self.assertEqual(stats()['entries'], 0)
+            self.assertEqual(stats()['evictions'], 1)
+        finally:
+            hl._set_auto_persist(False)
+
+    def test_daemon_sessions(self):
+        import os
+        import subprocess
+        import sys
+        import time
+
+        socket_path = os.path.join(hl.utils.new_local_temp_dir(), 'daemon.sock')
+        daemon = subprocess.Popen([sys.executable, '-m', 'hail.backend.daemon', '--socket', socket_path,
+                                   '--master', 'local[2]', '--idle-timeout', '600'])
+        try:
+            while _daemon_status(socket_path).get('free', 0) == 0:
+                self.assertIsNone(daemon.poll())
+                time.sleep(1)
+            # each session starts from the state of a new context
+            script = ('import hail as hl\n'
+                      f'hl.init(daemon={socket_path!r}, quiet=True)\n'
+                      'assert hl.eval(hl.literal([1, 2]).map(lambda x: x + 1)) == [2, 3]\n'
+                      'assert hl._get_flags("lower") == {"lower": None}\n'
+                      'hl._set_flags(lower="1")\n'
+                      'hl.ReferenceGenome("daemon_test", ["1"], {"1": 10})\n'
+                      'hl.stop()\n')
+            for _ in range(2):
+                subprocess.run([sys.executable, '-c', script], check=True)
+                while _daemon_status(socket_path)['in_use'] > 0:
+                    time.sleep(0.1)
+            self.assertEqual(_daemon_status(socket_path), {'free': 1, 'in_use': 0, 'starting': 0})
+        finally:
+            _request(socket_path, {'op': 'shutdown'})
+            daemon.wait(60)
+
+    def test_local_backend(self):
+        backend = hl.backend.LocalBackend(cores=4)
+        try:
+            t = hl.utils.range_table(1000, 8)
+            t = t.filter(t.idx % 3 == 0).annotate(x=hl.str(t.idx))
+            count, timings = backend.execute(hl.ir.TableCount(t._tir), timed=True)
+            self.assertEqual(count, 334)
+            self.assertEqual(len([stage for stage in timings if stage.endswith('-- partition 7')]), 1)
+            # partitions finish in any order, but are collected in order
+            rows = backend.execute(t.collect(_localize=False)._ir)
+            self.assertEqual(rows, t.collect())
+            self.assertEqual([row.idx for row in rows], list(range(0, 1000, 3)))
+        finally:
+            backend.stop()
+
+
+def _daemon_status(socket_path):
+    try:
+        return _request(socket_path, {'op': 'status'})
+    except OSError:
+        return {}
@@ -1,3 +1,4 @@
+import re
 import unittest
 import hail as hl
 import hail.ir as ir
@@ -274,6 +275,97 @@ class MatrixIRTests(unittest.TestCase):
         # ht._force_count()
 
 
+class HashTests(unittest.TestCase):
+    def deep(self, depth, leaf=0):
+        x = ir.I32(leaf)
+        for i in range(depth):
+            x = ir.ApplyBinaryPrimOp('+', x, ir.I32(i))
+        return x
+
+    def test_structurally_equal_irs_hash_equal(self):
+        for x, y in [(self.deep(100), self.deep(100)),
+                     (ir.MakeStruct([('a', ir.I32(1))]), ir.MakeStruct([('a', ir.I32(1))])),
+                     (ir.InsertFields(ir.Ref('row'), [('a', ir.I32(1))], None),
+                      ir.InsertFields(ir.Ref('row'), [('a', ir.I32(1))], None)),
+                     (ir.ArraySort(ir.Ref('a'), 'l', 'r', ir.TrueIR()),
+                      ir.ArraySort(ir.Ref('a'), 'l', 'r', ir.TrueIR()))]:
+            self.assertEqual(x, y)
+            self.assertEqual(hash(x), hash(y))
+
+    def test_structurally_different_irs_not_equal(self):
+        self.assertNotEqual(self.deep(100), self.deep(100, leaf=1))
+        self.assertNotEqual(self.deep(100), self.deep(101))
+        self.assertNotEqual(ir.MakeStruct([('a', ir.I32(1))]), ir.MakeStruct([('b', ir.I32(1))]))
+        self.assertNotEqual(ir.ArraySort(ir.Ref('a'), 'l', 'r', ir.TrueIR()),
+                            ir.ArraySort(ir.Ref('b'), 'l', 'r', ir.TrueIR()))
+
+    def test_hash_is_memoized(self):
+        x = self.deep(10_000)
+        h = hash(x)
+        self.assertEqual(x._hash, h)
+        self.assertEqual(x.children[0]._hash, hash(x.children[0]))
+        self.assertEqual({x: 1}[x], 1)
+
+    def test_deep_irs_compare_without_recursion(self):
+        x = self.deep(10_000)
+        self.assertEqual({x: 1}[self.deep(10_000)], 1)
+        self.assertNotEqual(x, self.deep(10_000, leaf=1))
+
+    def test_shared_irs_compare_each_pair_once(self):
+        def shared(depth, leaf=0):
+            x = ir.I32(leaf)
+            for _ in range(depth):
+                x = ir.ApplyBinaryPrimOp('+', x, x)
+            return x
+        self.assertEqual(shared(100), shared(100))
+        self.assertNotEqual(shared(100), shared(100, leaf=1))
+
+
+class CSETests(unittest.TestCase):
+    def test_shared_subexpression_rendered_once(self):
+        ht = hl.utils.range_table(10)
+        x = hl.float64(ht.idx)
+        for _ in range(40):
+            x = x + x
+        ht = ht.annotate(x=x)
+        self.assertLess(len(str(ht._tir)), 10_000)
+        self.assertEqual(ht.x.collect(), [float(i * 2 ** 40) for i in range(10)])
+
+    def test_shared_literal_bound_once(self):
+        s = hl.literal(set(range(0, 100, 3)))
+        ht = hl.utils.range_table(100)
+        ht = ht.filter(s.contains(ht.idx))
+        ht = ht.annotate(y=s.contains(ht.idx + 1))
+        self.assertEqual(str(ht._tir).count('(Literal '), 1)
+        self.assertEqual(ht.count(), 34)
+        self.assertFalse(any(ht.y.collect()))
+
+    def test_guarded_subexpression_not_hoisted(self):
+        a = hl.literal([1, 2, 3])
+        i = hl.literal(5)
+        elt = a[i]
+        self.assertIsNone(hl.eval(hl.or_missing(i < 3, elt + elt)))
+
+    def test_bound_variable_not_hoisted(self):
+        a = hl.literal([1, 2, 3])
+        self.assertEqual(hl.eval(a.map(lambda x: (lambda z: z * z + z)(x + 1))),
+                         [6, 12, 20])
+
+    def test_field_references_not_bound(self):
+        ht = hl.utils.range_table(10)
+        ht = ht.annotate(y=ht.idx + ht.idx * 2)
+        self.assertNotIn('(Let ', str(ht._tir))
+
+    def test_binding_names_unique_across_renders(self):
+        s = hl.literal(set(range(0, 100, 3)))
+        ht = hl.utils.range_table(100)
+        ht = ht.filter(s.contains(ht.idx))
+        ht = ht.annotate(y=s.contains(ht.idx + 1))
+        names = [re.findall(r'\(RelationalLet\w* (\S+)', str(ht._tir)) for _ in range(2)]
+        self.assertTrue(names[0])
+        self.assertFalse(set(names[0]) & set(names[1]))
+
+
 class BlockMatrixIRTests(unittest.TestCase):
     def blockmatrix_irs(self):
         scalar_ir = ir.F64(2)
@@ -350,3 +442,95 @@ class ValueTests(unittest.TestCase):
                     None))
             new_globals = hl.eval(hl.Table(map_globals_ir).index_globals())
             self.assertEqual(new_globals, hl.Struct(foo=v))
+
+    def test_encoded_value_same_after_parsing(self):
+        threshold = ir.Literal.encoded_threshold
+        ir.Literal.encoded_threshold = 0
+        try:
+            for t, v in self.values():
+                row_v = ir.Literal(t, v)
+                self.assertTrue(str(row_v).startswith('(EncodedLiteral '))
+                map_globals_ir = ir.TableMapGlobals(
+                    ir.TableRange(1, 1),
+                    ir.InsertFields(
+                        ir.Ref("global"),
+                        [("foo", row_v)],
+                        None))
+                new_globals = hl.eval(hl.Table(map_globals_ir).index_globals())
+                self.assertEqual(new_globals, hl.Struct(foo=v))
+        finally:
+            ir.Literal.encoded_threshold = threshold
+
+    def test_large_literal_encoded(self):
+        v = [None if i % 7 == 0 else str(i) for i in range(50_000)]
+        lit = hl.literal(v)
+        self.assertTrue(str(lit._ir).startswith('(EncodedLiteral '))
+        self.assertEqual(hl.eval(lit), v)
+
+    def test_large_parallelize_encoded(self):
+        rows = [hl.Struct(idx=i, x=i / 2) for i in range(20_000)]
+        ht = hl.Table.parallelize(rows, hl.tstruct(idx=hl.tint32, x=hl.tfloat64))
+        self.assertEqual(ht.collect(), rows)
+
+
+class ReaderTypeTests(unittest.TestCase):
+    def assert_local_type(self, reader, backend_type):
+        local_type = reader._local_type()
+        self.assertIsNotNone(local_type)
+        self.assertEqual(local_type, backend_type)
+
+    @classmethod
+    def setUpClass(cls):
+        import numpy as np
+        cls.bm_path = new_temp_file(extension='bm')
+        hl.linalg.BlockMatrix.from_numpy(np.ones((3, 8)), block_size=2).write(cls.bm_path)
+
+    def test_table_readers(self):
+        table_type = Env.backend().table_type
+        for reader in [ir.TableNativeReader(resource('required_globals.ht'), None, False),
+                       ir.TableFromBlockMatrixNativeReader(self.bm_path, None),
+                       ir.TextTableReader([resource('variantAnnotations.tsv')], None, {'Position': hl.tint32},
+                                          [], '\t', 'NA', False, False, None, False, False, None, None, False),
+                       ir.TextTableReader([resource('fastlmmPheno.txt')], None, {}, ['#'], r'\s+', 'NA',
+                                          True, False, '"', True, False, None, None, False)]:
+            self.assert_local_type(reader, table_type(ir.TableRead(reader)))
+
+    def test_matrix_readers(self):
+        matrix_type = Env.backend().matrix_type
+        for reader in [ir.MatrixNativeReader(resource('sample.vcf.mt'), None, False),
+                       ir.MatrixRangeReader(10, 5, None),
+                       ir.MatrixVCFReader(resource('sample.vcf'), [], hl.tfloat64, None, None, 'GRCh37',
+                                          None, True, False, False, False, None, None, None),
+                       ir.MatrixVCFReader(resource('sample.vcf.bgz'), ['PGT'], hl.tfloat32, None, None, None,
+                                          None, True, False, False, False, None, None, None)]:
+            self.assert_local_type(reader, matrix_type(ir.MatrixRead(reader)))
+
+    def test_blockmatrix_readers(self):
+        blockmatrix_type = Env.backend().blockmatrix_type
+        for reader in [ir.BlockMatrixNativeReader(self.bm_path),
+                       ir.BlockMatrixBinaryReader(self.bm_path, [1, 8], 3)]:
+            self.assert_local_type(reader, blockmatrix_type(ir.BlockMatrixRead(reader)))
+
+    def test_unsupported_readers_use_backend(self):
+        reader = ir.MatrixVCFReader(resource('sample.vcf'), [], hl.tfloat64, None, None, 'GRCh37',
+                                    None, True, False, False, False, 'rs685723', None, None)
+        self.assertIsNone(reader._local_type())
+        self.assertEqual(ir.MatrixRead(reader).typ.row_type['locus'], hl.tlocus('GRCh37'))
+
+    def test_write_invalidates_metadata(self):
+        path = new_temp_file(extension='ht')
+        hl.utils.range_table(5).write(path)
+        self.assertEqual(hl.read_table(path).row.dtype, hl.tstruct(idx=hl.tint32))
+        hl.utils.range_table(5).annotate(x=5).write(path, overwrite=True)
+        self.assertEqual(hl.read_table(path).row.dtype, hl.tstruct(idx=hl.tint32, x=hl.tint32))
+
+    def test_metadata_rewritten_elsewhere_is_read_again(self):
+        path = new_temp_file(extension='ht')
+        other = new_temp_file(extension='ht')
+        hl.utils.range_table(5).write(path)
+        hl.utils.range_table(5).annotate(x=5).write(other)
+        self.assertEqual(hl.read_table(path).row.dtype, hl.tstruct(idx=hl.tint32))
+        # not written through this session's writers, so not invalidated
+        hl.hadoop_copy(other + '/metadata.json.gz', path + '/metadata.json.gz')
+        self.assertEqual(hl.ir.reader_metadata.native_type(path).row_type,
+                         hl.tstruct(idx=hl.tint32, x=hl.tint32))
@@ -6,3 +6,13 @@ from .helpers import *
 class Tests(unittest.TestCase):
     def test_get_reference_before_init(self):
         hl.get_reference('GRCh37') # Should be no error
+
+    def test_lazy_submodules(self):
+        import subprocess
+        import sys
+        script = ('import sys, hail as hl\n'
+                  'eager = [m for m in ("pandas", "scipy", "bokeh", "hail.linalg", "hail.plot") if m in sys.modules]\n'
+                  'assert not eager, eager\n'
+                  'assert hl.linalg.BlockMatrix is sys.modules["hail.linalg"].BlockMatrix\n'
+                  'assert "plot" in dir(hl)\n')
+        subprocess.run([sys.executable, '-c', script], check=True)
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from aiohttp import web
+
+import hail as hl
+from hail import ir
+from hail.ir.renderer import Renderer
+from hail.backend import ServiceBackend, AsyncServiceBackend
+
+
+class StandInApiserver:
+    """Local stand-in for the apiserver that answers from the types of the
+    IRs it receives instead of executing them, and records the requests."""
+
+    def __init__(self, types):
+        self.types = types
+        self.requests = []
+        self.connections = set()
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+        routes = web.RouteTableDef()
+
+        @routes.post('/type/value')
+        async def value_type(request):
+            code = await self.record(request)
+            return web.json_response(str(self.types[code]))
+
+        @routes.post('/type/table')
+        async def table_type(request):
+            code = await self.record(request)
+            ttyp = self.types[code]
+            response = web.json_response({'global': str(ttyp.global_type),
+                                          'row': str(ttyp.row_type),
+                                          'row_key': ttyp.row_key})
+            response.enable_compression()
+            return response
+
+        @routes.post('/execute/encoded')
+        async def execute_encoded(request):
+            code = await self.record(request)
+            return web.Response(body=hl.tint32._to_encoding(len(code)),
+                                headers={'X-Hail-Timings': json.dumps({'timings': {}})})
+
+        self.app = web.Application()
+        self.app.add_routes(routes)
+
+    async def record(self, request):
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            self.connections.add(request.transport.get_extra_info('peername'))
+            self.requests.append((request.path,
+                                  request.headers.get('Content-Encoding'),
+                                  request.headers.get('Accept-Encoding')))
+            # give concurrent requests the chance to overlap
+            await asyncio.sleep(0.05)
+            return await request.json()
+        finally:
+            self.concurrent -= 1
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        self.runner = web.AppRunner(self.app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, 'localhost', 0)
+        self.loop.run_until_complete(site.start())
+        self.url = f'http://localhost:{site._server.sockets[0].getsockname()[1]}'
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def render(x):
+    return Renderer()(x)
+
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.small = ir.I32(5)
+        self.large = ir.ArrayLen(hl.literal(list(range(1000)))._ir)
+        self.table = hl.utils.range_table(10)._tir
+        self.server = StandInApiserver({render(self.small): hl.tint32,
+                                        render(self.large): hl.tint32,
+                                        render(self.table): self.table.typ})
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_pooled_connections(self):
+        backend = ServiceBackend(self.server.url, token='token')
+        for _ in range(5):
+            self.assertEqual(backend.value_type(self.small), hl.tint32)
+        backend.close()
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_compressed_bodies(self):
+        backend = ServiceBackend(self.server.url, token='token')
+        self.assertEqual(backend.value_type(self.small), hl.tint32)
+        self.assertEqual(backend.value_type(self.large), hl.tint32)
+        self.assertEqual(backend.execute(self.large), len(render(self.large)))
+        self.assertEqual(backend.table_type(self.table), self.table.typ)
+        backend.close()
+        content_encodings = [encoding for _, encoding, _ in self.server.requests]
+        self.assertEqual(content_encodings, [None, 'gzip', 'gzip', None])
+        self.assertTrue(all('gzip' in accept for _, _, accept in self.server.requests))
+
+    def test_async_backend(self):
+        async def run():
+            async with AsyncServiceBackend(self.server.url, token='token') as backend:
+                futures = [asyncio.ensure_future(backend.value_type(self.small)),
+                           asyncio.ensure_future(backend.table_type(self.table))]
+                futures += [asyncio.ensure_future(backend.execute(x)) for x in [self.small, self.large]]
+                return await asyncio.gather(*futures)
+
+        results = asyncio.new_event_loop().run_until_complete(run())
+        self.assertEqual(results, [hl.tint32, self.table.typ,
+                                   len(render(self.small)), len(render(self.large))])
+        self.assertEqual(self.server.max_concurrent, 4)
+        self.assertEqual([encoding for path, encoding, _ in self.server.requests
+                          if path == '/execute/encoded'].count('gzip'), 1)
@@ -277,3 +277,64 @@ class Tests(unittest.TestCase):
         f(1)
         with self.assertRaises(TypeError):
             f(1, 2)
+
+    def test_signature_preserved(self):
+        import inspect
+
+        @typecheck(x=int, y=str, args=int, z=nullable(int), kwargs=int)
+        def f(x, y='a', *args, z=None, **kwargs):
+            """doc"""
+            return x, y, args, z, kwargs
+
+        self.assertEqual(str(inspect.signature(f)), "(x, y='a', *args, z=None, **kwargs)")
+        self.assertEqual(f.__name__, 'f')
+        self.assertEqual(f.__doc__, 'doc')
+        self.assertEqual(f(1, 'b', 2, 3, z=4, w=5), (1, 'b', (2, 3), 4, {'w': 5}))
+        self.assertEqual(f(y='c', x=1), (1, 'c', (), None, {}))
+        with self.assertRaisesRegex(TypeError, "f: parameter 'y': expected str, found int: 2"):
+            f(1, 2)
+        with self.assertRaisesRegex(TypeError, "f: parameter 'z': expected"):
+            f(1, z='2')
+
+    def test_cached_results(self):
+        calls = []
+
+        def parse(x):
+            calls.append(x)
+            return [x]
+
+        @typecheck(x=oneof(int, transformed((str, parse), cache=True)))
+        def f(x):
+            return x
+
+        self.assertEqual(f('a'), ['a'])
+        self.assertEqual(f('a'), ['a'])
+        self.assertEqual(f(1), 1)
+        self.assertEqual(calls, ['a'])
+        clear_caches()
+        f('a')
+        self.assertEqual(calls, ['a', 'a'])
+
+        @typecheck(x=transformed((str, parse)))
+        def g(x):
+            return x
+
+        g('b')
+        g('b')
+        self.assertEqual(calls, ['a', 'a', 'b', 'b'])
+
+    def test_checks_disabled(self):
+        @typecheck(x=int, y=transformed((str, lambda y: y + '!')))
+        def f(x, y):
+            return x, y
+
+        set_checks_enabled(False)
+        try:
+            # checks that only validate are skipped, conversions still run
+            self.assertEqual(f('1', 'a'), ('1', 'a!'))
+            with self.assertRaises(TypeError):
+                f(1, 2)
+        finally:
+            set_checks_enabled(True)
+        with self.assertRaises(TypeError):
+            f('1', 'a')
@@ -1,10 +1,16 @@
+import gc
+import pickle
+import tracemalloc
 import unittest
 
+import numpy as np
+
 import hail as hl
 from hail.utils import *
 from hail.utils.misc import escape_str, escape_id
 from hail.utils.java import Env
 from hail.utils.linkedlist import LinkedList
+from hail.utils.lru_cache import LRUCache
 from ..helpers import *
 
 setUpModule = startTestHailContext
@@ -148,6 +154,48 @@ class Tests(unittest.TestCase):
         self.assertEqual(s.annotate(**{'a': 5, 'x': 10, 'y': 15}),
                          Struct(a=5, b=2, c=3, x=10, y=15))
 
+    def test_struct_records(self):
+        t = hl.tstruct(a=hl.tint32, keys=hl.tstr, **{'1kg': hl.tfloat64, 'c d': hl.tarray(hl.tstruct(x=hl.tint32))})
+        s = Struct(a=1, keys='x', **{'1kg': 2.5, 'c d': [Struct(x=1), None]})
+        records = [hl.eval(hl.literal(s, t)), t._convert_from_json(t._convert_to_json(s))]
+        for r in records:
+            self.assertIsInstance(r, Struct)
+            self.assertFalse(hasattr(r, '__dict__') and r.__dict__)
+            self.assertIs(type(r), type(records[0]))
+            self.assertEqual(r, s)
+            self.assertEqual(s, r)
+            self.assertEqual(str(r), str(s))
+            self.assertEqual(list(r.items()), list(s.items()))
+            self.assertEqual((r.a, r.keys, r['1kg'], r['c d'][0].x), (1, 'x', 2.5, 1))
+            self.assertEqual(hash(r.drop('c d')), hash(s.drop('c d')))
+            self.assertEqual(r.annotate(y=2), s.annotate(y=2))
+            self.assertEqual(r.select('a', y=2), s.select('a', y=2))
+            self.assertEqual(r.drop('a'), s.drop('a'))
+            self.assertEqual(pickle.loads(pickle.dumps(r)), s)
+            with self.assertRaises(AttributeError):
+                r.y
+            with self.assertRaises(KeyError):
+                r['y']
+
+    def test_struct_records_memory(self):
+        t = hl.tstruct(**{f'f{i}': hl.tint32 for i in range(20)})
+        rows = [hl.Struct(**{f'f{i}': j + i for i in range(20)}) for j in range(1000)]
+        json = [t._convert_to_json(r) for r in rows]
+
+        def allocated(f):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                values = f()
+                return tracemalloc.get_traced_memory()[0], values
+            finally:
+                tracemalloc.stop()
+
+        record_bytes, records = allocated(lambda: [t._convert_from_json(x) for x in json])
+        struct_bytes, structs = allocated(lambda: [hl.Struct(**x) for x in json])
+        self.assertEqual(records, structs)
+        self.assertLess(record_bytes, 2 * struct_bytes / 3)
+
     def test_expr_exception_results_in_fatal_error(self):
         df = range_table(10)
         df = df.annotate(x=[1, 2])
@@ -169,6 +217,83 @@ class Tests(unittest.TestCase):
         self.assertFalse(interval1.contains(22))
         self.assertTrue(interval1.overlaps(interval2))
 
+    def test_interval_ops_same_as_eval(self):
+        endpoints = [-1.5, -0.0, 0.0, 1.0, float('inf')]
+        points = endpoints + [None, float('nan')]
+        intervals = [Interval(endpoints[i], endpoints[j], includes_start, includes_end)
+                     for i in range(5) for j in range(i, 5)
+                     for includes_start in [True, False] for includes_end in [True, False]
+                     if i < j or (includes_start and includes_end)]
+        for i in intervals:
+            expected = hl.eval(hl.array([hl.literal(i).contains(hl.literal(p, hl.tfloat64)) for p in points]))
+            self.assertEqual([i.contains(p) if p is not None else None for p in points], expected)
+            expected = hl.eval(hl.array([hl.literal(i).overlaps(j) for j in intervals]))
+            self.assertEqual([i.overlaps(j) for j in intervals], expected)
+
+        loci = [hl.Locus('1', 100), hl.Locus('1', 1000), hl.Locus('X', 5), hl.Locus('MT', 5)]
+        interval = Interval(hl.Locus('1', 1000), hl.Locus('X', 5), includes_end=True)
+        self.assertEqual([interval.contains(l) for l in loci],
+                         hl.eval(hl.array([hl.literal(interval).contains(l) for l in loci])))
+
+        with self.assertRaises(TypeError):
+            Interval(3, 22).contains('a')
+        with self.assertRaises(TypeError):
+            Interval(3, 22).overlaps(Interval('a', 'b'))
+
+    def test_interval_index(self):
+        intervals = [Interval(0, 10), Interval(5, 15, includes_start=False, includes_end=True),
+                     Interval(5, 5), Interval(20, 30), Interval(-5, 40)]
+        index = IntervalIndex(intervals)
+        points = [-10, 0, 5, 10, 15, 25, 40, None]
+        self.assertEqual(list(index.count_many(points)), [0, 2, 2, 2, 2, 2, 0, 0])
+        self.assertEqual(list(index.count_many(np.array([-10, 0, 5]))), [0, 2, 2])
+        self.assertEqual(index.query(5), [Interval(-5, 40), Interval(0, 10)])
+        self.assertFalse(index.contains(None))
+        self.assertEqual(index.overlaps(Interval(15, 20, includes_start=False)), [Interval(-5, 40)])
+        self.assertEqual(index.overlaps(Interval(15, 20, includes_end=True)),
+                         [Interval(-5, 40), Interval(5, 15, includes_start=False, includes_end=True),
+                          Interval(20, 30)])
+
+        for point_type, make in [(hl.tint32, lambda i: i),
+                                 (hl.tstr, lambda i: str(i)),
+                                 (hl.tlocus(), lambda i: hl.Locus(['1', '2'][i % 2], i + 1)),
+                                 (hl.tstruct(a=hl.tint32, b=hl.tfloat64), lambda i: hl.Struct(a=i // 3, b=i / 2))]:
+            intervals = [Interval(make(i), make(j), includes_start, includes_end, point_type)
+                         for i in range(0, 12, 3) for j in range(i, 12, 4)
+                         for includes_start in [True, False] for includes_end in [True, False]
+                         if i < j or (includes_start and includes_end)]
+            index = IntervalIndex(intervals)
+            points = [make(i) for i in range(13)]
+            expected = hl.eval(hl.array([hl.array([hl.literal(i).contains(hl.literal(p, point_type))
+                                                   for i in intervals]) for p in points]))
+            point_indices, interval_indices = index.query_many(points)
+            found = [[False] * len(intervals) for _ in points]
+            for p, i in zip(point_indices, interval_indices):
+                found[p][i] = True
+            self.assertEqual(found, expected)
+
+            queries = intervals[::3]
+            expected = hl.eval(hl.array([hl.array([hl.literal(q).overlaps(i) for i in intervals]) for q in queries]))
+            query_indices, interval_indices = index.overlaps_many(queries)
+            found = [[False] * len(intervals) for _ in queries]
+            for q, i in zip(query_indices, interval_indices):
+                found[q][i] = True
+            self.assertEqual(found, expected)
+
+    def test_interval_index_spanning_interval(self):
+        intervals = [Interval(0, 10 ** 9)] + [Interval(10 * i, 10 * i + 5) for i in range(100_000)]
+        index = IntervalIndex(intervals)
+        points = np.arange(0, 1_000_000, 7)
+        point_indices, interval_indices = index.query_many(points)
+        inside = np.flatnonzero(points % 10 < 5)
+        self.assertEqual(point_indices.tolist(), sorted(list(range(len(points))) + inside.tolist()))
+        self.assertEqual(interval_indices[point_indices == inside[1]].tolist(), [0, points[inside[1]] // 10 + 1])
+        self.assertEqual(list(index.count_many(points[:3])), [2, 1, 2])
+
+        query_indices, interval_indices = index.overlaps_many([Interval(12, 28), Interval(-5, 0, includes_end=True)])
+        self.assertEqual(query_indices.tolist(), [0, 0, 0, 1, 1])
+        self.assertEqual(interval_indices.tolist(), [0, 2, 3, 0, 1])
+
     def test_range_matrix_table_n_lt_partitions(self):
         hl.utils.range_matrix_table(1, 1)._force_count_rows()
 
@@ -194,3 +319,23 @@ class Tests(unittest.TestCase):
         self.assertEqual(escape_id("cat"), "cat")
         self.assertEqual(escape_id("abc123"), "abc123")
         self.assertEqual(escape_id("123abc"), "`123abc`")
+
+    def test_lru_cache(self):
+        cache = LRUCache(3, 10, size=len)
+        cache.put('a', 'aaaa')
+        cache.put('b', 'bb')
+        self.assertEqual(cache.get('a'), 'aaaa')
+        cache.put('c', 'cccc')
+        # 'b' is the least recently used value and the total size is 10
+        cache.put('d', 'd')
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.total_size, 9)
+        cache.put('e', 'e')
+        self.assertNotIn('a', cache)
+        self.assertEqual(len(cache), 3)
+        # larger than the cache
+        cache.put('f', 'f' * 11)
+        self.assertNotIn('f', cache)
+        self.assertIsNone(cache.get('b'))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (1, 1, 2))
@@ -5,7 +5,7 @@ import java.nio.charset.Charset
 import java.util.Properties
 
 import is.hail.annotations._
-import is.hail.backend.Backend
+import is.hail.backend.{AutoPersist, Backend}
 import is.hail.backend.distributed.DistributedBackend
 import is.hail.backend.spark.SparkBackend
 import is.hail.expr.ir
@@ -326,6 +326,27 @@ object HailContext {
     theContext = null
   }
 
+  /**
+    * Starts a session on a context kept alive across sessions, as by the backend
+    * daemon, with a new temporary directory in `tmpDir`.
+    */
+  def startSession(tmpDir: String): Unit = contextLock.synchronized {
+    get.startSession(tmpDir)
+  }
+
+  /**
+    * Ends the current session, deleting its temporary directory and restoring the
+    * references, functions and flags of a new context. The SparkContext and the
+    * compiled code are kept for the next session.
+    */
+  def endSession(): Unit = contextLock.synchronized {
+    val hc = get
+    ReferenceGenome.reset()
+    IRFunctionRegistry.clearUserFunctions()
+    ReferenceGenome.addDefaultReferences()
+    hc.endSession()
+  }
+
   def startProgressBar(sc: SparkContext) {
     ProgressBarBuilder.build(sc)
   }
@@ -584,6 +605,113 @@ object HailContext {
     }
   }
 
+  // reads the rows of a partition stored in several streams sharing the index
+  // `idxr`; the fields of `requestedType` are taken from the stream whose
+  // requested type has them
+  def readGroupedRowsPartition(
+    mkDecs: IndexedSeq[(InputStream) => Decoder],
+    requestedType: PStruct,
+    requestedTypes: IndexedSeq[PStruct]
+  )(ctx: RVDContext,
+    ins: IndexedSeq[InputStream],
+    idxr: IndexReader,
+    offsetFields: IndexedSeq[Option[String]],
+    bounds: Interval
+  ): Iterator[RegionValue] = new Iterator[RegionValue] {
+    private val region = ctx.region
+    private val rv = RegionValue(region)
+    private val rvb = new RegionValueBuilder(region)
+    private val idx = idxr.queryByInterval(bounds).buffered
+    private val nStreams = ins.length
+
+    private val fieldStream = requestedType.fieldNames.map(f => requestedTypes.indexWhere(_.hasField(f)))
+    private val fieldIdx = requestedType.fieldNames.zip(fieldStream).map { case (f, j) => requestedTypes(j).fieldIdx(f) }
+    private val offs = new Array[Long](nStreams)
+
+    private val offsetIdx = offsetFields.map(_.map(idxr.annotationType.asInstanceOf[TStruct].fieldIdx))
+
+    private def closeAll(): Unit = {
+      idxr.close()
+      ins.foreach(_.close())
+    }
+
+    private val decs: Array[Decoder] = try {
+      if (idx.hasNext) {
+        val i = idx.head
+        Array.tabulate(nStreams) { j =>
+          val dec = mkDecs(j)(new ByteTrackingInputStream(ins(j)))
+          dec.seek(offsetIdx(j).map(k => i.annotation.asInstanceOf[Row].getAs[Long](k)).getOrElse(i.recordOffset))
+          dec
+        }
+      } else {
+        closeAll()
+        null
+      }
+    } catch {
+      case e: Exception =>
+        closeAll()
+        throw e
+    }
+
+    private def nextCont(): Byte = {
+      val b = decs(0).readByte()
+      var j = 1
+      while (j < nStreams) {
+        val bj = decs(j).readByte()
+        assert(b == bj)
+        j += 1
+      }
+      b
+    }
+
+    private var cont: Byte = if (decs != null) nextCont() else 0
+
+    def hasNext: Boolean = cont != 0 && idx.hasNext
+
+    def next(): RegionValue = {
+      if (!hasNext)
+        throw new NoSuchElementException("next on empty iterator")
+
+      try {
+        idx.next()
+        var j = 0
+        while (j < nStreams) {
+          offs(j) = decs(j).readRegionValue(region)
+          j += 1
+        }
+
+        rvb.start(requestedType)
+        rvb.startStruct()
+        var i = 0
+        while (i < fieldIdx.length) {
+          val s = fieldStream(i)
+          rvb.addField(requestedTypes(s), region, offs(s), fieldIdx(i))
+          i += 1
+        }
+        rvb.endStruct()
+        rv.setOffset(rvb.end())
+        cont = nextCont()
+
+        if (cont == 0) {
+          decs.foreach(_.close())
+          idxr.close()
+        }
+
+        rv
+      } catch {
+        case e: Exception =>
+          decs.foreach(_.close())
+          idxr.close()
+          throw e
+      }
+    }
+
+    override def finalize(): Unit = {
+      idxr.close()
+      if (decs != null) decs.foreach(_.close())
+    }
+  }
+
   private[this] val codecsKey = "io.compression.codecs"
   private[this] val hadoopGzipCodec = "org.apache.hadoop.io.compress.GzipCodec"
   private[this] val hailGzipAsBGZipCodec = "is.hail.io.compress.BGzipCodecGZ"
@@ -620,10 +748,33 @@ class HailContext private(
   lazy val sparkSession = SparkSession.builder().config(sc.getConf).getOrCreate()
   lazy val bcFS: Broadcast[FS] = sc.broadcast(sFS)
 
-  val tmpDir = TempDir.createTempDir(tmpDirPath, sFS)
-  info(s"Hail temporary directory: $tmpDir")
+  private[this] var _tmpDir = TempDir.createTempDir(tmpDirPath, sFS)
+  info(s"Hail temporary directory: $_tmpDir")
+
+  def tmpDir: String = _tmpDir
+
+  private[this] var _flags: HailFeatureFlags = new HailFeatureFlags()
+
+  def flags: HailFeatureFlags = _flags
 
-  val flags: HailFeatureFlags = new HailFeatureFlags()
+  private[this] var _autoPersist: Option[AutoPersist] = None
+
+  def autoPersist: Option[AutoPersist] = _autoPersist
+
+  def enableAutoPersist(maxBytes: Long): Unit = _autoPersist match {
+    case Some(ap) =>
+      ap.maxBytes = maxBytes
+      ap.evict()
+    case None =>
+      _autoPersist = Some(new AutoPersist(maxBytes))
+  }
+
+  def disableAutoPersist(): Unit = {
+    _autoPersist.foreach(_.clear())
+    _autoPersist = None
+  }
+
+  def pyAutoPersistStatsJSON(): String = _autoPersist.map(_.statsJSON).orNull
 
   var checkRVDKeys: Boolean = false
 
@@ -643,6 +794,19 @@ class HailContext private(
 
   def version: String = is.hail.HAIL_PRETTY_VERSION
 
+  private def startSession(tmpDirPath: String): Unit = {
+    _tmpDir = TempDir.createTempDir(tmpDirPath, sFS)
+    info(s"Hail temporary directory: $_tmpDir")
+  }
+
+  private def endSession(): Unit = {
+    sFS.delete(_tmpDir, recursive = true)
+    _flags = new HailFeatureFlags()
+    disableAutoPersist()
+    checkRVDKeys = false
+    irVectors.clear()
+  }
+
   def grep(regex: String, files: Seq[String], maxLines: Int = 100) {
     val regexp = regex.r
     sc.textFilesLines(sFS.globAll(files))
@@ -901,6 +1065,59 @@ class HailContext private(
     }
   }
 
+  def readRowsGrouped(
+    paths: IndexedSeq[String],
+    indexSpecs: IndexedSeq[IndexSpec],
+    typs: IndexedSeq[PStruct],
+    codecSpec: CodecSpec,
+    partFiles: Array[String],
+    bounds: Array[Interval],
+    requestedType: PStruct,
+    requestedTypes: IndexedSeq[PStruct]
+  ): ContextRDD[RVDContext, RegionValue] = {
+    require(paths.length == indexSpecs.length && paths.length == typs.length && paths.length == requestedTypes.length)
+    val localFS = bcFS
+    val makeDecs = typs.zip(requestedTypes).map { case (t, rt) => codecSpec.buildDecoder(t, rt) }
+
+    val nPartitions = partFiles.length
+    val indexPath = s"${ paths.head }/${ indexSpecs.head.relPath }"
+    val mkIndexReader = {
+      val (keyType, annotationType) = indexSpecs.head.types
+      indexSpecs.foreach(_.offsetField.foreach { f =>
+        require(annotationType.asInstanceOf[TStruct].hasField(f))
+        require(annotationType.asInstanceOf[TStruct].fieldType(f) == TInt64())
+      })
+      val (leafDec, intDec) = IndexReader.buildDecoders(keyType, annotationType)
+      IndexReaderBuilder.withDecoders(leafDec, intDec, keyType, annotationType)
+    }
+
+    val rdd = new RDD[(IndexedSeq[InputStream], IndexReader, Interval)](sc, Nil) {
+      def getPartitions: Array[Partition] =
+        Array.tabulate(nPartitions) { i =>
+          IndexedFilePartition(i, partFiles(i), Some(bounds(i)))
+        }
+
+      override def compute(
+        split: Partition, context: TaskContext
+      ): Iterator[(IndexedSeq[InputStream], IndexReader, Interval)] = {
+        val p = split.asInstanceOf[IndexedFilePartition]
+        val fs = localFS.value
+        val idxr = mkIndexReader(fs, s"$indexPath/${ p.file }.idx", 8) // default cache capacity
+        val ins = paths.map(path => fs.unsafeReader(s"$path/parts/${ p.file }"))
+        Iterator.single((ins, idxr, p.bounds.get))
+      }
+    }
+
+    val offsetFields = indexSpecs.map(_.offsetField)
+    ContextRDD.weaken[RVDContext](rdd).cmapPartitions { (ctx, it) =>
+      assert(it.hasNext)
+      val (ins, idxr, bounds) = it.next
+      assert(!it.hasNext)
+      HailContext.readGroupedRowsPartition(makeDecs, requestedType, requestedTypes)(
+        ctx, ins, idxr, offsetFields, bounds)
+    }
+  }
+
   def parseVCFMetadata(file: String): Map[String, Map[String, Map[String, String]]] = {
     LoadVCF.parseHeaderMetadata(this, Set.empty, TFloat64(), file)
   }
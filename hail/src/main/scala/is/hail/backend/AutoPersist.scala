@@ -0,0 +1,142 @@
+package is.hail.backend
+
+import java.util
+import java.util.Map.Entry
+
+import is.hail.expr.ir._
+import is.hail.rvd.RVD
+import is.hail.utils._
+import org.apache.spark.storage.StorageLevel
+import org.json4s.DefaultFormats
+import org.json4s.jackson.Serialization
+
+import scala.collection.JavaConverters._
+import scala.collection.mutable
+
+// Persists the table and matrix table subtrees that recur across the queries
+// of a session, so that later queries read them instead of recomputing them.
+// A subtree is persisted (in memory and on disk) the second time a query
+// contains it, and the least recently used persisted subtrees are unpersisted
+// once they hold more than `maxBytes` bytes. Subtrees are matched by
+// structural equality, so the files they read are assumed not to change
+// during the session. Leaves, like reads, are not persisted.
+class AutoPersist(var maxBytes: Long, maxSeen: Int = 1000) {
+  private[this] val seen = new Cache[BaseIR, java.lang.Boolean](maxSeen)
+
+  private[this] case class Persisted(literal: BaseIR, rvd: RVD, bytes: Long)
+
+  // in order of use, least recent first
+  private[this] val persisted = new util.LinkedHashMap[BaseIR, Persisted](16, 0.75f, true)
+
+  private[this] var totalBytes: Long = 0L
+  private[this] var hits: Long = 0L
+  private[this] var bytesSaved: Long = 0L
+  private[this] var nPersisted: Long = 0L
+  private[this] var evictions: Long = 0L
+
+  def scoped[T](ir: IR)(f: IR => T): T = synchronized {
+    try
+      f(apply(ir))
+    finally
+      evict()
+  }
+
+  // `ir` with the subtrees persisted by earlier queries replaced by their
+  // persisted values, after persisting those an earlier query computed
+  def apply(ir: IR): IR = synchronized {
+    val current = mutable.ArrayBuffer[BaseIR]()
+    val hitsBefore = hits
+    val bytesSavedBefore = bytesSaved
+    val newIR = rewrite(ir, current, persistReused = true).asInstanceOf[IR]
+    current.foreach(x => seen += x -> java.lang.Boolean.TRUE)
+    if (hits > hitsBefore)
+      log.info(s"auto persist: ${ hits - hitsBefore } ${ plural(hits - hitsBefore, "hit") } " +
+        s"saved ${ formatSpace(bytesSaved - bytesSavedBefore) }; $hits ${ plural(hits, "hit") } " +
+        s"saved ${ formatSpace(bytesSaved) } this session")
+    newIR
+  }
+
+  // with `persistReused` false, only replaces the subtrees already persisted
+  private def rewrite(ir: BaseIR, current: mutable.ArrayBuffer[BaseIR], persistReused: Boolean): BaseIR = ir match {
+    // the bodies of relational lets refer to their values
+    case _: RelationalLet | _: RelationalLetTable | _: RelationalLetMatrixTable | _: RelationalLetBlockMatrix =>
+      val value = rewrite(ir.children(0), current, persistReused)
+      if (value eq ir.children(0))
+        ir
+      else
+        ir.copy(value +: ir.children.tail)
+    case _: TableIR | _: MatrixIR if ir.children.nonEmpty =>
+      Option(persisted.get(ir)) match {
+        case Some(p) =>
+          hits += 1
+          bytesSaved += p.bytes
+          log.info(s"auto persist: hit on ${ ir.getClass.getSimpleName }, reading ${ formatSpace(p.bytes) } persisted")
+          p.literal
+        case None if persistReused && seen.get(ir).isDefined =>
+          persist(ir, ir.mapChildren(rewrite(_, current, persistReused = false)))
+        case None =>
+          current += ir
+          ir.mapChildren(rewrite(_, current, persistReused))
+      }
+    case _ =>
+      ir.mapChildren(rewrite(_, current, persistReused))
+  }
+
+  // persists the value of `ir`, computed as `toCompute`
+  private def persist(ir: BaseIR, toCompute: BaseIR): BaseIR = ExecuteContext.scoped { ctx =>
+    val tv = toCompute match {
+      case tir: TableIR => Interpret(tir, ctx, optimize = true)
+      case mir: MatrixIR => Interpret(mir, ctx, optimize = true)
+    }
+    // rows persisted by `Table.persist` are left to their owner
+    val owned = tv.rvd.storageLevel == StorageLevel.NONE
+    val rvd = if (owned) tv.rvd.persist(StorageLevel.MEMORY_AND_DISK) else tv.rvd
+    val tl = TableLiteral(tv.copy(rvd = rvd), ctx)
+    val literal = ir match {
+      case mir: MatrixIR => MatrixLiteral(mir.typ, tl)
+      case _ => tl
+    }
+
+    if (owned) {
+      rvd.count()
+      val bytes = rvd.persistedBytes
+      persisted.put(ir, Persisted(literal, rvd, bytes))
+      totalBytes += bytes
+      nPersisted += 1
+      log.info(s"auto persist: persisted reused ${ ir.getClass.getSimpleName } in ${ formatSpace(bytes) }, " +
+        s"${ formatSpace(totalBytes) } of ${ formatSpace(maxBytes) } persisted")
+    }
+    literal
+  }
+
+  // unpersists the least recently used subtrees beyond the budget
+  def evict(): Unit = synchronized {
+    val it = persisted.entrySet().iterator()
+    while (totalBytes > maxBytes && it.hasNext) {
+      val e: Entry[BaseIR, Persisted] = it.next()
+      val p = e.getValue
+      p.rvd.unpersist()
+      it.remove()
+      totalBytes -= p.bytes
+      evictions += 1
+      log.info(s"auto persist: unpersisted ${ e.getKey.getClass.getSimpleName } of ${ formatSpace(p.bytes) }")
+    }
+  }
+
+  def clear(): Unit = synchronized {
+    persisted.values().asScala.foreach(_.rvd.unpersist())
+    persisted.clear()
+    totalBytes = 0L
+  }
+
+  def statsJSON: String = synchronized {
+    Serialization.write(Map(
+      "entries" -> persisted.size(),
+      "size" -> totalBytes,
+      "max_size" -> maxBytes,
+      "hits" -> hits,
+      "bytes_saved" -> bytesSaved,
+      "persisted" -> nPersisted,
+      "evictions" -> evictions))(new DefaultFormats {})
+  }
+}
@@ -3,7 +3,7 @@ package is.hail.backend
 import is.hail.annotations.{Region, SafeRow}
 import is.hail.backend.spark.SparkBackend
 import is.hail.expr.ir.IRParser
-import is.hail.io.CodecSpec
+import is.hail.io.{CodecSpec, ValueEncoding}
 import is.hail.{HailContext, cxx}
 import is.hail.expr.JSONAnnotationImpex
 import is.hail.expr.ir.{Compilable, Compile, CompileAndEvaluate, ExecuteContext, IR, MakeTuple, Pretty}
@@ -17,6 +17,25 @@ import scala.reflect.ClassTag
 
 abstract class BroadcastValue[T] { def value: T }
 
+object Backend {
+  private[this] val executing = new ThreadLocal[(Backend, Option[ExecutionTimer])]
+
+  // distributed arrays run on the backend executing the query on this thread,
+  // which records the time spent in each partition in the timer of the query
+  def current: Backend = Option(executing.get()).map(_._1).getOrElse(HailContext.backend)
+
+  def currentTimer: Option[ExecutionTimer] = Option(executing.get()).flatMap(_._2)
+
+  def executing[T](backend: Backend, timer: Option[ExecutionTimer])(body: => T): T = {
+    val previous = executing.get()
+    executing.set((backend, timer))
+    try
+      body
+    finally
+      executing.set(previous)
+  }
+}
+
 abstract class Backend {
   def broadcast[T: ClassTag](value: T): BroadcastValue[T]
 
@@ -32,14 +51,16 @@ abstract class Backend {
     if (!Compilable(ir))
       throw new LowererUnsupportedOperation(s"lowered to uncompilable IR: ${Pretty(ir)}")
 
-    val res = Region.scoped { region =>
-      ir.typ match {
-        case TVoid =>
-          val (_, f) = timer.time(Compile[Unit](ir), "JVM compile")
-          timer.time(f(0, region)(region), "Runtime")
-        case _ =>
-          val (pt: PTuple, f) = timer.time(Compile[Long](MakeTuple.ordered(FastSeq(ir))), "JVM compile")
-          timer.time(SafeRow(pt, region, f(0, region)(region)).get(0), "Runtime")
+    val res = Backend.executing(this, Some(timer)) {
+      Region.scoped { region =>
+        ir.typ match {
+          case TVoid =>
+            val (_, f) = timer.time(Compile[Unit](ir), "JVM compile")
+            timer.time(f(0, region)(region), "Runtime")
+          case _ =>
+            val (pt: PTuple, f) = timer.time(Compile[Long](MakeTuple.ordered(FastSeq(ir))), "JVM compile")
+            timer.time(SafeRow(pt, region, f(0, region)(region)).get(0), "Runtime")
+        }
       }
     }
 
@@ -53,29 +74,40 @@ abstract class Backend {
     if (!Compilable(ir))
       throw new LowererUnsupportedOperation(s"lowered to uncompilable IR: ${Pretty(ir)}")
 
-    val res = ir.typ match {
-      case TVoid =>
-        val f = timer.time(cxx.Compile(ir, optimize), "CXX compile")
-        timer.time(Region.scoped { region => f(region.get()) }, "Runtime")
-        Unit
-      case _ =>
-        val pipeline = MakeTuple.ordered(FastIndexedSeq(ir))
-        val f = timer.time(cxx.Compile(pipeline, optimize: Boolean), "CXX compile")
-        timer.time(
-          Region.scoped { region =>
-            val off = f(region.get())
-            SafeRow(pipeline.pType.asInstanceOf[PTuple], region, off).get(0)
-          },
-          "Runtime")
+    val res = Backend.executing(this, Some(timer)) {
+      ir.typ match {
+        case TVoid =>
+          val f = timer.time(cxx.Compile(ir, optimize), "CXX compile")
+          timer.time(Region.scoped { region => f(region.get()) }, "Runtime")
+          Unit
+        case _ =>
+          val pipeline = MakeTuple.ordered(FastIndexedSeq(ir))
+          val f = timer.time(cxx.Compile(pipeline, optimize: Boolean), "CXX compile")
+          timer.time(
+            Region.scoped { region =>
+              val off = f(region.get())
+              SafeRow(pipeline.pType.asInstanceOf[PTuple], region, off).get(0)
+            },
+            "Runtime")
+      }
     }
 
     (res, timer.timings)
   }
 
-  def execute(ir: IR, optimize: Boolean): (Any, Timings) = {
+  // whether queries are lowered when the "lower" flag is not set
+  def lowerByDefault: Boolean = false
+
+  def execute(ir: IR, optimize: Boolean): (Any, Timings) =
+    HailContext.get.autoPersist match {
+      case Some(ap) => ap.scoped(ir)(execute1(_, optimize))
+      case None => execute1(ir, optimize)
+    }
+
+  private def execute1(ir: IR, optimize: Boolean): (Any, Timings) = {
     try {
       if (HailContext.get.flags.get("cpp") == null) {
-        if (HailContext.get.flags.get("lower") == null)
+        if (!lowerByDefault && HailContext.get.flags.get("lower") == null)
           throw new LowererUnsupportedOperation("lowering not enabled")
         jvmLowerAndExecute(ir, optimize)
       }
@@ -96,6 +128,17 @@ abstract class Backend {
     Serialization.write(Map("value" -> jsonValue, "timings" -> timings.value))(new DefaultFormats {})
   }
 
+  def executeEncode(ir: IR, codecString: String): (Array[Byte], String) = {
+    val t = ir.typ
+    if (t == TVoid)
+      fatal("cannot encode unit-valued IR")
+    val (value, timings) = execute(ir, optimize = true)
+    val bytes = ValueEncoding.encode(t, value, codecString)
+    timings.logInfo()
+
+    (bytes, Serialization.write(Map("timings" -> timings.value))(new DefaultFormats {}))
+  }
+
   def encode(ir0: IR, codecString: String): (String, Array[Byte]) = {
     val codec = CodecSpec.fromShortString(codecString)
     val ir = lower(ir0, None, false)
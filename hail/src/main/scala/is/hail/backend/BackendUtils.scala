@@ -1,6 +1,5 @@
 package is.hail.backend
 
-import is.hail.HailContext
 import is.hail.annotations.Region
 import is.hail.asm4s._
 
@@ -15,7 +14,7 @@ class BackendUtils(mods: Array[(String, (Int, Region) => AsmFunction3[Region, Ar
   def collectDArray(modID: String, contexts: Array[Array[Byte]], globals: Array[Byte]): Array[Array[Byte]] = {
     if (contexts.isEmpty)
       return Array()
-    val backend = HailContext.backend
+    val backend = Backend.current
     val globalsBC = backend.broadcast(globals)
     val f = getModule(modID)
 
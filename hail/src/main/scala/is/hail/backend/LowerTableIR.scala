@@ -124,7 +124,9 @@ object LowerTableIR {
             val rowEncType = rowsSpec.encodedType.virtualType
             val ctxType = TStruct("path" -> TString())
 
-            if (rowsSpec.key startsWith typ.key) {
+            if (r.spec.rowGroupComponents.nonEmpty) {
+              throw new LowererUnsupportedOperation("can't lower a table written with field groups.")
+            } else if (rowsSpec.key startsWith typ.key) {
               TableStage(
                 MakeStruct(FastIndexedSeq(globalRef -> ArrayRef(ToArray(ReadPartition(Str(gPath), gSpec, gEncType, gType)), 0))),
                 globalRef,
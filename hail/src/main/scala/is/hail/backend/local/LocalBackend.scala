@@ -1,20 +1,98 @@
 package is.hail.backend.local
 
+import java.util.concurrent.{Callable, ExecutionException, ExecutorService, Executors, Future, ThreadFactory}
+import java.util.concurrent.atomic.AtomicInteger
+
 import is.hail.backend.{Backend, BroadcastValue}
-import is.hail.expr.ir._
-import is.hail.utils.{ExecutionTimer, Timings}
 
 import scala.reflect.ClassTag
 
 class LocalBroadcastValue[T](val value: T) extends BroadcastValue[T]
 
-object LocalBackend extends Backend {
+object LocalBackend {
+  def apply(nThreads: Int): LocalBackend = new LocalBackend(nThreads)
+
+  def apply(): LocalBackend = apply(Runtime.getRuntime.availableProcessors())
+}
+
+// Runs the partitions of lowered queries on `nThreads` threads of this JVM,
+// without Spark jobs. Queries that cannot be lowered run on the Spark backend
+// of the context.
+class LocalBackend(val nThreads: Int) extends Backend {
+  require(nThreads >= 1, s"number of threads must be positive, got $nThreads")
+
+  private[this] var _pool: ExecutorService = _
+
+  private[this] val inPool = new ThreadLocal[Boolean] {
+    override def initialValue(): Boolean = false
+  }
+
+  private[this] def pool: ExecutorService = synchronized {
+    if (_pool == null) {
+      val nCreated = new AtomicInteger(0)
+      _pool = Executors.newFixedThreadPool(nThreads, new ThreadFactory {
+        def newThread(r: Runnable): Thread = {
+          val t = new Thread(new Runnable {
+            def run(): Unit = {
+              inPool.set(true)
+              r.run()
+            }
+          }, s"hail-local-backend-${ nCreated.getAndIncrement() }")
+          t.setDaemon(true)
+          t
+        }
+      })
+    }
+    _pool
+  }
 
   def broadcast[T: ClassTag](value: T): LocalBroadcastValue[T] = new LocalBroadcastValue(value)
 
+  override def lowerByDefault: Boolean = true
+
   def parallelizeAndComputeWithIndex[T : ClassTag, U : ClassTag](collection: Array[T])(f: (T, Int) => U): Array[U] = {
-    collection.zipWithIndex.map { case (elt, i) => f(elt, i) }.toArray
+    def timed(elt: T, i: Int): (U, Long) = {
+      val t0 = System.nanoTime()
+      val u = f(elt, i)
+      (u, System.nanoTime() - t0)
+    }
+
+    // partitions of nested distributed arrays run on the thread of their
+    // parent, since waiting for the pool from one of its threads can deadlock
+    val results = if (nThreads == 1 || collection.length <= 1 || inPool.get())
+      collection.zipWithIndex.map { case (elt, i) => timed(elt, i) }
+    else {
+      // distributed arrays started by the partitions run on the backend and
+      // record times in the timer of the query submitting them
+      val backend = Backend.current
+      val timer = Backend.currentTimer
+      val futures: Array[Future[(U, Long)]] = collection.zipWithIndex.map { case (elt, i) =>
+        pool.submit(new Callable[(U, Long)] {
+          def call(): (U, Long) = Backend.executing(backend, timer)(timed(elt, i))
+        })
+      }
+      try {
+        futures.map(_.get())
+      } catch {
+        case e: ExecutionException =>
+          futures.foreach(_.cancel(true))
+          throw e.getCause
+        case e: InterruptedException =>
+          futures.foreach(_.cancel(true))
+          throw e
+      }
+    }
+
+    Backend.currentTimer.foreach { timer =>
+      results.zipWithIndex.foreach { case ((_, nanos), i) => timer.record(s"partition $i", nanos) }
+    }
+    results.map(_._1)
   }
 
-  override def lower(ir: IR, timer: Option[ExecutionTimer], optimize: Boolean): IR = LowerTableIR(ir, timer, optimize)
+  def close(): Unit = synchronized {
+    if (_pool != null) {
+      _pool.shutdownNow()
+      _pool = null
+    }
+  }
 }
@@ -2,8 +2,8 @@ package is.hail.cxx
 
 import java.io.{ByteArrayInputStream, ByteArrayOutputStream}
 
-import is.hail.HailContext
 import is.hail.annotations.Region
+import is.hail.backend.Backend
 import is.hail.nativecode.{NativeModule, NativeStatus, ObjectArray}
 import is.hail.utils.using
 
@@ -20,7 +20,7 @@ class SparkUtils(mods: Array[(String, (Array[Byte], NativeModule))]) {
   def parallelizeComputeCollect(modID: String, bodyf: String, contexts: Array[Array[Byte]], globals: Array[Byte]): Array[Array[Byte]] = {
 
 
-    val backend = HailContext.backend
+    val backend = Backend.current
     val globalsBC = backend.broadcast(globals)
     val (lit, key, bin) = getModule(modID)
 
@@ -10,7 +10,6 @@ import is.hail.annotations.Region
 import is.hail.expr.types.virtual.Type
 
 import scala.collection.mutable.ArrayBuffer
-import is.hail.utils.richUtils.RichDenseMatrixDouble
 import org.json4s.{DefaultFormats, Formats, ShortTypeHints}
 
 import scala.collection.immutable.NumericRange
@@ -116,8 +115,7 @@ case class BlockMatrixBinaryReader(path: String, shape: IndexedSeq[Long], blockS
   }
 
   override def apply(hc: HailContext): BlockMatrix = {
-    val breezeMatrix = RichDenseMatrixDouble.importFromDoubles(hc, path, nRows.toInt, nCols.toInt, rowMajor = true)
-    BlockMatrix.fromBreezeMatrix(hc.sc, breezeMatrix, blockSize)
+    BlockMatrix.readDoubles(hc, path, nRows.toInt, nCols.toInt, blockSize)
   }
 }
 
@@ -0,0 +1,188 @@
+package is.hail.expr.ir
+
+import is.hail.expr.types.virtual._
+import is.hail.methods.{MatrixFilterPartitions, TableFilterPartitions}
+import is.hail.table.AbstractTableSpec
+import is.hail.utils._
+import org.apache.spark.sql.Row
+
+// Skips the partitions of a native read that a filter cannot keep any rows
+// from, judged by the field stats written with `Table.write(_partition_stats=...)`.
+object ExtractPartitionStatsFilters {
+
+  case class FieldStats(typ: Type, min: Any, max: Any, nMissing: Long)
+
+  // what the stats say about the rows of one partition
+  case class PartitionFacts(nRows: Long, fields: Map[IndexedSeq[String], FieldStats])
+
+  def partitionFacts(spec: AbstractTableSpec): Option[IndexedSeq[PartitionFacts]] =
+    spec.partitionStats.map { c =>
+      val paths = c.fieldPaths
+      val types = c.statsType.types.map(_.asInstanceOf[TStruct].types(0))
+      c.partitionStats.zip(spec.partitionCounts).map { case (stats, n) =>
+        PartitionFacts(n, paths.indices.map { j =>
+          val s = stats.getAs[Row](j)
+          paths(j) -> FieldStats(types(j), s.get(0), s.get(1), s.getLong(2))
+        }.toMap)
+      }
+    }
+
+  private def fieldPath(ir: IR, rowRefs: Set[String]): Option[IndexedSeq[String]] = ir match {
+    case GetField(Ref(name, _), f) if rowRefs.contains(name) => Some(FastIndexedSeq(f))
+    case GetField(o, f) => fieldPath(o, rowRefs).map(_ :+ f)
+    case _ => None
+  }
+
+  private def constant(ir: IR): Option[Any] = ir match {
+    case NA(_) => Some(null)
+    case I32(_) | I64(_) | F32(_) | F64(_) | Str(_) => Some(ExtractIntervalFilters.constValue(ir))
+    case _ => None
+  }
+
+  // NaN and signed zeros order differently in compiled comparisons and in the
+  // total ordering the stats are kept in
+  private def isNaN(x: Any): Boolean = x match {
+    case d: Double => d.isNaN
+    case f: Float => f.isNaN
+    case _ => false
+  }
+
+  private def orderedConstant(c: Any): Boolean = c match {
+    case d: Double => !d.isNaN && d != 0.0
+    case f: Float => !f.isNaN && f != 0.0f
+    case _ => true
+  }
+
+  private def swap(op: ComparisonOp[_]): ComparisonOp[_] = op match {
+    case LT(t1, t2) => GT(t2, t1)
+    case LTEQ(t1, t2) => GTEQ(t2, t1)
+    case GT(t1, t2) => LT(t2, t1)
+    case GTEQ(t1, t2) => LTEQ(t2, t1)
+    case EQ(t1, t2) => EQ(t2, t1)
+    case NEQ(t1, t2) => NEQ(t2, t1)
+    case _ => op
+  }
+
+  private class Analysis(facts: PartitionFacts) {
+    private def fieldStats(ir: IR, rowRefs: Set[String]): Option[FieldStats] =
+      fieldPath(ir, rowRefs).flatMap(facts.fields.get).filter(_.typ.isOfType(ir.typ))
+
+    // the comparison as (field op constant)
+    private def comparison(op: ComparisonOp[_], l: IR, r: IR, rowRefs: Set[String]): Option[(ComparisonOp[_], FieldStats, Any)] =
+      (fieldStats(l, rowRefs), constant(r)) match {
+        case (Some(fs), Some(c)) => Some((op, fs, c))
+        case _ => (constant(l), fieldStats(r, rowRefs)) match {
+          case (Some(c), Some(fs)) => Some((swap(op), fs, c))
+          case _ => None
+        }
+      }
+
+    private def letRowRefs(name: String, value: IR, rowRefs: Set[String]): Set[String] = value match {
+      case Ref(v, _) if rowRefs.contains(v) => rowRefs + name
+      case _ => rowRefs - name
+    }
+
+    // true if `ir` is false or missing for every row of the partition
+    def alwaysFalse(ir: IR, rowRefs: Set[String]): Boolean = facts.nRows == 0 || (ir match {
+      case False() | NA(_) => true
+      case ApplySpecial("&&", Seq(l, r)) => alwaysFalse(l, rowRefs) || alwaysFalse(r, rowRefs)
+      case ApplySpecial("||", Seq(l, r)) => alwaysFalse(l, rowRefs) && alwaysFalse(r, rowRefs)
+      case ApplyUnaryPrimOp(Bang(), x) => alwaysTrue(x, rowRefs)
+      case Coalesce(Seq(x, False())) => alwaysFalse(x, rowRefs)
+      case Let(name, value, body) => alwaysFalse(body, letRowRefs(name, value, rowRefs))
+      case IsNA(x) => fieldStats(x, rowRefs).exists(_.nMissing == 0)
+      case ApplyComparisonOp(op, l, r) => comparison(op, l, r, rowRefs).exists { case (fieldOp, fs, c) =>
+        def cmp(x: Any, y: Any): Int = PartitionStats.compare(fs.typ, x, y)
+
+        if (c == null || fs.min == null)
+          true
+        else if (!orderedConstant(c))
+          false
+        else fieldOp match {
+          case _: LT => cmp(fs.min, c) >= 0
+          case _: LTEQ => cmp(fs.min, c) > 0
+          case _: GT => cmp(fs.max, c) <= 0
+          case _: GTEQ => cmp(fs.max, c) < 0
+          case _: EQ => cmp(c, fs.min) < 0 || cmp(c, fs.max) > 0
+          case _: NEQ => cmp(fs.min, c) == 0 && cmp(fs.max, c) == 0
+          case _ => false
+        }
+      }
+      case _ => false
+    })
+
+    // true if `ir` is true, and never missing, for every row of the partition
+    def alwaysTrue(ir: IR, rowRefs: Set[String]): Boolean = ir match {
+      case True() => true
+      case ApplySpecial("&&", Seq(l, r)) => alwaysTrue(l, rowRefs) && alwaysTrue(r, rowRefs)
+      case ApplySpecial("||", Seq(l, r)) => alwaysTrue(l, rowRefs) || alwaysTrue(r, rowRefs)
+      case Coalesce(Seq(x, False())) => alwaysTrue(x, rowRefs)
+      case Let(name, value, body) => alwaysTrue(body, letRowRefs(name, value, rowRefs))
+      case IsNA(x) => fieldStats(x, rowRefs).exists(_.nMissing == facts.nRows)
+      case ApplyComparisonOp(op, l, r) => comparison(op, l, r, rowRefs).exists { case (fieldOp, fs, c) =>
+        def cmp(x: Any, y: Any): Int = PartitionStats.compare(fs.typ, x, y)
+
+        if (c == null || fs.min == null || fs.nMissing != 0 || isNaN(fs.max) || !orderedConstant(c))
+          false
+        else fieldOp match {
+          case _: LT => cmp(fs.max, c) < 0
+          case _: LTEQ => cmp(fs.max, c) <= 0
+          case _: GT => cmp(fs.min, c) > 0
+          case _: GTEQ => cmp(fs.min, c) >= 0
+          case _: EQ => cmp(fs.min, c) == 0 && cmp(fs.max, c) == 0
+          case _: NEQ => cmp(c, fs.min) < 0 || cmp(c, fs.max) > 0
+          case _ => false
+        }
+      }
+      case _ => false
+    }
+  }
+
+  private def readerFacts(reader: TableReader): Option[IndexedSeq[PartitionFacts]] = reader match {
+    case r: TableNativeReader if r.options.isEmpty => partitionFacts(r.spec)
+    case r: TableNativeZippedReader if r.options.isEmpty => partitionFacts(r.specLeft)
+    case _ => None
+  }
+
+  // the partitions `pred`, on the rows named `rowRef`, can keep rows from, if
+  // it rules any out
+  private def keptPartitions(facts: IndexedSeq[PartitionFacts], pred: IR, rowRef: String): Option[IndexedSeq[Int]] = {
+    val parts = facts.indices.filter(i => !new Analysis(facts(i)).alwaysFalse(pred, Set(rowRef)))
+    if (parts.length < facts.length) {
+      log.info(s"partition stats: reading ${ parts.length } of ${ facts.length } partitions for predicate:\n  " +
+        s"${ Pretty(pred) }")
+      Some(parts)
+    } else
+      None
+  }
+
+  // `child` with the partitions of its native read that `pred` cannot keep
+  // rows from filtered out
+  private def filterPartitions(child: TableIR, pred: IR): Option[TableIR] = child match {
+    case TableMapGlobals(c, newGlobals) => filterPartitions(c, pred).map(TableMapGlobals(_, newGlobals))
+    case read@TableRead(_, false, reader) =>
+      readerFacts(reader).flatMap(keptPartitions(_, pred, "row"))
+        .map(parts => TableToTableApply(read, TableFilterPartitions(parts, keep = true)))
+    case _ => None
+  }
+
+  private def filterPartitions(child: MatrixIR, pred: IR): Option[MatrixIR] = child match {
+    case MatrixMapGlobals(c, newGlobals) => filterPartitions(c, pred).map(MatrixMapGlobals(_, newGlobals))
+    case read@MatrixRead(_, _, false, r: MatrixNativeReader) if r.options.isEmpty =>
+      partitionFacts(r.spec.rowsTableSpec(r.path + "/rows")).flatMap(keptPartitions(_, pred, "va"))
+        .map(parts => MatrixToMatrixApply(read, MatrixFilterPartitions(parts, keep = true)))
+    case _ => None
+  }
+
+  def apply(ir0: BaseIR): BaseIR = {
+    MapIR.mapBaseIR(ir0, (ir: BaseIR) => {
+      (ir match {
+        case TableFilter(child, pred) =>
+          filterPartitions(child, pred).map(TableFilter(_, pred))
+        case MatrixFilterRows(child, pred) =>
+          filterPartitions(child, pred).map(MatrixFilterRows(_, pred))
+        case _ => None
+      }).getOrElse(ir)
+    })
+  }
+}
@@ -122,7 +122,9 @@ case class MatrixValue(
     fs: FS,
     path: String,
     codecSpec: CodecSpec,
-    partitionCounts: Array[Long]
+    partitionCounts: Array[Long],
+    nFieldGroups: Int = 0,
+    partitionStats: Option[PartitionStatsComponentSpec] = None
   ) = {
     val globalsPath = path + "/globals"
     fs.mkDir(globalsPath)
@@ -135,7 +137,9 @@ case class MatrixValue(
       typ.rowsTableType,
       Map("globals" -> RVDComponentSpec("../globals/rows"),
         "rows" -> RVDComponentSpec("rows"),
-        "partition_counts" -> PartitionCountsComponentSpec(partitionCounts)))
+        "partition_counts" -> PartitionCountsComponentSpec(partitionCounts)) ++
+        (0 until nFieldGroups).map(i => s"row_group_$i" -> RVDComponentSpec(s"row_groups/$i")) ++
+        partitionStats.map("partition_stats" -> _))
     rowsSpec.write(fs, path + "/rows")
 
     fs.writeTextFile(path + "/rows/_SUCCESS")(out => ())
@@ -189,7 +193,9 @@ case class MatrixValue(
     stageLocally: Boolean,
     codecSpecJSONStr: String,
     partitions: String,
-    partitionsTypeStr: String) = {
+    partitionsTypeStr: String,
+    fieldGroups: IndexedSeq[IndexedSeq[String]] = FastIndexedSeq(),
+    partitionStats: IndexedSeq[IndexedSeq[String]] = FastIndexedSeq()) = {
     assert(typ.isCanonical)
     val hc = HailContext.get
     val fs = hc.sFS
@@ -202,6 +208,9 @@ case class MatrixValue(
       } else
         CodecSpec.default
 
+    if (partitionStats.nonEmpty)
+      PartitionStats.statsType(typ.rowType, partitionStats)
+
     if (overwrite)
       fs.delete(path, recursive = true)
     else if (fs.exists(path))
@@ -219,9 +228,32 @@ case class MatrixValue(
       } else
         null
 
-    val partitionCounts = rvd.writeRowsSplit(path, codecSpec, stageLocally, targetPartitioner)
-
-    finalizeWrite(fs, path, codecSpec, partitionCounts)
+    // stats are recorded for the partitions as written
+    val repartitioned = if (targetPartitioner != null && (fieldGroups.nonEmpty || partitionStats.nonEmpty))
+      rvd.repartition(targetPartitioner)
+    else
+      rvd
+    val (writeRVD, getStats) = if (partitionStats.nonEmpty)
+      PartitionStats.record(repartitioned, partitionStats)
+    else
+      (repartitioned, null)
+
+    val partitionCounts = if (fieldGroups.nonEmpty) {
+      // row fields in groups are written to streams next to the rows, read
+      // through the shared index like the entries
+      val fullRowType = rvd.rowPType
+      val streamTypes = TableValue.fieldGroupTypes(MatrixType.getRowType(fullRowType), typ.rowKey, fieldGroups) :+
+        MatrixType.getSplitEntriesType(fullRowType)
+      writeRVD.writeRowsGrouped(path, codecSpec, stageLocally,
+        ("rows/rows" +: fieldGroups.indices.map(i => s"rows/row_groups/$i")) :+ "entries/rows",
+        streamTypes,
+        fieldGroups.indices.map(i => s"row_group_${ i }_offset") :+ "entries_offset")
+    } else
+      writeRVD.writeRowsSplit(path, codecSpec, stageLocally,
+        if (repartitioned eq rvd) targetPartitioner else null)
+
+    finalizeWrite(fs, path, codecSpec, partitionCounts, fieldGroups.length,
+      Option(getStats).map(f => PartitionStats.component(typ.rowType, partitionStats, f())))
   }
 
   def colsRVD(): RVD = {
@@ -5,7 +5,7 @@ import is.hail.io._
 import is.hail.io.gen.{ExportBGEN, ExportGen}
 import is.hail.io.plink.ExportPlink
 import is.hail.io.vcf.ExportVCF
-import is.hail.utils.ExportType
+import is.hail.utils._
 import org.json4s.{DefaultFormats, Formats, ShortTypeHints}
 
 object MatrixWriter {
@@ -34,9 +34,13 @@ case class MatrixNativeWriter(
   stageLocally: Boolean = false,
   codecSpecJSONStr: String = null,
   partitions: String = null,
-  partitionsTypeStr: String = null
+  partitionsTypeStr: String = null,
+  fieldGroups: Seq[Seq[String]] = null,
+  partitionStats: Seq[Seq[String]] = null
 ) extends MatrixWriter {
-  def apply(mv: MatrixValue): Unit = mv.write(path, overwrite, stageLocally, codecSpecJSONStr, partitions, partitionsTypeStr)
+  def apply(mv: MatrixValue): Unit = mv.write(path, overwrite, stageLocally, codecSpecJSONStr, partitions, partitionsTypeStr,
+    if (fieldGroups == null) FastIndexedSeq() else fieldGroups.map(_.toFastIndexedSeq).toFastIndexedSeq,
+    if (partitionStats == null) FastIndexedSeq() else partitionStats.map(_.toFastIndexedSeq).toFastIndexedSeq)
 }
 
 case class MatrixVCFWriter(
@@ -17,6 +17,7 @@ object Optimize {
       last = ir
       ir = FoldConstants(ir, canGenerateLiterals = canGenerateLiterals)
       ir = ExtractIntervalFilters(ir)
+      ir = ExtractPartitionStatsFilters(ir)
       ir = Simplify(ir)
       ir = ForwardLets(ir)
       ir = ForwardRelationalLets(ir)
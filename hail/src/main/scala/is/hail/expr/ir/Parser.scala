@@ -6,7 +6,7 @@ import is.hail.expr.{JSONAnnotationImpex, Nat, ParserUtils}
 import is.hail.expr.types.{MatrixType, TableType}
 import is.hail.expr.types.virtual._
 import is.hail.expr.types.physical.PType
-import is.hail.io.CodecSpec
+import is.hail.io.{CodecSpec, ValueEncoding}
 import is.hail.io.bgen.MatrixBGENReaderSerializer
 import is.hail.rvd.{AbstractRVDSpec, RVDType}
 import is.hail.table.{Ascending, Descending, SortField}
@@ -586,6 +586,11 @@ object IRParser {
       case "Literal" =>
         val (t, v) = ir_value(it)
         Literal.coerce(t, v)
+      case "EncodedLiteral" =>
+        val t = type_expr(it)
+        val codec = identifier(it)
+        val bytes = java.util.Base64.getDecoder.decode(string_literal(it))
+        Literal.coerce(t, ValueEncoding.decode(t, bytes, codec))
       case "Void" => Void()
       case "Cast" =>
         val typ = type_expr(it)
@@ -0,0 +1,172 @@
+package is.hail.expr.ir
+
+import java.nio.charset.StandardCharsets
+
+import is.hail.HailContext
+import is.hail.annotations.{RegionValue, UnsafeRow}
+import is.hail.expr.JSONAnnotationImpex
+import is.hail.expr.types.virtual._
+import is.hail.rvd.RVD
+import is.hail.table.AbstractTableSpec
+import is.hail.utils._
+import is.hail.variant.{AbstractMatrixTableSpec, PartitionStatsComponentSpec, RelationalSpec}
+import org.apache.spark.sql.Row
+import org.json4s.{JObject, JString}
+import org.json4s.jackson.JsonMethods
+
+import scala.collection.JavaConverters._
+
+// per-partition min, max and missing count of chosen row fields, recorded by
+// `Table.write(_partition_stats=...)` and used by ExtractPartitionStatsFilters
+// to skip partitions a filter cannot keep rows from
+object PartitionStats {
+  def supportsType(t: Type): Boolean = t match {
+    case _: TInt32 | _: TInt64 | _: TFloat32 | _: TFloat64 | _: TString => true
+    case _ => false
+  }
+
+  def fieldName(path: IndexedSeq[String]): String = path.mkString(".")
+
+  def fieldType(rowType: TStruct, path: IndexedSeq[String]): Type = {
+    val t = path.foldLeft[Type](rowType) { case (t, name) =>
+      t match {
+        case ts: TStruct if ts.hasField(name) => ts.field(name).typ
+        case _ => fatal(s"partition stats: no row field '${ fieldName(path) }'")
+      }
+    }
+    if (!supportsType(t))
+      fatal(s"partition stats: field '${ fieldName(path) }' has type $t, expected a numeric or string type")
+    t
+  }
+
+  def statsType(rowType: TStruct, paths: IndexedSeq[IndexedSeq[String]]): TStruct = {
+    if (!paths.map(fieldName).areDistinct())
+      fatal(s"partition stats: fields are not distinct: ${ paths.map(fieldName).mkString(", ") }")
+    TStruct(paths.map { path =>
+      val t = fieldType(rowType, path)
+      fieldName(path) -> TStruct("min" -> t, "max" -> t, "n_missing" -> TInt64())
+    }: _*)
+  }
+
+  // strings compare by their UTF-8 bytes, as in compiled comparisons
+  def compare(t: Type, x: Any, y: Any): Int = t match {
+    case _: TString =>
+      val xb = x.asInstanceOf[String].getBytes(StandardCharsets.UTF_8)
+      val yb = y.asInstanceOf[String].getBytes(StandardCharsets.UTF_8)
+      var i = 0
+      while (i < xb.length && i < yb.length) {
+        val c = Integer.compare(xb(i) & 0xff, yb(i) & 0xff)
+        if (c != 0)
+          return c
+        i += 1
+      }
+      Integer.compare(xb.length, yb.length)
+    case _ => t.ordering.compareNonnull(x, y)
+  }
+
+  // -0.0 and 0.0 are equal in comparisons but not under Double.compare
+  def normalize(x: Any): Any = x match {
+    case d: Double if d == 0.0 => 0.0
+    case f: Float if f == 0.0f => 0.0f
+    case _ => x
+  }
+
+  private class Builder(types: Array[Type]) {
+    private val mins = new Array[Any](types.length)
+    private val maxs = new Array[Any](types.length)
+    private val nMissing = new Array[Long](types.length)
+
+    def add(i: Int, x: Any) {
+      if (x == null)
+        nMissing(i) += 1
+      else {
+        val v = normalize(x)
+        if (mins(i) == null || compare(types(i), v, mins(i)) < 0)
+          mins(i) = v
+        if (maxs(i) == null || compare(types(i), v, maxs(i)) > 0)
+          maxs(i) = v
+      }
+    }
+
+    def result(): Row = Row.fromSeq(types.indices.map(i => Row(mins(i), maxs(i), nMissing(i))))
+  }
+
+  // records the stats of each partition of `rvd` as it is consumed; the
+  // returned function gives them once an action has consumed every partition
+  def record(rvd: RVD, paths: IndexedSeq[IndexedSeq[String]]): (RVD, () => IndexedSeq[Row]) = {
+    val rowPType = rvd.rowPType
+    val rowType = rowPType.virtualType
+    val types = paths.map(fieldType(rowType, _)).toArray
+    val idxPaths = paths.map { path =>
+      path.indices.map { i =>
+        path.take(i).foldLeft[Type](rowType)((t, n) => t.asInstanceOf[TStruct].field(n).typ)
+          .asInstanceOf[TStruct].fieldIdx(path(i))
+      }.toArray
+    }.toArray
+
+    val acc = HailContext.get.sc.collectionAccumulator[(Int, Row)]("partition stats")
+    val newRVD = rvd.mapPartitionsWithIndex(rvd.typ) { (i, it) =>
+      val b = new Builder(types)
+      val ur = new UnsafeRow(rowPType)
+      new Iterator[RegionValue] {
+        private var done = false
+
+        def hasNext: Boolean = {
+          val more = it.hasNext
+          if (!more && !done) {
+            done = true
+            acc.add((i, b.result()))
+          }
+          more
+        }
+
+        def next(): RegionValue = {
+          val rv = it.next()
+          ur.set(rv)
+          var j = 0
+          while (j < idxPaths.length) {
+            val path = idxPaths(j)
+            var x: Any = ur
+            var k = 0
+            while (k < path.length && x != null) {
+              x = x.asInstanceOf[Row].get(path(k))
+              k += 1
+            }
+            b.add(j, x)
+            j += 1
+          }
+          rv
+        }
+      }
+    }
+
+    val nPartitions = rvd.getNumPartitions
+    (newRVD, () => {
+      val byPartition = acc.value.asScala.toMap
+      assert(byPartition.size == nPartitions)
+      Array.tabulate(nPartitions)(byPartition).toFastIndexedSeq
+    })
+  }
+
+  def component(rowType: TStruct, paths: IndexedSeq[IndexedSeq[String]], stats: IndexedSeq[Row]): PartitionStatsComponentSpec = {
+    val t = statsType(rowType, paths)
+    PartitionStatsComponentSpec(paths, t.parsableString(), JSONAnnotationImpex.exportAnnotation(stats, TArray(t)))
+  }
+
+  // for `Table._partition_stats` in Python: the stats of the table or matrix
+  // table rows at `path` as JSON, or null if none were recorded
+  def pyPartitionStatsJSON(path: String): String = {
+    val hc = HailContext.get
+    val spec = RelationalSpec.read(hc, path) match {
+      case ts: AbstractTableSpec => ts
+      case _: AbstractMatrixTableSpec => RelationalSpec.read(hc, path + "/rows").asInstanceOf[AbstractTableSpec]
+    }
+    spec.partitionStats match {
+      case Some(c) =>
+        JsonMethods.compact(JObject(
+          "type" -> JString(TArray(c.statsType).parsableString()),
+          "value" -> c.stats))
+      case None => null
+    }
+  }
+}
@@ -3,6 +3,7 @@ package is.hail.expr.ir
 import is.hail.annotations._
 import is.hail.expr.types._
 import is.hail.expr.types.virtual._
+import is.hail.methods.{MatrixFilterPartitions, TableFilterPartitions}
 import is.hail.table.Ascending
 import is.hail.utils._
 
@@ -499,6 +500,7 @@ object PruneDeadFields {
           rowType = PruneDeadFields.unify(child.typ.rowType,
             requestedType.rowType,
             PruneDeadFields.selectKey(child.typ.rowType, child.typ.key))), memo)
+      case TableToTableApply(child, _: TableFilterPartitions) => memoizeTableIR(child, requestedType, memo)
       case TableToTableApply(child, f) => memoizeTableIR(child, child.typ, memo)
       case MatrixToTableApply(child, _) => memoizeMatrixIR(child, child.typ, memo)
       case BlockMatrixToTable(child) => memoizeBlockMatrixIR(child, child.typ, memo)
@@ -705,6 +707,7 @@ object PruneDeadFields {
           rowType = unify(child.typ.rowType,
             requestedType.rowType,
             selectKey(child.typ.rowType, child.typ.rowKey))), memo)
+      case MatrixToMatrixApply(child, _: MatrixFilterPartitions) => memoizeMatrixIR(child, requestedType, memo)
       case MatrixToMatrixApply(child, f) => memoizeMatrixIR(child, child.typ, memo)
       case MatrixRename(child, globalMap, colMap, rowMap, entryMap) =>
         val globalMapRev = globalMap.map { case (k, v) => (v, k) }
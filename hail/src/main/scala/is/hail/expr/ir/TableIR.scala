@@ -167,7 +167,12 @@ case class TableNativeReader(
         intervals.map(i => RVDPartitioner.union(tr.typ.keyType, i, tr.typ.key.length - 1))
       else
         intervals.map(i => new RVDPartitioner(tr.typ.keyType, i))
-      val rvd = spec.rowsComponent.read(hc, path, tr.typ.rowType.physicalType, partitioner, filterIntervals)
+      val streams = spec.rowStreams(path, tr.typ.rowType)
+      val rvd = if (streams.length == 1)
+        spec.rowsComponent.read(hc, path, tr.typ.rowType.physicalType, partitioner, filterIntervals)
+      else
+        AbstractRVDSpec.readGrouped(hc, streams.map(_._1), streams.map(_._2),
+          tr.typ.rowType.physicalType, partitioner, filterIntervals)
       if (rvd.typ.key startsWith tr.typ.key)
         rvd
       else {
@@ -222,7 +227,15 @@ case class TableNativeZippedReader(
         intervals.map(i => new RVDPartitioner(tr.typ.keyType, i))
       val leftFieldSet = specLeft.table_type.rowType.fieldNames.toSet
       val rightFieldSet = specRight.table_type.rowType.fieldNames.toSet
-      if (tr.typ.rowType.fieldNames.forall(f => !rightFieldSet.contains(f))) {
+      val leftStreams = specLeft.rowStreams(pathLeft, tr.typ.rowType)
+      if (leftStreams.length > 1) {
+        val streams = if (tr.typ.rowType.fieldNames.exists(rightFieldSet.contains))
+          leftStreams :+ ((specRight.rowsComponent.rvdSpec(hc.sFS, pathRight), specRight.rowsComponent.absolutePath(pathRight)))
+        else
+          leftStreams
+        AbstractRVDSpec.readGrouped(hc, streams.map(_._1), streams.map(_._2),
+          tr.typ.rowType.physicalType, partitioner, filterIntervals)
+      } else if (tr.typ.rowType.fieldNames.forall(f => !rightFieldSet.contains(f))) {
         specLeft.rowsComponent.read(hc, pathLeft, tr.typ.rowType.physicalType, partitioner, filterIntervals)
       } else if (tr.typ.rowType.fieldNames.forall(f => !leftFieldSet.contains(f))) {
         specRight.rowsComponent.read(hc, pathRight, tr.typ.rowType.physicalType, partitioner, filterIntervals)
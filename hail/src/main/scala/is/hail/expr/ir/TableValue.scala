@@ -39,6 +39,28 @@ object TableValue {
 
   def apply(typ: TableType, globals: BroadcastRow, rdd: RDD[Row]): TableValue =
     TableValue(typ, globals, RVD.coerce(typ.canonicalRVDType, ContextRDD.weaken[RVDContext](rdd).toRegionValues(typ.rowType)))
+
+  // the types of the row streams of a table written with `fieldGroups`: the
+  // fields of `rowType` in no group, with the key, then the fields of each
+  // group, in the order of `rowType`
+  def fieldGroupTypes(rowType: PStruct, key: IndexedSeq[String], fieldGroups: IndexedSeq[IndexedSeq[String]]): IndexedSeq[PStruct] = {
+    val grouped = fieldGroups.flatten
+    if (fieldGroups.exists(_.isEmpty))
+      fatal("field groups must not be empty")
+    grouped.foreach { f =>
+      if (!rowType.hasField(f))
+        fatal(s"field group has unknown row field '$f'")
+      if (key.contains(f))
+        fatal(s"key field '$f' cannot be in a field group")
+    }
+    if (!grouped.areDistinct())
+      fatal(s"field groups must be disjoint, found duplicates: ${ grouped.duplicates().mkString(", ") }")
+
+    rowType.dropFields(grouped.toSet) +: fieldGroups.map { group =>
+      val groupSet = group.toSet
+      rowType.selectFields(rowType.fieldNames.filter(groupSet.contains))
+    }
+  }
 }
 
 case class TableValue(typ: TableType, globals: BroadcastRow, rvd: RVD) {
@@ -62,7 +84,9 @@ case class TableValue(typ: TableType, globals: BroadcastRow, rvd: RVD) {
     filterWithPartitionOp((_, _) => ())((_, rv1, rv2) => p(rv1, rv2))
   }
 
-  def write(path: String, overwrite: Boolean, stageLocally: Boolean, codecSpecJSONStr: String) {
+  def write(path: String, overwrite: Boolean, stageLocally: Boolean, codecSpecJSONStr: String,
+    fieldGroups: IndexedSeq[IndexedSeq[String]] = FastIndexedSeq(),
+    partitionStats: IndexedSeq[IndexedSeq[String]] = FastIndexedSeq()) {
     assert(typ.isCanonical)
     val hc = HailContext.get
     val fs = hc.sFS
@@ -75,6 +99,14 @@ case class TableValue(typ: TableType, globals: BroadcastRow, rvd: RVD) {
       } else
         CodecSpec.default
 
+    val streamTypes = if (fieldGroups.nonEmpty)
+      TableValue.fieldGroupTypes(rvd.rowPType, typ.key, fieldGroups)
+    else
+      null
+
+    if (partitionStats.nonEmpty)
+      PartitionStats.statsType(typ.rowType, partitionStats)
+
     if (overwrite)
       fs.delete(path, recursive = true)
     else if (fs.exists(path))
@@ -86,7 +118,18 @@ case class TableValue(typ: TableType, globals: BroadcastRow, rvd: RVD) {
     fs.mkDir(globalsPath)
     AbstractRVDSpec.writeSingle(fs, globalsPath, globals.t, codecSpec, Array(globals.javaValue))
 
-    val partitionCounts = rvd.write(path + "/rows", "../index", stageLocally, codecSpec)
+    val (writeRVD, getStats) = if (partitionStats.nonEmpty)
+      PartitionStats.record(rvd, partitionStats)
+    else
+      (rvd, null)
+
+    val partitionCounts = if (fieldGroups.nonEmpty)
+      writeRVD.writeRowsGrouped(path, codecSpec, stageLocally,
+        "rows" +: fieldGroups.indices.map(i => s"row_groups/$i"),
+        streamTypes,
+        fieldGroups.indices.map(i => s"row_group_${ i }_offset"))
+    else
+      writeRVD.write(path + "/rows", "../index", stageLocally, codecSpec)
 
     val referencesPath = path + "/references"
     fs.mkDir(referencesPath)
@@ -100,7 +143,9 @@ case class TableValue(typ: TableType, globals: BroadcastRow, rvd: RVD) {
       typ,
       Map("globals" -> RVDComponentSpec("globals"),
         "rows" -> RVDComponentSpec("rows"),
-        "partition_counts" -> PartitionCountsComponentSpec(partitionCounts)))
+        "partition_counts" -> PartitionCountsComponentSpec(partitionCounts)) ++
+        fieldGroups.indices.map(i => s"row_group_$i" -> RVDComponentSpec(s"row_groups/$i")) ++
+        Option(getStats).map(f => "partition_stats" -> PartitionStats.component(typ.rowType, partitionStats, f())))
     spec.write(fs, path)
 
     writeNativeFileReadMe(path)
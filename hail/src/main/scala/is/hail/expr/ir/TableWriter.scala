@@ -1,7 +1,7 @@
 package is.hail.expr.ir
 
 import is.hail.GenericIndexedSeqSerializer
-import is.hail.utils.ExportType
+import is.hail.utils._
 import org.json4s.{DefaultFormats, Formats, ShortTypeHints}
 
 object TableWriter {
@@ -20,9 +20,13 @@ case class TableNativeWriter(
   path: String,
   overwrite: Boolean = true,
   stageLocally: Boolean = false,
-  codecSpecJSONStr: String = null
+  codecSpecJSONStr: String = null,
+  fieldGroups: Seq[Seq[String]] = null,
+  partitionStats: Seq[Seq[String]] = null
 ) extends TableWriter {
-  def apply(tv: TableValue): Unit = tv.write(path, overwrite, stageLocally, codecSpecJSONStr)
+  def apply(tv: TableValue): Unit = tv.write(path, overwrite, stageLocally, codecSpecJSONStr,
+    if (fieldGroups == null) FastIndexedSeq() else fieldGroups.map(_.toFastIndexedSeq).toFastIndexedSeq,
+    if (partitionStats == null) FastIndexedSeq() else partitionStats.map(_.toFastIndexedSeq).toFastIndexedSeq)
 }
 
 case class TableTextWriter(
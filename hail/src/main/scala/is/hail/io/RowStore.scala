@@ -1970,6 +1970,143 @@ object RichContextRDDRegionValue {
       RVDPartitioner.unkeyed(partitioner.numPartitions))
     entriesSpec.write(fs, path + "/entries/rows")
   }
+
+  // relative path of the index of a split layout at `path/index` from the
+  // stream at `path/relPath`
+  def groupedIndexRelPath(relPath: String): String =
+    "../" * relPath.split("/").length + "index"
+
+  def groupedAnnotationType(offsetFields: IndexedSeq[String]): TStruct =
+    (+TStruct(offsetFields.map(_ -> TInt64()): _*)).asInstanceOf[TStruct]
+
+  private def writeFiles[T](fs: FS, paths: IndexedSeq[String])(f: IndexedSeq[OutputStream] => T): T = {
+    def go(i: Int, oss: List[OutputStream]): T =
+      if (i == paths.length)
+        f(oss.reverse.toFastIndexedSeq)
+      else
+        fs.writeFile(paths(i))(os => go(i + 1, os :: oss))
+    go(0, Nil)
+  }
+
+  // writes the fields of the rows in `it` to one stream per encoder, the
+  // stream i at `path/relPaths(i)/parts`, with an index of the first stream
+  // whose annotation has the offset of each row in the other streams
+  def writeGroupedRegion(
+    fs: FS,
+    path: String,
+    t: RVDType,
+    it: Iterator[RegionValue],
+    idx: Int,
+    ctx: RVDContext,
+    partDigits: Int,
+    stageLocally: Boolean,
+    makeIndexWriter: (FS, String) => IndexWriter,
+    relPaths: IndexedSeq[String],
+    makeEncs: IndexedSeq[(OutputStream) => Encoder]
+  ): (String, Long) = {
+    val fullRowType = t.rowType
+    val nStreams = makeEncs.length
+
+    val context = TaskContext.get
+    val f = partFile(partDigits, idx, context)
+    val outputMetrics = context.taskMetrics().outputMetrics
+    val finalPartPaths = relPaths.map(p => path + "/" + p + "/parts/" + f)
+    val finalIdxPath = path + "/index/" + f + ".idx"
+    val (partPaths, idxPath) =
+      if (stageLocally) {
+        val partPaths = relPaths.map(_ => fs.getTemporaryFile("file:///tmp"))
+        val idxPath = partPaths.head + ".idx"
+        context.addTaskCompletionListener { (context: TaskContext) =>
+          partPaths.foreach(fs.delete(_, recursive = false))
+          fs.delete(idxPath, recursive = true)
+        }
+        (partPaths, idxPath)
+      } else
+        (finalPartPaths, finalIdxPath)
+
+    val rowCount = writeFiles(fs, partPaths) { oss =>
+      val trackedOSs = oss.map(new ByteTrackingOutputStream(_)).toArray
+      val ens = trackedOSs.map(os => null: Encoder)
+      try {
+        var i = 0
+        while (i < nStreams) {
+          ens(i) = makeEncs(i)(trackedOSs(i))
+          i += 1
+        }
+
+        using(makeIndexWriter(fs, idxPath)) { iw =>
+          var rowCount = 0L
+
+          it.foreach { rv =>
+            val offs = ens.map(_.indexOffset())
+            val key = SafeRow.selectFields(fullRowType, rv)(t.kFieldIdx)
+            iw += (key, offs(0), Row.fromSeq(offs.tail))
+
+            var i = 0
+            while (i < nStreams) {
+              ens(i).writeByte(1)
+              ens(i).writeRegionValue(rv.region, rv.offset)
+              i += 1
+            }
+
+            ctx.region.clear()
+
+            rowCount += 1
+
+            ExposedMetrics.setBytes(outputMetrics, trackedOSs.map(_.bytesWritten).sum)
+            ExposedMetrics.setRecords(outputMetrics, nStreams * rowCount)
+          }
+
+          ens.foreach { en =>
+            en.writeByte(0) // end
+            en.flush()
+          }
+          ExposedMetrics.setBytes(outputMetrics, trackedOSs.map(_.bytesWritten).sum)
+
+          rowCount
+        }
+      } finally {
+        ens.foreach { en => if (en != null) en.close() }
+      }
+    }
+
+    if (stageLocally) {
+      partPaths.zip(finalPartPaths).foreach { case (p, finalP) => fs.copy(p, finalP) }
+      fs.copy(idxPath + "/index", finalIdxPath + "/index")
+      fs.copy(idxPath + "/metadata.json.gz", finalIdxPath + "/metadata.json.gz")
+    }
+
+    f -> rowCount
+  }
+
+  // the first stream is keyed by the key of `t`, the others are unkeyed and
+  // read through the index of the first, at the offset in `offsetFields(i - 1)`
+  def writeGroupedSpecs(
+    fs: FS,
+    path: String,
+    codecSpec: CodecSpec,
+    t: RVDType,
+    relPaths: IndexedSeq[String],
+    streamTypes: IndexedSeq[PStruct],
+    offsetFields: IndexedSeq[String],
+    partFiles: Array[String],
+    partitioner: RVDPartitioner
+  ) {
+    val kType = t.kType.virtualType
+    val annotationType = groupedAnnotationType(offsetFields)
+
+    val spec = IndexedRVDSpec(streamTypes.head, t.key, codecSpec,
+      IndexSpec(groupedIndexRelPath(relPaths.head), kType, annotationType), partFiles, partitioner)
+    spec.write(fs, path + "/" + relPaths.head)
+
+    offsetFields.indices.foreach { i =>
+      val relPath = relPaths(i + 1)
+      val groupSpec = IndexedRVDSpec(streamTypes(i + 1), FastIndexedSeq(), codecSpec,
+        IndexSpec(groupedIndexRelPath(relPath), kType, annotationType, Some(offsetFields(i))), partFiles,
+        RVDPartitioner.unkeyed(partitioner.numPartitions))
+      groupSpec.write(fs, path + "/" + relPath)
+    }
+  }
 }
 
 class RichContextRDDRegionValue(val crdd: ContextRDD[RVDContext, RegionValue]) extends AnyVal {
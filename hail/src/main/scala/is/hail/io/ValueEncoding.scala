@@ -0,0 +1,43 @@
+package is.hail.io
+
+import is.hail.annotations.{Annotation, Region, RegionValueBuilder, SafeRow}
+import is.hail.expr.types.physical.{PTuple, PType}
+import is.hail.expr.types.virtual._
+
+// Encoding of single values exchanged with Python: a tuple with one field
+// holding the value. Every value is encoded as optional so that the layout
+// can be recovered from the virtual type alone.
+object ValueEncoding {
+  def optionalType(t: Type): Type = t match {
+    case t: TArray => TArray(optionalType(t.elementType))
+    case t: TSet => TSet(optionalType(t.elementType))
+    case t: TDict => TDict(optionalType(t.keyType), optionalType(t.valueType))
+    case t: TStruct => TStruct(t.fields.map(f => Field(f.name, optionalType(f.typ), f.index)))
+    case t: TTuple => TTuple(t._types.map(fd => fd.copy(typ = optionalType(fd.typ))))
+    case t: TInterval => TInterval(optionalType(t.pointType))
+    case t => t.setRequired(false)
+  }
+
+  def encodedPType(t: Type): PTuple = PTuple(PType.canonical(optionalType(t)))
+
+  def encode(t: Type, value: Annotation, codecString: String): Array[Byte] = {
+    val codec = CodecSpec.fromShortString(codecString)
+    val pt = encodedPType(t)
+    Region.scoped { region =>
+      val rvb = new RegionValueBuilder(region)
+      rvb.start(pt)
+      rvb.startTuple()
+      rvb.addAnnotation(t, value)
+      rvb.endTuple()
+      codec.encode(pt, region, rvb.end())
+    }
+  }
+
+  def decode(t: Type, bytes: Array[Byte], codecString: String): Annotation = {
+    val codec = CodecSpec.fromShortString(codecString)
+    val pt = encodedPType(t)
+    Region.scoped { region =>
+      SafeRow(pt, region, codec.decode(pt, bytes, region)).get(0)
+    }
+  }
+}
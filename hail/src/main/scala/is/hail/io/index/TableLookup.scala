@@ -0,0 +1,170 @@
+package is.hail.io.index
+
+import java.util
+import java.util.Map.Entry
+
+import is.hail.HailContext
+import is.hail.annotations.{Annotation, Region, SafeRow}
+import is.hail.expr.JSONAnnotationImpex
+import is.hail.expr.types.physical.PStruct
+import is.hail.expr.types.virtual.{TArray, TInterval, TStruct}
+import is.hail.io.{Decoder, ValueEncoding}
+import is.hail.rvd.{AbstractRVDSpec, IndexedRVDSpec, RVDPartitioner}
+import is.hail.table.AbstractTableSpec
+import is.hail.utils._
+import is.hail.variant.RelationalSpec
+import org.apache.spark.sql.Row
+import org.json4s.jackson.JsonMethods
+
+object TableLookup {
+  def apply(path: String, maxOpenPartitions: Int): TableLookup =
+    new TableLookup(HailContext.get, path, maxOpenPartitions)
+}
+
+// Looks up the rows of the native table at `path` by key, on the driver: the
+// partitioner prunes the partitions, and the index of each partition gives the
+// offsets of the matching rows, which are decoded alone. The index readers and
+// decoders of the `maxOpenPartitions` most recently used partitions stay open.
+class TableLookup(hc: HailContext, path: String, maxOpenPartitions: Int) extends AutoCloseable {
+  require(maxOpenPartitions >= 1)
+
+  private[this] val fs = hc.sFS
+
+  private[this] val tableSpec = (RelationalSpec.read(hc, path): @unchecked) match {
+    case ts: AbstractTableSpec => ts
+    case _ => fatal(s"file is a MatrixTable, not a Table: '$path'")
+  }
+
+  if (tableSpec.rowGroupComponents.nonEmpty)
+    fatal(s"cannot look up rows of a table written with field groups: '$path'")
+
+  private[this] val rowsPath = tableSpec.rowsComponent.absolutePath(path)
+
+  private[this] val rowsSpec = AbstractRVDSpec.read(hc, rowsPath) match {
+    case spec: IndexedRVDSpec => spec
+    case _ => fatal(
+      s"""cannot look up rows of an unindexed table: '$path'
+         |This table was written using an older version of hail
+         |rewrite the table in order to create an index to proceed""".stripMargin)
+  }
+
+  val keyType: TStruct = tableSpec.table_type.keyType
+
+  private[this] val rowPType: PStruct = rowsSpec.encodedType
+
+  val rowType: TStruct = rowPType.virtualType
+
+  private[this] val partitioner: RVDPartitioner = rowsSpec.partitioner
+
+  private[this] val indexSpec = rowsSpec.indexSpec
+
+  private[this] val mkIndexReader = {
+    val (indexKeyType, annotationType) = indexSpec.types
+    val (leafDec, intDec) = IndexReader.buildDecoders(indexKeyType, annotationType)
+    IndexReaderBuilder.withDecoders(leafDec, intDec, indexKeyType, annotationType)
+  }
+
+  private[this] val offsetFieldIdx = indexSpec.offsetField.map(indexSpec.annotationType.fieldIdx)
+
+  private[this] val makeDec = rowsSpec.codecSpec.buildDecoder(rowPType, rowPType)
+
+  private[this] class OpenPartition(val index: IndexReader, val dec: Decoder) {
+    def close(): Unit = {
+      index.close()
+      dec.close()
+    }
+  }
+
+  private[this] val open = new util.LinkedHashMap[Int, OpenPartition](maxOpenPartitions, 0.75f, true) {
+    override def removeEldestEntry(eldest: Entry[Int, OpenPartition]): Boolean = {
+      if (size() > maxOpenPartitions) {
+        eldest.getValue.close()
+        true
+      } else
+        false
+    }
+  }
+
+  private[this] def openPartition(i: Int): OpenPartition = {
+    var p = open.get(i)
+    if (p == null) {
+      val file = rowsSpec.partFiles(i)
+      val index = mkIndexReader(fs, s"$rowsPath/${ indexSpec.relPath }/$file.idx", 8)
+      val dec = try {
+        makeDec(new ByteTrackingInputStream(fs.unsafeReader(s"$rowsPath/parts/$file")))
+      } catch {
+        case e: Exception =>
+          index.close()
+          throw e
+      }
+      p = new OpenPartition(index, dec)
+      open.put(i, p)
+    }
+    p
+  }
+
+  private[this] def readRows(p: OpenPartition, entries: Iterator[LeafChild], region: Region, ab: ArrayBuilder[Row]): Unit =
+    entries.foreach { entry =>
+      val offset = offsetFieldIdx
+        .map(j => entry.annotation.asInstanceOf[Row].getAs[Long](j))
+        .getOrElse(entry.recordOffset)
+      p.dec.seek(offset)
+      assert(p.dec.readByte() == 1)
+      ab += SafeRow(rowPType, region, p.dec.readRegionValue(region))
+      region.clear()
+    }
+
+  // rows whose keys start with one of `keys`, key prefixes of the same length,
+  // in the order of `keys`
+  def get(keys: IndexedSeq[Annotation]): IndexedSeq[Row] = synchronized {
+    val ab = new ArrayBuilder[Row]()
+    Region.scoped { region =>
+      keys.foreach { key =>
+        partitioner.queryKey(key).foreach { i =>
+          val p = openPartition(i)
+          readRows(p, p.index.keyIterator(key), region, ab)
+        }
+      }
+    }
+    ab.result()
+  }
+
+  // rows whose keys are in `interval`, an interval of key prefixes, in key order
+  def range(interval: Interval): IndexedSeq[Row] = synchronized {
+    val ab = new ArrayBuilder[Row]()
+    if (Interval.isValid(keyType.ordering, interval.start, interval.end, interval.includesStart, interval.includesEnd)) {
+      Region.scoped { region =>
+        partitioner.queryInterval(interval).foreach { i =>
+          val p = openPartition(i)
+          readRows(p, p.index.queryByInterval(interval), region, ab)
+        }
+      }
+    }
+    ab.result()
+  }
+
+  private[this] def encodeRows(rows: IndexedSeq[Row], codec: String): Array[Byte] =
+    if (codec == null)
+      JsonMethods.compact(JSONAnnotationImpex.exportAnnotation(rows, TArray(rowType))).getBytes("UTF-8")
+    else
+      ValueEncoding.encode(TArray(rowType), rows, codec)
+
+  // keys and intervals from Python are JSON, and rows are returned in the
+  // encoding `codec`, or as JSON if it is null
+  def pyGet(keysJSON: String, nKeyFields: Int, codec: String): Array[Byte] = {
+    val keys = JSONAnnotationImpex.importAnnotation(JsonMethods.parse(keysJSON), TArray(keyType.truncate(nKeyFields)))
+    encodeRows(get(keys.asInstanceOf[IndexedSeq[Annotation]]), codec)
+  }
+
+  def pyRange(intervalJSON: String, nKeyFields: Int, codec: String): Array[Byte] = {
+    val interval = JSONAnnotationImpex.importAnnotation(JsonMethods.parse(intervalJSON), TInterval(keyType.truncate(nKeyFields)))
+    encodeRows(range(interval.asInstanceOf[Interval]), codec)
+  }
+
+  def close(): Unit = synchronized {
+    val it = open.values().iterator()
+    while (it.hasNext)
+      it.next().close()
+    open.clear()
+  }
+}
@@ -7,6 +7,7 @@ import breeze.numerics.{abs => breezeAbs, log => breezeLog, pow => breezePow, sq
 import breeze.stats.distributions.{RandBasis, ThreadLocalRandomGenerator}
 import is.hail._
 import is.hail.annotations._
+import is.hail.backend.BroadcastValue
 import is.hail.expr.Parser
 import is.hail.expr.ir.{CompileAndEvaluate, ExecuteContext, IR, TableValue}
 import is.hail.expr.types._
@@ -119,6 +120,42 @@ object BlockMatrix {
     BlockMatrix(sc, gp, (gp, pi) => (gp.blockCoordinates(pi), localBlocksBc(pi).value))
   }
 
+  // reads a row-major binary file of doubles one row of blocks at a time, so
+  // the driver does not hold the whole matrix in addition to its blocks
+  def readDoubles(hc: HailContext, path: String, nRows: Int, nCols: Int, blockSize: Int): M = {
+    val gp = GridPartitioner(blockSize, nRows, nCols)
+    val localBlocksBc = new Array[BroadcastValue[BDM[Double]]](gp.numPartitions)
+
+    hc.sFS.readFile(path) { is =>
+      val in = new DoubleInputBuffer(is, RichArray.defaultBufSize)
+      val blockRow = new Array[Double](gp.blockRowNRows(0) * nCols)
+      var i = 0
+      while (i < gp.nBlockRows) {
+        val blockNRows = gp.blockRowNRows(i)
+        in.readDoubles(blockRow, 0, blockNRows * nCols)
+        var j = 0
+        while (j < gp.nBlockCols) {
+          val jOffset = j * blockSize
+          val block = new BDM[Double](blockNRows, gp.blockColNCols(j))
+          var jj = 0
+          while (jj < block.cols) {
+            var ii = 0
+            while (ii < blockNRows) {
+              block(ii, jj) = blockRow(ii * nCols + jOffset + jj)
+              ii += 1
+            }
+            jj += 1
+          }
+          localBlocksBc(gp.coordinatesBlock(i, j)) = HailContext.backend.broadcast(block)
+          j += 1
+        }
+        i += 1
+      }
+    }
+
+    BlockMatrix(hc.sc, gp, (gp, pi) => (gp.blockCoordinates(pi), localBlocksBc(pi).value))
+  }
+
   def fromIRM(irm: IndexedRowMatrix): M =
     fromIRM(irm, defaultBlockSize)
 
@@ -142,6 +142,47 @@ object AbstractRVDSpec {
       case _ => tmprvd
     }
   }
+
+  // reads rows stored in several streams written by RVD.writeRowsGrouped; the
+  // first spec is the keyed stream holding the index, and each field of
+  // `requestedType` is read from the stream that has it
+  def readGrouped(
+    hc: HailContext,
+    specs: IndexedSeq[AbstractRVDSpec],
+    paths: IndexedSeq[String],
+    requestedType: PStruct,
+    newPartitioner: Option[RVDPartitioner],
+    filterIntervals: Boolean
+  ): RVD = {
+    require(specs.tail.forall(_.key.isEmpty))
+    require(requestedType.fieldNames.forall(f => specs.count(_.encodedType.hasField(f)) == 1))
+    val requestedTypes = specs.map { spec =>
+      requestedType.virtualType.filter(f => spec.encodedType.hasField(f.name))._1.physicalType
+    }
+    val indexSpecs = specs.map {
+      case spec: IndexedRVDSpec => spec.indexSpec
+      case _ => fatal("field groups of a table must be indexed")
+    }
+    val first = specs.head
+    val requestedKey = first.key.takeWhile(requestedTypes.head.hasField)
+    val partitioner = first.partitioner
+    val tmpPartitioner = partitioner.intersect(newPartitioner.getOrElse(partitioner))
+
+    val rvdType = RVDType(requestedType, requestedKey)
+    val parts = if (first.key.isEmpty)
+      first.partFiles
+    else
+      tmpPartitioner.rangeBounds.map { b => first.partFiles(partitioner.lowerBoundInterval(b)) }.toArray
+
+    val crdd = hc.readRowsGrouped(
+      paths, indexSpecs, specs.map(_.encodedType), first.codecSpec, parts, tmpPartitioner.rangeBounds,
+      requestedType, requestedTypes)
+    val tmprvd = RVD(rvdType, tmpPartitioner.coarsen(requestedKey.length), crdd)
+    newPartitioner match {
+      case Some(part) if !filterIntervals => tmprvd.repartition(part.coarsen(requestedKey.length))
+      case _ => tmprvd
+    }
+  }
 }
 
 object OrderedRVDSpec {
@@ -695,6 +695,12 @@ class RVD(
         persistedRDD.unpersist()
         self
       }
+
+      override def persistedBytes: Long =
+        sparkContext.getRDDStorageInfo
+          .filter(_.id == persistedRDD.id)
+          .map(info => info.memSize + info.diskSize)
+          .sum
     }
   }
 
@@ -702,6 +708,9 @@ class RVD(
 
   def storageLevel: StorageLevel = StorageLevel.NONE
 
+  // the size of the blocks of a persisted RVD held in memory and on disk
+  def persistedBytes: Long = 0L
+
   def write(path: String, idxRelPath: String, stageLocally: Boolean, codecSpec: CodecSpec): Array[Long] = {
     val (partFiles, partitionCounts) = crdd.writeRows(path, idxRelPath, typ, stageLocally, codecSpec)
     rvdSpec(codecSpec, IndexSpec.emptyAnnotation(idxRelPath, typ.kType.virtualType), partFiles).write(HailContext.sFS, path)
@@ -862,6 +871,63 @@ class RVD(
     partitionCounts
   }
 
+  // writes the fields of `streamTypes(i)` to the stream at `path/relPaths(i)`;
+  // the first stream holds the key and the index at `path/index`, whose
+  // annotation field `offsetFields(i - 1)` is the offset of each row in
+  // stream i
+  def writeRowsGrouped(
+    path: String,
+    codecSpec: CodecSpec,
+    stageLocally: Boolean,
+    relPaths: IndexedSeq[String],
+    streamTypes: IndexedSeq[PStruct],
+    offsetFields: IndexedSeq[String]
+  ): Array[Long] = {
+    require(relPaths.length == streamTypes.length && offsetFields.length == streamTypes.length - 1)
+    require(typ.key.forall(streamTypes.head.hasField))
+
+    val fs = HailContext.sFS
+
+    relPaths.foreach(p => fs.mkDir(path + "/" + p + "/parts"))
+    fs.mkDir(path + "/index")
+
+    val bcFS = HailContext.bcFS
+    val d = digitsNeeded(crdd.getNumPartitions)
+
+    val fullRowType = typ.rowType
+    val makeEncs = streamTypes.map(t => codecSpec.buildEncoder(fullRowType, t))
+    val makeIndexWriter = IndexWriter.builder(typ.kType.virtualType,
+      RichContextRDDRegionValue.groupedAnnotationType(offsetFields))
+
+    val localTyp = typ
+
+    val partFilePartitionCounts: Array[(String, Long)] =
+      crdd.cmapPartitionsWithIndex { (i, ctx, it) =>
+        val fs = bcFS.value
+        val partFileAndCount = RichContextRDDRegionValue.writeGroupedRegion(
+          fs,
+          path,
+          localTyp,
+          it,
+          i,
+          ctx,
+          d,
+          stageLocally,
+          makeIndexWriter,
+          relPaths,
+          makeEncs)
+
+        Iterator.single(partFileAndCount)
+      }.collect()
+
+    val (partFiles, partitionCounts) = partFilePartitionCounts.unzip
+
+    RichContextRDDRegionValue.writeGroupedSpecs(fs, path, codecSpec, typ, relPaths, streamTypes, offsetFields,
+      partFiles, partitioner)
+
+    partitionCounts
+  }
+
   // Joining
 
   def orderedLeftJoinDistinctAndInsert(
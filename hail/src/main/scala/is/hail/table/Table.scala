@@ -39,6 +39,28 @@ abstract class AbstractTableSpec extends RelationalSpec {
     RVDType(rows.encodedType, rows.key)
   }
   def indexed(path: String): Boolean = rowsSpec(path).indexed
+
+  // row fields written in separate streams by `Table.write(_field_groups=...)`
+  def rowGroupComponents: IndexedSeq[RVDComponentSpec] =
+    Iterator.from(0)
+      .map(i => s"row_group_$i")
+      .takeWhile(components.contains)
+      .map(getComponent[RVDComponentSpec])
+      .toFastIndexedSeq
+
+  // field stats written by `Table.write(_partition_stats=...)`
+  def partitionStats: Option[PartitionStatsComponentSpec] =
+    components.get("partition_stats").map(_.asInstanceOf[PartitionStatsComponentSpec])
+
+  // the streams of rows to read for the fields of `requestedType`, with their
+  // paths: the keyed rows, then the field groups with requested fields
+  def rowStreams(path: String, requestedType: TStruct): IndexedSeq[(AbstractRVDSpec, String)] = {
+    val fs = HailContext.sFS
+    val groups = rowGroupComponents
+      .map(c => (c.rvdSpec(fs, path), c.absolutePath(path)))
+      .filter { case (spec, _) => requestedType.fieldNames.exists(spec.encodedType.hasField) }
+    (rowsComponent.rvdSpec(fs, path), rowsComponent.absolutePath(path)) +: groups
+  }
 }
 
 case class TableSpec(
@@ -24,10 +24,14 @@ class ExecutionTimer(val context: String) {
     val result = block
     val t1 = System.nanoTime()
 
-    val nanos = t1 - t0
-    val timing = Map("nano" -> nanos, "readable" -> formatTime(nanos))
-    timings += s"$context -- $stage" -> timing
+    record(stage, t1 - t0)
 
     result
   }
+
+  // partitions of the local backend record their times from its threads
+  def record(stage: String, nanos: Long): Unit = synchronized {
+    val timing = Map("nano" -> nanos, "readable" -> formatTime(nanos))
+    timings += s"$context -- $stage" -> timing
+  }
 }
@@ -57,6 +57,8 @@ trait Py4jUtils {
 
   def isDir(path: String, hc: HailContext): Boolean = hc.sFS.isDir(path)
 
+  def rmtree(path: String, hc: HailContext): Unit = hc.sFS.delete(path, recursive = true)
+
   def ls(path: String, hc: HailContext): String = {
     val statuses = hc.sFS.listStatus(path)
     JsonMethods.compact(JArray(statuses.map(fs => statusToJson(fs)).toList))
@@ -1,5 +1,7 @@
 package is.hail.expr.ir
 
+import java.io.{BufferedReader, InputStreamReader}
+import java.nio.charset.StandardCharsets
 import java.util.regex.Pattern
 
 import is.hail.HailContext
@@ -15,6 +17,8 @@ import is.hail.utils.StringEscapeUtils._
 import is.hail.utils._
 import org.apache.spark.rdd.RDD
 import org.apache.spark.sql.Row
+import org.json4s._
+import org.json4s.jackson.JsonMethods
 
 import scala.util.matching.Regex
 import is.hail.io.fs.FS
@@ -32,7 +36,10 @@ case class TextTableReaderOptions(
   skipBlankLines: Boolean,
   forceBGZ: Boolean,
   filterAndReplace: TextInputFilterAndReplace,
-  forceGZ: Boolean) {
+  forceGZ: Boolean,
+  imputeSample: Option[Int] = None,
+  imputeFallback: String = "error",
+  imputeCache: Boolean = false) {
   @transient val typeMap: Map[String, Type] = typeMapStr.mapValues(s => IRParser.parseType(s)).map(identity)
 
   private val commentStartsWith: Array[String] = comment.filter(_.length == 1)
@@ -45,7 +52,9 @@ case class TextTableReaderOptions(
   def nPartitions: Int = nPartitionsOpt.getOrElse(HailContext.get.sc.defaultParallelism)
 }
 
-case class TextTableReaderMetadata(globbedFiles: Array[String], header: String, fullType: TableType)
+// `sampledColumns` have types imputed from a sample of the lines
+case class TextTableReaderMetadata(globbedFiles: Array[String], header: String, fullType: TableType,
+  sampledColumns: Set[String] = Set.empty)
 
 object TextTableReader {
 
@@ -151,11 +160,10 @@ object TextTableReader {
     case e: NumberFormatException => false
   }
 
-  def imputeTypes(values: RDD[WithContext[String]], header: Array[String],
-    delimiter: String, missing: Set[String], quote: java.lang.Character): Array[Option[Type]] = {
-    val nFields = header.length
-
-    val matchTypes: Array[Type] = Array(TBoolean(), TInt32(), TInt64(), TFloat64())
+  // for each field, whether every non-missing value matches each of the
+  // imputed types, and whether every value is missing
+  def imputeMatches(lines: Iterator[WithContext[String]], nFields: Int,
+    delimiter: String, missing: Set[String], quote: java.lang.Character): MultiArray2[Boolean] = {
     val matchers: Array[String => Boolean] = Array(
       booleanMatcher,
       int32Matcher,
@@ -163,53 +171,194 @@ object TextTableReader {
       float64Matcher)
     val nMatchers = matchers.length
 
-    val imputation = values.mapPartitions { it =>
-      val ma = MultiArray2.fill[Boolean](nFields, nMatchers + 1)(true)
-      val ab = new ArrayBuilder[String]
-      val sb = new StringBuilder
-      it.foreach { line =>
-        line.foreach { l =>
-          val split = splitLine(l, delimiter, quote, ab, sb)
-          if (split.length != nFields)
-            fatal(s"expected $nFields fields, but found ${ split.length }")
+    val ma = MultiArray2.fill[Boolean](nFields, nMatchers + 1)(true)
+    val ab = new ArrayBuilder[String]
+    val sb = new StringBuilder
+    lines.foreach { line =>
+      line.foreach { l =>
+        val split = splitLine(l, delimiter, quote, ab, sb)
+        if (split.length != nFields)
+          fatal(s"expected $nFields fields, but found ${ split.length }")
 
-          var i = 0
-          while (i < nFields) {
-            val field = split(i)
-            if (!missing.contains(field)) {
-              var j = 0
-              while (j < nMatchers) {
-                ma.update(i, j, ma(i, j) && matchers(j)(field))
-                j += 1
-              }
-              ma.update(i, nMatchers, false)
+        var i = 0
+        while (i < nFields) {
+          val field = split(i)
+          if (!missing.contains(field)) {
+            var j = 0
+            while (j < nMatchers) {
+              ma.update(i, j, ma(i, j) && matchers(j)(field))
+              j += 1
             }
-            i += 1
+            ma.update(i, nMatchers, false)
           }
+          i += 1
         }
       }
-      Iterator.single(ma)
+    }
+    ma
+  }
+
+  def imputedTypes(imputation: MultiArray2[Boolean]): Array[Option[Type]] = {
+    val matchTypes: Array[Type] = Array(TBoolean(), TInt32(), TInt64(), TFloat64())
+    val nMatchers = matchTypes.length
+
+    imputation.rowIndices.map { i =>
+      someIf(!imputation(i, nMatchers),
+        (0 until nMatchers).find(imputation(i, _))
+          .map(matchTypes)
+          .getOrElse(TString()))
+    }.toArray
+  }
+
+  def imputeTypes(values: RDD[WithContext[String]], header: Array[String],
+    delimiter: String, missing: Set[String], quote: java.lang.Character): Array[Option[Type]] = {
+    val nFields = header.length
+
+    val imputation = values.mapPartitions { it =>
+      Iterator.single(imputeMatches(it, nFields, delimiter, missing, quote))
     }
       .reduce({ case (ma1, ma2) =>
         var i = 0
         while (i < nFields) {
           var j = 0
-          while (j < nMatchers) {
+          while (j < ma1.n2) {
             ma1.update(i, j, ma1(i, j) && ma2(i, j))
             j += 1
           }
-          ma1.update(i, nMatchers, ma1(i, nMatchers) && ma2(i, nMatchers))
           i += 1
         }
         ma1
       })
 
-    imputation.rowIndices.map { i =>
-      someIf(!imputation(i, nMatchers),
-        (0 until nMatchers).find(imputation(i, _))
-          .map(matchTypes)
-          .getOrElse(TString()))
-    }.toArray
+    imputedTypes(imputation)
+  }
+
+  val SAMPLE_OFFSETS_PER_FILE = 16
+
+  // up to `n` lines spread across `files` that `keep` accepts: lines from
+  // evenly spaced offsets in uncompressed files, and the first lines of
+  // compressed files, which cannot be read from an offset
+  def sampleLines(fs: FS, files: Array[String], n: Int, filterAndReplace: TextInputFilterAndReplace,
+    keep: String => Boolean): Array[WithContext[String]] = {
+    val perFile = (n + files.length - 1) / files.length
+    val ab = new ArrayBuilder[WithContext[String]]
+    files.foreach { file =>
+      if (fs.getCodec(file) != "")
+        fs.readLines(file, filterAndReplace) { lines =>
+          lines.filter(line => keep(line.value)).take(perFile).foreach(ab += _)
+        }
+      else {
+        val size = fs.getFileSize(file)
+        val nOffsets = math.min(SAMPLE_OFFSETS_PER_FILE, perFile)
+        fs.readFileNoCompression(file) { is =>
+          (0 until nOffsets).foreach { i =>
+            val offset = size * i / nOffsets
+            val nLines = perFile * (i + 1) / nOffsets - perFile * i / nOffsets
+            is.seek(offset)
+            val reader = new BufferedReader(new InputStreamReader(is, StandardCharsets.UTF_8))
+            // the line at a nonzero offset may start before it
+            if (offset > 0)
+              reader.readLine()
+            val lines = Iterator.continually(reader.readLine())
+              .takeWhile(_ != null)
+              .map(line => WithContext(line, Context(line, file, None)))
+            filterAndReplace(lines).filter(line => keep(line.value)).take(nLines).foreach(ab += _)
+          }
+        }
+      }
+    }
+    ab.result().take(n)
+  }
+
+  private def imputeCachePath(globbedFiles: Array[String]): String = globbedFiles.head + ".hail_types.json"
+
+  // imputed types depend on the input files, as identified by their sizes and
+  // modification times, and on the options for splitting and filtering lines
+  private def imputeCacheKey(fs: FS, options: TextTableReaderOptions, globbedFiles: Array[String], header: String): JValue =
+    JObject(
+      "files" -> JArray(globbedFiles.map { file =>
+        val status = fs.fileStatus(file)
+        JObject(
+          "path" -> JString(file),
+          "size" -> JInt(status.getLen),
+          "mtime" -> JInt(status.getModificationTime))
+      }.toList),
+      "header" -> JString(header),
+      "separator" -> JString(options.separator),
+      "missing" -> JArray(options.missing.toList.sorted.map(JString(_))),
+      "quote" -> Option(options.quoteStr).map(JString(_)).getOrElse(JNull),
+      "comment" -> JArray(options.comment.toList.map(JString(_))),
+      "noHeader" -> JBool(options.noHeader),
+      "skipBlankLines" -> JBool(options.skipBlankLines),
+      "filterAndReplace" -> JString(options.filterAndReplace.toString),
+      "imputeSample" -> options.imputeSample.map(JInt(_)).getOrElse(JNull))
+
+  private def readImputeCache(fs: FS, path: String, key: JValue, nFields: Int): Option[Array[Option[Type]]] = {
+    if (!fs.exists(path))
+      return None
+    try {
+      val jv = fs.readFile(path)(in => JsonMethods.parse(in))
+      if ((jv \ "key") != key)
+        None
+      else
+        jv \ "types" match {
+          case JArray(types) if types.length == nFields =>
+            Some(types.map {
+              case JString(t) => Some(IRParser.parseType(t))
+              case _ => None
+            }.toArray)
+          case _ => None
+        }
+    } catch {
+      case e: Exception =>
+        warn(s"ignoring unreadable imputed types in '$path': ${ e.getMessage }")
+        None
+    }
+  }
+
+  private def writeImputeCache(fs: FS, path: String, key: JValue, types: Array[Option[Type]]) {
+    try {
+      fs.writeTextFile(path) { out =>
+        out.write(JsonMethods.compact(JObject(
+          "key" -> key,
+          "types" -> JArray(types.map(_.map(t => JString(t.parsableString())).getOrElse(JNull)).toList))))
+      }
+      info(s"Cached imputed types in '$path'")
+    } catch {
+      case e: Exception =>
+        warn(s"could not cache imputed types in '$path': ${ e.getMessage }")
+    }
+  }
+
+  def imputeColumnTypes(options: TextTableReaderOptions, globbedFiles: Array[String], header: String,
+    columns: Array[String], lines: => RDD[WithContext[String]]): Array[Option[Type]] = {
+    val fs = HailContext.get.sFS
+    val cachePath = imputeCachePath(globbedFiles)
+    val cacheKey = if (options.imputeCache) imputeCacheKey(fs, options, globbedFiles, header) else null
+
+    val cached = if (options.imputeCache) readImputeCache(fs, cachePath, cacheKey, columns.length) else None
+    cached match {
+      case Some(types) =>
+        info(s"Using column types imputed earlier, cached in '$cachePath'")
+        types
+      case None =>
+        val types = options.imputeSample match {
+          case Some(n) =>
+            info(s"Sampling $n lines to impute column types")
+            val sample = sampleLines(fs, globbedFiles, n, options.filterAndReplace, { line =>
+              !options.isComment(line) &&
+                (options.noHeader || line != header) &&
+                !(options.skipBlankLines && line.isEmpty)
+            })
+            imputedTypes(imputeMatches(sample.iterator, columns.length, options.separator, options.missing, options.quote))
+          case None =>
+            info("Reading table to impute column types")
+            imputeTypes(lines, columns, options.separator, options.missing, options.quote)
+        }
+        if (options.imputeCache)
+          writeImputeCache(fs, cachePath, cacheKey, types)
+        types
+    }
   }
 
   def readMetadata(options: TextTableReaderOptions): TextTableReaderMetadata = {
@@ -221,7 +370,15 @@ object TextTableReader {
   def readMetadata1(options: TextTableReaderOptions): TextTableReaderMetadata = {
     val hc = HailContext.get
 
-    val TextTableReaderOptions(files, _, comment, separator, missing, noHeader, impute, _, _, skipBlankLines, forceBGZ, filterAndReplace, forceGZ) = options
+    val TextTableReaderOptions(files, _, comment, separator, missing, noHeader, impute, _, _, skipBlankLines, forceBGZ, filterAndReplace, forceGZ,
+    imputeSample, imputeFallback, _) = options
+
+    imputeSample.foreach { n =>
+      if (n <= 0)
+        fatal(s"'impute_sample' must be positive, found $n")
+    }
+    if (imputeFallback != "error" && imputeFallback != "missing")
+      fatal(s"'impute_fallback' must be 'error' or 'missing', found '$imputeFallback'")
 
     val globbedFiles: Array[String] = {
       val fs = HailContext.get.sFS
@@ -278,10 +435,8 @@ object TextTableReader {
 
     val namesAndTypes = {
       if (impute) {
-        info("Reading table to impute column types")
-
         sb.append("Finished type imputation")
-        val imputedTypes = imputeTypes(rdd, columns, separator, missing, quote)
+        val imputedTypes = imputeColumnTypes(options, globbedFiles, header, columns, rdd)
         columns.zip(imputedTypes).map { case (name, imputedType) =>
           types.get(name) match {
             case Some(t) =>
@@ -316,7 +471,11 @@ object TextTableReader {
     info(sb.result())
 
     val t = TableType(TStruct(namesAndTypes: _*), FastIndexedSeq(), TStruct())
-    TextTableReaderMetadata(globbedFiles, header, t)
+    val sampledColumns = if (impute && imputeSample.isDefined)
+      columns.filter(c => !types.contains(c)).toSet
+    else
+      Set.empty[String]
+    TextTableReaderMetadata(globbedFiles, header, t, sampledColumns)
   }
 
   def read(hc: HailContext)(files: Array[String],
@@ -362,6 +521,9 @@ case class TextTableReader(options: TextTableReaderOptions) extends TableReader
     val rowPType = PType.canonical(rowTyp).asInstanceOf[PStruct]
 
     val useColIndices = rowTyp.fields.map(f => fullType.rowType.fieldIdx(f.name))
+    val sampled = rowTyp.fields.map(f => metadata.sampledColumns.contains(f.name)).toArray
+    val nSampleLines = options.imputeSample.getOrElse(0)
+    val sampledFallbackToMissing = options.imputeFallback == "missing"
 
     val crdd = ContextRDD.textFilesLines[RVDContext](hc.sc, metadata.globbedFiles, options.nPartitions, options.filterAndReplace)
       .filter { line =>
@@ -375,6 +537,7 @@ case class TextTableReader(options: TextTableReaderOptions) extends TableReader
 
       val ab = new ArrayBuilder[String]
       val sb = new StringBuilder
+      var nFallbacks = 0L
       it.map {
         _.map { line =>
           val sp = TextTableReader.splitLine(line, options.separator, options.quote, ab, sb)
@@ -397,6 +560,16 @@ case class TextTableReader(options: TextTableReaderOptions) extends TableReader
               else
                 rvb.addAnnotation(typ, TableAnnotationImpex.importAnnotation(field, typ))
             } catch {
+              case e: Exception if sampled(i) && sampledFallbackToMissing =>
+                if (nFallbacks == 0)
+                  log.warn(s"""could not convert "$field" to $typ in column "$name", imputed from a sample; """ +
+                    "setting it and later unconvertible values to missing")
+                nFallbacks += 1
+                rvb.setMissing()
+              case e: Exception if sampled(i) =>
+                fatal(s"""${ e.getClass.getName }: could not convert "$field" to $typ in column "$name" """ +
+                  s"(type imputed from a sample of $nSampleLines lines). Import with a larger 'impute_sample', " +
+                  "with impute_fallback='missing', or with the type of the column in 'types'.", e)
               case e: Exception =>
                 fatal(s"""${ e.getClass.getName }: could not convert "$field" to $typ in column "$name" """, e)
             }
@@ -2,6 +2,7 @@ package is.hail.variant
 
 import is.hail.annotations._
 import is.hail.check.Gen
+import is.hail.expr.JSONAnnotationImpex
 import is.hail.expr.ir
 import is.hail.expr.ir._
 import is.hail.expr.types._
@@ -29,7 +30,7 @@ object RelationalSpec {
   implicit val formats: Formats = new DefaultFormats() {
     override val typeHints = ShortTypeHints(List(
       classOf[ComponentSpec], classOf[RVDComponentSpec], classOf[PartitionCountsComponentSpec],
-      classOf[RelationalSpec], classOf[MatrixTableSpec], classOf[TableSpec]))
+      classOf[PartitionStatsComponentSpec], classOf[RelationalSpec], classOf[MatrixTableSpec], classOf[TableSpec]))
     override val typeHintFieldName = "name"
   } +
     new TableTypeSerializer +
@@ -118,6 +119,16 @@ case class RVDComponentSpec(rel_path: String) extends ComponentSpec {
 
 case class PartitionCountsComponentSpec(counts: Seq[Long]) extends ComponentSpec
 
+// `stats` is an array with the stats of each partition, see PartitionStats
+case class PartitionStatsComponentSpec(paths: Seq[Seq[String]], stats_type: String, stats: JValue) extends ComponentSpec {
+  def fieldPaths: IndexedSeq[IndexedSeq[String]] = paths.map(_.toFastIndexedSeq).toFastIndexedSeq
+
+  def statsType: TStruct = IRParser.parseStructType(stats_type)
+
+  def partitionStats: IndexedSeq[Row] =
+    JSONAnnotationImpex.importAnnotation(stats, TArray(statsType)).asInstanceOf[IndexedSeq[Row]]
+}
+
 abstract class AbstractMatrixTableSpec extends RelationalSpec {
   def matrix_type: MatrixType
 
@@ -11,7 +11,7 @@ import is.hail.expr.ir.functions._
 import is.hail.expr.types.TableType
 import is.hail.expr.types.physical.{PArray, PBoolean, PFloat32, PFloat64, PInt32, PInt64, PString, PStruct, PType}
 import is.hail.expr.types.virtual._
-import is.hail.io.CodecSpec
+import is.hail.io.{CodecSpec, ValueEncoding}
 import is.hail.io.bgen.MatrixBGENReader
 import is.hail.linalg.BlockMatrix
 import is.hail.methods._
@@ -2085,6 +2085,14 @@ class IRSuite extends HailSuite {
     assert(x2 eq cached)
   }
 
+  @Test def testEncodedLiteralParser() {
+    val t = TStruct("a" -> TArray(TInt32()), "b" -> TDict(TString(), TInterval(TFloat64())), "c" -> TCall())
+    val v = Row(FastIndexedSeq(1, null, 3), Map("x" -> Interval(1.0, null, true, false), "y" -> null), Call2(0, 1))
+    val bytes = ValueEncoding.encode(t, v, "unblockedUncompressed")
+    val s = s"""(EncodedLiteral ${ t.parsableString() } unblockedUncompressed "${ java.util.Base64.getEncoder.encodeToString(bytes) }")"""
+    assert(IRParser.parse_value_ir(s) == Literal(t, v))
+  }
+
   @Test def testCachedTableIR() {
     val cached = TableRange(1, 1)
     val s = s"(JavaTable __uid1)"